@@ -0,0 +1,293 @@
+"""
+告警规则引擎
+规则在 config.yml 的 alerts 段配置，启动时编译一次；每轮采集后用最新样本增量求值：
+- 每条（规则, 指标）维护一个时间窗口，avg 用滑动求和，min/max 用单调队列，均为 O(1) 摊还；
+- 状态机 ok → pending（满足条件但未达 for 时长）→ firing → ok，解除阈值 clear 提供迟滞，避免抖动；
+- 只在状态切换（及 firing 期间超过 repeat_interval）时通知，由后台线程发送到 webhook / 命令 / 日志。
+"""
+import fnmatch
+import json
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .app_config import get_alerts_config
+
+_OPS = {
+    ">": lambda v, t: v > t,
+    ">=": lambda v, t: v >= t,
+    "<": lambda v, t: v < t,
+    "<=": lambda v, t: v <= t,
+}
+_AGGS = ("avg", "min", "max", "last")
+
+
+class Rule:
+    """编译后的告警规则"""
+
+    def __init__(self, cfg: Dict):
+        if not isinstance(cfg, dict):
+            raise ValueError(f"规则应为映射，实际为 {type(cfg).__name__}")
+        for key in ("metric", "threshold"):
+            if cfg.get(key) is None:
+                raise ValueError(f"告警规则 {cfg.get('name') or cfg.get('metric') or '?'}: 缺少 {key}")
+        self.name = str(cfg.get("name") or cfg.get("metric"))
+        self.metric = str(cfg["metric"])
+        self.pattern = re.compile(fnmatch.translate(self.metric))
+        self.op = str(cfg.get("op", ">"))
+        if self.op not in _OPS:
+            raise ValueError(f"告警规则 {self.name}: 不支持的比较符 {self.op}")
+        self.agg = str(cfg.get("agg", "last"))
+        if self.agg not in _AGGS:
+            raise ValueError(f"告警规则 {self.name}: 不支持的聚合 {self.agg}")
+        self.threshold = float(cfg["threshold"])
+        # 解除阈值：默认与触发阈值相同；如 > 90 触发、clear: 85 表示降到 85 以下才恢复
+        self.clear = float(cfg.get("clear", self.threshold))
+        self.window = float(cfg.get("window", 0))
+        self.for_seconds = float(cfg.get("for", 0))
+        self.severity = str(cfg.get("severity", "warning"))
+        self._cmp = _OPS[self.op]
+
+    def matches(self, series: str) -> bool:
+        return bool(self.pattern.fullmatch(series))
+
+    def triggered(self, value: float) -> bool:
+        return self._cmp(value, self.threshold)
+
+    def holds(self, value: float) -> bool:
+        """firing 状态下是否仍未恢复（与 clear 阈值比较）"""
+        return self._cmp(value, self.clear)
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "metric": self.metric, "op": self.op, "threshold": self.threshold,
+                "clear": self.clear, "agg": self.agg, "window": self.window, "for": self.for_seconds,
+                "severity": self.severity}
+
+
+class WindowAggregate:
+    """时间窗口内的增量聚合：avg 滑动求和，min/max 单调队列"""
+
+    def __init__(self, window: float, agg: str):
+        self.window = window
+        self.agg = agg
+        self.points = deque()  # (ts, value)
+        self.total = 0.0
+        self.mono = deque()    # min/max 候选 (ts, value)
+
+    def push(self, ts: float, value: float) -> float:
+        self.points.append((ts, value))
+        self.total += value
+        if self.agg == "max":
+            while self.mono and self.mono[-1][1] <= value:
+                self.mono.pop()
+            self.mono.append((ts, value))
+        elif self.agg == "min":
+            while self.mono and self.mono[-1][1] >= value:
+                self.mono.pop()
+            self.mono.append((ts, value))
+        while self.points and ts - self.points[0][0] > self.window:
+            _, old = self.points.popleft()
+            self.total -= old
+        while self.mono and ts - self.mono[0][0] > self.window:
+            self.mono.popleft()
+        if self.agg == "avg":
+            return self.total / len(self.points)
+        if self.agg in ("min", "max"):
+            return self.mono[0][1]
+        return value
+
+
+class AlertState:
+    """单个（规则, 指标）的告警状态"""
+
+    def __init__(self, rule: Rule, series: str):
+        self.rule = rule
+        self.series = series
+        self.agg = WindowAggregate(rule.window, rule.agg)
+        self.state = "ok"
+        self.since = 0.0      # 进入当前状态的时间
+        self.value = None
+        self.notified = 0.0   # 最近一次发送通知的时间（去重用）
+
+    def to_dict(self) -> Dict:
+        return {"rule": self.rule.name, "series": self.series, "state": self.state,
+                "severity": self.rule.severity, "value": self.value, "since": self.since,
+                "threshold": self.rule.threshold, "op": self.rule.op}
+
+
+def compile_rules(rules: List[Dict]) -> List[Rule]:
+    """
+    编译规则列表。无效的规则（缺少字段、比较符 / 聚合不支持、数值无法解析）打印原因后跳过；
+    告警状态按（规则名, 指标）保存，同名规则会共用迟滞与 for 计时，因此重名时只保留第一条。
+    配置有误时告警少几条，而不是整个面板无法启动。
+    """
+    out, names = [], set()
+    for i, cfg in enumerate(rules or []):
+        try:
+            rule = Rule(cfg)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"告警规则 #{i + 1} 无效，已跳过: {e}（{cfg}）")
+            continue
+        if rule.name in names:
+            print(f"告警规则 #{i + 1} 名称 {rule.name} 重复，已跳过（未设置 name 时默认取 metric，同一指标的多条规则需各自命名）")
+            continue
+        names.add(rule.name)
+        out.append(rule)
+    return out
+
+
+class AlertEngine:
+    """告警引擎：规则编译、增量求值、去重通知"""
+
+    def __init__(self, rules: List[Dict], notifiers: List[Dict], repeat_interval: float = 3600):
+        self.rules = compile_rules(rules)
+        self.notifiers = list(notifiers or [])
+        self.repeat_interval = repeat_interval
+        self.states: Dict[tuple, AlertState] = {}
+        # 指标名 -> 命中的规则列表；每个新出现的指标只做一次模式匹配，历史存储回收序列时随之清理（forget）
+        self._bindings: Dict[str, List[Rule]] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=1000)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "AlertEngine":
+        rules = (cfg.get("rules") or []) if cfg.get("enable", False) else []
+        try:
+            repeat = float(cfg.get("repeat_interval", 3600))
+        except (TypeError, ValueError):
+            print(f"告警配置 repeat_interval 无效，使用默认值 3600: {cfg.get('repeat_interval')}")
+            repeat = 3600.0
+        return cls(rules, cfg.get("notifiers") or [], repeat)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rules)
+
+    def _rules_for(self, series: str) -> List[Rule]:
+        bound = self._bindings.get(series)
+        if bound is None:
+            bound = [r for r in self.rules if r.matches(series)]
+            self._bindings[series] = bound
+        return bound
+
+    def forget(self, series: Iterable[str]):
+        """丢弃已消失序列的规则匹配缓存（与历史存储回收空闲列同步），避免缓存随更替的序列名无限增长"""
+        with self._lock:
+            for name in series:
+                self._bindings.pop(name, None)
+
+    def evaluate(self, ts: float, sample: Dict[str, float]) -> List[Dict]:
+        """用一轮样本增量求值所有规则，返回本轮产生的事件（firing / resolved）"""
+        events = []
+        with self._lock:
+            for series, value in sample.items():
+                if value is None:
+                    continue
+                for rule in self._rules_for(series):
+                    key = (rule.name, series)
+                    st = self.states.get(key)
+                    if st is None:
+                        st = self.states[key] = AlertState(rule, series)
+                    v = st.agg.push(ts, float(value))
+                    st.value = round(v, 2)
+                    ev = self._step(st, ts)
+                    if ev:
+                        events.append(ev)
+            # 超出历史存储上限而未记录的序列不会被 forget：缓存明显多于本轮指标数时只保留本轮出现的
+            if len(self._bindings) > 2 * len(sample) + 1024:
+                self._bindings = {k: v for k, v in self._bindings.items() if k in sample}
+            # 指标消失（网卡拔出、容器退出）：firing 的告警按恢复处理，其余直接丢弃
+            for key in [k for k in self.states if k[1] not in sample]:
+                st = self.states.pop(key)
+                if st.state == "firing":
+                    st.state = "ok"
+                    st.since = ts
+                    events.append(dict(st.to_dict(), event="resolved"))
+        for ev in events:
+            self._enqueue(ev)
+        return events
+
+    def _step(self, st: AlertState, ts: float) -> Optional[Dict]:
+        rule, v = st.rule, st.value
+        if st.state == "firing":
+            if not rule.holds(v):
+                st.state, st.since = "ok", ts
+                return dict(st.to_dict(), event="resolved")
+            if self.repeat_interval > 0 and ts - st.notified >= self.repeat_interval:
+                st.notified = ts
+                return dict(st.to_dict(), event="firing")
+            return None
+        if not rule.triggered(v):
+            if st.state == "pending":
+                st.state, st.since = "ok", ts
+            return None
+        if st.state == "ok":
+            st.state, st.since = "pending", ts
+        if ts - st.since >= rule.for_seconds:
+            st.state, st.since, st.notified = "firing", ts, ts
+            return dict(st.to_dict(), event="firing")
+        return None
+
+    def active(self) -> List[Dict]:
+        """当前处于 pending / firing 的告警"""
+        with self._lock:
+            return [st.to_dict() for st in self.states.values() if st.state != "ok"]
+
+    # ---------- 通知 ----------
+
+    def _enqueue(self, event: Dict):
+        if not self.notifiers:
+            return
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_notifier, daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            pass  # 通知端长时间不可用时丢弃，避免拖垮采集循环
+
+    def _run_notifier(self):
+        while True:
+            event = self._queue.get()
+            for n in self.notifiers:
+                try:
+                    send_notification(n, event)
+                except Exception as e:
+                    print(f"告警通知发送失败（{n.get('type')}）: {e}")
+
+
+def send_notification(notifier: Dict, event: Dict):
+    """按通知器类型发送单条告警事件：webhook（POST JSON）/ command（stdin 传 JSON）/ log（追加一行）"""
+    kind = notifier.get("type", "log")
+    payload = json.dumps(event, ensure_ascii=False)
+    if kind == "webhook":
+        req = urllib.request.Request(
+            notifier["url"], data=payload.encode("utf-8"), method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=float(notifier.get("timeout", 5))) as resp:
+            resp.read()
+    elif kind == "command":
+        env = dict(os.environ, ALERT_RULE=event["rule"], ALERT_SERIES=event["series"],
+                   ALERT_EVENT=event["event"], ALERT_VALUE=str(event["value"]))
+        subprocess.run(notifier["command"], shell=True, input=payload, text=True, env=env,
+                       timeout=float(notifier.get("timeout", 10)),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        line = time.strftime("%Y-%m-%d %H:%M:%S") + " " + payload
+        path = notifier.get("path")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        else:
+            print(f"[ALERT] {line}")
+
+
+alert_engine = AlertEngine.from_config(get_alerts_config())
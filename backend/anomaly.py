@@ -0,0 +1,93 @@
+"""
+流式异常检测
+为历史存储中的每一列（每条序列）维护在线统计状态，每轮采集用一次 NumPy 向量化计算更新全部序列，
+开销只随列数线性增长、与网卡 / 磁盘数量无关的 Python 循环无关：
+- ewma：指数加权均值 / 方差，分数 = (x - mean) / std；
+- mad：流式中位数 / 中位绝对偏差（随机逼近），分数 = 0.6745 * (x - median) / MAD，对尖峰更稳健。
+分数先用更新前的状态计算，再吸收当前值；预热期（warmup）内分数为 0。
+"""
+from typing import Dict, Iterable
+
+import numpy as np
+
+from .app_config import get_anomaly_config
+
+# 尺度下限：按中心值的 1% 计，避免常量序列（方差≈0）出现微小变化时分数爆炸
+_REL_FLOOR = 0.01
+_ABS_FLOOR = 1e-3
+
+
+class AnomalyDetector:
+    """按列向量化的流式异常检测器，状态数组与 HistoryStore 的列一一对应"""
+
+    def __init__(self, method: str = "ewma", alpha: float = 0.05, threshold: float = 4.0, warmup: int = 30):
+        if method not in ("ewma", "mad"):
+            raise ValueError(f"不支持的异常检测方法: {method}")
+        self.method = method
+        self.alpha = float(alpha)
+        self.threshold = float(threshold)
+        self.warmup = int(warmup)
+        self.center = np.zeros(0)   # ewma 均值 / mad 中位数
+        self.spread = np.zeros(0)   # ewma 方差 / mad 偏差
+        self.count = np.zeros(0, dtype=np.int64)
+        self.last_scores = np.zeros(0)
+
+    def _grow(self, n: int):
+        if n <= len(self.count):
+            return
+        pad = n - len(self.count)
+        self.center = np.concatenate([self.center, np.zeros(pad)])
+        self.spread = np.concatenate([self.spread, np.zeros(pad)])
+        self.count = np.concatenate([self.count, np.zeros(pad, dtype=np.int64)])
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        """吸收一行样本（NaN 表示该序列本轮无数据），返回同长度的异常分数"""
+        n = len(x)
+        self._grow(n)
+        center, spread, count = self.center[:n], self.spread[:n], self.count[:n]
+        valid = ~np.isnan(x)
+        first = valid & (count == 0)
+        xv = np.where(valid, x, center)
+        # 首个样本直接作为初始中心
+        center[first] = xv[first]
+
+        diff = xv - center
+        floor = _REL_FLOOR * np.abs(center) + _ABS_FLOOR
+        if self.method == "ewma":
+            scores = diff / np.maximum(np.sqrt(spread), floor)
+            center += np.where(valid, self.alpha * diff, 0.0)
+            spread[:] = np.where(valid, (1 - self.alpha) * (spread + self.alpha * diff * diff), spread)
+        else:
+            scores = 0.6745 * diff / np.maximum(spread, floor)
+            # 步长与当前尺度成比例，使不同量纲的序列收敛速度一致
+            step = self.alpha * np.maximum(spread, floor)
+            center += np.where(valid, step * np.sign(diff), 0.0)
+            spread += np.where(valid, self.alpha * (np.abs(diff) - spread), 0.0)
+
+        count += valid
+        scores[~valid | (count <= self.warmup)] = 0.0
+        # 截断到 float16 可安全存储的范围
+        np.clip(scores, -100, 100, out=scores)
+        self.last_scores = scores
+        return scores
+
+    def flagged(self, names, scores: np.ndarray) -> Dict[str, float]:
+        """分数绝对值超过阈值的序列：{序列名: 分数}"""
+        hits = np.nonzero(np.abs(scores) >= self.threshold)[0]
+        return {names[i]: round(float(scores[i]), 2) for i in hits if names[i] is not None}
+
+    def reset(self, cols: Iterable[int]):
+        """清空若干列的状态（历史存储回收列后，复用该槽的新序列从头预热）"""
+        idx = [i for i in cols if i < len(self.count)]
+        self.center[idx] = 0
+        self.spread[idx] = 0
+        self.count[idx] = 0
+
+
+_CFG = get_anomaly_config()
+anomaly_detector = AnomalyDetector(
+    method=str(_CFG.get("method", "ewma")),
+    alpha=float(_CFG.get("alpha", 0.05)),
+    threshold=float(_CFG.get("threshold", 4)),
+    warmup=int(_CFG.get("warmup", 30)),
+)
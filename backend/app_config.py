@@ -34,16 +34,115 @@ def _default_config() -> Dict:
         "server": {
             "host": "0.0.0.0",
             "port": 8001,
+            "workers": 1,
+            "shm_snapshot_mb": 8,
+            "shm_delta_kb": 256,
         },
         "display": {
             "show_network": True,
             "show_battery": True,
         },
+        "static": {
+            "fingerprint": True,
+            "cache_dir": ".static_cache",
+        },
         "disk_filter": {
             "devices": [],
             "mountpoints": ["/boot/efi"],
             "fstypes": ["vfat", "squashfs", "tmpfs"],
         },
+        "cgroups": {
+            "enable": True,
+            "root": "",
+            "max_depth": 4,
+            "rescan_interval": 30,
+            "max_series": 64,
+        },
+        "sensors": {
+            "enable": True,
+            "hwmon_root": "",
+            "thermal_root": "",
+            "rescan_interval": 300,
+        },
+        "pressure": {
+            "enable": True,
+        },
+        "processes": {
+            "netlink": True,
+            "rescan_interval": 60,
+            "history": True,
+            "history_retention": 900,
+            "history_max": 128,
+            "group_max": 128,
+        },
+        "devices": {
+            "nic": {
+                "allow": [],
+                "deny": [],
+                "aggregate": ["veth*", "cali*", "cilium*", "lxc*", "flannel*", "cni*", "vxlan*", "tap*", "vnet*", "br-*"],
+                "max_series": 64,
+                "idle_timeout": 300,
+            },
+            "disk": {
+                "allow": [],
+                "deny": ["loop*"],
+                "aggregate": ["zram*", "nbd*", "rbd*"],
+                "max_series": 64,
+                "idle_timeout": 300,
+            },
+        },
+        "disk_usage": {
+            "workers": 4,
+            "timeout": 2,
+            "wait": 0.5,
+            "backoff_max": 600,
+            "max_hung": 16,
+            "refresh": {"default": 5, "nfs*": 30, "cifs": 30, "smb*": 30, "fuse.*": 30, "ceph": 30, "glusterfs": 30},
+        },
+        "inventory": {
+            "watch": True,
+            "min_interval": 2,
+            "poll_interval": 30,
+            "refresh_interval": 600,
+        },
+        "history": {
+            "retention": 3600,
+            "rollup_interval": 60,
+            "rollup_retention": 604800,
+            "max_series": 2048,
+            "persist": "history.npz",
+            "persist_interval": 60,
+            "per_core": True,
+            "per_core_retention": 3600,
+        },
+        "anomaly": {
+            "enable": True,
+            "method": "ewma",
+            "alpha": 0.05,
+            "threshold": 4,
+            "warmup": 30,
+        },
+        "provider": {
+            "type": "real",
+            "fast_path": True,
+            "synthetic": {
+                "cpus": 8,
+                "nics": 4,
+                "disks": 4,
+                "processes": 300,
+                "gpus": 0,
+                "sensors": 4,
+                "seed": 0,
+                "churn": 0.01,
+                "trace": "",
+            },
+        },
+        "alerts": {
+            "enable": False,
+            "repeat_interval": 3600,
+            "rules": [],
+            "notifiers": [],
+        },
         "web_ui": {
             "page_title": {
                 "enable": False,
@@ -86,7 +185,7 @@ _CONFIG = _load_config()
 
 
 def get_server_config() -> Dict:
-    """返回服务监听配置：host / port。"""
+    """返回服务监听配置：host / port / workers（大于 1 时启用多进程模式）/ shm_snapshot_mb / shm_delta_kb（共享内存快照段的槽大小）。"""
     return _CONFIG.get("server", _default_config()["server"])
 
 
@@ -103,3 +202,63 @@ def get_disk_filter() -> Dict[str, List[str]]:
 def get_web_ui_config() -> Dict:
     """返回 WebUI 配置：page_title / web_title 两个子项，各自含 enable 与按语言覆盖的字典。"""
     return _CONFIG.get("web_ui", _default_config()["web_ui"])
+
+
+def get_static_config() -> Dict:
+    """返回静态资源配置：fingerprint（指纹文件名 + 预压缩 + 长缓存）/ cache_dir（压缩结果缓存目录，留空不缓存）。"""
+    return _CONFIG.get("static", _default_config()["static"])
+
+
+def get_cgroups_config() -> Dict:
+    """返回 cgroup 采集配置：enable / root（留空自动探测）/ max_depth / rescan_interval / max_series（单独写入历史的 cgroup 数上限）。"""
+    return _CONFIG.get("cgroups", _default_config()["cgroups"])
+
+
+def get_sensors_config() -> Dict:
+    """返回传感器采集配置：enable / hwmon_root / thermal_root（留空为 /sys/class 下的默认路径）/ rescan_interval。"""
+    return _CONFIG.get("sensors", _default_config()["sensors"])
+
+
+def get_pressure_config() -> Dict:
+    """返回内存压力采集配置：enable（PSI、meminfo 明细与 vmstat 速率，仅 Linux）。"""
+    return _CONFIG.get("pressure", _default_config()["pressure"])
+
+
+def get_processes_config() -> Dict:
+    """返回进程配置：netlink（有权限时订阅进程 fork / exit 事件）/ rescan_interval（全量重扫 /proc 的间隔秒数）/ history / history_retention / history_max / group_max（进程历史与分组汇总）。"""
+    return _CONFIG.get("processes", _default_config()["processes"])
+
+
+def get_devices_config() -> Dict:
+    """返回网卡 / 磁盘序列的基数控制配置：nic / disk 两个子项，各含 allow / deny / aggregate（通配符列表）/ max_series / idle_timeout。"""
+    return _CONFIG.get("devices", _default_config()["devices"])
+
+
+def get_disk_usage_config() -> Dict:
+    """返回磁盘用量采集配置：workers / timeout / wait / backoff_max / refresh（文件系统类型模式 -> 刷新间隔秒）。"""
+    return _CONFIG.get("disk_usage", _default_config()["disk_usage"])
+
+
+def get_inventory_config() -> Dict:
+    """返回硬件清单配置：watch / min_interval / poll_interval / refresh_interval。"""
+    return _CONFIG.get("inventory", _default_config()["inventory"])
+
+
+def get_alerts_config() -> Dict:
+    """返回告警配置：enable / repeat_interval / rules（规则列表）/ notifiers（通知器列表）。"""
+    return _CONFIG.get("alerts", _default_config()["alerts"])
+
+
+def get_history_config() -> Dict:
+    """返回历史存储配置：retention（原始秒级保留秒数）/ rollup_interval / rollup_retention / max_series / persist / persist_interval / per_core / per_core_retention。"""
+    return _CONFIG.get("history", _default_config()["history"])
+
+
+def get_anomaly_config() -> Dict:
+    """返回异常检测配置：enable / method（ewma|mad）/ alpha / threshold / warmup。"""
+    return _CONFIG.get("anomaly", _default_config()["anomaly"])
+
+
+def get_provider_config() -> Dict:
+    """返回数据源配置：type（real|synthetic）/ fast_path（Linux 下 real 是否走 procfs 快速路径）/ synthetic（规模、seed、churn、trace 回放文件）。"""
+    return _CONFIG.get("provider", _default_config()["provider"])
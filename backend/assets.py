@@ -0,0 +1,245 @@
+"""
+静态资源流水线
+启动时（或构建镜像时 python -m backend.assets）遍历前端目录，一次性准备好全部静态资源：
+- 按内容 SHA-256 生成指纹文件名（script.js -> script.3f2a9c1b7d.js），index.html / 404.html 中的
+  /static/ 引用改写为指纹路径；
+- 页面引用的资源存在精简构建时改为引用精简版（ALIASES，如 build/ 生成的 echarts.min.js）；
+  tailwind.css 按当前源码重新编译（见 backend/tailwind.py）；
+- 文本类资源预先生成 gzip 与 brotli（需安装 brotli）压缩版本，按内容摘要缓存到 cache_dir，重启时直接复用；
+- 请求按 Accept-Encoding 协商返回预压缩内容：指纹路径带 Cache-Control: immutable（内容变化即换名，
+  浏览器无需再验证），原始路径与页面带 no-cache + ETag，重新验证命中时返回 304。
+"""
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import tailwind
+from .app_config import BASE_DIR, get_static_config
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+FRONTEND_DIR = BASE_DIR / "frontend"
+PREFIX = "/static/"
+PAGES = ("index.html", "404.html")  # 入口页面：不加指纹，内容中的资源引用改写为指纹路径
+COMPRESSIBLE = {".js", ".css", ".html", ".json", ".svg", ".txt", ".md", ".xml", ".map", ".ico"}
+MIN_COMPRESS_SIZE = 1024  # 小于该字节数的文件压缩收益不抵头部开销
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# 协商优先级：brotli 压缩率最好，其次 gzip
+ENCODINGS = ("br", "gzip")
+_REF_RE = re.compile(r"""(["'])/static/([^"'?#]+)\1""")
+_MEDIA_TYPES = {".js": "text/javascript", ".css": "text/css", ".html": "text/html", ".md": "text/markdown"}
+# 页面中的引用 -> 存在时改用的精简构建（build/ 下 npm run build 生成，只含面板用到的图表与组件）
+ALIASES = {"echarts_lib/echarts.js": "echarts_lib/echarts.min.js"}
+
+
+def fingerprint(rel: str, digest: str) -> str:
+    """在扩展名前插入摘要前 10 位：echarts_lib/echarts.js -> echarts_lib/echarts.<hash>.js"""
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest[:10]}{ext}"
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """解析 Accept-Encoding 为 {编码: q 值}；q=0 表示明确拒绝"""
+    out = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[name.strip().lower()] = q
+    return out
+
+
+class Asset:
+    """一个静态资源：原始内容与各压缩版本，ETag 按内容摘要与编码区分"""
+
+    __slots__ = ("rel", "media_type", "digest", "variants")
+
+    def __init__(self, rel: str, data: bytes, media_type: str):
+        self.rel = rel
+        self.media_type = media_type
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.variants: Dict[str, bytes] = {"identity": data}
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest[:16]}-{encoding}"' if encoding != "identity" else f'"{self.digest[:16]}"'
+
+    def negotiate(self, accept_encoding: Optional[str]) -> str:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for enc in ENCODINGS:
+            if enc in self.variants and accepted.get(enc, wildcard) > 0:
+                return enc
+        return "identity"
+
+
+class AssetPipeline:
+    """前端静态资源的指纹、预压缩与缓存协商"""
+
+    def __init__(self, root: Path = FRONTEND_DIR, cache_dir: Optional[str] = None,
+                 gzip_level: int = 9, brotli_quality: int = 11):
+        self.root = Path(root)
+        self.cache_dir = cache_dir
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.assets: Dict[str, Asset] = {}     # {原始相对路径: 资源}
+        self.hashed: Dict[str, Asset] = {}     # {指纹相对路径: 资源}
+        self.manifest: Dict[str, str] = {}     # {原始相对路径: 指纹相对路径}
+        self.built = False
+
+    def _files(self) -> List[str]:
+        out = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for name in sorted(filenames):
+                if not name.startswith("."):
+                    out.append(Path(dirpath, name).relative_to(self.root).as_posix())
+        return out
+
+    def _compress(self, asset: Asset):
+        data = asset.variants["identity"]
+        if os.path.splitext(asset.rel)[1] not in COMPRESSIBLE or len(data) < MIN_COMPRESS_SIZE:
+            return
+        codecs = {"gzip": lambda b: gzip.compress(b, self.gzip_level, mtime=0)}
+        if BROTLI_AVAILABLE:
+            codecs["br"] = lambda b: brotli.compress(b, quality=self.brotli_quality)
+        for enc, fn in codecs.items():
+            cached = self._cache_path(asset, enc)
+            body = None
+            if cached and os.path.exists(cached):
+                with open(cached, "rb") as f:
+                    body = f.read()
+            if body is None:
+                body = fn(data)
+                if cached:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp = cached + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(body)
+                    os.replace(tmp, cached)
+            # 压缩后没有明显变小（已压缩的格式）就不提供该编码
+            if len(body) < len(data) * 0.9:
+                asset.variants[enc] = body
+
+    def _cache_path(self, asset: Asset, encoding: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        level = self.brotli_quality if encoding == "br" else self.gzip_level
+        return os.path.join(self.cache_dir, f"{asset.digest}.{encoding}{level}")
+
+    def _load(self, rel: str, data: bytes) -> Asset:
+        ext = os.path.splitext(rel)[1]
+        media_type = _MEDIA_TYPES.get(ext) or mimetypes.guess_type(rel)[0] or "application/octet-stream"
+        asset = Asset(rel, data, media_type)
+        self._compress(asset)
+        return asset
+
+    def rewrite(self, html: str) -> str:
+        """把页面中 "/static/<原始路径>" 引用替换为指纹路径"""
+        def repl(m):
+            rel = m.group(2)
+            if ALIASES.get(rel) in self.manifest:
+                rel = ALIASES[rel]
+            hashed = self.manifest.get(rel)
+            return f"{m.group(1)}{PREFIX}{hashed}{m.group(1)}" if hashed else m.group(0)
+        return _REF_RE.sub(repl, html)
+
+    def build(self) -> "AssetPipeline":
+        """读取、指纹化并压缩全部资源；页面最后处理（依赖其它资源的指纹）"""
+        assets, hashed, manifest = {}, {}, {}
+        files = self._files()
+        pages = [rel for rel in files if rel in PAGES]
+        for rel in files:
+            if rel in pages:
+                continue
+            if rel == tailwind.OUTPUT:
+                data = tailwind.build(self.root)[0].encode("utf-8")
+            else:
+                data = (self.root / rel).read_bytes()
+            asset = self._load(rel, data)
+            assets[rel] = asset
+            manifest[rel] = fingerprint(rel, asset.digest)
+            hashed[manifest[rel]] = asset
+        self.manifest = manifest
+        for rel in pages:
+            html = (self.root / rel).read_text(encoding="utf-8")
+            assets[rel] = self._load(rel, self.rewrite(html).encode("utf-8"))
+        self.assets, self.hashed = assets, hashed
+        self.built = True
+        return self
+
+    def lookup(self, path: str) -> Tuple[Optional[Asset], bool]:
+        """按请求路径（/static/ 之后的部分）查找资源，返回 (资源, 是否为指纹路径)"""
+        asset = self.hashed.get(path)
+        if asset is not None:
+            return asset, True
+        return self.assets.get(path), False
+
+    def url(self, rel: str) -> str:
+        return PREFIX + self.manifest.get(rel, rel)
+
+    def stats(self) -> Dict:
+        total = {enc: 0 for enc in ("identity",) + ENCODINGS}
+        for asset in self.assets.values():
+            for enc in total:
+                total[enc] += len(asset.variants.get(enc, asset.variants["identity"]))
+        return {"files": len(self.assets), "bytes": total, "brotli": BROTLI_AVAILABLE}
+
+
+def respond(asset: Asset, accept_encoding: Optional[str], if_none_match: Optional[str], immutable: bool):
+    """按协商结果构造响应：(状态码, 响应头, 响应体)；If-None-Match 命中时为 304 且无响应体"""
+    encoding = asset.negotiate(accept_encoding)
+    etag = asset.etag(encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if immutable else REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return 304, headers, b""
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return 200, headers, asset.variants[encoding]
+
+
+_CFG = get_static_config()
+FINGERPRINT_ENABLED = bool(_CFG.get("fingerprint", True))
+static_assets = AssetPipeline(cache_dir=_CFG.get("cache_dir") or None)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="预先生成前端静态资源的指纹与 gzip / brotli 压缩缓存")
+    ap.add_argument("--root", default=str(FRONTEND_DIR))
+    ap.add_argument("--cache-dir", default=_CFG.get("cache_dir") or ".static_cache")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    pipeline = AssetPipeline(Path(args.root), cache_dir=args.cache_dir).build()
+    for rel, hashed in sorted(pipeline.manifest.items()):
+        asset = pipeline.assets[rel]
+        sizes = "  ".join(f"{enc}={len(body)}" for enc, body in asset.variants.items())
+        print(f"{rel} -> {hashed}  {sizes}")
+    print(f"{pipeline.stats()}  耗时 {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+实时快照广播
+所有实时订阅者（WebSocket、SSE、长轮询、/api/data）共用同一条流水线：
+每个推送周期只生成一次完整快照、只做一次 JSON 编码，并计算相对上一帧的增量；
+最近若干帧保存在环形队列中，断线重连（Last-Event-ID）或长轮询（?since=seq）时按序补发增量，
+落后太多则直接发送完整快照。没有订阅者且一段时间无请求时，生产循环自动停止。
+多进程模式（server.workers > 1）下由采集进程的 publish_forever 把编码好的帧写入共享内存段，
+各 worker 的 SharedBroadcaster 从中读取，接口与单进程时相同。
+
+增量格式（前端 applyDelta 按同样规则合并）：
+- 对象：只包含变化的键；新值不是对象或类型变化时整体替换；被删除的键列在 "$del" 中；
+- 时间序列（[[毫秒时间戳, 值], ...]）：{"$append": 新增的点, "$from": 新序列首点时间戳}，
+  合并时丢弃早于 $from 的点再追加；
+- 其它值（含普通列表）变化时整体替换。
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from . import monitor
+from .downsample import downsample_snapshot
+from .shm import SHM_ENV, SnapshotSegment
+
+PUSH_INTERVAL = 1.0  # 推送间隔（秒）
+BACKLOG = 120        # 保留最近多少帧用于补发增量
+IDLE_STOP = 30       # 无订阅者且无请求超过该秒数后停止生产循环
+SHARED_POLL = 0.05   # 多进程模式下 worker 轮询共享内存段的间隔（秒）
+
+_SAME = object()
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _is_points(v) -> bool:
+    return isinstance(v, list) and bool(v) and isinstance(v[0], list) and len(v[0]) == 2
+
+
+def make_delta(old, new):
+    """返回把 old 变为 new 的增量，无变化时返回 _SAME"""
+    if old is new:
+        return _SAME  # 跨帧共享的对象（如版本未变的硬件清单）无需逐键比较
+    if isinstance(old, dict) and isinstance(new, dict):
+        out = {}
+        for k, v in new.items():
+            if k not in old:
+                out[k] = v
+                continue
+            d = make_delta(old[k], v)
+            if d is not _SAME:
+                out[k] = d
+        removed = [k for k in old if k not in new]
+        if removed:
+            out["$del"] = removed
+        return out if out else _SAME
+    if _is_points(old) and _is_points(new):
+        # 新序列通常是旧序列向前滑动的结果：重叠部分不变时只发送新增点
+        last = old[-1][0]
+        k = 0
+        while k < len(new) and new[k][0] <= last:
+            k += 1
+        if k and new[:k] == old[len(old) - k:]:
+            if k == len(new) and len(new) == len(old):
+                return _SAME
+            return {"$append": new[k:], "$from": new[0][0]}
+        return new
+    return _SAME if old == new else new
+
+
+def apply_delta(target, delta):
+    """把 make_delta 生成的增量合并到 target，返回合并结果（与前端 applyDelta 一致）"""
+    if isinstance(delta, dict) and "$append" in delta and isinstance(target, list):
+        cut = delta["$from"]
+        return [p for p in target if p[0] >= cut] + delta["$append"]
+    if isinstance(delta, dict) and isinstance(target, dict):
+        for k in delta.get("$del", ()):
+            target.pop(k, None)
+        for k, v in delta.items():
+            if k != "$del":
+                target[k] = apply_delta(target[k], v) if k in target else v
+        return target
+    return delta
+
+
+class Frame:
+    """
+    一帧快照：完整数据、相对上一帧的增量，以及按需缓存的 JSON 编码。
+    多进程模式下 worker 从共享内存得到的是已编码的 JSON，此时 snapshot 在首次访问（降采样）时才解析。
+    """
+
+    __slots__ = ("seq", "ts", "_snapshot", "delta", "_json", "_delta_json", "_lock")
+
+    def __init__(self, seq: int, snapshot: Optional[Dict], delta, snapshot_json: Optional[str] = None,
+                 delta_json: Optional[str] = None):
+        self.seq = seq
+        self.ts = time.monotonic()
+        self._snapshot = snapshot
+        self.delta = delta
+        self._json: Dict[Tuple[int, str, bool], str] = \
+            {(0, "", True): snapshot_json} if snapshot_json is not None else {}
+        self._delta_json: Optional[str] = delta_json
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Dict:
+        if self._snapshot is None:
+            self._snapshot = json.loads(self._json[(0, "", True)])
+        return self._snapshot
+
+    def json(self, points: int = 0, mode: str = "lttb", hardware: bool = True) -> str:
+        """
+        完整快照的 JSON；points > 0 时为降采样版本，hardware=False 时不含硬件清单（供已持有当前版本的订阅者），
+        同一帧的每种参数只编码一次
+        """
+        key = (points, mode, hardware) if points > 0 else (0, "", hardware)
+        text = self._json.get(key)
+        if text is None:
+            snap = self.snapshot
+            if not hardware:
+                snap = {k: v for k, v in snap.items() if k != "hardware_info"}
+            if points > 0:
+                snap = dict(snap, real_time_data=downsample_snapshot(snap["real_time_data"], points, mode))
+            text = _dumps(snap)
+            with self._lock:
+                self._json[key] = text
+        return text
+
+    def delta_json(self) -> str:
+        if self._delta_json is None:
+            self._delta_json = _dumps(self.delta)
+        return self._delta_json
+
+
+class Broadcaster:
+    """单生产者、多订阅者的快照广播器"""
+
+    shared = False  # 帧是否来自采集进程的共享内存（多进程模式的 worker）
+
+    def __init__(self, interval: float = PUSH_INTERVAL, backlog: int = BACKLOG):
+        self.interval = interval
+        self.frames: deque = deque(maxlen=backlog)
+        self.seq = 0
+        self.subscribers = 0
+        self._demand = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+        self._event: Optional[asyncio.Event] = None
+
+    @property
+    def latest(self) -> Optional[Frame]:
+        return self.frames[-1] if self.frames else None
+
+    def publish(self, snapshot: Dict) -> Frame:
+        """生成新帧并唤醒所有等待者（须在事件循环线程中调用）"""
+        prev = self.latest
+        delta = make_delta(prev.snapshot, snapshot) if prev else snapshot
+        return self._push(Frame(self.seq + 1, snapshot, {} if delta is _SAME else delta))
+
+    def _push(self, frame: Frame) -> Frame:
+        self.seq = frame.seq
+        self.frames.append(frame)
+        if self._event is not None:
+            self._event.set()
+            self._event = asyncio.Event()
+        return frame
+
+    async def _run(self):
+        while self.subscribers > 0 or time.monotonic() - self._demand < IDLE_STOP:
+            start = time.monotonic()
+            try:
+                self.publish(await asyncio.to_thread(monitor.get_full_snapshot))
+            except Exception as e:
+                print(f"快照广播失败: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def ensure_running(self):
+        """按需启动生产循环；uvicorn 重建事件循环后也会在新循环上重新启动"""
+        self._demand = time.monotonic()
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._event = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    @contextmanager
+    def subscription(self):
+        """长连接订阅者（WebSocket / SSE）在连接期间持有，保证生产循环不停止"""
+        self.subscribers += 1
+        try:
+            yield self
+        finally:
+            self.subscribers -= 1
+
+    async def wait_after(self, seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """
+        等待序号大于 seq 的帧出现，返回最新帧；超时返回 None。
+        seq 比最新帧还新（服务重启后序号从 1 重新计数，客户端仍带着旧序号）时立即返回，由 catch_up 发送完整快照。
+        """
+        self.ensure_running()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.frames or self.seq == seq:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self.latest
+
+    def catch_up(self, after: int) -> List[Tuple[str, int, str]]:
+        """
+        返回让持有 after 号帧的客户端追上最新帧所需的消息 [(类型, 序号, JSON)]：
+        after 仍在环形队列中时为逐帧增量，否则（落后太多，或比最新帧还新——服务重启后的旧序号）为一条完整快照。
+        """
+        frames = list(self.frames)
+        if not frames or after == frames[-1].seq:
+            return []
+        if after <= 0 or after < frames[0].seq or after > frames[-1].seq:
+            return [("snapshot", frames[-1].seq, frames[-1].json())]
+        return [("delta", f.seq, f.delta_json()) for f in frames if f.seq > after]
+
+    def fresh(self) -> Optional[Frame]:
+        """最新帧仍在一个推送周期内时返回它（供 /api/data 直接复用），并登记需求以保持循环运行"""
+        self.ensure_running()
+        frame = self.latest
+        if frame and time.monotonic() - frame.ts <= self.interval * 2:
+            return frame
+        return None
+
+
+class SharedBroadcaster(Broadcaster):
+    """
+    多进程模式下 worker 使用的广播器：不采集也不编码，轮询共享内存段中采集进程发布的帧。
+    每帧只从共享内存复制一次，本进程的所有订阅者共用同一份 JSON；
+    增量缺失（落后超过 backlog 或过大）时清空环形队列，落后的客户端改为收到完整快照。
+    """
+
+    shared = True
+
+    def __init__(self, segment: SnapshotSegment, interval: float = PUSH_INTERVAL, backlog: int = BACKLOG,
+                 poll: float = SHARED_POLL):
+        super().__init__(interval, backlog)
+        self.segment = segment
+        self.poll_interval = poll
+
+    def poll(self) -> bool:
+        """读取比本地更新的帧，返回是否有新帧"""
+        latest = self.segment.latest()
+        if latest <= self.seq:
+            return False
+        snap = self.segment.snapshot(latest)
+        if snap is None:
+            return False  # 写者已推进到下一帧，下次轮询再读
+        first = max(self.seq + 1, latest - self.frames.maxlen + 1)
+        if first != self.seq + 1:
+            self.frames.clear()
+        for seq in range(first, latest):
+            delta = self.segment.delta(seq)
+            if delta is None:
+                self.frames.clear()
+                continue
+            self.frames.append(Frame(seq, None, None, delta_json=delta.decode("utf-8")))
+        delta = self.segment.delta(latest)
+        if delta is None:
+            self.frames.clear()
+            delta = snap
+        self._push(Frame(latest, None, None, snapshot_json=snap.decode("utf-8"), delta_json=delta.decode("utf-8")))
+        return True
+
+    async def _run(self):
+        while self.subscribers > 0 or time.monotonic() - self._demand < IDLE_STOP:
+            self.segment.touch()
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"读取共享快照失败: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def fresh(self) -> Optional[Frame]:
+        """采集进程是唯一的数据来源：只要已有帧就直接返回最新帧"""
+        self.ensure_running()
+        self.segment.touch()
+        self.poll()
+        return self.latest
+
+
+def publish_forever(segment: SnapshotSegment, stop: threading.Event, interval: float = PUSH_INTERVAL):
+    """
+    采集进程中的发布线程：每个推送周期生成并编码一次快照与增量，写入共享内存段。
+    最近 IDLE_STOP 秒内没有 worker 登记需求时暂停，与单进程模式下生产循环的按需启停一致。
+    """
+    prev = None
+    seq = 0
+    while not stop.is_set():
+        start = time.monotonic()
+        if prev is None or time.time() - segment.demand() < IDLE_STOP:
+            try:
+                snapshot = monitor.get_full_snapshot()
+                delta = make_delta(prev, snapshot) if prev is not None else snapshot
+                seq += 1
+                if not segment.write(seq, _dumps(snapshot).encode("utf-8"),
+                                     _dumps({} if delta is _SAME else delta).encode("utf-8")):
+                    print(f"快照超过共享内存槽大小（{segment.snap_size} 字节），请调大 server.shm_snapshot_mb")
+                prev = snapshot
+            except Exception as e:
+                print(f"快照发布失败: {e}")
+        stop.wait(max(0.0, interval - (time.monotonic() - start)))
+
+
+if os.environ.get(SHM_ENV):
+    broadcaster: Broadcaster = SharedBroadcaster(SnapshotSegment.attach(os.environ[SHM_ENV]))
+else:
+    broadcaster = Broadcaster()
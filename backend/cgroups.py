@@ -0,0 +1,282 @@
+"""
+cgroup v2 资源统计模块
+按容器 / systemd slice 统计 CPU、内存、IO 与 PSI 压力。
+增量遍历 /sys/fs/cgroup：缓存目录树，仅对 mtime 变化（有子 cgroup 新建/删除）的目录重新 listdir；
+CPU 时间与 IO 字节等累计计数与网卡、磁盘一样经速率引擎（rates.CounterRates）在单调时钟上换算为速率，
+系统时间被 NTP 调整时不会跳过或扭曲，计数器重置（cgroup 以同名重建）按引擎口径处理。
+容器启停使 cgroup 不断更替，每个 cgroup 在历史存储中占 7 列且要到汇总层保留期后才回收，
+因此单独写入历史存储的 cgroup 数不超过 max_series，其余合并为 cgroup./*.<字段>（各成员的最大值，
+嵌套的父子 cgroup 不会重复计入）；名额在对应的历史列被回收后释放。
+所有路径均以 root 为基准，可直接指向一个伪造的 cgroupfs 目录树进行测试。
+"""
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from .app_config import get_cgroups_config
+from .rates import CounterRates
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+HISTORY_DURATION = 120  # 与 monitor.CACHE_DURATION 保持一致：保留 2 分钟
+
+# 每个 cgroup 保存的时间序列
+SERIES_KEYS = ("cpu", "mem", "io_read", "io_write", "psi_cpu", "psi_mem", "psi_io")
+# 由累计计数换算为速率的字段：(输出名, _read_cgroup 中的计数, 换算系数)；CPU 为 µs → 占用 %，IO 为字节 → KB/s
+COUNTERS = (("cpu", "usage_usec", 100 / 1e6), ("io_read", "rbytes", 1 / 1024), ("io_write", "wbytes", 1 / 1024))
+PREFIX = "cgroup./"  # 历史存储 / 告警中的序列名：cgroup./<路径>.<字段>
+OVERFLOW = "*"       # 超出单独序列上限的 cgroup 合并到这条序列
+
+
+def detect_root(base: str = CGROUP_ROOT) -> Optional[str]:
+    """定位 cgroup v2 层级：纯 v2 直接挂载在 base；hybrid 模式挂载在 base/unified。"""
+    for cand in (base, os.path.join(base, "unified")):
+        if os.path.exists(os.path.join(cand, "cgroup.controllers")):
+            return cand
+    return None
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def parse_flat_keyed(text: Optional[str]) -> Dict[str, int]:
+    """解析 "key value" 每行一项的文件（cpu.stat、memory.stat 等）"""
+    out = {}
+    for line in (text or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try:
+                out[parts[0]] = int(parts[1])
+            except ValueError:
+                continue
+    return out
+
+
+def parse_io_stat(text: Optional[str]) -> Dict[str, int]:
+    """解析 io.stat（每行 "MAJ:MIN rbytes=.. wbytes=.. rios=.. wios=.."），按设备求和"""
+    total = {"rbytes": 0, "wbytes": 0, "rios": 0, "wios": 0}
+    for line in (text or "").splitlines():
+        for field in line.split()[1:]:
+            k, _, v = field.partition("=")
+            if k in total:
+                try:
+                    total[k] += int(v)
+                except ValueError:
+                    pass
+    return total
+
+
+def parse_pressure(text: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """
+    解析 PSI 文件（*.pressure 或 /proc/pressure/*）：
+    some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+    full avg10=0.00 avg60=0.00 avg300=0.00 total=0
+    返回 {"some": {"avg10", "avg60", "avg300", "total"}, "full": {...}}
+    """
+    out = {}
+    for line in (text or "").splitlines():
+        parts = line.split()
+        if not parts or parts[0] not in ("some", "full"):
+            continue
+        vals = {}
+        for field in parts[1:]:
+            k, _, v = field.partition("=")
+            try:
+                vals[k] = float(v)
+            except ValueError:
+                continue
+        out[parts[0]] = vals
+    return out
+
+
+class CgroupCollector:
+    """cgroup v2 增量采集器：维护目录树缓存、上一轮累计值与每个 cgroup 的时间序列"""
+
+    def __init__(self, root: Optional[str] = None, max_depth: int = 4, rescan_interval: float = 30,
+                 max_series: int = 64):
+        self.root = root if root is not None else detect_root()
+        self.max_depth = max_depth
+        self.max_series = max(0, int(max_series))
+        # 目录树缓存：{相对路径: (目录签名, [子目录相对路径])}
+        self._tree: Dict[str, tuple] = {}
+        # 同一 tick 内一增一删会让 nr_descendants 不变，故定期强制全量重扫兜底
+        self.rescan_interval = rescan_interval
+        self._last_full_scan = 0.0
+        self._force_rescan = False
+        # 累计计数的基线：每个 cgroup 一行，本轮未出现的 cgroup 基线随之丢弃
+        self._rates = CounterRates([name for name, _, _ in COUNTERS], scale=[k for _, _, k in COUNTERS])
+        # 时间序列：{相对路径: {series_key: [(ts, val), ...]}}
+        self.history: Dict[str, Dict[str, List]] = {}
+        # 最近一轮各 cgroup 的最新值，用于 top-N 视图
+        self.latest: Dict[str, Dict] = {}
+        self.rescanned = 0  # 最近一轮实际 listdir 的目录数（便于观测增量效果）
+        self._tracked = set()  # 占用历史存储名额（单独成序列）的 cgroup
+        self.overflowed = 0    # 最近一轮合并到 OVERFLOW 的 cgroup 数
+
+    @property
+    def available(self) -> bool:
+        return bool(self.root) and os.path.isdir(self.root)
+
+    def _children(self, rel: str) -> List[str]:
+        """
+        返回子 cgroup 列表；目录签名未变化时直接复用缓存。
+        cgroupfs 上新建/删除子 cgroup 不会更新父目录 mtime，因此签名同时包含
+        cgroup.stat 中的 nr_descendants；两者都未变化时才认为子树结构未变。
+        """
+        path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        stat = parse_flat_keyed(_read(os.path.join(path, "cgroup.stat")))
+        sig = (mtime, stat.get("nr_descendants"))
+        cached = self._tree.get(rel)
+        if cached and cached[0] == sig and not self._force_rescan:
+            return cached[1]
+        self.rescanned += 1
+        try:
+            with os.scandir(path) as it:
+                kids = sorted(os.path.join(rel, e.name) if rel else e.name
+                              for e in it if e.is_dir(follow_symlinks=False))
+        except OSError:
+            kids = []
+        self._tree[rel] = (sig, kids)
+        return kids
+
+    def walk(self) -> List[str]:
+        """按深度优先遍历 cgroup 树（不含根），深度不超过 max_depth"""
+        self.rescanned = 0
+        now = time.monotonic()
+        self._force_rescan = now - self._last_full_scan >= self.rescan_interval
+        if self._force_rescan:
+            self._last_full_scan = now
+        result = []
+        stack = [("", 0)]
+        while stack:
+            rel, depth = stack.pop()
+            if rel:
+                result.append(rel)
+            if depth >= self.max_depth:
+                continue
+            for kid in reversed(self._children(rel)):
+                stack.append((kid, depth + 1))
+        seen = set(result)
+        seen.add("")
+        for rel in list(self._tree.keys()):
+            if rel not in seen:
+                del self._tree[rel]
+        return result
+
+    def _read_cgroup(self, rel: str) -> Dict:
+        base = os.path.join(self.root, rel)
+        cpu = parse_flat_keyed(_read(os.path.join(base, "cpu.stat")))
+        io = parse_io_stat(_read(os.path.join(base, "io.stat")))
+        mem_text = _read(os.path.join(base, "memory.current"))
+        try:
+            mem = int(mem_text.strip()) if mem_text else 0
+        except ValueError:
+            mem = 0
+        psi = {}
+        for res in ("cpu", "memory", "io"):
+            p = parse_pressure(_read(os.path.join(base, f"{res}.pressure")))
+            psi[res] = (p.get("some") or {}).get("avg10", 0.0)
+        return {"usage_usec": cpu.get("usage_usec", 0), "rbytes": io["rbytes"],
+                "wbytes": io["wbytes"], "mem": mem, "psi": psi}
+
+    def sample(self, timestamp: Optional[float] = None, clock: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        采集一轮：遍历树、读取统计文件、计算速率并写入时间序列。返回 {cgroup: 最新值}。
+        timestamp 为写入时间序列的墙钟时间，clock 为求速率间隔用的单调时钟（默认 time.monotonic()）；
+        新出现的 cgroup 本轮只建立基线。
+        """
+        if not self.available:
+            return {}
+        ts = timestamp if timestamp is not None else time.time()
+        clock = clock if clock is not None else time.monotonic()
+        latest = {}
+        walked = self.walk()
+        raws = [self._read_cgroup(rel) for rel in walked]
+        counts = np.array([[raw[src] for _, src, _ in COUNTERS] for raw in raws], dtype=np.float64)
+        rates, ok = self._rates.update(walked, counts.reshape(len(raws), len(COUNTERS)), clock)
+        for rel, raw, row, valid in zip(walked, raws, rates.round(1).tolist(), ok.tolist()):
+            if not valid:
+                continue
+            cur = dict(zip((name for name, _, _ in COUNTERS), row))
+            cur.update({
+                "mem": round(raw["mem"] / 1024 / 1024, 1),
+                "psi_cpu": raw["psi"]["cpu"],
+                "psi_mem": raw["psi"]["memory"],
+                "psi_io": raw["psi"]["io"],
+            })
+            latest[rel] = cur
+            hist = self.history.setdefault(rel, {k: [] for k in SERIES_KEYS})
+            for k in SERIES_KEYS:
+                hist[k].append((ts, cur[k]))
+                hist[k] = [x for x in hist[k] if ts - x[0] <= HISTORY_DURATION]
+        # 已消失的 cgroup（容器退出）同步清理
+        alive = set(walked)
+        for rel in list(self.history.keys()):
+            if rel not in alive:
+                del self.history[rel]
+        self.latest = latest
+        return latest
+
+    def top(self, n: int = 10, sort: str = "cpu") -> List[Dict]:
+        """按指定指标降序返回前 N 个 cgroup 的最新值"""
+        key = sort if sort in SERIES_KEYS else "cpu"
+        rows = [dict(v, path="/" + rel) for rel, v in self.latest.items()]
+        rows.sort(key=lambda r: r[key], reverse=True)
+        return rows[:max(0, n)]
+
+    def series(self, path: str) -> Optional[Dict[str, List]]:
+        return self.history.get(path.strip("/"))
+
+    def flatten(self) -> Dict[str, float]:
+        """
+        最近一轮的值展平为 {cgroup./<路径>.<字段>: 值}，供历史存储与告警使用。
+        单独成序列的 cgroup 不超过 max_series 个（先到先得），其余按字段取最大值合并为 cgroup./*.<字段>。
+        """
+        out = {}
+        over: Dict[str, float] = {}
+        overflowed = 0
+        for rel, vals in self.latest.items():
+            if rel not in self._tracked:
+                if len(self._tracked) >= self.max_series:
+                    overflowed += 1
+                    for k, v in vals.items():
+                        over[k] = max(over.get(k, v), v)
+                    continue
+                self._tracked.add(rel)
+            for k, v in vals.items():
+                out[f"{PREFIX}{rel}.{k}"] = v
+        for k, v in over.items():
+            out[f"{PREFIX}{OVERFLOW}.{k}"] = v
+        self.overflowed = overflowed
+        return out
+
+    @staticmethod
+    def _paths(names: Iterable[str]) -> Set[str]:
+        return {n[len(PREFIX):].rsplit(".", 1)[0] for n in names if n.startswith(PREFIX)} - {OVERFLOW}
+
+    def release(self, names: Iterable[str]):
+        """历史存储回收了这些序列（按序列名），对应 cgroup 的名额随之释放"""
+        self._tracked -= self._paths(names)
+
+    def adopt(self, names: Iterable[str]):
+        """从持久化文件恢复的历史中已有的 cgroup 序列计入名额"""
+        self._tracked |= self._paths(names)
+
+
+_CFG = get_cgroups_config()
+cgroup_collector = CgroupCollector(
+    root=_CFG.get("root") or None,
+    max_depth=int(_CFG.get("max_depth", 4)),
+    rescan_interval=float(_CFG.get("rescan_interval", 30)),
+    max_series=int(_CFG.get("max_series", 64)),
+)
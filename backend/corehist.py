@@ -0,0 +1,141 @@
+"""
+每核 CPU 历史
+每轮把所有核的占用分项与频率写入一行，按 时间 × 核 的二维环形数组紧凑存放：
+- 占用分项（usage / user / system / iowait / steal / irq）用 uint8 存储，精度 0.5%，255 表示无数据；
+- 频率用 uint16 存储（MHz），0 表示无数据。
+128 核保留 1 小时约 3.6 MB。热力图查询沿时间与核两个方向分桶聚合（max / avg），
+一次返回整张 行 × 列 矩阵，前端无需为每个核单独请求或绘制一条序列。
+"""
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .app_config import get_history_config
+
+FIELDS = ("usage", "user", "system", "iowait", "steal", "irq", "freq")
+UTIL_FIELDS = FIELDS[:-1]
+AGGS = ("max", "avg", "min")
+_SCALE = 2          # uint8 存储单位为 0.5%
+_MISSING = 255
+
+
+class CoreHistory:
+    """每核占用分项与频率的二维环形存储，线程安全（采集线程写、API 读）"""
+
+    def __init__(self, retention: int = 3600):
+        self.capacity = max(1, int(retention))
+        self.cores = 0
+        self.ts = np.full(self.capacity, np.nan)
+        self.util = np.full((self.capacity, 0, len(UTIL_FIELDS)), _MISSING, dtype=np.uint8)
+        self.freq = np.zeros((self.capacity, 0), dtype=np.uint16)
+        self.head = 0
+        self.size = 0
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _resize(self, cores: int):
+        """核数变化（热插拔、容器配额调整）时按列扩缩，保留已有数据"""
+        util = np.full((self.capacity, cores, len(UTIL_FIELDS)), _MISSING, dtype=np.uint8)
+        freq = np.zeros((self.capacity, cores), dtype=np.uint16)
+        n = min(cores, self.cores)
+        util[:, :n] = self.util[:, :n]
+        freq[:, :n] = self.freq[:, :n]
+        self.util, self.freq, self.cores = util, freq, cores
+
+    def append(self, ts: float, util: np.ndarray, freq: Optional[Sequence[float]] = None):
+        """写入一轮：util 为 [核, len(UTIL_FIELDS)] 的百分比，freq 为每核 MHz（可缺省）"""
+        util = np.asarray(util, dtype=np.float64)
+        cores = util.shape[0]
+        with self.lock:
+            if cores != self.cores:
+                self._resize(cores)
+            row = self.head
+            self.ts[row] = ts
+            self.util[row] = np.clip(np.rint(util * _SCALE), 0, 100 * _SCALE).astype(np.uint8)
+            self.freq[row] = 0
+            if freq is not None and len(freq):
+                f = np.clip(np.rint(np.asarray(freq, dtype=np.float64)[:cores]), 0, 65535)
+                self.freq[row, :len(f)] = f
+            self.head = (row + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            self.version += 1
+
+    def query(self, field: str, start: float = 0, end: float = float("inf")):
+        """返回 (ts[N], values[N, 核])，values 为 float32，无数据为 NaN"""
+        if field not in FIELDS:
+            raise ValueError(f"不支持的字段: {field}（可选 {', '.join(FIELDS)}）")
+        with self.lock:
+            rows = np.arange(self.size) if self.size < self.capacity else \
+                (np.arange(self.capacity) + self.head) % self.capacity
+            ts = self.ts[rows]
+            rows = rows[(ts >= start) & (ts <= end)]
+            if field == "freq":
+                raw = self.freq[rows]
+                values = raw.astype(np.float32)
+                values[raw == 0] = np.nan
+            else:
+                raw = self.util[rows, :, UTIL_FIELDS.index(field)]
+                values = raw.astype(np.float32) / _SCALE
+                values[raw == _MISSING] = np.nan
+            return self.ts[rows], values
+
+    def heatmap(self, field: str = "usage", start: float = 0, end: float = float("inf"),
+                rows: int = 200, cols: int = 64, agg: str = "max") -> Dict:
+        """
+        沿时间（最多 rows 桶）与核（最多 cols 组，相邻核合并）两个方向聚合，返回热力图矩阵：
+        {"ts": [桶起点毫秒], "cores": [[首核, 末核], ...], "values": [[...每组...], ...每桶]}。
+        agg 默认 max，保证单个核跑满在降采样后仍然可见。
+        """
+        if agg not in AGGS:
+            raise ValueError(f"不支持的聚合函数: {agg}（可选 {', '.join(AGGS)}）")
+        ts, values = self.query(field, start, end)
+        n, k = values.shape
+        t_edges = _edges(n, rows)
+        c_edges = _edges(k, cols)
+        out = _reduce(_reduce(values, t_edges, 0, agg), c_edges, 1, agg) if n and k else np.empty((0, 0))
+        c_bounds = np.append(c_edges, k)
+        return {
+            "field": field,
+            "agg": agg,
+            "from": start,
+            "to": end,
+            "ts": np.rint(ts[t_edges] * 1000).astype(np.int64).tolist() if n else [],
+            "cores": [[int(a), int(b) - 1] for a, b in zip(c_bounds[:-1], c_bounds[1:])] if k else [],
+            "values": [[None if np.isnan(v) else v for v in row] for row in np.round(out.astype(np.float64), 1).tolist()],
+            "max": 100 if field != "freq" else (float(np.nanmax(values)) if n and k and np.isfinite(values).any() else 0),
+        }
+
+
+def _edges(n: int, buckets: int) -> np.ndarray:
+    """把 n 个元素均分为至多 buckets 桶，返回每桶起始下标"""
+    buckets = max(1, min(int(buckets), n))
+    return np.unique(np.floor(np.linspace(0, n, buckets, endpoint=False)).astype(np.int64)) if n else np.zeros(0, np.int64)
+
+
+def _reduce(values: np.ndarray, edges: np.ndarray, axis: int, agg: str) -> np.ndarray:
+    """按 edges 分桶做 reduceat 聚合，忽略 NaN（fmax / fmin 会跳过 NaN）"""
+    if agg == "max":
+        return np.fmax.reduceat(values, edges, axis=axis)
+    if agg == "min":
+        return np.fmin.reduceat(values, edges, axis=axis)
+    valid = ~np.isnan(values)
+    total = np.add.reduceat(np.where(valid, values, 0), edges, axis=axis)
+    count = np.add.reduceat(valid.astype(np.float32), edges, axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def core_row(times: List, usage: List[float]) -> np.ndarray:
+    """把 cpu_times_percent(percpu=True) 的结果与每核占用率合成为 [核, len(UTIL_FIELDS)]"""
+    rows = []
+    for i, u in enumerate(usage):
+        t = times[i] if i < len(times) else None
+        g = (lambda name: getattr(t, name, 0.0) or 0.0) if t is not None else (lambda name: 0.0)
+        rows.append((u, g("user") + g("nice"), g("system"), g("iowait"), g("steal"), g("irq") + g("softirq")))
+    return np.array(rows, dtype=np.float64).reshape(-1, len(UTIL_FIELDS))
+
+
+_CFG = get_history_config()
+PER_CORE_ENABLED = bool(_CFG.get("per_core", True))
+core_history = CoreHistory(retention=int(_CFG.get("per_core_retention", _CFG.get("retention", 3600))))
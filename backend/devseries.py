@@ -0,0 +1,120 @@
+"""
+网卡 / 磁盘序列的基数控制
+容器宿主机上 veth*、cali* 等短命网卡与大量 loop / dm 设备会让按设备名建立的历史序列无限增长，
+每帧快照也会一直携带早已消失的设备。这里按设备名决定每个设备计入哪条序列：
+- deny / allow：命中 deny，或 allow 非空且未命中时丢弃；
+- aggregate：命中某个模式的设备合并为一条以该模式命名的组序列（如 "veth*" 为全部 veth 之和）；
+- max_series：单独成序列的设备数上限，超出的设备合并到 OVERFLOW（"*"）序列；
+- idle_timeout：超过该秒数没有数据的序列被淘汰，空出的名额留给新设备。
+模式为 fnmatch 通配符。各设备先各自求速率（基线随设备消失而丢弃），再按序列键求和，
+因此组成员的加入与退出不会在组序列上产生尖峰。
+"""
+import fnmatch
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .app_config import get_devices_config
+
+OVERFLOW = "*"       # 超出单独序列上限的设备合并到这条序列
+_ROUTE_CACHE_MAX = 8192
+
+
+class DeviceSeries:
+    """一类设备（网卡或磁盘）的序列准入、聚合与淘汰"""
+
+    def __init__(self, allow: Iterable[str] = (), deny: Iterable[str] = (), aggregate: Iterable[str] = (),
+                 max_series: int = 64, idle_timeout: float = 300.0):
+        self.allow = list(allow or [])
+        self.deny = list(deny or [])
+        self.aggregate = list(aggregate or [])
+        self.max_series = max(0, int(max_series))
+        self.idle_timeout = float(idle_timeout)
+        self.members: Dict[str, List[str]] = {}   # 最近一轮各序列键包含的设备
+        self.overflowed = 0                       # 因超出上限而合并到 OVERFLOW 的设备累计数
+        self._routes: Dict[str, Optional[str]] = {}
+        self._seen: Dict[str, float] = {}         # 序列键 -> 最近一次有数据的时钟
+        self._individual = set()                  # 已占用名额的单独序列
+
+    def route(self, name: str) -> Optional[str]:
+        """设备按名称计入的序列键：None 为丢弃，组模式为聚合，否则为设备名本身（不考虑数量上限）"""
+        key = self._routes.get(name, "")
+        if key != "":
+            return key
+        if any(fnmatch.fnmatchcase(name, p) for p in self.deny) or \
+                (self.allow and not any(fnmatch.fnmatchcase(name, p) for p in self.allow)):
+            key = None
+        else:
+            key = next((p for p in self.aggregate if fnmatch.fnmatchcase(name, p)), name)
+        if len(self._routes) >= _ROUTE_CACHE_MAX:
+            self._routes.clear()  # 设备名不断更替（短命 veth）时防止缓存本身无限增长
+        self._routes[name] = key
+        return key
+
+    def is_individual(self, name: str) -> bool:
+        """该设备是否单独成序列（未被丢弃或聚合）"""
+        return self.route(name) == name
+
+    def _admit(self, key: str, name: str) -> str:
+        if key != name or key in self._individual:
+            return key
+        if len(self._individual) < self.max_series:
+            self._individual.add(key)
+            return key
+        self.overflowed += 1
+        return OVERFLOW
+
+    def group(self, names: Sequence[str], values: np.ndarray, ok: np.ndarray, now: float
+              ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        把各设备本轮的数值（形状 (设备数, 字段数)，如每秒增量）按序列键求和，返回 (序列键, 合计, 有效)。
+        被丢弃的设备不计入；组内任一成员有效时组序列有效，无效成员不参与求和。now 为单调时钟。
+        """
+        index: Dict[str, int] = {}
+        rows = np.empty(len(names), dtype=np.intp)
+        members: Dict[str, List[str]] = {}
+        for i, name in enumerate(names):
+            key = self.route(name)
+            if key is not None:
+                key = self._admit(key, name)
+            if key is None:
+                rows[i] = -1
+                continue
+            rows[i] = index.setdefault(key, len(index))
+            members.setdefault(key, []).append(name)
+        keys = list(index)
+        values = np.asarray(values, dtype=np.float64)
+        totals = np.zeros((len(keys), values.shape[1]))
+        valid = np.zeros(len(keys), dtype=bool)
+        take = (rows >= 0) & ok
+        np.add.at(totals, rows[take], values[take])
+        valid[rows[take]] = True
+        for key in keys:
+            self._seen[key] = now
+        self.members = members
+        return keys, totals, valid
+
+    def expire(self, now: float) -> List[str]:
+        """淘汰超过 idle_timeout 没有数据的序列，返回其键（调用方据此删除对应历史）"""
+        gone = [k for k, t in self._seen.items() if now - t > self.idle_timeout]
+        for k in gone:
+            del self._seen[k]
+            self._individual.discard(k)
+        return gone
+
+    def clear(self):
+        self.members = {}
+        self.overflowed = 0
+        self._routes.clear()
+        self._seen.clear()
+        self._individual.clear()
+
+
+def create_series(kind: str) -> DeviceSeries:
+    cfg = get_devices_config().get(kind) or {}
+    return DeviceSeries(cfg.get("allow") or (), cfg.get("deny") or (), cfg.get("aggregate") or (),
+                        max_series=int(cfg.get("max_series", 64)), idle_timeout=float(cfg.get("idle_timeout", 300)))
+
+
+nic_series = create_series("nic")
+disk_series = create_series("disk")
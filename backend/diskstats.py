@@ -0,0 +1,176 @@
+"""
+Linux 磁盘 IO 统计模块
+直接读取 /proc/diskstats（一次 read 取全量），结合 /sys/block 区分整盘与分区，
+计算每块设备的读写 IOPS、吞吐、平均等待延迟（await）、队列深度与利用率。
+dm（LVM / LUKS）与 md（软 RAID）等堆叠设备单独统计，并记录其底层 slaves。
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .devseries import DeviceSeries
+from .rates import CounterRates
+
+DISKSTATS_PATH = "/proc/diskstats"
+SYS_BLOCK_PATH = "/sys/block"
+
+# 不参与统计的虚拟块设备前缀；loop 等是否统计、是否聚合由 devices.disk 配置决定
+IGNORED_PREFIXES = ("ram", "fd", "sr")
+
+# /proc/diskstats 中（主次设备号、设备名之后）各列含义，仅取前 11 列
+# 0 读完成次数 1 读合并 2 读扇区 3 读耗时ms 4 写完成次数 5 写合并 6 写扇区 7 写耗时ms
+# 8 进行中 IO 9 IO 耗时ms(io_ticks) 10 加权 IO 耗时ms(time_in_queue)
+_FIELDS = 11
+SECTOR_SIZE = 512
+
+# 参与差分的计数列（第 8 列进行中 IO 是瞬时值，不参与）。次数与扇区为 unsigned long，
+# 耗时列（3、7、9、10）在内核中按 unsigned int 毫秒输出，约 49.7 天回绕一次
+_COUNTER_COLS = (0, 1, 2, 3, 4, 5, 6, 7, 9, 10)
+_COUNTER_BITS = (None, None, None, 32, None, None, None, 32, 32, 32)
+# 上一轮原始计数登记在速率引擎中，全部设备一次向量化差分
+_RATES = CounterRates([str(i) for i in _COUNTER_COLS], bits=_COUNTER_BITS)
+# 设备拓扑缓存：{dev: {"type": "disk|dm|md", "name": str, "slaves": [...]}}，设备集合变化时重建
+_TOPOLOGY: Dict[str, Dict] = {}
+_TOPOLOGY_KEYS: frozenset = frozenset()
+
+
+def is_available(path: str = DISKSTATS_PATH) -> bool:
+    """当前系统是否可用 /proc/diskstats（仅 Linux）"""
+    return os.path.exists(path)
+
+
+def read_diskstats(path: str = DISKSTATS_PATH) -> Dict[str, Tuple[int, ...]]:
+    """
+    一次性读取 /proc/diskstats 并解析为 {设备名: 11 列原始计数}。
+    整个文件通过单次 os.read 取回，避免逐行 readline 带来的多次系统调用。
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        raw = os.read(fd, 1 << 20)
+    finally:
+        os.close(fd)
+    result = {}
+    for line in raw.decode("ascii", "ignore").splitlines():
+        cols = line.split()
+        if len(cols) < 3 + _FIELDS:
+            continue
+        try:
+            result[cols[2]] = tuple(int(x) for x in cols[3:3 + _FIELDS])
+        except ValueError:
+            continue
+    return result
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def scan_topology(sys_block: str = SYS_BLOCK_PATH) -> Dict[str, Dict]:
+    """
+    扫描 /sys/block 得到整盘设备拓扑。/sys/block 下只有整盘（含 dm-*、md*），
+    分区只作为其子目录出现，因此不在这里的设备一律视为分区。
+    """
+    topo = {}
+    try:
+        names = os.listdir(sys_block)
+    except OSError:
+        return topo
+    for dev in names:
+        if dev.startswith(IGNORED_PREFIXES):
+            continue
+        base = os.path.join(sys_block, dev)
+        if os.path.isdir(os.path.join(base, "dm")):
+            kind = "dm"
+            name = _read_text(os.path.join(base, "dm", "name")) or dev
+        elif os.path.isdir(os.path.join(base, "md")):
+            kind = "md"
+            name = dev
+        else:
+            kind = "disk"
+            name = dev
+        try:
+            slaves = sorted(os.listdir(os.path.join(base, "slaves")))
+        except OSError:
+            slaves = []
+        topo[dev] = {"type": kind, "name": name, "slaves": slaves}
+    return topo
+
+
+def get_topology(devices=None, sys_block: str = SYS_BLOCK_PATH) -> Dict[str, Dict]:
+    """返回缓存的设备拓扑；传入的设备集合与上次不同（热插拔、新建 LV）时才重新扫描 sysfs"""
+    global _TOPOLOGY, _TOPOLOGY_KEYS
+    keys = frozenset(devices) if devices is not None else None
+    if not _TOPOLOGY or (keys is not None and keys != _TOPOLOGY_KEYS):
+        _TOPOLOGY = scan_topology(sys_block)
+        if keys is not None:
+            _TOPOLOGY_KEYS = keys
+    return _TOPOLOGY
+
+
+def compute_rates(d: np.ndarray, dt: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    由各设备的计数差值（按 _COUNTER_COLS 排列，形状 (设备数, 10)）与间隔秒计算指标，语义与 iostat -x 一致：
+    r_iops / w_iops（次/s）、read / write（KB/s）、r_await / w_await / await（ms）、
+    queue（平均队列深度 aqu-sz）、busy（利用率 %）。dt 须为正。
+    """
+    r_ios, w_ios = d[:, 0], d[:, 4]
+    r_ticks, w_ticks = d[:, 3], d[:, 7]
+    ios = r_ios + w_ios
+
+    def ratio(a, b):
+        return np.divide(a, b, out=np.zeros_like(a), where=b > 0)
+
+    return {
+        "r_iops": (r_ios / dt).round(1),
+        "w_iops": (w_ios / dt).round(1),
+        "read": (d[:, 2] * SECTOR_SIZE / 1024 / dt).round(1),
+        "write": (d[:, 6] * SECTOR_SIZE / 1024 / dt).round(1),
+        "r_await": ratio(r_ticks, r_ios).round(2),
+        "w_await": ratio(w_ticks, w_ios).round(2),
+        "await": ratio(r_ticks + w_ticks, ios).round(2),
+        "queue": (d[:, 9] / 1000 / dt).round(2),
+        "busy": np.minimum(d[:, 8] / 1000 / dt * 100, 100).round(1),
+    }
+
+
+def sample(clock: float, path: str = DISKSTATS_PATH, sys_block: str = SYS_BLOCK_PATH,
+           stats: Optional[Dict[str, Tuple[int, ...]]] = None, topology: Optional[Dict[str, Dict]] = None,
+           devices: Optional[DeviceSeries] = None) -> Dict[str, Dict]:
+    """
+    采集一轮整盘设备（disk/dm/md）的 IO 指标：{dev: 指标字典}，clock 为单调时钟（秒）。
+    分区不单独统计也不向整盘累加，避免整盘与分区重复计数。首轮只建立基线，返回空；
+    耗时列回绕时补上 2^32，设备被移除后重建（计数回退）的那一轮对应指标为 0。
+    stats / topology 由数据源传入时不再读取 procfs / sysfs。
+    传入 devices 时按其规则丢弃或聚合设备：各设备先换算为每秒增量再按序列键求和，
+    组序列的 await 即为成员按 IO 次数加权的平均值。
+    """
+    global _TOPOLOGY
+    if stats is None:
+        stats = read_diskstats(path)
+    if topology is not None:
+        _TOPOLOGY = topo = topology
+    else:
+        topo = get_topology(stats.keys(), sys_block)
+    devs = [dev for dev in stats if dev in topo]
+    rows = [[stats[dev][i] for i in _COUNTER_COLS] for dev in devs]
+    d, dt, ok = _RATES.deltas(devs, rows, clock)
+    if devices is not None:
+        per_sec = np.divide(d, dt[:, None], out=np.zeros_like(d), where=ok[:, None])
+        devs, d, ok = devices.group(devs, per_sec, ok, clock)
+        dt = np.ones(len(devs))
+    if not ok.any():
+        return {}
+    metrics = compute_rates(d[ok], dt[ok])
+    names = [dev for dev, valid in zip(devs, ok.tolist()) if valid]
+    columns = {k: v.tolist() for k, v in metrics.items()}
+    return {dev: {k: columns[k][i] for k in columns} for i, dev in enumerate(names)}
+
+
+def get_device_info() -> Dict[str, Dict]:
+    """返回当前设备拓扑（类型、dm 映射名、底层 slaves），供前端展示堆叠关系"""
+    return {dev: dict(info) for dev, info in _TOPOLOGY.items()}
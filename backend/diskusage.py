@@ -0,0 +1,197 @@
+"""
+磁盘用量采集
+statvfs（psutil.disk_usage）在 NFS / CIFS / FUSE 服务端无响应时会一直阻塞，原先在请求路径上对每个挂载点串行调用，
+一个挂起的挂载点就会让 /api/data、WebSocket 推送与缓存文件刷新同时卡住。这里改为：
+- 由固定数量的后台线程执行 statvfs，调用方从不等待超过 wait 秒（只在挂载点尚无任何结果时短暂等待，
+  本地磁盘通常在这段时间内返回）；
+- 结果按挂载点缓存，按文件系统类型的刷新间隔（refresh，键为 fnmatch 模式，如 "fuse.*"）重新获取；
+- 单次调用超过 timeout 秒或出错记为一次失败：继续返回上一次的结果并标记 stale，
+  下次重试按 刷新间隔 × 2^失败次数 退避（不超过 backoff_max）；
+- 每个挂载点同时最多一个调用在途，挂起的挂载点至多占用一个线程，恢复后其结果照常收回；
+  挂载点从分区列表中消失时，仍在途的调用按路径保留，挂载点反复出现 / 消失（autofs、NFS 抖动）
+  也不会为同一路径再提交调用、逐个占满线程；
+  排队尚未开始的调用不计超时，线程被占满时健康的挂载点只是推迟而不会被误判为失败；
+- 在途调用超过 timeout 时视为挂起：该线程被放弃（调用返回后线程即退出），另起一个线程补足 workers，
+  同时被放弃的线程至多 max_hung 个，workers 个以上的挂载点同时挂起也不会让其余挂载点一直排队。
+statvfs 可替换为任意 (路径) -> 带 total / used / percent 属性的对象 的函数（默认为当前数据源的 disk_usage），
+便于用人为变慢或挂起的实现测试（见 bench/diskusage.py）。
+"""
+import fnmatch
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+from typing import Callable, Dict, List, Optional
+
+from .app_config import get_disk_usage_config
+
+
+class _Mount:
+    __slots__ = ("path", "fstype", "future", "started", "value", "failures", "timed_out", "next_due")
+
+    def __init__(self, path: str, fstype: str):
+        self.path = path
+        self.fstype = fstype
+        self.future: Optional[Future] = None
+        self.started: Optional[float] = None  # 在途调用开始执行的时刻（排队中为 None）
+        self.value = None                     # 最近一次成功的 (total, used, usage_percent)
+        self.failures = 0                     # 连续失败（超时或出错）次数
+        self.timed_out = False                # 在途调用已按超时记过一次失败
+        self.next_due = 0.0
+
+
+class DiskUsageCollector:
+    """按挂载点缓存的非阻塞磁盘用量采集"""
+
+    def __init__(self, workers: int = 4, timeout: float = 2.0, wait: float = 0.5,
+                 refresh: Optional[Dict[str, float]] = None, backoff_max: float = 600.0,
+                 max_hung: int = 16, statvfs: Optional[Callable] = None):
+        self.workers = max(1, int(workers))
+        self.max_hung = max(0, int(max_hung))
+        self.timeout = float(timeout)
+        self.wait = float(wait)
+        self.refresh = dict(refresh or {"default": 5.0})
+        self.backoff_max = float(backoff_max)
+        self.statvfs = statvfs
+        self._mounts: Dict[str, _Mount] = {}
+        self._detached: Dict[str, _Mount] = {}  # 已从分区列表消失、调用仍在途的挂载点
+        self._intervals: Dict[str, float] = {}
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._threads = 0     # 存活的线程数（含被放弃的）
+        self._abandoned = 0   # 其中因调用挂起被放弃、已另起线程补足的
+        self._spawned = 0
+        self._lock = threading.Lock()
+
+    def interval(self, fstype: str) -> float:
+        """该文件系统类型的刷新间隔（秒）：取 refresh 中第一个匹配的模式，否则为 default"""
+        iv = self._intervals.get(fstype)
+        if iv is None:
+            key = next((k for k in self.refresh if k != "default" and fnmatch.fnmatchcase(fstype, k)), "default")
+            iv = self._intervals[fstype] = float(self.refresh.get(key, 5.0))
+        return iv
+
+    # ---------- 后台线程 ----------
+    def _stat(self, path: str):
+        if self.statvfs is not None:
+            return self.statvfs(path)
+        from .providers import provider
+        return provider.disk_usage(path)
+
+    def _work(self):
+        while True:
+            mount, fut = self._queue.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            mount.started = time.monotonic()
+            try:
+                fut.set_result(self._stat(mount.path))
+            except BaseException as e:
+                fut.set_exception(e)
+            with self._lock:
+                if getattr(fut, "abandoned", False):
+                    # 已另起线程顶替：挂起的调用返回后本线程退出
+                    self._abandoned -= 1
+                    self._threads -= 1
+                    return
+
+    def _spawn(self):
+        # 守护线程：挂起在 statvfs 中的线程不会阻止进程退出
+        t = threading.Thread(target=self._work, name=f"diskusage-{self._spawned}", daemon=True)
+        self._spawned += 1
+        self._threads += 1
+        t.start()
+
+    def _submit(self, m: _Mount):
+        if self._threads - self._abandoned < self.workers:
+            self._spawn()
+        m.future, m.started, m.timed_out = Future(), None, False
+        self._queue.put((m, m.future))
+
+    # ---------- 结果 ----------
+    def _fail(self, m: _Mount, now: float):
+        m.failures += 1
+        m.next_due = now + min(self.backoff_max, self.interval(m.fstype) * 2 ** m.failures)
+
+    def _harvest(self, m: _Mount, now: float):
+        f = m.future
+        if f is None:
+            return
+        if f.done():
+            m.future = None
+            try:
+                usage = f.result()
+            except Exception:
+                if not m.timed_out:
+                    self._fail(m, now)
+                return
+            m.value = (round(usage.total / (1024**3), 2), round(usage.used / (1024**3), 2), round(usage.percent, 1))
+            m.failures = 0
+            m.next_due = now + self.interval(m.fstype)
+        elif m.started is not None and not m.timed_out and time.monotonic() - m.started > self.timeout:
+            m.timed_out = True
+            self._fail(m, now)
+            if self._abandoned < self.max_hung:
+                # 放弃挂起的线程并补一个，排队中的挂载点不必等它返回
+                f.abandoned = True
+                self._abandoned += 1
+                self._spawn()
+
+    def usage(self, partitions: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """
+        为各分区补充容量与用量（GB、%）及 stale（最近一次获取失败或超时，数值为上一次成功的结果）；
+        从未成功获取过的分区跳过。now 为单调时钟。
+        """
+        now = time.monotonic() if now is None else now
+        fresh = []
+        with self._lock:
+            seen = set()
+            for part in partitions:
+                path = part["mountpoint"]
+                seen.add(path)
+                m = self._mounts.get(path) or self._detached.pop(path, None)
+                if m is None or m.fstype != part.get("fstype", ""):
+                    old, m = m, _Mount(path, part.get("fstype", ""))
+                    if old is not None and old.future is not None:
+                        # 同一路径的调用仍在途：沿用它而不是再提交一个
+                        m.future, m.started, m.timed_out = old.future, old.started, old.timed_out
+                self._mounts[path] = m
+                self._harvest(m, now)
+                if m.future is None and now >= m.next_due:
+                    self._submit(m)
+                    if m.value is None:
+                        fresh.append(m.future)
+            for path in [p for p in self._mounts if p not in seen]:
+                m = self._mounts.pop(path)
+                if m.future is not None and not m.future.done():
+                    self._detached[path] = m
+            for path in [p for p, m in self._detached.items() if m.future.done()]:
+                del self._detached[path]
+        if fresh:
+            wait_futures(fresh, timeout=self.wait)
+        out = []
+        with self._lock:
+            for part in partitions:
+                m = self._mounts.get(part["mountpoint"])
+                if m is None:
+                    continue
+                self._harvest(m, now)
+                if m.value is not None:
+                    total, used, percent = m.value
+                    out.append(dict(part, total=total, used=used, usage_percent=percent, stale=m.failures > 0))
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._mounts.clear()
+            self._detached.clear()
+            self._intervals.clear()
+
+
+def create_collector(cfg: Optional[Dict] = None) -> DiskUsageCollector:
+    cfg = get_disk_usage_config() if cfg is None else cfg
+    return DiskUsageCollector(workers=int(cfg.get("workers", 4)), timeout=float(cfg.get("timeout", 2)),
+                              wait=float(cfg.get("wait", 0.5)), refresh=cfg.get("refresh") or None,
+                              backoff_max=float(cfg.get("backoff_max", 600)), max_hung=int(cfg.get("max_hung", 16)))
+
+
+disk_usage_collector = create_collector()
@@ -0,0 +1,179 @@
+"""
+历史数据批量导出
+按时间分段从历史存储取数，逐段编码为 CSV / NDJSON / Parquet 并以生成器输出，
+内存占用只与单段大小（CHUNK_ROWS 行）有关，与导出的时间范围无关。
+既供 /api/export 的 StreamingResponse 使用，也可作为命令行工具离线导出：
+
+    python -m backend.export --metrics cpu_usage "net.*.up" --last 86400 -o cpu.csv
+    python -m backend.export --format parquet -o all.parquet            # 读取 history.persist 文件
+    python -m backend.export --url http://127.0.0.1:8001 --format ndjson  # 从运行中的服务拉取
+"""
+import argparse
+import io
+import json
+import sys
+import time
+import urllib.parse
+import urllib.request
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .history import HistoryStore, HISTORY_FILE, history_store
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+CHUNK_ROWS = 1000  # 每段最多的行数（原始层 1 行 = 1 秒，汇总层 1 行 = rollup_interval 秒）
+
+
+def iter_chunks(store: HistoryStore, names: List[str], start: float, end: float
+                ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """按时间顺序分段产出 (ts[N], values[N, k])，相邻段不重叠"""
+    oldest, newest = store.span()
+    lo, end = max(start, oldest), min(end, newest)
+    while lo <= end:
+        raw_oldest = store.raw.oldest()
+        step = 1.0 if lo >= raw_oldest else float(store.rollup_interval)
+        hi = min(lo + CHUNK_ROWS * step, end)
+        if lo < raw_oldest:
+            hi = min(hi, raw_oldest)
+        ts, values, _ = store.query(names, lo, hi)
+        if hi < end:
+            keep = ts < hi
+            ts, values = ts[keep], values[keep]
+        if len(ts):
+            yield ts, values
+        if hi >= end:
+            break
+        lo = hi
+
+
+def iter_csv(store: HistoryStore, names: List[str], start: float, end: float) -> Iterator[bytes]:
+    """宽表 CSV：timestamp 列为 Unix 秒，缺失值留空"""
+    yield (",".join(["timestamp"] + [_csv_field(n) for n in names]) + "\n").encode("utf-8")
+    for ts, values in iter_chunks(store, names, start, end):
+        buf = io.StringIO()
+        np.savetxt(buf, np.column_stack([ts, values]), delimiter=",",
+                   fmt=["%.3f"] + ["%.6g"] * len(names))
+        yield buf.getvalue().replace("nan", "").encode("utf-8")
+
+
+def iter_ndjson(store: HistoryStore, names: List[str], start: float, end: float) -> Iterator[bytes]:
+    """每行一个 JSON 对象：{"ts": Unix 秒, 序列名: 值, ...}，缺失的序列不输出"""
+    for ts, values in iter_chunks(store, names, start, end):
+        rows = np.round(values, 6).tolist()
+        lines = []
+        for t, row in zip(ts.tolist(), rows):
+            obj = {"ts": t}
+            obj.update((n, v) for n, v in zip(names, row) if v == v)
+            lines.append(json.dumps(obj, ensure_ascii=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _DrainSink(io.RawIOBase):
+    """供 ParquetWriter 写入的缓冲区，每写完一个 row group 取走已写出的字节"""
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._parts.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(store: HistoryStore, names: List[str], start: float, end: float) -> Iterator[bytes]:
+    """Parquet：每段写成一个 row group，timestamp 列为 UTC 时间戳（毫秒）"""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("导出 Parquet 需要安装 pyarrow")
+    schema = pa.schema([("timestamp", pa.timestamp("ms", tz="UTC"))] + [(n, pa.float32()) for n in names])
+    sink = _DrainSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for ts, values in iter_chunks(store, names, start, end):
+            cols = [pa.array(np.rint(ts * 1000).astype(np.int64), type=pa.timestamp("ms", tz="UTC"))]
+            cols += [pa.array(values[:, i].astype(np.float32), from_pandas=True) for i in range(len(names))]
+            writer.write_table(pa.Table.from_arrays(cols, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_ENCODERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
+
+
+def export(store: HistoryStore, names: List[str], start: float, end: float, fmt: str = "csv") -> Iterator[bytes]:
+    """按格式返回字节块生成器"""
+    if fmt not in _ENCODERS:
+        raise ValueError(f"不支持的导出格式: {fmt}（可选 {', '.join(FORMATS)}）")
+    return _ENCODERS[fmt](store, names, start, end)
+
+
+def _csv_field(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"' if any(c in name for c in ',"\n') else name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.export", description="导出 SystemStatus 历史数据")
+    parser.add_argument("--metrics", nargs="*", default=[], help="序列名或通配符，默认全部")
+    parser.add_argument("--from", dest="start", type=float, help="起始时间（Unix 秒）")
+    parser.add_argument("--to", dest="end", type=float, help="结束时间（Unix 秒），默认当前")
+    parser.add_argument("--last", type=float, help="最近 N 秒，与 --from 二选一")
+    parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="csv")
+    parser.add_argument("-o", "--output", help="输出文件，默认标准输出")
+    parser.add_argument("--source", default=HISTORY_FILE, help="历史存储文件（默认取 config.yml 的 history.persist）")
+    parser.add_argument("--url", help="从运行中的服务导出（如 http://127.0.0.1:8001），不读本地文件")
+    args = parser.parse_args(argv)
+
+    end = args.end if args.end is not None else time.time()
+    start = end - args.last if args.last is not None else (args.start if args.start is not None else 0.0)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        if args.url:
+            query = [("metrics", m) for m in args.metrics] + [("from", start), ("to", end), ("format", args.fmt)]
+            url = args.url.rstrip("/") + "/api/export?" + urllib.parse.urlencode(query)
+            with urllib.request.urlopen(url) as resp:
+                while True:
+                    block = resp.read(1 << 16)
+                    if not block:
+                        break
+                    out.write(block)
+            return 0
+        if not args.source or not history_store.load(args.source):
+            print(f"无法读取历史存储文件: {args.source}", file=sys.stderr)
+            return 1
+        names = history_store.resolve(args.metrics) if args.metrics else history_store.series()
+        for block in export(history_store, names, start, end, args.fmt):
+            out.write(block)
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
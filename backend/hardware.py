@@ -9,6 +9,7 @@ import time
 from typing import Dict, List
 import subprocess
 from backend.app_config import get_disk_filter
+from backend.devseries import nic_series
 
 # NVML全局变量
 NVML_AVAILABLE = False
@@ -229,13 +230,15 @@ def get_intel_gpu_usage() -> object:
 _INTEL_GPU_CACHE = {"ts": 0, "data": None}
 
 
-def get_gpu_details() -> Dict:
+def get_gpu_details(info: Dict = None) -> Dict:
     """
     获取 GPU 详细信息（NVIDIA 用 NVML；Intel/AMD 由 intel_gpu_top 补充利用率/频率/功耗）
+    info 为已知的 get_gpu_info() 结果（如硬件清单中缓存的），省去重新识别型号（lspci / WMI 子进程）
     返回: {"available": bool, "model", "memory_total", "memory_used",
            "temperature", "power_draw", "power_limit", "utilization", "brand", "frequency"}
     """
-    info = get_gpu_info()
+    if info is None:
+        info = get_gpu_info()
     details = {
         "available": info.get("available", False),
         "model": info.get("model", "Unknown"),
@@ -444,17 +447,12 @@ def get_swap_info() -> Dict:
                额外用 PowerShell 探测页面文件配置（是否启用、是否系统托管、初始/最大大小）
     无法获取时返回 total=0 的结构，前端据此显示「无」
     """
-    swap = psutil.swap_memory()
-    info = {
-        "total": round(swap.total / (1024**3), 2),
-        "used": round(swap.used / (1024**3), 2),
-        "free": round(swap.free / (1024**3), 2),
-        "percent": round(swap.percent, 1),
-        "sin": round(swap.sin / (1024**3), 2) if swap.sin else 0,
-        "sout": round(swap.sout / (1024**3), 2) if swap.sout else 0,
-        "pagefiles": []
-    }
+    return dict(get_swap_usage(), pagefiles=get_pagefiles())
+
 
+def get_pagefiles() -> List[Dict]:
+    """Windows 页面文件配置（名称、初始/最大大小、是否系统托管），其他平台为空列表"""
+    pagefiles = []
     # Windows 下补充页面文件配置详情
     if platform.system() == "Windows":
         try:
@@ -481,7 +479,7 @@ def get_swap_info() -> Dict:
                         except ValueError:
                             maximum = 0
                         system_managed = parts[3].strip().lower() in ("true", "1")
-                        info["pagefiles"].append({
+                        pagefiles.append({
                             "name": name,
                             "initial_size_mb": init,
                             "maximum_size_mb": maximum,
@@ -490,7 +488,7 @@ def get_swap_info() -> Dict:
         except Exception:
             pass
 
-    return info
+    return pagefiles
 
 
 def map_physical_disk(device: str) -> str:
@@ -521,30 +519,17 @@ def map_physical_disk(device: str) -> str:
     return re.sub(r'\d+$', '', d) or device
 
 
-def get_hardware_info() -> Dict:
-    """获取完整硬件信息"""
-    # CPU
-    cpu_info = {
-        "model": get_cpu_model(),
-        "cores": psutil.cpu_count(logical=True),
-        "physical_cores": psutil.cpu_count(logical=False)
-    }
-
-    # 内存
-    mem = psutil.virtual_memory()
-    mem_info = {
-        "total": round(mem.total / (1024**3), 2),
-        "model": get_memory_model()
-    }
+def get_partitions() -> List[Dict]:
+    """经过 disk_filter 过滤的分区（不含用量）：device / physical_disk / mountpoint / fstype"""
+    from .providers import provider
 
-    # 硬盘
-    disks = []
+    parts = []
     disk_filter = get_disk_filter()
     filter_devices = set(disk_filter.get("devices", []))
     filter_mountpoints = disk_filter.get("mountpoints", [])
     filter_fstypes = set(disk_filter.get("fstypes", []))
 
-    for part in psutil.disk_partitions(all=False):
+    for part in provider.disk_partitions():
         if "cdrom" in part.opts or part.fstype == "":
             continue
         # 命中任一过滤规则则跳过：设备名 / 挂载点 / 文件系统类型
@@ -560,60 +545,115 @@ def get_hardware_info() -> Dict:
         # Linux 下过滤 /dev/loop* 循环设备（snap、docker 等挂载），避免冗余条目
         if platform.system() == "Linux" and part.device.startswith("/dev/loop"):
             continue
-        try:
-            usage = psutil.disk_usage(part.mountpoint)
-            disks.append({
-                "device": part.device,
-                "physical_disk": map_physical_disk(part.device),
-                "mountpoint": part.mountpoint,
-                "fstype": part.fstype,
-                "total": round(usage.total / (1024**3), 2),
-                "used": round(usage.used / (1024**3), 2),
-                "usage_percent": round(usage.percent, 1)
-            })
-        except:
-            continue
+        parts.append({
+            "device": part.device,
+            "physical_disk": map_physical_disk(part.device),
+            "mountpoint": part.mountpoint,
+            "fstype": part.fstype,
+        })
+    return parts
 
-    # 显卡
-    gpu_info = get_gpu_info()
-    gpu_details = get_gpu_details()
 
-    # 内存频率
-    mem_freq = get_memory_frequency()
+def get_disk_usage(partitions: List[Dict]) -> List[Dict]:
+    """
+    为各分区补充容量与用量（GB、%）及 stale 标记，取不到用量的分区跳过。
+    statvfs 在后台线程中执行并按挂载点缓存，挂起的网络文件系统不会阻塞调用方（见 diskusage 模块）
+    """
+    from .diskusage import disk_usage_collector
+    return disk_usage_collector.usage(partitions)
+
+
+def get_physical_disks(partitions: List[Dict]) -> List[str]:
+    """分区所在的物理磁盘（按出现顺序去重）"""
+    physical_disks = []
+    seen = set()
+    for d in partitions:
+        pd = d.get("physical_disk")
+        if pd and pd not in seen:
+            seen.add(pd)
+            physical_disks.append(pd)
+    return physical_disks
 
-    # 交换分区 / 页面文件
-    swap_info = get_swap_info()
 
-    # 硬盘 SMART
-    disk_smart = get_disk_smart()
+def get_network_interfaces() -> List[Dict]:
+    """网卡及其 IPv4 地址（被丢弃或聚合为组序列的网卡不单独列出，如容器的 veth*）"""
+    from .providers import provider
 
-    # 网卡（显示所有网卡）
     net_ifaces = []
-    for iface, addrs in psutil.net_if_addrs().items():
-        if iface == "lo":
+    for iface, addrs in provider.net_if_addrs().items():
+        if iface == "lo" or not nic_series.is_individual(iface):
             continue
         net_ifaces.append({
             "name": iface,
             "addresses": [addr.address for addr in addrs if addr.family == 2]
         })
+    return net_ifaces
 
-    physical_disks = []
-    seen = set()
-    for d in disks:
-        pd = d.get("physical_disk")
-        if pd and pd not in seen:
-            seen.add(pd)
-            physical_disks.append(pd)
 
+def get_swap_usage() -> Dict:
+    """交换分区 / 页面文件的当前用量（不含 Windows 页面文件配置，后者见 get_swap_info）"""
+    from .providers import provider
+    swap = provider.swap_memory()
     return {
-        "cpu": cpu_info,
-        "memory": mem_info,
-        "mem_frequency": mem_freq,
-        "swap": swap_info,
-        "disks": disks,
-        "physical_disks": physical_disks,
-        "disk_smart": disk_smart,
-        "gpu": gpu_info,
-        "gpu_details": gpu_details,
-        "network": net_ifaces
+        "total": round(swap.total / (1024**3), 2),
+        "used": round(swap.used / (1024**3), 2),
+        "free": round(swap.free / (1024**3), 2),
+        "percent": round(swap.percent, 1),
+        "sin": round(swap.sin / (1024**3), 2) if swap.sin else 0,
+        "sout": round(swap.sout / (1024**3), 2) if swap.sout else 0,
     }
+
+
+# 硬件清单的各个部分：很少变化，由 inventory 模块在检测到变化或定期刷新时按部分重新获取
+INVENTORY_SECTIONS = ("cpu", "memory", "mem_frequency", "swap", "disks", "physical_disks", "disk_smart", "gpu",
+                      "network")
+
+
+def get_hardware_inventory(sections=INVENTORY_SECTIONS) -> Dict:
+    """获取硬件清单中指定的部分（原始数据均来自当前数据源）；physical_disks 随 disks 一同获取"""
+    from .providers import provider
+
+    sections = set(sections)
+    out = {}
+    if "cpu" in sections:
+        out["cpu"] = {
+            "model": provider.cpu_model(),
+            "cores": provider.cpu_count(logical=True),
+            "physical_cores": provider.cpu_count(logical=False)
+        }
+    if "memory" in sections:
+        mem = provider.virtual_memory()
+        out["memory"] = {
+            "total": round(mem.total / (1024**3), 2),
+            "model": get_memory_model()
+        }
+    if "mem_frequency" in sections:
+        out["mem_frequency"] = get_memory_frequency()
+    if "swap" in sections:
+        out["swap"] = {"pagefiles": get_pagefiles()}
+    if sections & {"disks", "physical_disks"}:
+        out["disks"] = get_partitions()
+        out["physical_disks"] = get_physical_disks(out["disks"])
+    if "disk_smart" in sections:
+        out["disk_smart"] = provider.disk_smart()
+    if "gpu" in sections:
+        out["gpu"] = provider.gpu_info()[0]
+    if "network" in sections:
+        out["network"] = get_network_interfaces()
+    return out
+
+
+def get_hardware_live(gpu: Dict = None) -> Dict:
+    """硬件信息中随时间变化的部分：交换分区用量与 GPU 实时详情（温度、显存、功耗等）；gpu 为清单中的 GPU 型号信息"""
+    from .providers import provider
+    return {"swap": get_swap_usage(), "gpu_details": provider.gpu_details(gpu)}
+
+
+def get_hardware_info() -> Dict:
+    """获取完整硬件信息：清单 + 实时部分，disks 含用量（原始数据均来自当前数据源）"""
+    info = get_hardware_inventory()
+    live = get_hardware_live(info["gpu"])
+    info["swap"] = dict(info["swap"], **live["swap"])
+    info["gpu_details"] = live["gpu_details"]
+    info["disks"] = get_disk_usage(info["disks"])
+    return info
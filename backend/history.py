@@ -0,0 +1,415 @@
+"""
+历史时间序列存储
+所有序列共用一条时间轴，按列存放在 NumPy 二维环形缓冲区中（行 = 采样时刻，列 = 序列）：
+- 原始层：每轮采集一行，保留 retention 秒；
+- 汇总层：按 rollup_interval（默认 60 秒）求均值，保留 rollup_retention 秒，用于长时间范围查询。
+新序列出现时按列扩容（旧行填 NaN），查询时按时间范围先取汇总层、再接原始层。
+容器、进程、挂载点等序列会不断更替：两层保留期内都没有写入的列被回收，槽位留给之后出现的新序列复用；
+列数达到 max_series 时不再为新序列分配列（丢弃并记录日志），内存始终有界。
+每行还附带一份同形状的异常分数（float16），由异常检测模块写入。
+可定期保存为 .npz 文件，重启后恢复，离线导出工具也直接读取该文件。
+"""
+import fnmatch
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .app_config import get_history_config
+from .downsample import select_indices, downsample_cache
+
+_INITIAL_COLS = 64
+
+
+class RingTier:
+    """单层环形缓冲区：ts[capacity]、values[capacity, cols]、scores[capacity, cols]"""
+
+    def __init__(self, capacity: int, step: float):
+        self.capacity = max(1, int(capacity))
+        self.step = step
+        self.ts = np.full(self.capacity, np.nan)
+        self.values = np.full((self.capacity, _INITIAL_COLS), np.nan, dtype=np.float32)
+        self.scores = np.zeros((self.capacity, _INITIAL_COLS), dtype=np.float16)
+        self.head = 0   # 下一次写入的行
+        self.size = 0   # 已写入行数（<= capacity）
+
+    @property
+    def cols(self) -> int:
+        return self.values.shape[1]
+
+    def ensure_cols(self, n: int):
+        if n <= self.cols:
+            return
+        new = self.cols
+        while new < n:
+            new *= 2
+        values = np.full((self.capacity, new), np.nan, dtype=np.float32)
+        values[:, :self.cols] = self.values
+        scores = np.zeros((self.capacity, new), dtype=np.float16)
+        scores[:, :self.cols] = self.scores
+        self.values, self.scores = values, scores
+
+    def write(self, ts: float, values: np.ndarray, scores: Optional[np.ndarray] = None) -> int:
+        row = self.head
+        n = len(values)
+        self.ts[row] = ts
+        self.values[row, :n] = values
+        self.values[row, n:] = np.nan
+        self.scores[row] = 0
+        if scores is not None:
+            self.scores[row, :len(scores)] = scores
+        self.head = (row + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return row
+
+    def order(self) -> np.ndarray:
+        """按时间先后排列的行号"""
+        if self.size < self.capacity:
+            return np.arange(self.size)
+        return (np.arange(self.capacity) + self.head) % self.capacity
+
+    def oldest(self) -> float:
+        if not self.size:
+            return float("inf")
+        return float(self.ts[self.order()[0]])
+
+
+class HistoryStore:
+    """原始层 + 汇总层的列式历史存储，线程安全（采集线程写、API 读）"""
+
+    def __init__(self, retention: int = 3600, rollup_interval: int = 60, rollup_retention: int = 604800,
+                 max_series: int = 2048):
+        self.columns: Dict[str, int] = {}
+        self.names: List[Optional[str]] = []  # 按列号排列，已回收的空槽为 None
+        self.max_series = max(1, int(max_series))
+        self._free: List[int] = []            # 可复用的空槽
+        self._last_write = np.zeros(_INITIAL_COLS)  # 每列最近一次写入非 NaN 值的时刻
+        self._retire_ts = 0.0
+        self.dropped = 0                      # 上次回收以来因列数上限被丢弃的新序列数
+        self.raw = RingTier(retention, 1.0)
+        self.rollup_interval = max(1, int(rollup_interval))
+        self.rollup = RingTier(rollup_retention // self.rollup_interval, float(self.rollup_interval))
+        # 当前汇总桶的累加器
+        self._bucket = None
+        self._sum = np.zeros(_INITIAL_COLS)
+        self._cnt = np.zeros(_INITIAL_COLS)
+        self._score = np.zeros(_INITIAL_COLS, dtype=np.float32)
+        self.last_row: Optional[np.ndarray] = None
+        self.version = 0  # 每写入一行递增，供下游缓存判断数据是否更新
+        self.rollup_version = 0  # 汇总层内容变化时递增（每个汇总周期一次），供长时间范围的降采样缓存使用
+        self.lock = threading.Lock()
+
+    def series(self) -> List[str]:
+        """当前在用的序列名（按列号顺序，不含空槽）"""
+        return [n for n in self.names if n is not None]
+
+    def column(self, name: str) -> Optional[int]:
+        """返回序列的列号，新序列优先复用空槽；列数已达 max_series 时返回 None"""
+        idx = self.columns.get(name)
+        if idx is not None:
+            return idx
+        if self._free:
+            idx = self._free.pop()
+            self.names[idx] = name
+        elif len(self.names) < self.max_series:
+            idx = len(self.names)
+            self.names.append(name)
+            if idx >= len(self._last_write):
+                self._last_write = np.pad(self._last_write, (0, len(self._last_write)))
+        else:
+            if not self.dropped:
+                print(f"历史存储序列数已达上限 max_series={self.max_series}，新序列不再记录（如 {name}）")
+            self.dropped += 1
+            return None
+        self.columns[name] = idx
+        self._last_write[idx] = time.time()  # 从分配时起计空闲时间，未写入过的列也能按期回收
+        return idx
+
+    def to_row(self, sample: Dict[str, float]) -> np.ndarray:
+        """把 {序列名: 值} 映射为按列排列的向量（缺失为 NaN），新序列自动分配列，超出上限的新序列丢弃"""
+        with self.lock:
+            for name in sample:
+                if name not in self.columns:
+                    self.column(name)
+        row = np.full(len(self.names), np.nan, dtype=np.float64)
+        cols = self.columns
+        for name, v in sample.items():
+            idx = cols.get(name)
+            if v is not None and idx is not None:
+                row[idx] = v
+        return row
+
+    def append(self, ts: float, row: np.ndarray, scores: Optional[np.ndarray] = None):
+        """写入一行（row 由 to_row 生成），并累加到当前汇总桶"""
+        with self.lock:
+            n = len(row)
+            for tier in (self.raw, self.rollup):
+                tier.ensure_cols(n)
+            self.raw.write(ts, row, scores)
+            self._accumulate(ts, row, scores)
+            self._last_write[:n][~np.isnan(row)] = ts
+            self.last_row = row
+            self.version += 1
+
+    def retire_idle(self, now: float) -> Dict[int, str]:
+        """
+        回收两层保留期内都没有写入的列（其数据已全部滚出环形缓冲区）：清空该列、加入空槽，
+        返回 {列号: 序列名}，供异常检测、告警等按列 / 按序列名保存状态的模块同步清理。
+        每个汇总周期最多检查一次。
+        """
+        if now - self._retire_ts < self.rollup_interval:
+            return {}
+        self._retire_ts = now
+        with self.lock:
+            n = len(self.names)
+            horizon = now - max(self.raw.capacity * self.raw.step, self.rollup.capacity * self.rollup.step)
+            retired = {}
+            for idx in np.nonzero(self._last_write[:n] < horizon)[0].tolist():
+                name = self.names[idx]
+                if name is None:
+                    continue
+                retired[idx] = name
+                del self.columns[name]
+                self.names[idx] = None
+                self._free.append(idx)
+                for tier in (self.raw, self.rollup):
+                    tier.values[:, idx] = np.nan
+                    tier.scores[:, idx] = 0
+                if idx < len(self._sum):
+                    self._sum[idx] = self._cnt[idx] = self._score[idx] = 0
+            if retired:
+                self.dropped = 0  # 腾出空槽后若再次达到上限重新记录日志
+                self.version += 1
+                self.rollup_version += 1
+        return retired
+
+    def _accumulate(self, ts: float, row: np.ndarray, scores: Optional[np.ndarray]):
+        bucket = int(ts // self.rollup_interval)
+        if self._bucket is not None and bucket != self._bucket:
+            self._flush()
+        self._bucket = bucket
+        n = len(row)
+        if len(self._sum) < n:
+            size = self.raw.cols
+            self._sum = np.pad(self._sum, (0, size - len(self._sum)))
+            self._cnt = np.pad(self._cnt, (0, size - len(self._cnt)))
+            self._score = np.pad(self._score, (0, size - len(self._score)))
+        valid = ~np.isnan(row)
+        self._sum[:n][valid] += row[valid]
+        self._cnt[:n][valid] += 1
+        if scores is not None:
+            s = np.abs(scores[:n])
+            np.maximum(self._score[:len(s)], s, out=self._score[:len(s)])
+
+    def _flush(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(self._cnt > 0, self._sum / np.maximum(self._cnt, 1), np.nan)
+        n = len(self.names)
+        self.rollup.write(self._bucket * self.rollup_interval, mean[:n], self._score[:n])
+        self.rollup_version += 1
+        self._sum[:] = 0
+        self._cnt[:] = 0
+        self._score[:] = 0
+
+    def query(self, names: Iterable[str], start: float = 0, end: float = float("inf")
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        取若干序列在 [start, end] 内的数据，返回 (ts[N], values[N, k], scores[N, k])。
+        早于原始层最旧时刻的部分取自汇总层。不存在的序列整列为 NaN。
+        """
+        names = list(names)
+        with self.lock:
+            idx = np.array([self.columns.get(n, -1) for n in names], dtype=np.int64)
+            parts = []
+            for tier, (lo, hi) in ((self.rollup, self.rollup_range(start, end)), (self.raw, self.raw_range(start, end))):
+                part = self._select(tier, idx, lo, hi)
+                if part is not None:
+                    parts.append(part)
+        return _concat(parts, len(names))
+
+    def rollup_range(self, start: float, end: float) -> Tuple[float, float]:
+        """
+        [start, end] 中由汇总层提供的部分：汇总行的时间戳为桶起点，只取整个桶都早于原始层的部分，
+        避免与原始数据重叠；两端对齐到桶边界，同一汇总周期内滑动的时间范围得到相同的区间
+        """
+        step = self.rollup_interval
+        hi = min(end, self.raw.oldest() - step)
+        lo = math.ceil(start / step) * step if math.isfinite(start) else start
+        return lo, (math.floor(hi / step) * step if math.isfinite(hi) else hi)
+
+    def raw_range(self, start: float, end: float) -> Tuple[float, float]:
+        """[start, end] 中由原始层提供的部分"""
+        return max(start, self.raw.oldest()), end
+
+    def query_tier(self, names: Iterable[str], rollup: bool, start: float, end: float
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """只取一层在 [start, end] 内的数据（区间由 rollup_range / raw_range 给出），返回格式同 query"""
+        names = list(names)
+        with self.lock:
+            idx = np.array([self.columns.get(n, -1) for n in names], dtype=np.int64)
+            part = self._select(self.rollup if rollup else self.raw, idx, start, end)
+        return _concat([part] if part is not None else [], len(names))
+
+    @staticmethod
+    def _select(tier: RingTier, idx: np.ndarray, lo: float, hi: float):
+        if lo > hi or not tier.size:
+            return None
+        rows = tier.order()
+        ts = tier.ts[rows]
+        sel = rows[(ts >= lo) & (ts <= hi)]
+        if not len(sel):
+            return None
+        safe = np.clip(idx, 0, tier.cols - 1)
+        vals = tier.values[np.ix_(sel, safe)].astype(np.float64)
+        scs = tier.scores[np.ix_(sel, safe)].astype(np.float32)
+        vals[:, idx < 0] = np.nan
+        scs[:, idx < 0] = 0
+        return tier.ts[sel], vals, scs
+
+    def span(self) -> Tuple[float, float]:
+        """当前可查询的时间范围 (最早, 最新)，无数据时为 (inf, -inf)"""
+        with self.lock:
+            oldest = min(self.raw.oldest(), self.rollup.oldest())
+            newest = float(self.raw.ts[(self.raw.head - 1) % self.raw.capacity]) if self.raw.size else float("-inf")
+        return oldest, newest
+
+    def save(self, path: str):
+        """按时间顺序保存两层数据到 .npz（先写临时文件再替换，避免读到半个文件）"""
+        with self.lock:
+            used = [i for i, name in enumerate(self.names) if name is not None]
+            arrays = {"names": np.array([self.names[i] for i in used], dtype=str),
+                      "rollup_interval": self.rollup_interval}
+            for key, tier in (("raw", self.raw), ("rollup", self.rollup)):
+                rows = tier.order()
+                arrays[f"{key}_ts"] = tier.ts[rows]
+                arrays[f"{key}_values"] = tier.values[np.ix_(rows, used)]
+                arrays[f"{key}_scores"] = tier.scores[np.ix_(rows, used)]
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """从 save() 写出的文件恢复；保留时长 / 汇总粒度变化时按当前容量截取，返回是否成功"""
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            names = [str(x) for x in data["names"]]
+            if int(data["rollup_interval"]) != self.rollup_interval:
+                return False
+            with self.lock:
+                cols = [self.column(name) for name in names]
+                keep = np.array([i for i, c in enumerate(cols) if c is not None], dtype=np.int64)
+                cols = np.array([c for c in cols if c is not None], dtype=np.int64)
+                n = len(self.names)
+                for key, tier in (("raw", self.raw), ("rollup", self.rollup)):
+                    tier.ensure_cols(n)
+                    ts = data[f"{key}_ts"][-tier.capacity:]
+                    values = data[f"{key}_values"][-tier.capacity:][:, keep]
+                    scores = data[f"{key}_scores"][-tier.capacity:][:, keep]
+                    for i in range(len(ts)):
+                        row = np.full(n, np.nan, dtype=np.float32)
+                        sc = np.zeros(n, dtype=np.float16)
+                        row[cols] = values[i]
+                        sc[cols] = scores[i]
+                        tier.write(float(ts[i]), row, sc)
+                # 恢复的列从文件中的最新时刻起计空闲时间
+                newest = np.nanmax(np.concatenate([data["raw_ts"][-1:], data["rollup_ts"][-1:], [0.0]]))
+                self._last_write[cols] = np.minimum(self._last_write[cols], newest)
+                self.version += 1
+                self.rollup_version += 1
+        return True
+
+    def resolve(self, patterns: Iterable[str]) -> List[str]:
+        """把序列名 / 通配符（如 net.*.up）展开为已知序列名，保持首次出现顺序去重"""
+        out = []
+        seen = set()
+        names = self.series()
+        for p in patterns:
+            hits = [n for n in names if fnmatch.fnmatchcase(n, p)] if any(c in p for c in "*?[") else [p]
+            for n in hits:
+                if n not in seen:
+                    seen.add(n)
+                    out.append(n)
+        return out
+
+
+def _concat(parts: List[Tuple], k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not parts:
+        return np.empty(0), np.empty((0, k)), np.empty((0, k), dtype=np.float32)
+    return (np.concatenate([p[0] for p in parts]),
+            np.concatenate([p[1] for p in parts]),
+            np.concatenate([p[2] for p in parts]))
+
+
+def _downsampled(store: HistoryStore, names: List[str], rollup: bool, lo: float, hi: float,
+                 points: int, mode: str, key) -> Dict[str, Dict[str, List]]:
+    """取一层数据并逐条降采样，结果按 (序列,) + key 缓存"""
+    out = {}
+    missing = []
+    for name in names:
+        hit = downsample_cache.get((name,) + key)
+        if hit is not None:
+            out[name] = hit
+        else:
+            missing.append(name)
+    if missing:
+        ts, values, scores = store.query_tier(missing, rollup, lo, hi)
+        for i, name in enumerate(missing):
+            sel = select_indices(ts, values[:, i], points, mode)
+            out[name] = {"data": to_points(ts[sel], values[sel, i]), "score": to_points(ts[sel], scores[sel, i])}
+            downsample_cache.put((name,) + key, out[name])
+    return out
+
+
+def series_points(store: HistoryStore, names: List[str], start: float, end: float,
+                  points: int = 0, mode: str = "lttb") -> Dict[str, Dict[str, List]]:
+    """
+    取序列并按需降采样为 {序列名: {"data": [[ms, v]...], "score": [[ms, s]...]}}。
+    points > 0 时每条序列降到约 points 个点，点数按两层覆盖的时长分配：
+    汇总层部分按（对齐到桶边界的范围, 汇总层版本）缓存，每个汇总周期才重新计算一次，
+    长时间范围的查询因此与短范围开销相近；只有原始层部分按数据版本（每轮采集）重新计算。
+    """
+    if points <= 0:
+        ts, values, scores = store.query(names, start, end)
+        return {name: {"data": to_points(ts, values[:, i]), "score": to_points(ts, scores[:, i])}
+                for i, name in enumerate(names)}
+    with store.lock:
+        r_lo, r_hi = store.rollup_range(start, end)
+        w_lo, w_hi = store.raw_range(start, end)
+        rollup_version, version = store.rollup_version, store.version
+    span = max(end - start, 1.0)
+    parts = []
+    n_roll = 0
+    if r_lo <= r_hi:
+        n_roll = min(points, max(3, round(points * (r_hi - r_lo + store.rollup_interval) / span)))
+        parts.append(_downsampled(store, names, True, r_lo, r_hi, n_roll, mode,
+                                  ("rollup", r_lo, r_hi, n_roll, mode, rollup_version)))
+    if w_lo <= w_hi:
+        n_raw = max(3, points - n_roll)
+        parts.append(_downsampled(store, names, False, w_lo, w_hi, n_raw, mode,
+                                  ("raw", int(w_lo), int(w_hi), n_raw, mode, version)))
+    if len(parts) == 1:
+        return {name: parts[0][name] for name in names}
+    return {name: {k: sum((p[name][k] for p in parts), []) for k in ("data", "score")} for name in names}
+
+
+def to_points(ts: np.ndarray, values: np.ndarray) -> List[List]:
+    """转换为 ECharts 所需的 [[毫秒时间戳, 值], ...]，跳过 NaN（JSON 无法表示）"""
+    mask = ~np.isnan(values)
+    ms = np.rint(ts[mask] * 1000).astype(np.int64).tolist()
+    vals = np.round(values[mask].astype(np.float64), 2).tolist()
+    return [[t, v] for t, v in zip(ms, vals)]
+
+
+_CFG = get_history_config()
+HISTORY_FILE = _CFG.get("persist", "history.npz") or None
+history_store = HistoryStore(
+    retention=int(_CFG.get("retention", 3600)),
+    rollup_interval=int(_CFG.get("rollup_interval", 60)),
+    rollup_retention=int(_CFG.get("rollup_retention", 604800)),
+    max_series=int(_CFG.get("max_series", 2048)),
+)
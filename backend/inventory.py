@@ -0,0 +1,247 @@
+"""
+硬件清单
+CPU / 内存型号、分区、SMART、GPU 型号与网卡地址几乎不会变化，原先却在每帧快照中重新获取（含 smartctl、lspci
+等子进程）并随每帧推送。这里把它们缓存为带版本号的清单：
+- 只重新获取可能变化的部分，内容确有不同时版本号加一，并记录本次变化的部分（差异）；
+- Linux 真实数据源上的变化来源：/proc/self/mountinfo 的 POLLPRI（挂载 / 卸载）、uevent netlink（块设备、
+  网卡、显卡热插拔）与 rtnetlink（网卡增删、地址变化）。事件在 min_interval 内合并为一次刷新；
+  接收缓冲区溢出（ENOBUFS，有事件丢失）时视为对应部分全部可能变化；
+- netlink 不可用时回退为比较 /sys/block、/sys/class/net 的目录列表，并与其它平台 / 合成数据源一样
+  每 poll_interval 秒重新获取分区与网卡；SMART、内存频率等没有事件来源的部分每 refresh_interval 秒刷新。
+检查由生成快照的线程在取清单时顺带完成（没有事件时只是一次 poll(0)），订阅者按版本号只接收差异
+（见 /api/ws 的 hardware_changed 消息与 /api/hardware?since=）。
+"""
+import errno
+import os
+import platform
+import select
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .app_config import get_inventory_config
+from .hardware import INVENTORY_SECTIONS, get_hardware_inventory
+from .providers import get_provider
+from .providers.real import RealProvider
+
+MOUNTINFO = "/proc/self/mountinfo"
+SYS_BLOCK = "/sys/block"
+SYS_NET = "/sys/class/net"
+CHANGES_MAX = 64  # 保留最近多少次变化，供 diff_since 合并差异
+
+NETLINK_ROUTE = 0
+NETLINK_KOBJECT_UEVENT = 15
+RTMGRP_LINK, RTMGRP_IPV4_IFADDR, RTMGRP_IPV6_IFADDR = 0x1, 0x10, 0x100
+
+# uevent 的 SUBSYSTEM -> 可能变化的清单部分（physical_disks 随 disks 一同获取）
+_UEVENT_SECTIONS = {
+    b"block": ("disks", "disk_smart"),
+    b"net": ("network",),
+    b"drm": ("gpu",),
+    b"cpu": ("cpu",),
+    b"memory": ("memory", "mem_frequency"),
+}
+_POLLED = ("disks", "network")  # 没有事件来源时按 poll_interval 重新获取的部分
+
+
+def _netlink(protocol: int, groups: int) -> socket.socket:
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, protocol)
+    try:
+        sock.bind((0, groups))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _drain(sock: socket.socket) -> Tuple[List[bytes], bool]:
+    """读出套接字中积压的全部消息，返回 (消息, 是否有事件丢失)"""
+    msgs, lost = [], False
+    while True:
+        try:
+            msgs.append(sock.recv(65536))
+        except BlockingIOError:
+            return msgs, lost
+        except OSError as e:
+            if e.errno != errno.ENOBUFS:
+                return msgs, True
+            lost = True
+
+
+def _listing(path: str) -> Tuple[str, ...]:
+    try:
+        return tuple(sorted(os.listdir(path)))
+    except OSError:
+        return ()
+
+
+def section_diff(old: Dict, new: Dict, keys: Optional[Iterable[str]] = None) -> Dict:
+    """
+    清单 old → new 的差异 {部分: 新值}，new 中已不存在的部分列在 "$del" 中（与 broadcast.make_delta 相同）；
+    keys 给出时只比较这些部分
+    """
+    keys = set(old) | set(new) if keys is None else set(keys)
+    diff = {k: new[k] for k in keys if k in new and (k not in old or old[k] != new[k])}
+    removed = sorted(k for k in keys if k not in new)
+    if removed:
+        diff["$del"] = removed
+    return diff
+
+
+class HardwareInventory:
+    """带版本号的硬件清单；version 为 0 表示尚未获取"""
+
+    def __init__(self, watch: bool = True, min_interval: float = 2.0, poll_interval: float = 30.0,
+                 refresh_interval: float = 600.0, max_changes: int = CHANGES_MAX):
+        self.watch = watch
+        self.min_interval = float(min_interval)
+        self.poll_interval = float(poll_interval)
+        self.refresh_interval = float(refresh_interval)
+        self.info: Dict = {}
+        self.version = 0
+        self.changes: deque = deque(maxlen=max_changes)  # [(版本号, 本次变化的部分名)]
+        self.sources: List[str] = []                      # 生效的变化来源，见 /api/hardware
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self._poll = None
+        self._handlers: Dict[int, Callable[[], Set[str]]] = {}
+        self._open = []
+        self._signature = None  # netlink 不可用时 /sys/block 与 /sys/class/net 的目录列表
+        self._last_refresh = self._last_full = self._last_poll = 0.0
+
+    # ---------- 变化来源 ----------
+    def _start_watchers(self):
+        if not (self.watch and platform.system() == "Linux" and isinstance(get_provider(), RealProvider)):
+            self.sources = ["poll"]
+            return
+        self._poll = select.poll()
+        try:
+            f = open(MOUNTINFO, "rb")
+            self._add(f, select.POLLPRI, lambda: {"disks"})
+            self.sources.append("mountinfo")
+        except OSError:
+            pass
+        try:
+            uevent = _netlink(NETLINK_KOBJECT_UEVENT, 1)
+            self._add(uevent, select.POLLIN, lambda: self._on_uevent(uevent))
+            rtnl = _netlink(NETLINK_ROUTE, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR)
+            self._add(rtnl, select.POLLIN, lambda: self._on_rtnetlink(rtnl))
+            self.sources += ["uevent", "rtnetlink"]
+        except (OSError, AttributeError):
+            # 容器内无权限、非 init 网络命名空间等：改为比较目录列表，并按 poll_interval 兜底
+            self._signature = (_listing(SYS_BLOCK), _listing(SYS_NET))
+            self.sources += ["sysfs", "poll"]
+
+    def _add(self, obj, events: int, handler: Callable[[], Set[str]]):
+        self._open.append(obj)
+        self._poll.register(obj.fileno(), events)
+        self._handlers[obj.fileno()] = handler
+
+    @staticmethod
+    def _on_uevent(sock: socket.socket) -> Set[str]:
+        msgs, lost = _drain(sock)
+        if lost:
+            return set(INVENTORY_SECTIONS)
+        out = set()
+        for msg in msgs:
+            # 格式：ACTION@DEVPATH\0ACTION=add\0DEVPATH=...\0SUBSYSTEM=block\0...
+            for field in msg.split(b"\0"):
+                if field.startswith(b"SUBSYSTEM="):
+                    out.update(_UEVENT_SECTIONS.get(field[10:], ()))
+                    break
+        return out
+
+    @staticmethod
+    def _on_rtnetlink(sock: socket.socket) -> Set[str]:
+        msgs, lost = _drain(sock)
+        return {"network"} if msgs or lost else set()
+
+    def _check(self, now: float):
+        if self._poll is not None:
+            for fd, _ in self._poll.poll(0):
+                self._dirty |= self._handlers[fd]()
+        if self._signature is not None and now - self._last_refresh >= self.min_interval:
+            signature = (_listing(SYS_BLOCK), _listing(SYS_NET))
+            if signature[0] != self._signature[0]:
+                self._dirty.update(("disks", "disk_smart"))
+            if signature[1] != self._signature[1]:
+                self._dirty.add("network")
+            self._signature = signature
+        if "poll" in self.sources and now - self._last_poll >= self.poll_interval:
+            self._last_poll = now
+            self._dirty.update(_POLLED)
+        if now - self._last_full >= self.refresh_interval:
+            self._refresh(INVENTORY_SECTIONS, now)
+        elif self._dirty and now - self._last_refresh >= self.min_interval:
+            self._refresh(self._dirty, now)
+
+    def _refresh(self, sections, now: float):
+        sections = set(sections)
+        self._dirty -= sections
+        new = get_hardware_inventory(sections)
+        # 本次获取的部分中不再出现的（数据源不再给出该部分）从清单中删除，同样记为变化
+        removed = [k for k in sections if k in self.info and k not in new]
+        changed = [k for k, v in new.items() if self.info.get(k) != v] + removed
+        self._last_refresh = now
+        if sections.issuperset(INVENTORY_SECTIONS):
+            self._last_full = self._last_poll = now
+        if changed or not self.version:
+            # 整体替换而非原地修改：已发出的快照仍引用旧清单
+            self.info = {k: v for k, v in dict(self.info, **new).items() if k not in removed}
+            self.version += 1
+            self.changes.append((self.version, changed))
+
+    # ---------- 对外接口 ----------
+    def current(self, now: Optional[float] = None) -> Tuple[int, Dict]:
+        """检查变化（必要时重新获取变化的部分）并返回 (版本号, 清单)；首次调用时获取完整清单"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self.version:
+                self._start_watchers()
+                self._refresh(INVENTORY_SECTIONS, now)
+            else:
+                self._check(now)
+            return self.version, self.info
+
+    def diff_since(self, version: int) -> Tuple[int, Optional[Dict]]:
+        """
+        返回 (当前版本号, 自 version 以来变化的部分 {部分: 当前值})，已删除的部分列在 "$del" 中
+        （与广播增量相同）；未变化时差异为空，version 无效或早于保留的变化记录时差异为 None（调用方应改发完整清单）
+        """
+        with self._lock:
+            if version == self.version:
+                return self.version, {}
+            if version <= 0 or version > self.version or not self.changes or version + 1 < self.changes[0][0]:
+                return self.version, None
+            changed = set()
+            for v, sections in self.changes:
+                if v > version:
+                    changed.update(sections)
+            return self.version, section_diff({}, self.info, changed)
+
+    def clear(self):
+        """关闭变化来源并丢弃清单，下次 current() 时按当前数据源重新获取（如基准中切换数据源后）"""
+        with self._lock:
+            for obj in self._open:
+                try:
+                    obj.close()
+                except OSError:
+                    pass
+            self._open, self._handlers, self._poll, self._signature = [], {}, None, None
+            self.info, self.version, self.sources = {}, 0, []
+            self.changes.clear()
+            self._dirty.clear()
+            self._last_refresh = self._last_full = self._last_poll = 0.0
+
+
+def create_inventory(cfg: Optional[Dict] = None) -> HardwareInventory:
+    cfg = get_inventory_config() if cfg is None else cfg
+    return HardwareInventory(watch=bool(cfg.get("watch", True)), min_interval=float(cfg.get("min_interval", 2)),
+                             poll_interval=float(cfg.get("poll_interval", 30)),
+                             refresh_interval=float(cfg.get("refresh_interval", 600)))
+
+
+hardware_inventory = create_inventory()
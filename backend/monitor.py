@@ -2,14 +2,28 @@
 监控数据采集模块
 定时采集CPU、内存、GPU、网络等实时数据
 """
+import heapq
 import time
 import psutil
-import platform
 import json
 import os
 from typing import Dict, List
-from .hardware import get_hardware_info, NVML_AVAILABLE, NVML_HANDLE, shutdown_nvml, map_physical_disk, get_intel_gpu_usage, get_gpu_info
-from .app_config import get_display_config
+from .hardware import get_disk_usage, get_hardware_live, map_physical_disk
+from .app_config import get_display_config, get_cgroups_config, get_anomaly_config, get_history_config
+from . import diskstats, netstats
+from .cgroups import cgroup_collector
+from .pressure import pressure_collector, PRESSURE_ENABLED
+from .sensors import sensor_collector, SENSORS_ENABLED
+from .alerts import alert_engine
+from .history import history_store, HISTORY_FILE
+from .corehist import core_history, core_row, PER_CORE_ENABLED
+from .anomaly import anomaly_detector
+from .prochist import process_history, PROC_HISTORY_ENABLED
+from .proctrack import start_time
+from .rates import CounterRates
+from .devseries import nic_series, disk_series
+from .inventory import hardware_inventory
+from .providers import provider
 
 # 数据缓存
 DATA_CACHE = {
@@ -27,12 +41,107 @@ DATA_CACHE = {
     "battery_info": {},
     "cpu_temperature": [],
     "processes": [],  # 前 20 进程（按 CPU 降序）：[{pid,name,cpu,mem,disk_read,disk_write,gpu}]
+    "anomalies": {},  # 当前异常分数超过阈值的序列：{序列名: 分数}
+    "net_stats": {},  # 协议栈与链路：{tcp, udp, sockets, nics}，见 netstats.sample
 }
 
-# 进程磁盘 IO 速率计算缓存：{pid: (read_bytes, write_bytes, ts)}
-_PROC_IO_LAST = {}
-# 进程网络速率计算缓存：{pid: (rx_bytes, tx_bytes, ts)}（仅 Linux 可用）
-_PROC_NET_LAST = {}
+# 累计计数 → 速率（KB/s、%）：按族登记在速率引擎中，以数据源给出的单调时钟求间隔
+_NET_RATES = CounterRates(("up", "down"), scale=1 / 1024)                  # 全部网卡合计
+_NIC_RATES = CounterRates(("up", "down", "err_in", "err_out", "drop_in", "drop_out"),  # 每张网卡（含错误 / 丢包每秒）
+                          scale=(1 / 1024, 1 / 1024, 1, 1, 1, 1))
+_DISK_RATES = CounterRates(("read", "write", "busy"), scale=(1 / 1024, 1 / 1024, 100 / 1000))  # 非 Linux 按物理磁盘
+_PROC_IO_RATES = CounterRates(("read", "write"), scale=1 / 1024)           # 逐个遍历进程时使用；增量跟踪器自带基线
+_PROC_NET_RATES = CounterRates(("down", "up"), scale=1 / 1024)             # 仅 Linux 可用，只登记前列进程
+
+
+TOP_PROCESSES = 20
+# 系统伪进程：不是真实占用，且 CPU 会被累加至多核之和（如 System Idle Process 达 1000%+）
+_SYS_PROCESS_NAMES = {"system idle process", "system", "registry", "memory compression", "kernel_task"}
+
+
+def _process_row(pid: int, name: str, cpu: float, mem: float, disk_read: float, disk_write: float,
+                 gpu_mem: Dict[int, float]) -> Dict:
+    return {
+        "pid": pid,
+        "name": name[:60],
+        "cpu": round(cpu, 1),
+        "mem": round(mem, 1),
+        "disk_read": round(disk_read, 1),
+        "disk_write": round(disk_write, 1),
+        "net_up": 0.0,
+        "net_down": 0.0,
+        "gpu": gpu_mem.get(pid, 0),  # MB；0 表示未用 GPU
+    }
+
+
+def _top_tracked(entries, gpu_mem: Dict[int, float]) -> List[Dict]:
+    """增量跟踪器的结果：速率已在跟踪器内算好，只为前 TOP_PROCESSES 个进程生成字典"""
+    candidates = (e for e in entries
+                  if e.pid != 0 and e.name.strip().lower() not in _SYS_PROCESS_NAMES)
+    return [_process_row(e.pid, e.name or "—", e.cpu, e.mem, e.disk_read, e.disk_write, gpu_mem)
+            for e in heapq.nlargest(TOP_PROCESSES, candidates, key=lambda e: e.cpu)]
+
+
+def _rank_iterated(clock: float, gpu_mem: Dict[int, float]) -> List[Dict]:
+    """逐个遍历进程（psutil / 合成数据源），返回按 CPU 降序的全部进程；磁盘速率由 _PROC_IO_RATES 一次算出"""
+    proc_list = []
+    pids, io = [], []
+    for p in provider.process_iter(['pid', 'name']):
+        try:
+            pid = p.info['pid']
+            name = p.info['name'] or "—"
+            cpu = p.cpu_percent(interval=None)  # 需上轮基线，首轮为 0
+            mem = p.memory_percent()
+            try:
+                c = p.io_counters()
+                rb, wb = c.read_bytes, c.write_bytes
+            except Exception:
+                rb, wb = 0, 0
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            continue
+        pids.append(pid)
+        io.append((rb, wb))
+        proc_list.append(_process_row(pid, name, cpu, mem, 0.0, 0.0, gpu_mem))
+    # 磁盘速率（KB/s）：pid 复用导致的计数回退按重置处理
+    rates, _ = _PROC_IO_RATES.update(pids, io, clock)
+    for row, (r, w) in zip(proc_list, rates.round(1).tolist()):
+        row["disk_read"], row["disk_write"] = r, w
+    proc_list = [p for p in proc_list
+                 if not (p["pid"] == 0 or p["name"].strip().lower() in _SYS_PROCESS_NAMES)]
+    proc_list.sort(key=lambda x: x["cpu"], reverse=True)
+    return proc_list
+
+
+def _history_rows(entries, ranked: List[Dict]):
+    """进程历史所需的每进程元组：(pid, 启动时刻, 名称, cpu, rss 字节, 读, 写, 用户, 服务)"""
+    if entries is not None:
+        btime = provider.boot_time()
+        return ((e.pid, start_time(e, btime), e.name or "—", e.cpu, e.rss, e.disk_read, e.disk_write,
+                 e.user or None, e.service or None) for e in entries)
+    # 逐个遍历时没有启动时刻、用户与服务：pid 作键，只按可执行文件名分组
+    total = provider.virtual_memory().total
+    return ((r["pid"], 0.0, r["name"], r["cpu"], r["mem"] * total / 100, r["disk_read"], r["disk_write"], None, None)
+            for r in ranked)
+
+
+def _fill_net_rates(proc_list: List[Dict], clock: float):
+    """
+    进程网络速率（Linux：/proc/<pid>/net/dev 累计收发；Windows 无简易 API，留 0）。
+    只对展示的前 TOP_PROCESSES 个进程读取；新进入前列（或本轮读取失败后恢复）的进程本轮建立基线，下一轮起有速率。
+    """
+    rows, pids, counters = [], [], []
+    for p in proc_list:
+        try:
+            c = provider.proc_net_dev(p["pid"])
+        except (OSError, ValueError, IndexError):
+            continue
+        if c is not None:
+            rows.append(p)
+            pids.append(p["pid"])
+            counters.append(c)
+    rates, _ = _PROC_NET_RATES.update(pids, counters, clock)
+    for p, (down, up) in zip(rows, rates.round(1).tolist()):
+        p["net_down"], p["net_up"] = down, up
 
 
 def get_gpu_process_memory() -> Dict[int, float]:
@@ -41,174 +150,150 @@ def get_gpu_process_memory() -> Dict[int, float]:
     per-process 的 GPU 利用率无法跨平台直接获取（psutil/nvml 均只给显存），
     故此处返回 {pid: 已用显存MB} 作为「GPU 占用」近似。无 GPU / 无进程时返回空。
     """
-    if not (NVML_AVAILABLE and NVML_HANDLE):
-        return {}
     try:
-        import py3nvml.py3nvml as nvml
-        procs = []
-        try:
-            procs += nvml.nvmlDeviceGetComputeRunningProcesses(NVML_HANDLE)
-        except Exception:
-            pass
-        try:
-            procs += nvml.nvmlDeviceGetGraphicsRunningProcesses(NVML_HANDLE)
-        except Exception:
-            pass
-        result = {}
-        for p in procs:
-            pid = int(p.pid)
-            mem_mb = round(p.usedGpuMemory / 1024, 1) if getattr(p, "usedGpuMemory", 0) else 0
-            result[pid] = max(result.get(pid, 0), mem_mb)
-        return result
+        return provider.gpu_process_memory()
     except Exception:
         return {}
 
-# 磁盘 IO 历史（按物理磁盘聚合）：{physical_disk: {"read":[], "write":[], "busy":[]}}
+# 磁盘 IO 历史：{disk: {"read":[], "write":[], "busy":[], ...}}
+# Linux 下按 /proc/diskstats 的整盘/dm/md 设备统计，额外包含 IOPS、await、队列深度；
+# 其他平台按物理磁盘聚合，仅有 read / write / busy
 DISK_IO_HISTORY = {}
-_DISK_IO_LAST = {}  # {physical_disk: (read_bytes, write_bytes, busy_time_ms, ts)}
+DISK_IO_FIELDS = ("read", "write", "busy", "r_iops", "w_iops", "r_await", "w_await", "await", "queue")
+DISK_IO_DEVICES = {}  # {disk: {"type": "disk|dm|md|group", "name", "slaves"}}（仅 Linux；group 为聚合序列，slaves 为其成员）
 
 CACHE_DURATION = 120  # 2分钟缓存
 CACHE_FILE = "tmp.json"
 
-# 网卡流量初始值
-net_io_counters = psutil.net_io_counters()
-last_net_bytes_sent = net_io_counters.bytes_sent
-last_net_bytes_recv = net_io_counters.bytes_recv
-last_net_time = time.time()
-
 # 每张网卡的实时上传/下载速率历史：{iface: {"up":[], "down":[]}}
+# 网卡与磁盘序列均经 devseries 准入：可丢弃、按模式聚合为组序列（如 "veth*"），并淘汰长时间无数据的序列
 NET_IO_NIC_HISTORY = {}
-_NET_IO_NIC_LAST = {}  # {iface: (bytes_sent, bytes_recv, ts)}
-
-def calculate_net_speed():
-    """计算网卡上传/下载速度（KB/s）"""
-    global last_net_bytes_sent, last_net_bytes_recv, last_net_time
-
-    current_time = time.time()
-    time_diff = current_time - last_net_time
-
-    if time_diff < 0.1:
-        return 0, 0
-
-    current_net = psutil.net_io_counters()
-    sent_diff = current_net.bytes_sent - last_net_bytes_sent
-    recv_diff = current_net.bytes_recv - last_net_bytes_recv
-
-    upload_speed = round(sent_diff / 1024 / time_diff, 2)
-    download_speed = round(recv_diff / 1024 / time_diff, 2)
-
-    last_net_bytes_sent = current_net.bytes_sent
-    last_net_bytes_recv = current_net.bytes_recv
-    last_net_time = current_time
 
+def calculate_net_speed(clock: float = None):
+    """计算网卡上传/下载速度（KB/s）；clock 为数据源的单调时钟，首轮只建立基线返回 0"""
+    if clock is None:
+        clock = provider.clock(time.time())
+    c = provider.net_io_counters()
+    rates, _ = _NET_RATES.update(("total",), ((c.bytes_sent, c.bytes_recv),), clock)
+    upload_speed, download_speed = rates[0].round(2).tolist()
     return upload_speed, download_speed
 
-def collect_real_time_data():
-    """定时采集所有实时数据（含网卡流量）"""
-    cache_update_counter = 0
-    DATA_CACHE["boot_time"] = psutil.boot_time()
-
-    while True:
+def collect_tick(timestamp: float = None):
+    """
+    执行一轮采集：更新 DATA_CACHE 与各类历史，写入历史存储并求值告警（采集线程每秒调用一次）。
+    timestamp 为写入历史的墙钟时间；各类速率按数据源的单调时钟 clock 求间隔。
+    """
+    if timestamp is None:
         timestamp = time.time()
+    provider.advance(timestamp)
+    clock = provider.clock(timestamp)
 
-        # 清理过期缓存
-        for key in ["cpu_usage", "mem_usage", "gpu_usage", "net_upload_speed",
-                    "net_download_speed", "system_load", "process_count", "cpu_temperature",
-                    "cpu_freq"]:
-            DATA_CACHE[key] = [item for item in DATA_CACHE[key] if timestamp - item[0] <= CACHE_DURATION]
+    # 清理过期缓存
+    for key in ["cpu_usage", "mem_usage", "gpu_usage", "net_upload_speed",
+                "net_download_speed", "system_load", "process_count", "cpu_temperature",
+                "cpu_freq"]:
+        DATA_CACHE[key] = [item for item in DATA_CACHE[key] if timestamp - item[0] <= CACHE_DURATION]
 
-        # 采集基础数据
-        DATA_CACHE["cpu_usage"].append((timestamp, psutil.cpu_percent(interval=None)))
-        DATA_CACHE["mem_usage"].append((timestamp, psutil.virtual_memory().percent))
-        DATA_CACHE["cpu_core_usage"] = psutil.cpu_percent(interval=None, percpu=True)
+    # 采集基础数据
+    DATA_CACHE["cpu_usage"].append((timestamp, provider.cpu_percent()))
+    DATA_CACHE["mem_usage"].append((timestamp, provider.virtual_memory().percent))
+    DATA_CACHE["cpu_core_usage"] = provider.cpu_percent(percpu=True)
 
-        # CPU 频率（总体 + 每核）
-        try:
-            freq = psutil.cpu_freq(percpu=True)
-            if freq:
-                DATA_CACHE["cpu_core_freq"] = [round(f.current, 0) for f in freq]
-                overall = psutil.cpu_freq(percpu=False)
-                if overall:
-                    DATA_CACHE["cpu_freq"].append((timestamp, round(overall.current, 0)))
-        except Exception:
-            pass
+    # CPU 频率（总体 + 每核）
+    try:
+        freq = provider.cpu_freq(percpu=True)
+        if freq:
+            DATA_CACHE["cpu_core_freq"] = [round(f.current, 0) for f in freq]
+            overall = provider.cpu_freq(percpu=False)
+            if overall:
+                DATA_CACHE["cpu_freq"].append((timestamp, round(overall.current, 0)))
+    except Exception:
+        pass
 
-        # GPU占用率
-        gpu_usage = 0
-        gpu_vendor = (DATA_CACHE.get("gpu_vendor") or "nvidia")
-        if gpu_vendor == "nvidia" and NVML_AVAILABLE and NVML_HANDLE is not None:
-            try:
-                import py3nvml.py3nvml as nvml
-                gpu_usage = nvml.nvmlDeviceGetUtilizationRates(NVML_HANDLE).gpu
-            except Exception:
-                shutdown_nvml()
+    # 每核占用分项与频率写入二维历史（热力图）
+    if PER_CORE_ENABLED:
+        try:
+            times = provider.cpu_times_percent(percpu=True)
+            core_history.append(timestamp, core_row(times, DATA_CACHE["cpu_core_usage"] or []),
+                                DATA_CACHE["cpu_core_freq"])
+        except Exception as e:
+            print(f"每核历史写入失败: {e}")
+
+    # GPU占用率（NVIDIA 走 NVML；否则尝试 intel_gpu_top；Windows 再回退性能计数器）
+    gpu_usage = 0
+    try:
+        gpu_usage, intel = provider.gpu_sample(DATA_CACHE.get("gpu_vendor") or "nvidia")
+        if intel is not None:
+            DATA_CACHE["gpu_intel_details"] = intel
+    except Exception:
+        pass
 
-        if gpu_usage == 0:
-            try:
-                ig = get_intel_gpu_usage()
-                if isinstance(ig, dict):
-                    if ig.get("utilization") is not None:
-                        gpu_usage = ig["utilization"]
-                    DATA_CACHE["gpu_intel_details"] = ig
-            except Exception:
-                pass
+    DATA_CACHE["gpu_usage"].append((timestamp, gpu_usage))
 
-        if gpu_usage == 0 and platform.system() == "Windows":
-            try:
-                result = subprocess.run(
-                    ['powershell', '-Command',
-                     '(Get-Counter "\\GPU Engine(*)% 3D Utilization").CounterSamples.CookedValue'],
-                    capture_output=True,
-                    text=True,
-                    timeout=3,
-                    encoding='utf-8',
-                    errors='ignore'
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    values = [float(line.strip()) for line in lines if
-                             line.strip().replace('.', '', 1).isdigit()]
-                    if values:
-                        gpu_usage = round(max(values), 1)
-            except Exception:
-                pass
+    # 网卡流量速度
+    upload_speed, download_speed = calculate_net_speed(clock)
+    DATA_CACHE["net_upload_speed"].append((timestamp, upload_speed))
+    DATA_CACHE["net_download_speed"].append((timestamp, download_speed))
 
-        DATA_CACHE["gpu_usage"].append((timestamp, gpu_usage))
-
-        # 网卡流量速度
-        upload_speed, download_speed = calculate_net_speed()
-        DATA_CACHE["net_upload_speed"].append((timestamp, upload_speed))
-        DATA_CACHE["net_download_speed"].append((timestamp, download_speed))
+    # 每张网卡的实时上传/下载速率、错误 / 丢包每秒与带宽利用率（单独成序列且链路带宽已知的网卡）
+    nic_stats = {}
+    try:
+        nic_counters = provider.net_io_counters(pernic=True) or {}
+        rates, ok = _NIC_RATES.update(nic_counters.keys(),
+                                      [(c.bytes_sent, c.bytes_recv, c.errin, c.errout, c.dropin, c.dropout)
+                                       for c in nic_counters.values()], clock)
+        keys, rates, ok = nic_series.group(list(nic_counters), rates, ok, clock)
+        links = netstats.get_links([k for k in keys if k in nic_counters], clock, provider.net_if_stats)
+        for nic, (up_kbs, down_kbs, err_in, err_out, drop_in, drop_out), valid in zip(keys, rates.round(1).tolist(),
+                                                                                     ok.tolist()):
+            hist = NET_IO_NIC_HISTORY.setdefault(nic, {"up": [], "down": [], "errors": [], "drops": []})
+            link = links.get(nic)
+            util = netstats.utilization(up_kbs, down_kbs, link.speed) if link is not None else None
+            entry = nic_stats[nic] = {"errors": round(err_in + err_out, 1), "drops": round(drop_in + drop_out, 1),
+                                      "util": util} if valid else {}
+            if link is not None:
+                entry.update(speed=link.speed, duplex=int(link.duplex), mtu=link.mtu, isup=bool(link.isup))
+            if valid:
+                hist["up"].append((timestamp, up_kbs))
+                hist["down"].append((timestamp, down_kbs))
+                hist["errors"].append((timestamp, entry["errors"]))
+                hist["drops"].append((timestamp, entry["drops"]))
+                if util is not None:
+                    hist.setdefault("util", []).append((timestamp, util))
+                for kk in hist:
+                    hist[kk] = [x for x in hist[kk] if timestamp - x[0] <= CACHE_DURATION]
+        for nic in nic_series.expire(clock):
+            NET_IO_NIC_HISTORY.pop(nic, None)
+    except Exception:
+        pass
 
-        # 每张网卡的实时上传/下载速率
-        try:
-            nic_counters = psutil.net_io_counters(pernic=True) or {}
-            for nic, c in nic_counters.items():
-                if nic not in NET_IO_NIC_HISTORY:
-                    NET_IO_NIC_HISTORY[nic] = {"up": [], "down": []}
-                last = _NET_IO_NIC_LAST.get(nic)
-                if last:
-                    dt = timestamp - last[2]
-                    if dt > 0.1:
-                        up_kbs = max(0.0, (c.bytes_sent - last[0]) / 1024 / dt)
-                        down_kbs = max(0.0, (c.bytes_recv - last[1]) / 1024 / dt)
-                        hist = NET_IO_NIC_HISTORY[nic]
-                        hist["up"].append((timestamp, round(up_kbs, 1)))
-                        hist["down"].append((timestamp, round(down_kbs, 1)))
-                        for kk in hist:
-                            hist[kk] = [x for x in hist[kk] if timestamp - x[0] <= CACHE_DURATION]
-                _NET_IO_NIC_LAST[nic] = (c.bytes_sent, c.bytes_recv, timestamp)
-        except Exception:
-            pass
+    # 网络协议栈：TCP / UDP 计数速率（重传、重置、监听队列溢出等）与 TCP 套接字状态
+    try:
+        DATA_CACHE["net_stats"] = dict(netstats.sample(clock, provider.net_snmp(), provider.socket_states()),
+                                       nics=nic_stats)
+    except Exception:
+        DATA_CACHE["net_stats"] = {"nics": nic_stats}
 
-        # 磁盘 IO（按物理磁盘聚合：读写速率 KB/s + 忙碌/等待占比 %）
-        try:
-            io_counters = psutil.disk_io_counters(perdisk=True) or {}
+    # 磁盘 IO：Linux 直接读 /proc/diskstats（整盘/dm/md 各自统计，含 IOPS、await、队列深度）；
+    # 其他平台回退 psutil（按物理磁盘聚合：读写速率 KB/s + 忙碌/等待占比 %）
+    try:
+        ds = provider.diskstats()
+        if ds is not None:
+            for dev, rates in diskstats.sample(clock, stats=ds[0], topology=ds[1], devices=disk_series).items():
+                hist = DISK_IO_HISTORY.setdefault(dev, {k: [] for k in DISK_IO_FIELDS})
+                for kk in DISK_IO_FIELDS:
+                    hist[kk].append((timestamp, rates[kk]))
+                    hist[kk] = [x for x in hist[kk] if timestamp - x[0] <= CACHE_DURATION]
+            topo = diskstats.get_device_info()
+            for key, members in disk_series.members.items():
+                if members == [key] and key in topo:
+                    DISK_IO_DEVICES[key] = topo[key]
+                else:
+                    DISK_IO_DEVICES[key] = {"type": "group", "name": key, "slaves": sorted(members)}
+        else:
+            io_counters = provider.disk_io_counters(perdisk=True) or {}
             cur = {}
-            is_linux = platform.system() == "Linux"
             for k, c in io_counters.items():
-                if is_linux and k.startswith("loop"):
-                    continue  # 跳过循环设备，避免与分区过滤口径不一致
                 pd = map_physical_disk(k)
                 rb, wb = c.read_bytes, c.write_bytes
                 bt = getattr(c, "busy_time", 0) or 0  # 仅 Linux 可用
@@ -216,134 +301,119 @@ def collect_real_time_data():
                     cur[pd][0] += rb; cur[pd][1] += wb; cur[pd][2] += bt
                 else:
                     cur[pd] = [rb, wb, bt]
-            for pd, (rb, wb, bt) in cur.items():
-                last = _DISK_IO_LAST.get(pd)
-                if last:
-                    dt = timestamp - last[3]
-                    if dt > 0.1:
-                        read_kbs = (rb - last[0]) / 1024 / dt
-                        write_kbs = (wb - last[1]) / 1024 / dt
-                        busy_pct = ((bt - last[2]) / 1000 / dt * 100) if (bt - last[2]) > 0 else 0
-                        hist = DISK_IO_HISTORY.setdefault(pd, {"read": [], "write": [], "busy": []})
-                        hist["read"].append((timestamp, round(read_kbs, 1)))
-                        hist["write"].append((timestamp, round(write_kbs, 1)))
-                        hist["busy"].append((timestamp, round(min(busy_pct, 100), 1)))
-                        for kk in hist:
-                            hist[kk] = [x for x in hist[kk] if timestamp - x[0] <= CACHE_DURATION]
-                _DISK_IO_LAST[pd] = (rb, wb, bt, timestamp)
+            rates, ok = _DISK_RATES.update(cur.keys(), list(cur.values()), clock)
+            keys, rates, ok = disk_series.group(list(cur), rates, ok, clock)
+            rates[:, 2] = rates[:, 2].clip(max=100)
+            for pd, (read_kbs, write_kbs, busy_pct), valid in zip(keys, rates.round(1).tolist(), ok.tolist()):
+                if not valid:
+                    continue
+                hist = DISK_IO_HISTORY.setdefault(pd, {"read": [], "write": [], "busy": []})
+                hist["read"].append((timestamp, read_kbs))
+                hist["write"].append((timestamp, write_kbs))
+                hist["busy"].append((timestamp, busy_pct))
+                for kk in hist:
+                    hist[kk] = [x for x in hist[kk] if timestamp - x[0] <= CACHE_DURATION]
+        for dev in disk_series.expire(clock):
+            DISK_IO_HISTORY.pop(dev, None)
+            DISK_IO_DEVICES.pop(dev, None)
+    except Exception:
+        pass
+
+    # cgroup v2 资源统计（容器 / systemd slice 的 CPU、内存、IO、PSI）
+    if get_cgroups_config().get("enable", True):
+        try:
+            cgroup_collector.sample(timestamp, clock)
         except Exception:
             pass
 
-        # 系统负载
-        if hasattr(psutil, 'getloadavg'):
-            load_avg = psutil.getloadavg()[0]
-            DATA_CACHE["system_load"].append((timestamp, round(load_avg, 2)))
-
-        # 进程数量
-        process_count = len(psutil.pids())
-        DATA_CACHE["process_count"].append((timestamp, process_count))
-
-        # 进程监测（只读，前 20 按 CPU 降序）
+    # 内存压力：PSI（cpu / memory / io）、meminfo 明细与 vmstat 换页 / 回收速率
+    if PRESSURE_ENABLED:
         try:
-            gpu_mem = get_gpu_process_memory()
-            proc_list = []
-            io_snapshot = {}
-            for p in psutil.process_iter(['pid', 'name']):
-                try:
-                    pid = p.info['pid']
-                    name = p.info['name'] or "—"
-                    cpu = p.cpu_percent(interval=None)  # 需上轮基线，首轮为 0
-                    mem = p.memory_percent()
-                    try:
-                        io = p.io_counters()
-                        rb, wb = io.read_bytes, io.write_bytes
-                    except Exception:
-                        rb, wb = 0, 0
-                except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
-                    continue
-                # 磁盘速率（KB/s）
-                disk_read = disk_write = 0.0
-                last = _PROC_IO_LAST.get(pid)
-                if last:
-                    dt = timestamp - last[2]
-                    if dt > 0.1:
-                        disk_read = max(0.0, (rb - last[0]) / 1024 / dt)
-                        disk_write = max(0.0, (wb - last[1]) / 1024 / dt)
-                io_snapshot[pid] = (rb, wb, timestamp)
-                proc_list.append({
-                    "pid": pid,
-                    "name": name[:60],
-                    "cpu": round(cpu, 1),
-                    "mem": round(mem, 1),
-                    "disk_read": round(disk_read, 1),
-                    "disk_write": round(disk_write, 1),
-                    "net_up": 0.0,
-                    "net_down": 0.0,
-                    "gpu": gpu_mem.get(pid, 0),  # MB；0 表示未用 GPU
-                })
-            for pid in list(_PROC_IO_LAST.keys()):
-                if pid not in io_snapshot:
-                    del _PROC_IO_LAST[pid]
-            _PROC_IO_LAST.update(io_snapshot)
-            # 进程网络速率（Linux：/proc/<pid>/net/dev 累计收发；Windows 无简易 API，留 0）
-            net_snapshot = {}
-            if platform.system() == "Linux":
-                for p in proc_list:
-                    pid = p["pid"]
-                    try:
-                        rx = tx = 0
-                        with open(f"/proc/{pid}/net/dev", "r", errors="ignore") as f:
-                            for line in f.readlines()[2:]:
-                                parts = line.split(":")
-                                if len(parts) != 2:
-                                    continue
-                                cols = parts[1].split()
-                                rx += int(cols[0]); tx += int(cols[8])
-                        last = _PROC_NET_LAST.get(pid)
-                        if last:
-                            dt = timestamp - last[2]
-                            if dt > 0.1:
-                                p["net_down"] = round(max(0.0, (rx - last[0]) / 1024 / dt), 1)
-                                p["net_up"] = round(max(0.0, (tx - last[1]) / 1024 / dt), 1)
-                        net_snapshot[pid] = (rx, tx, timestamp)
-                    except (OSError, ValueError, IndexError):
-                        net_snapshot[pid] = _PROC_NET_LAST.get(pid, (0, 0, timestamp))
-                for pid in list(_PROC_NET_LAST.keys()):
-                    if pid not in net_snapshot:
-                        del _PROC_NET_LAST[pid]
-                _PROC_NET_LAST.update(net_snapshot)
-            # 过滤系统伪进程：它们不是真实占用，且 CPU 会被累加至多核之和（如 System Idle Process 达 1000%+）
-            sys_names = {"system idle process", "system", "registry", "memory compression", "kernel_task"}
-            proc_list = [p for p in proc_list
-                         if not (p["pid"] == 0 or p["name"].strip().lower() in sys_names)]
-            proc_list.sort(key=lambda x: x["cpu"], reverse=True)
-            DATA_CACHE["processes"] = proc_list[:20]
+            pressure_collector.sample(clock, provider.memory_stats())
         except Exception:
             pass
 
-        # 电池状态（show_battery 为 false 时跳过采集）
-        if get_display_config().get("show_battery", True):
-            if hasattr(psutil, 'sensors_battery'):
-                battery = psutil.sensors_battery()
-                if battery:
-                    DATA_CACHE["battery_info"] = {
-                        "percent": battery.percent,
-                        "plugged": battery.power_plugged,
-                        "secsleft": battery.secsleft
-                    }
-
-        # CPU温度
-        if hasattr(psutil, 'sensors_temperatures'):
-            temps = psutil.sensors_temperatures()
-            if 'coretemp' in temps:
-                cpu_temp = temps['coretemp'][0].current
-                DATA_CACHE["cpu_temperature"].append((timestamp, round(cpu_temp, 1)))
-            elif 'acpitz' in temps:
-                cpu_temp = temps['acpitz'][0].current
-                DATA_CACHE["cpu_temperature"].append((timestamp, round(cpu_temp, 1)))
-            elif 'k10temp' in temps:
-                cpu_temp = temps['k10temp'][0].current
+    # 系统负载
+    load = provider.getloadavg()
+    if load:
+        DATA_CACHE["system_load"].append((timestamp, round(load[0], 2)))
+
+    # 进程数量与进程监测（只读，前 TOP_PROCESSES 按 CPU 降序）
+    tracker = provider.process_tracker()
+    entries = tracker.sample(clock) if tracker is not None else None
+    process_count = len(entries) if entries is not None else len(provider.pids())
+    DATA_CACHE["process_count"].append((timestamp, process_count))
+    try:
+        gpu_mem = get_gpu_process_memory()
+        ranked = []
+        if entries is not None:
+            proc_list = _top_tracked(entries, gpu_mem)
+        else:
+            ranked = _rank_iterated(clock, gpu_mem)
+            proc_list = ranked[:TOP_PROCESSES]
+        _fill_net_rates(proc_list, clock)
+        DATA_CACHE["processes"] = proc_list
+        if PROC_HISTORY_ENABLED:
+            process_history.record(timestamp, proc_list, _history_rows(entries, ranked), gpu_mem)
+    except Exception:
+        pass
+
+    # 电池状态（show_battery 为 false 时跳过采集）
+    if get_display_config().get("show_battery", True):
+        battery = provider.sensors_battery()
+        if battery:
+            DATA_CACHE["battery_info"] = {
+                "percent": battery.percent,
+                "plugged": battery.power_plugged,
+                "secsleft": battery.secsleft
+            }
+
+    # 硬件传感器（hwmon / thermal 全部读数）与 CPU 温度
+    if SENSORS_ENABLED:
+        try:
+            if provider.name in ("real", "procfs") and sensor_collector.available:
+                sensor_collector.sample(timestamp)
+            else:
+                sensor_collector.ingest(provider.sensors_temperatures() or {}, timestamp)
+            cpu_temp = sensor_collector.cpu_temperature()
+            if cpu_temp is not None:
                 DATA_CACHE["cpu_temperature"].append((timestamp, round(cpu_temp, 1)))
+        except Exception as e:
+            print(f"传感器采集失败: {e}")
+
+    # 展平本轮样本：写入历史存储、异常检测（全部序列一次向量化更新）、告警求值
+    sample = get_latest_sample()
+    try:
+        row = history_store.to_row(sample)
+        scores = None
+        if get_anomaly_config().get("enable", True):
+            scores = anomaly_detector.update(row)
+            DATA_CACHE["anomalies"] = anomaly_detector.flagged(history_store.names, scores)
+        history_store.append(timestamp, row, scores)
+        # 回收长期无数据的列（容器、进程等序列更替），按列保存的异常检测状态与告警规则匹配缓存同步清理
+        retired = history_store.retire_idle(timestamp)
+        if retired:
+            anomaly_detector.reset(retired)
+            alert_engine.forget(retired.values())
+            cgroup_collector.release(retired.values())
+    except Exception as e:
+        print(f"历史存储写入失败: {e}")
+    if alert_engine.enabled:
+        try:
+            alert_engine.evaluate(timestamp, sample)
+        except Exception as e:
+            print(f"告警求值失败: {e}")
+
+def collect_real_time_data():
+    """定时采集所有实时数据（含网卡流量）"""
+    cache_update_counter = 0
+    last_persist = time.time()
+    persist_interval = float(get_history_config().get("persist_interval", 60))
+    DATA_CACHE["boot_time"] = provider.boot_time()
+
+    while True:
+        timestamp = time.time()
+        collect_tick(timestamp)
 
         # 每10秒更新缓存文件
         cache_update_counter += 1
@@ -351,16 +421,30 @@ def collect_real_time_data():
             update_cache_file()
             cache_update_counter = 0
 
+        # 定期保存历史存储，重启后恢复，也供离线导出使用
+        if HISTORY_FILE and timestamp - last_persist >= persist_interval:
+            last_persist = timestamp
+            try:
+                history_store.save(HISTORY_FILE)
+            except Exception as e:
+                print(f"历史存储保存失败: {e}")
+
         time.sleep(1)
 
 def update_cache_file():
     """更新缓存文件"""
     try:
-        hardware_info = get_hardware_info()
+        version, hardware_info = hardware_inventory.current()
+        hardware_live = get_hardware_live(hardware_info.get("gpu"))
+        disk_usage = get_disk_usage(hardware_info.get("disks") or [])
+        DATA_CACHE["hardware_live"] = hardware_live
+        DATA_CACHE["disk_usage"] = disk_usage
         DATA_CACHE["gpu_vendor"] = (hardware_info.get("gpu") or {}).get("brand", "nvidia")
 
         cache_data = {
             "hardware_info": hardware_info,
+            "hardware_version": version,
+            "hardware_live": hardware_live,
             "real_time_data": {
                 "cpu_usage": DATA_CACHE["cpu_usage"],
                 "mem_usage": DATA_CACHE["mem_usage"],
@@ -378,7 +462,7 @@ def update_cache_file():
                 "battery_info": DATA_CACHE["battery_info"],
                 "timestamp": time.time()
             },
-            "disk_usage": hardware_info["disks"]
+            "disk_usage": disk_usage
         }
 
         with open(CACHE_FILE, 'w', encoding='utf-8') as f:
@@ -388,6 +472,14 @@ def update_cache_file():
 
 def restore_from_cache():
     """从缓存文件恢复数据"""
+    if HISTORY_FILE:
+        try:
+            if history_store.load(HISTORY_FILE):
+                cgroup_collector.adopt(history_store.series())
+                print(f"从 {HISTORY_FILE} 恢复历史数据成功")
+        except Exception as e:
+            print(f"恢复历史数据失败: {e}")
+
     try:
         if not os.path.exists(CACHE_FILE):
             return
@@ -417,6 +509,7 @@ def restore_from_cache():
     except Exception as e:
         print(f"从缓存恢复数据失败: {e}")
 
+
 def get_real_time_data() -> Dict:
     """获取实时数据"""
     def format_data(data: List) -> List:
@@ -426,15 +519,12 @@ def get_real_time_data() -> Dict:
     def format_disk_io(hist: Dict) -> Dict:
         out = {}
         for pd, series in hist.items():
-            out[pd] = {
-                "read": format_data(series.get("read", [])),
-                "write": format_data(series.get("write", [])),
-                "busy": format_data(series.get("busy", [])),
-            }
+            out[pd] = {k: format_data(v) for k, v in series.items()}
         return out
 
     def format_net_io_per_nic() -> Dict:
         out = {}
+        # 快照只带收发速率曲线；错误 / 丢包 / 利用率的最新值在 net_stats.nics，历史走 /api/history
         for nic, series in NET_IO_NIC_HISTORY.items():
             out[nic] = {
                 "up": format_data(series.get("up", [])),
@@ -458,16 +548,81 @@ def get_real_time_data() -> Dict:
         "boot_time": DATA_CACHE["boot_time"],
         "battery_info": DATA_CACHE["battery_info"],
         "disk_io": format_disk_io(DISK_IO_HISTORY),
+        "disk_io_devices": DISK_IO_DEVICES,
+        "net_stats": DATA_CACHE["net_stats"],
+        "memory_pressure": pressure_collector.latest,
         "processes": DATA_CACHE["processes"],
+        "anomalies": DATA_CACHE["anomalies"],
         "timestamp": time.time()
     }
 
+# 可按名称引用的标量时间序列（展平时直接取最新值）
+SCALAR_SERIES = ("cpu_usage", "mem_usage", "gpu_usage", "net_upload_speed", "net_download_speed",
+                 "system_load", "process_count", "cpu_temperature", "cpu_freq")
+SAMPLE_MAX_AGE = 5  # 展平时忽略超过该秒数未更新的序列（如已拔出的网卡）
+
+
+def get_latest_sample() -> Dict[str, float]:
+    """
+    把最近一轮采集结果展平为 {指标名: 数值}，供告警规则等按名称引用。
+    命名规则：cpu_usage、cpu_core_usage.<核>、net.<网卡>.up|down|errors|drops|util、tcp.<字段>、udp.<字段>、
+             sockets.<TCP 状态>、meminfo.<字段>、vmstat.<字段>、psi.<资源>.<字段>、disk_io.<磁盘>.<字段>、
+             disk_usage.<挂载点>、gpu_temperature、sensor.<设备>.<标签>、cgroup.<路径>.<字段>
+             （超出 cgroups.max_series 的 cgroup 合并为 cgroup./*.<字段>）
+    """
+    now = time.time()
+    sample = {}
+
+    def put(name, series):
+        if series and now - series[-1][0] <= SAMPLE_MAX_AGE:
+            sample[name] = series[-1][1]
+
+    for key in SCALAR_SERIES:
+        put(key, DATA_CACHE[key])
+    for i, v in enumerate(DATA_CACHE["cpu_core_usage"] or []):
+        sample[f"cpu_core_usage.{i}"] = v
+    for i, v in enumerate(DATA_CACHE["cpu_core_freq"] or []):
+        sample[f"cpu_core_freq.{i}"] = v
+    for nic, hist in NET_IO_NIC_HISTORY.items():
+        for k, series in hist.items():
+            put(f"net.{nic}.{k}", series)
+    net_stats = DATA_CACHE["net_stats"]
+    for group in ("tcp", "udp", "sockets"):
+        for k, v in (net_stats.get(group) or {}).items():
+            sample[f"{group}.{k}"] = v
+    mp = pressure_collector.latest
+    for group in ("meminfo", "vmstat"):
+        for k, v in (mp.get(group) or {}).items():
+            sample[f"{group}.{k}"] = v
+    for res, vals in (mp.get("psi") or {}).items():
+        for k, v in vals.items():
+            sample[f"psi.{res}.{k}"] = v
+    for dev, hist in DISK_IO_HISTORY.items():
+        for k, series in hist.items():
+            put(f"disk_io.{dev}.{k}", series)
+    for d in DATA_CACHE.get("disk_usage") or []:
+        sample[f"disk_usage.{d['mountpoint']}"] = d.get("usage_percent", 0)
+    gpu_temp = (DATA_CACHE.get("hardware_live", {}).get("gpu_details") or {}).get("temperature")
+    if gpu_temp is not None:
+        sample["gpu_temperature"] = gpu_temp
+    for key, v in sensor_collector.latest.items():
+        sample[f"sensor.{key}"] = v
+    sample.update(cgroup_collector.flatten())
+    return sample
+
+
 def get_full_snapshot() -> Dict:
-    """获取完整监控快照：硬件信息 + 实时数据 + 磁盘"""
-    hardware_info = get_hardware_info()
+    """
+    获取完整监控快照：硬件清单（带版本号，只在检测到变化时重新获取）+ 硬件实时部分 + 实时数据 + 磁盘用量。
+    hardware_info 在版本不变时是同一个对象，增量计算据此直接跳过。
+    """
+    version, hardware_info = hardware_inventory.current()
     return {
         "hardware_info": hardware_info,
+        "hardware_version": version,
+        "hardware_live": get_hardware_live(hardware_info.get("gpu")),
         "real_time_data": get_real_time_data(),
-        "disk_usage": hardware_info["disks"],
+        "disk_usage": get_disk_usage(hardware_info.get("disks") or []),
+        "alerts": alert_engine.active(),
         "timestamp": time.time(),
     }
@@ -0,0 +1,250 @@
+"""
+网络协议栈统计模块
+- 链路：/sys/class/net/<网卡>/{speed,duplex,mtu,flags}，带宽单位 Mb/s，虚拟网卡的 -1 与读取失败记为 0（未知）。
+  链路属性几乎不变，网卡集合不变时每 LINK_INTERVAL 秒才重新读取；
+- 协议计数：/proc/net/snmp（Tcp / Udp）与 /proc/net/netstat（TcpExt）各一次 read，取 COUNTERS 中的累计计数，
+  经速率引擎换算为每秒速率（重传、重置、监听队列溢出、UDP 错误等），另给出重传率与 CurrEstab；
+- 套接字状态：sock_diag netlink 按 AF_INET / AF_INET6 dump TCP 套接字，只读每条消息头之后的状态字节计数，
+  不需要逐行解析文本；netlink 不可用（容器内受限、非 Linux）时回退解析 /proc/net/tcp{,6} 的状态列。
+网卡错误 / 丢包速率与带宽利用率在 monitor 中随每网卡速率一同计算（utilization 见本模块）。
+"""
+import os
+import socket
+import struct
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .providers.base import snicstats
+from .rates import CounterRates
+
+PROC_NET = "/proc/net"
+SYS_NET = "/sys/class/net"
+LINK_INTERVAL = 10.0  # 网卡集合不变时链路属性的重新读取间隔（秒）
+
+# (分组, /proc/net/snmp 或 netstat 中的 "段.字段", 输出名)；缺失的字段按 0 计
+COUNTERS = (
+    ("tcp", "Tcp.RetransSegs", "retrans"),
+    ("tcp", "Tcp.InSegs", "in_segs"),
+    ("tcp", "Tcp.OutSegs", "out_segs"),
+    ("tcp", "Tcp.ActiveOpens", "active_opens"),
+    ("tcp", "Tcp.PassiveOpens", "passive_opens"),
+    ("tcp", "Tcp.AttemptFails", "attempt_fails"),
+    ("tcp", "Tcp.EstabResets", "estab_resets"),
+    ("tcp", "Tcp.OutRsts", "out_rsts"),
+    ("tcp", "Tcp.InErrs", "in_errs"),
+    ("tcp", "TcpExt.ListenOverflows", "listen_overflows"),
+    ("tcp", "TcpExt.ListenDrops", "listen_drops"),
+    ("tcp", "TcpExt.TCPTimeouts", "timeouts"),
+    ("tcp", "TcpExt.TCPSynRetrans", "syn_retrans"),
+    ("udp", "Udp.InDatagrams", "in"),
+    ("udp", "Udp.OutDatagrams", "out"),
+    ("udp", "Udp.InErrors", "in_errors"),
+    ("udp", "Udp.NoPorts", "no_ports"),
+    ("udp", "Udp.RcvbufErrors", "rcvbuf_errors"),
+    ("udp", "Udp.SndbufErrors", "sndbuf_errors"),
+)
+# 系统级计数只有一行，登记在速率引擎中的键固定为 "system"
+_RATES = CounterRates([f"{group}.{name}" for group, _, name in COUNTERS])
+
+# 内核 TCP 状态编号（include/net/tcp_states.h）-> 名称
+TCP_STATES = ("", "established", "syn_sent", "syn_recv", "fin_wait1", "fin_wait2", "time_wait",
+              "close", "close_wait", "last_ack", "listen", "closing", "new_syn_recv")
+
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST, NLM_F_DUMP = 0x1, 0x300
+NLMSG_ERROR, NLMSG_DONE = 2, 3
+_NLMSG_HDR = struct.Struct("=IHHII")
+# inet_diag_req_v2：family protocol ext pad states + inet_diag_sockid（48 字节，全 0 表示不过滤）
+_DIAG_REQ = struct.Struct("=BBBBI48x")
+_STATE_OFFSET = _NLMSG_HDR.size + 1  # inet_diag_msg 第二个字节 idiag_state
+
+_LINKS: Dict[str, snicstats] = {}
+_LINKS_KEYS: frozenset = frozenset()
+_LINKS_TS = None
+
+
+def is_available(proc_net: str = PROC_NET) -> bool:
+    """当前系统是否可用 /proc/net/snmp（仅 Linux）"""
+    return os.path.exists(os.path.join(proc_net, "snmp"))
+
+
+def _read(path: str, size: int = 1 << 16) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def parse_snmp(raw: bytes, out: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    解析 /proc/net/snmp 与 /proc/net/netstat 的格式：每段两行，表头行为 "Tcp: 字段 ..."，
+    数值行为 "Tcp: 值 ..."，结果为 {"Tcp.RetransSegs": 值}
+    """
+    out = {} if out is None else out
+    lines = raw.split(b"\n")
+    for head, vals in zip(lines[::2], lines[1::2]):
+        section, _, names = head.partition(b":")
+        if not names or not vals.startswith(section + b":"):
+            continue
+        prefix = section.decode() + "."
+        for name, v in zip(names.split(), vals[len(section) + 1:].split()):
+            try:
+                out[prefix + name.decode()] = int(v)
+            except ValueError:
+                continue
+    return out
+
+
+def read_snmp(proc_net: str = PROC_NET) -> Dict[str, int]:
+    """读取 /proc/net/snmp 与 /proc/net/netstat（后者不存在时只含前者）"""
+    out = parse_snmp(_read(os.path.join(proc_net, "snmp")))
+    try:
+        parse_snmp(_read(os.path.join(proc_net, "netstat")), out)
+    except OSError:
+        pass
+    return out
+
+
+def _diag_dump(sock: socket.socket, family: int, counts: List[int]):
+    req = _DIAG_REQ.pack(family, socket.IPPROTO_TCP, 0, 0, 0xFFFFFFFF)
+    sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(req), SOCK_DIAG_BY_FAMILY, NLM_F_REQUEST | NLM_F_DUMP,
+                              family, 0) + req)
+    buf = bytearray(1 << 16)
+    view = memoryview(buf)
+    unpack = _NLMSG_HDR.unpack_from
+    while True:
+        n = sock.recv_into(view)
+        off = 0
+        while off + _NLMSG_HDR.size <= n:
+            length, kind = unpack(buf, off)[:2]
+            if kind == NLMSG_DONE:
+                return
+            if kind == NLMSG_ERROR:
+                raise OSError("sock_diag dump failed")
+            state = buf[off + _STATE_OFFSET]
+            if state < len(counts):
+                counts[state] += 1
+            off += (length + 3) & ~3
+            if length < _NLMSG_HDR.size:
+                return
+
+
+def _diag_states() -> List[int]:
+    counts = [0] * len(TCP_STATES)
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG)
+    try:
+        for family in (socket.AF_INET, socket.AF_INET6):
+            _diag_dump(sock, family, counts)
+    finally:
+        sock.close()
+    return counts
+
+
+def _proc_states(proc_net: str) -> List[int]:
+    counts = [0] * len(TCP_STATES)
+    for name in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(proc_net, name), "rb") as f:
+                f.readline()
+                for line in f:
+                    # "  sl  local_address rem_address   st ..."，第 4 列为十六进制状态
+                    cols = line.split(None, 4)
+                    if len(cols) > 3:
+                        state = int(cols[3], 16)
+                        if state < len(counts):
+                            counts[state] += 1
+        except OSError:
+            continue
+    return counts
+
+
+def socket_states(proc_net: str = PROC_NET) -> Dict[str, int]:
+    """TCP 套接字按状态计数 {状态名: 个数}（IPv4 + IPv6），另含 total"""
+    try:
+        counts = _diag_states()
+    except (OSError, AttributeError):
+        counts = _proc_states(proc_net)
+    out = {name: counts[i] for i, name in enumerate(TCP_STATES) if name and name != "new_syn_recv"}
+    out["syn_recv"] += counts[12]  # 内核 4.4+ 的半连接请求以 NEW_SYN_RECV 出现在 dump 中
+    out["total"] = sum(counts)
+    return out
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def read_link(nic: str, sys_net: str = SYS_NET) -> snicstats:
+    """读取一张网卡的链路属性；speed 为 Mb/s，未知为 0，duplex 与 psutil 一致（2 全双工 / 1 半双工 / 0 未知）"""
+    base = os.path.join(sys_net, nic)
+    try:
+        speed = max(0, int(_read_text(os.path.join(base, "speed")) or 0))
+    except ValueError:
+        speed = 0
+    try:
+        mtu = int(_read_text(os.path.join(base, "mtu")) or 0)
+    except ValueError:
+        mtu = 0
+    try:
+        isup = bool(int(_read_text(os.path.join(base, "flags")) or "0", 16) & 0x1)  # IFF_UP，与 psutil 一致
+    except ValueError:
+        isup = False
+    duplex = {"full": 2, "half": 1}.get(_read_text(os.path.join(base, "duplex")), 0)
+    return snicstats(isup, duplex, speed, mtu)
+
+
+def read_links(names: Sequence[str], sys_net: str = SYS_NET) -> Dict[str, snicstats]:
+    return {nic: read_link(nic, sys_net) for nic in names}
+
+
+def get_links(names: Sequence[str], clock: float, reader: Callable[[Sequence[str]], Dict]) -> Dict[str, snicstats]:
+    """返回缓存的链路属性；网卡集合变化或距上次读取超过 LINK_INTERVAL 秒时才调用 reader(names) 重新读取"""
+    global _LINKS, _LINKS_KEYS, _LINKS_TS
+    keys = frozenset(names)
+    if keys != _LINKS_KEYS or _LINKS_TS is None or not 0 <= clock - _LINKS_TS < LINK_INTERVAL:
+        _LINKS = reader(list(names)) or {}
+        _LINKS_KEYS, _LINKS_TS = keys, clock
+    return _LINKS
+
+
+def utilization(up_kbs: float, down_kbs: float, speed: int) -> Optional[float]:
+    """带宽利用率（%）：收发中较大的一个方向占链路带宽（Mb/s，全双工各方向独立计）的比例，带宽未知时为 None"""
+    if not speed or speed <= 0:
+        return None
+    return round(min(100.0, max(up_kbs, down_kbs) * 1024 * 8 / (speed * 1e6) * 100), 1)
+
+
+def sample(clock: float, snmp: Optional[Dict[str, int]], sockets: Optional[Dict[str, int]] = None) -> Dict[str, Dict]:
+    """
+    采集一轮协议栈指标：{"tcp": {...}, "udp": {...}, "sockets": {...}}，clock 为单调时钟（秒）。
+    计数字段为每秒速率（首轮只建立基线，不含速率），tcp 另含 retrans_pct（重传段占发送段 %）与 curr_estab；
+    snmp / sockets 为 None（数据源不支持）时对应分组为空。
+    """
+    out = {"tcp": {}, "udp": {}, "sockets": dict(sockets or {})}
+    if not snmp:
+        _RATES.clear()
+        return out
+    row = [snmp.get(src, 0) for _, src, _ in COUNTERS]
+    rates, ok = _RATES.update(["system"], np.array([row], dtype=np.float64), clock)
+    if ok[0]:
+        for (group, _, name), v in zip(COUNTERS, rates[0].round(2).tolist()):
+            out[group][name] = v
+        tcp = out["tcp"]
+        tcp["retrans_pct"] = round(tcp["retrans"] / tcp["out_segs"] * 100, 2) if tcp["out_segs"] > 0 else 0.0
+    if "Tcp.CurrEstab" in snmp:
+        out["tcp"]["curr_estab"] = snmp["Tcp.CurrEstab"]
+    return out
+
+
+def clear():
+    """丢弃速率基线与链路缓存（如切换数据源后）"""
+    global _LINKS, _LINKS_KEYS, _LINKS_TS
+    _RATES.clear()
+    _LINKS, _LINKS_KEYS, _LINKS_TS = {}, frozenset(), None
@@ -0,0 +1,162 @@
+"""
+内存压力采集模块
+mem_usage 只是 (total - available) / total，分不清页缓存周转与真正的内存紧张。这里每轮一次读取：
+- /proc/pressure/{cpu,memory,io}：PSI 的 some / full 10、60、300 秒平均值，另由累计停顿时间 total（µs）
+  经速率引擎换算出本轮间隔内的停顿占比（%），不必等 avg10 平滑；
+- /proc/meminfo 明细（MB）：匿名页、文件页、slab、脏页 / 回写、大页、swap、提交量等；
+- /proc/vmstat 换页与回收速率（每秒）：换入换出、缺页 / 主缺页、kswapd 与直接回收的扫描、回收、
+  分配停顿、workingset refault、OOM kill 等。
+原始数据由数据源给出（/proc 快速路径复用本轮已读取的 meminfo，vmstat 与 PSI 常驻描述符），
+结果展平为 meminfo.<字段>、vmstat.<字段>、psi.<资源>.<字段> 写入历史存储，可用于历史查询、异常检测与告警。
+"""
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from .app_config import get_pressure_config
+from .cgroups import parse_pressure
+from .rates import CounterRates
+
+PROC = "/proc"
+PSI_RESOURCES = ("cpu", "memory", "io")
+_MB = 1024 * 1024
+
+# /proc/meminfo 字段 -> 输出名（MB）；缺失的字段（旧内核、无 swap）不输出
+MEMINFO_FIELDS = (
+    ("MemTotal", "total"), ("MemFree", "free"), ("MemAvailable", "available"),
+    ("Buffers", "buffers"), ("Cached", "cached"), ("SwapCached", "swap_cached"),
+    ("AnonPages", "anon"), ("Active(anon)", "active_anon"), ("Inactive(anon)", "inactive_anon"),
+    ("Active(file)", "active_file"), ("Inactive(file)", "inactive_file"),
+    ("Unevictable", "unevictable"), ("Mlocked", "mlocked"), ("Shmem", "shmem"), ("Mapped", "mapped"),
+    ("Slab", "slab"), ("SReclaimable", "slab_reclaimable"), ("SUnreclaim", "slab_unreclaimable"),
+    ("KernelStack", "kernel_stack"), ("PageTables", "page_tables"),
+    ("Dirty", "dirty"), ("Writeback", "writeback"),
+    ("AnonHugePages", "anon_huge"), ("Hugetlb", "hugetlb"),
+    ("SwapTotal", "swap_total"), ("SwapFree", "swap_free"),
+    ("Committed_AS", "committed"), ("CommitLimit", "commit_limit"),
+)
+
+# 输出名 -> /proc/vmstat 中求和的字段（各内核版本的拆分不同，缺失的按 0 计）；pgpgin / pgpgout 单位为 KB
+VMSTAT_COUNTERS = (
+    ("page_in", ("pgpgin",)),
+    ("page_out", ("pgpgout",)),
+    ("swap_in", ("pswpin",)),
+    ("swap_out", ("pswpout",)),
+    ("faults", ("pgfault",)),
+    ("major_faults", ("pgmajfault",)),
+    ("scan_kswapd", ("pgscan_kswapd",)),
+    ("scan_direct", ("pgscan_direct",)),
+    ("steal", ("pgsteal_kswapd", "pgsteal_direct", "pgsteal_khugepaged")),
+    ("alloc_stalls", ("allocstall", "allocstall_dma", "allocstall_dma32", "allocstall_normal",
+                      "allocstall_movable", "allocstall_device")),
+    ("refaults", ("workingset_refault", "workingset_refault_anon", "workingset_refault_file")),
+    ("oom_kills", ("oom_kill",)),
+    ("compact_stalls", ("compact_stall",)),
+)
+_VMSTAT_NAMES = tuple(name for name, _ in VMSTAT_COUNTERS)
+_PSI_NAMES = tuple(f"{res}.{kind}" for res in PSI_RESOURCES for kind in ("some", "full"))
+
+
+def is_available(proc: str = PROC) -> bool:
+    """当前系统是否可用 /proc/vmstat（仅 Linux）；PSI 需内核 4.20+ 且未以 psi=0 启动，缺失时只少 psi 部分"""
+    return os.path.exists(os.path.join(proc, "vmstat"))
+
+
+def parse_vmstat(raw: bytes) -> Dict[bytes, int]:
+    """解析 /proc/vmstat（每行 "字段 值"）"""
+    out = {}
+    for line in raw.split(b"\n"):
+        key, _, v = line.partition(b" ")
+        if v:
+            out[key] = int(v)
+    return out
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_raw(proc: str = PROC) -> Dict:
+    """
+    读取一轮原始数据（数据源 memory_stats() 的格式）：{"meminfo": {b"字段": 字节}（同 procfs.parse_meminfo），
+    "vmstat": {b"字段": 值}, "pressure": {资源: parse_pressure 结果}}；PSI 不可用时 pressure 为空
+    """
+    from .providers.procfs import parse_meminfo
+    pressure = {}
+    for res in PSI_RESOURCES:
+        text = _read(os.path.join(proc, "pressure", res))
+        if text is not None:
+            pressure[res] = parse_pressure(text.decode("ascii", "ignore"))
+    return {"meminfo": parse_meminfo(_read(os.path.join(proc, "meminfo")) or b""),
+            "vmstat": parse_vmstat(_read(os.path.join(proc, "vmstat")) or b""),
+            "pressure": pressure}
+
+
+class PressureCollector:
+    """系统级内存压力：PSI、meminfo 明细与 vmstat 速率；latest 为最近一轮结果"""
+
+    def __init__(self):
+        # vmstat 计数与 PSI 累计停顿（µs → 每秒停顿占比 %）在同一行中差分
+        self._rates = CounterRates(_VMSTAT_NAMES + _PSI_NAMES,
+                                   scale=[1.0] * len(_VMSTAT_NAMES) + [100 / 1e6] * len(_PSI_NAMES))
+        self.latest: Dict[str, Dict] = {}
+
+    @staticmethod
+    def meminfo(m: Dict[bytes, int]) -> Dict[str, float]:
+        out = {name: round(m[key.encode()] / _MB, 1) for key, name in MEMINFO_FIELDS if key.encode() in m}
+        if b"Active(file)" in m and b"Inactive(file)" in m:
+            out["file"] = round((m[b"Active(file)"] + m[b"Inactive(file)"]) / _MB, 1)
+        if b"HugePages_Total" in m and b"Hugepagesize" in m:
+            # 大页数量行没有 kB 单位，parse_meminfo 同样乘了 1024，这里先还原为页数
+            size = m[b"Hugepagesize"]
+            out["hugepages_total"] = round(m[b"HugePages_Total"] // 1024 * size / _MB, 1)
+            out["hugepages_free"] = round(m.get(b"HugePages_Free", 0) // 1024 * size / _MB, 1)
+        return out
+
+    def sample(self, clock: float, raw: Optional[Dict]) -> Dict[str, Dict]:
+        """
+        采集一轮：{"meminfo": {字段: MB}, "vmstat": {字段: 每秒}, "psi": {资源: {some_avg10, ..., some, full}}}，
+        clock 为单调时钟（秒）。速率与 PSI 的 some / full 停顿占比首轮只建立基线；raw 为 None（数据源不支持）时返回空。
+        """
+        if not raw:
+            self.clear()
+            return {}
+        vm = raw.get("vmstat") or {}
+        psi = raw.get("pressure") or {}
+        row = [sum(vm.get(k.encode(), 0) for k in keys) for _, keys in VMSTAT_COUNTERS]
+        row += [(psi.get(res) or {}).get(kind, {}).get("total", 0.0) for res in PSI_RESOURCES
+                for kind in ("some", "full")]
+        rates, ok = self._rates.update(["system"], np.array([row], dtype=np.float64), clock)
+        out = {"meminfo": self.meminfo(raw.get("meminfo") or {}), "vmstat": {}, "psi": {}}
+        values = rates[0].round(2).tolist()
+        if ok[0] and vm:
+            out["vmstat"] = dict(zip(_VMSTAT_NAMES, values))
+        stalls = dict(zip(_PSI_NAMES, values[len(_VMSTAT_NAMES):]))
+        for res in PSI_RESOURCES:
+            if res not in psi:
+                continue
+            entry = out["psi"][res] = {}
+            for kind in ("some", "full"):
+                avgs = psi[res].get(kind)
+                if avgs is None:
+                    continue  # 旧内核的 cpu 没有 full 行
+                for win in ("avg10", "avg60", "avg300"):
+                    entry[f"{kind}_{win}"] = avgs.get(win, 0.0)
+                if ok[0]:
+                    entry[kind] = min(100.0, stalls[f"{res}.{kind}"])
+        self.latest = out
+        return out
+
+    def clear(self):
+        self._rates.clear()
+        self.latest = {}
+
+
+_CFG = get_pressure_config()
+PRESSURE_ENABLED = bool(_CFG.get("enable", True))
+pressure_collector = PressureCollector()
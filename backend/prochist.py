@@ -0,0 +1,272 @@
+"""
+进程历史与分组汇总
+DATA_CACHE["processes"] 只是当前时刻的前 20，尖峰过去后就无从得知是哪个进程造成的。这里为保留期内
+进入过前列的每个进程保存紧凑的时间序列（CPU、RSS、磁盘读写、网络收发、显存），并按用户、可执行文件名、
+所属服务（systemd unit / 容器 scope）做分组汇总：
+- 进程以 (pid, 启动时刻) 为键，pid 复用不会把两个进程的数据混在一起；
+- 所有序列共用一条时间轴，按 槽位 × 时刻 × 字段 存放在 float32 三维环形数组中；槽位数固定，
+  满了按 LRU（最近一次进入前列的时刻）淘汰，数据已全部超出保留期的键也会释放槽位；
+- 进入过前列的进程此后每轮都记录（即使跌出前列），直到退出或被淘汰，尖峰前后的曲线是完整的；
+  网络收发只对前列进程采集，其余时刻为空；
+- 分组键在进程首次出现时确定并缓存，每轮按组 np.bincount 求和；各分组方式中进入过前列（按 CPU）的分组
+  同样按 LRU 保存时间序列，当前全部分组的汇总值可随时排序查询。
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .app_config import get_processes_config
+
+PROC_FIELDS = ("cpu", "rss", "disk_read", "disk_write", "net_up", "net_down", "gpu")
+GROUP_FIELDS = ("cpu", "rss", "disk_read", "disk_write", "count")
+GROUP_KINDS = ("user", "name", "service")
+TOP_K = 20  # 与 monitor.TOP_PROCESSES 一致：进入前 TOP_K 即开始记录
+
+
+class SeriesArena:
+    """按键分配槽位的多序列环形存储：values[槽位, 时刻, 字段]，所有键共用 ts 时间轴，槽位按 LRU 淘汰"""
+
+    def __init__(self, capacity: int, slots: int, fields: Tuple[str, ...]):
+        self.capacity = max(1, int(capacity))
+        self.fields = fields
+        self.ts = np.full(self.capacity, np.nan)
+        self.values = np.full((max(1, int(slots)), self.capacity, len(fields)), np.nan, dtype=np.float32)
+        self.head = 0
+        self.size = 0
+        self.slots: "OrderedDict[Hashable, int]" = OrderedDict()  # {键: 槽位}，按最近一次 touch 排序
+        self.last_seen: Dict[Hashable, float] = {}
+        self._free = list(range(self.values.shape[0] - 1, -1, -1))
+        self.evictions = 0
+
+    def begin(self, ts: float) -> int:
+        """推进一行并清空该行（被覆盖的最旧时刻），返回行号"""
+        row = self.head
+        self.ts[row] = ts
+        self.values[:, row] = np.nan
+        self.head = (row + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return row
+
+    def touch(self, key: Hashable) -> Tuple[int, Optional[Hashable]]:
+        """标记 key 为最近使用，必要时分配槽位（无空闲时淘汰最久未使用的键）；返回 (槽位, 被淘汰的键)"""
+        slot = self.slots.get(key)
+        if slot is not None:
+            self.slots.move_to_end(key)
+            return slot, None
+        evicted = None
+        if not self._free:
+            evicted, old = self.slots.popitem(last=False)
+            self.last_seen.pop(evicted, None)
+            self.values[old] = np.nan
+            self._free.append(old)
+            self.evictions += 1
+        slot = self._free.pop()
+        self.slots[key] = slot
+        return slot, evicted
+
+    def write(self, row: int, ts: float, slots: List[int], keys: List[Hashable], values: np.ndarray):
+        if slots:
+            self.values[slots, row] = values
+            for key in keys:
+                self.last_seen[key] = ts
+
+    def expire(self, before: float) -> List[Hashable]:
+        """释放最后一次写入早于 before（整段数据已超出保留期）的键"""
+        stale = [k for k, t in self.last_seen.items() if t < before]
+        for key in stale:
+            self.drop(key)
+        return stale
+
+    def drop(self, key: Hashable):
+        slot = self.slots.pop(key, None)
+        self.last_seen.pop(key, None)
+        if slot is not None:
+            self.values[slot] = np.nan
+            self._free.append(slot)
+
+    def query(self, key: Hashable, start: float = 0, end: float = float("inf")):
+        """返回 (ts[N], values[N, 字段])；键不存在时返回 None"""
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        rows = np.arange(self.size) if self.size < self.capacity else \
+            (np.arange(self.capacity) + self.head) % self.capacity
+        ts = self.ts[rows]
+        rows = rows[(ts >= start) & (ts <= end)]
+        values = self.values[slot, rows]
+        keep = ~np.isnan(values).all(axis=1)
+        return self.ts[rows][keep], values[keep]
+
+
+class ProcessHistory:
+    """
+    进程历史：record(ts, top, procs) 每轮调用一次。
+    top 为本轮展示的前列进程（monitor 生成的字典，含网络与显存）；
+    procs 为全部进程的 (pid, 启动时刻, 名称, cpu %, rss 字节, 读 KB/s, 写 KB/s, 用户, 服务) 元组，
+    用户 / 服务未知时为 None（psutil / 合成数据源），对应分组方式不参与汇总。
+    """
+
+    def __init__(self, retention: int = 900, max_processes: int = 128, max_groups: int = 128, top_k: int = TOP_K):
+        self.retention = retention
+        self.top_k = top_k
+        self.procs = SeriesArena(retention, max_processes, PROC_FIELDS)
+        self.groups = {kind: SeriesArena(retention, max_groups, GROUP_FIELDS) for kind in GROUP_KINDS}
+        self.meta: Dict[Tuple[int, float], Dict] = {}     # {(pid, 启动时刻): 名称、用户、服务、峰值等}
+        self.totals: Dict[str, Tuple[List[str], np.ndarray]] = {kind: ([], np.zeros((0, len(GROUP_FIELDS))))
+                                                                 for kind in GROUP_KINDS}
+        self._gids: Dict[str, Dict[str, int]] = {kind: {} for kind in GROUP_KINDS}
+        self._names: Dict[str, List[str]] = {kind: [] for kind in GROUP_KINDS}
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _gid(self, kind: str, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        ids = self._gids[kind]
+        gid = ids.get(name)
+        if gid is None:
+            gid = ids[name] = len(ids)
+            self._names[kind].append(name)
+        return gid
+
+    def record(self, ts: float, top: List[Dict], procs: Iterable[Tuple], gpu_mem: Optional[Dict[int, float]] = None):
+        gpu_mem = gpu_mem or {}
+        top_by_pid = {p["pid"]: p for p in top[:self.top_k]}
+        with self.lock:
+            row = self.procs.begin(ts)
+            pending: Dict[Tuple[int, float], Tuple[int, Tuple]] = {}   # {键: (槽位, 本轮数值)}
+            cpu, rss, rd, wr = [], [], [], []
+            gids = {kind: [] for kind in GROUP_KINDS}
+            for pid, start, name, c, r, dr, dw, user, service in procs:
+                key = (pid, start)
+                cpu.append(c)
+                rss.append(r)
+                rd.append(dr)
+                wr.append(dw)
+                gids["user"].append(self._gid("user", user))
+                gids["name"].append(self._gid("name", name))
+                gids["service"].append(self._gid("service", service))
+                t = top_by_pid.get(pid)
+                if t is not None:
+                    slot, evicted = self.procs.touch(key)
+                    if evicted is not None:
+                        self.meta.pop(evicted, None)
+                        pending.pop(evicted, None)
+                    m = self.meta.get(key)
+                    if m is None:
+                        m = self.meta[key] = {"pid": pid, "start_time": start, "name": name, "user": user,
+                                              "service": service, "first_seen": ts, "peak_cpu": 0.0}
+                    net = (t.get("net_up", np.nan), t.get("net_down", np.nan))
+                else:
+                    slot = self.procs.slots.get(key)
+                    if slot is None:
+                        continue
+                    m = self.meta[key]
+                    net = (np.nan, np.nan)
+                m["last_seen"] = ts
+                m["peak_cpu"] = max(m["peak_cpu"], c)
+                pending[key] = (slot, (c, r / 1048576, dr, dw, net[0], net[1], gpu_mem.get(pid, 0)))
+            self.procs.write(row, ts, [v[0] for v in pending.values()], list(pending),
+                             np.array([v[1] for v in pending.values()], dtype=np.float32).reshape(-1, len(PROC_FIELDS)))
+            for key in self.procs.expire(ts - self.retention):
+                self.meta.pop(key, None)
+            self._rollup(ts, np.array(cpu, dtype=np.float64), np.array(rss, dtype=np.float64) / 1048576,
+                         np.array(rd, dtype=np.float64), np.array(wr, dtype=np.float64), gids)
+            self.version += 1
+
+    def _rollup(self, ts: float, cpu: np.ndarray, rss: np.ndarray, rd: np.ndarray, wr: np.ndarray,
+                gids: Dict[str, List[int]]):
+        """按组求和（np.bincount），记录各分组方式中 CPU 前 top_k 的分组"""
+        for kind in GROUP_KINDS:
+            gid = np.array(gids[kind], dtype=np.int64)
+            valid = gid >= 0
+            n = len(self._names[kind])
+            arena = self.groups[kind]
+            row = arena.begin(ts)
+            if not valid.any():
+                self.totals[kind] = ([], np.zeros((0, len(GROUP_FIELDS))))
+                continue
+            g = gid[valid]
+            sums = np.stack([np.bincount(g, weights=x[valid], minlength=n)
+                             for x in (cpu, rss, rd, wr)] + [np.bincount(g, minlength=n).astype(np.float64)], axis=1)
+            present = np.flatnonzero(sums[:, -1] > 0)
+            names = [self._names[kind][i] for i in present.tolist()]
+            table = sums[present]
+            self.totals[kind] = (names, table)
+            order = np.argsort(-table[:, 0], kind="stable")[:self.top_k]
+            for i in order.tolist():
+                arena.touch(names[i])
+            index = {name: i for i, name in enumerate(names)}
+            slots, keys, values = [], [], []
+            for name, slot in arena.slots.items():
+                i = index.get(name)
+                if i is not None:
+                    slots.append(slot)
+                    keys.append(name)
+                    values.append(table[i])
+            arena.write(row, ts, slots, keys, np.array(values, dtype=np.float32).reshape(-1, len(GROUP_FIELDS)))
+            arena.expire(ts - self.retention)
+            # 分组编号只增不减：已消失的分组过多时重建编号表
+            if n > 4 * max(len(names), 64):
+                self._gids[kind] = {name: i for i, name in enumerate(names)}
+                self._names[kind] = list(names)
+
+    # ---------- 查询 ----------
+    def processes(self) -> List[Dict]:
+        """正在记录的全部进程（按峰值 CPU 降序）"""
+        with self.lock:
+            items = [dict(m) for m in self.meta.values()]
+        return sorted(items, key=lambda m: m["peak_cpu"], reverse=True)
+
+    def process_series(self, pid: int, start_time: Optional[float] = None, start: float = 0,
+                       end: float = float("inf")) -> Optional[Dict]:
+        """单个进程的序列；同一 pid 有多个进程（pid 复用）时默认取最近启动的那个"""
+        with self.lock:
+            keys = [k for k in self.meta if k[0] == pid and (start_time is None or abs(k[1] - start_time) < 0.01)]
+            if not keys:
+                return None
+            key = max(keys, key=lambda k: k[1])
+            ts, values = self.procs.query(key, start, end)
+            return dict(self.meta[key], series=_series(ts, values, PROC_FIELDS))
+
+    def group_totals(self, kind: str, sort: str = "cpu", top: int = 10) -> List[Dict]:
+        """某种分组方式下当前全部分组的汇总值，按 sort 降序取前 top 个"""
+        if kind not in GROUP_KINDS:
+            raise ValueError(f"不支持的分组方式: {kind}（可选 {', '.join(GROUP_KINDS)}）")
+        if sort not in GROUP_FIELDS:
+            raise ValueError(f"不支持的排序字段: {sort}（可选 {', '.join(GROUP_FIELDS)}）")
+        with self.lock:
+            names, table = self.totals[kind]
+            order = np.argsort(-table[:, GROUP_FIELDS.index(sort)], kind="stable")[:max(0, top)] if len(names) else []
+            return [dict({"name": names[i]}, **{f: round(float(v), 1) for f, v in zip(GROUP_FIELDS, table[i])})
+                    for i in list(order)]
+
+    def group_series(self, kind: str, name: str, start: float = 0, end: float = float("inf")) -> Optional[Dict]:
+        if kind not in GROUP_KINDS:
+            raise ValueError(f"不支持的分组方式: {kind}（可选 {', '.join(GROUP_KINDS)}）")
+        with self.lock:
+            hit = self.groups[kind].query(name, start, end)
+            if hit is None:
+                return None
+            return _series(*hit, GROUP_FIELDS)
+
+
+def _series(ts: np.ndarray, values: np.ndarray, fields: Tuple[str, ...]) -> Dict[str, List]:
+    """{字段: [[毫秒时间戳, 值], ...]}，跳过 NaN"""
+    ms = np.rint(ts * 1000).astype(np.int64).tolist()
+    out = {}
+    for i, field in enumerate(fields):
+        col = values[:, i].astype(np.float64)
+        out[field] = [[t, round(v, 2)] for t, v in zip(ms, col.tolist()) if v == v]
+    return out
+
+
+_CFG = get_processes_config()
+PROC_HISTORY_ENABLED = bool(_CFG.get("history", True))
+process_history = ProcessHistory(
+    retention=int(_CFG.get("history_retention", 900)),
+    max_processes=int(_CFG.get("history_max", 128)),
+    max_groups=int(_CFG.get("group_max", 128)),
+)
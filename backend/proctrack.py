@@ -0,0 +1,406 @@
+"""
+增量进程跟踪
+替代每轮 psutil.pids() + process_iter()（每轮为每个进程新建对象、open / read / close 多个文件）：
+- 进程集合按轮次做差分：新出现的 pid 才打开 /proc/<pid>/stat 与 /proc/<pid>/io 并解析名称，
+  消失的 pid 关闭描述符、丢弃状态；长期存活的进程每轮只对常驻描述符各做一次 pread；
+- pid 复用以 stat 中的 starttime 识别：读到的启动时间变化即视为新进程，重置速率基线与名称；
+- 进程的用户与所属服务（/proc/<pid>/cgroup 中的 systemd unit / 容器 scope）在首次出现时解析一次，供分组汇总；
+- 有权限时（root / CAP_NET_ADMIN，且位于初始 pid 命名空间）订阅 netlink proc connector 的
+  fork / exit 事件，进程集合直接由事件维护，不再每轮 listdir /proc；事件丢失（接收缓冲区溢出）
+  或每隔 rescan_interval 秒做一次全量重扫兜底。
+因此除每个进程一次 pread 外，每轮的开销（打开文件、解析名称、分配状态、清理缓存）只与进程更替数量成正比。
+描述符数受 RLIMIT_NOFILE 限制：超出预算的进程退回每轮打开读取，结果不变。
+"""
+import errno
+import os
+import socket
+import struct
+import time
+from typing import Dict, List, Optional
+
+from .app_config import get_processes_config
+
+PROC = "/proc"
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_READ_SIZE = 2048           # /proc/<pid>/stat 与 io 都远小于该长度
+FD_RESERVE = 1024           # 给套接字、日志等其它用途保留的描述符数
+# 进程已退出（描述符指向的进程不存在）或 /proc 条目已消失
+_GONE = {errno.ESRCH, errno.ENOENT}
+
+# netlink proc connector（linux/connector.h、linux/cn_proc.h）
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXIT = 0x80000000
+PROC_PID_INIT_INO = 0xEFFFFFFC  # 初始 pid 命名空间的 inode；事件中的 pid 只在该命名空间内有意义
+_NLMSG = struct.Struct("=IHHII")      # len, type, flags, seq, pid
+_CNMSG = struct.Struct("=IIIIHH")     # idx, val, seq, ack, len, flags
+_EVENT = struct.Struct("=IIQ")        # what, cpu, timestamp_ns
+_PIDS = struct.Struct("=IIII")
+_EVENT_OFFSET = _NLMSG.size + _CNMSG.size
+NLMSG_DONE = 3
+
+
+def parse_stat(raw: bytes):
+    """解析 /proc/<pid>/stat：返回 (comm, ppid, utime + stime 时钟数, starttime, rss 页数)"""
+    l, r = raw.find(b"("), raw.rfind(b")")
+    rest = raw[r + 2:].split()
+    # rest[0] 为第 3 列 state：第 k 列对应 rest[k - 3]
+    return (raw[l + 1:r].decode("utf-8", "replace"), int(rest[1]), int(rest[11]) + int(rest[12]),
+            int(rest[19]), int(rest[21]))
+
+
+def service_of(cgroup: str) -> str:
+    """
+    从 /proc/<pid>/cgroup 内容取所属服务：cgroup v2 路径中最深的 *.service / *.scope 单元
+    （如 nginx.service、docker-<id>.scope），没有时取最后一级目录，根 cgroup 为 "-"
+    """
+    path = ""
+    for line in cgroup.splitlines():
+        if line.startswith("0::"):
+            path = line[3:]
+            break
+        path = path or line.rpartition(":")[2]
+    parts = [p for p in path.strip().split("/") if p]
+    for part in reversed(parts):
+        if part.endswith((".service", ".scope")):
+            return part
+    return parts[-1] if parts else "-"
+
+
+_USERS: Dict[int, str] = {}
+
+
+def user_name(uid: int) -> str:
+    name = _USERS.get(uid)
+    if name is None:
+        try:
+            import pwd
+            name = pwd.getpwuid(uid).pw_name
+        except (ImportError, KeyError):
+            name = str(uid)
+        _USERS[uid] = name
+    return name
+
+
+def parse_io(raw: bytes):
+    """解析 /proc/<pid>/io：返回 (read_bytes, write_bytes)"""
+    rb = wb = 0
+    for line in raw.split(b"\n"):
+        if line.startswith(b"read_bytes:"):
+            rb = int(line[11:])
+        elif line.startswith(b"write_bytes:"):
+            wb = int(line[12:])
+    return rb, wb
+
+
+def _pread(fd: int) -> bytes:
+    return os.pread(fd, _READ_SIZE, 0)
+
+
+def _read_path(path: str) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return _pread(fd)
+    finally:
+        os.close(fd)
+
+
+def _close(fd: Optional[int]):
+    if fd is not None:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+class ProcEntry:
+    """一个被跟踪的进程：常驻描述符、上一轮计数与本轮派生的速率"""
+
+    __slots__ = ("pid", "start", "comm", "name", "user", "service", "ppid", "stat_fd", "io_fd", "io_ok",
+                 "ticks", "rb", "wb", "ts", "cpu", "mem", "rss", "disk_read", "disk_write")
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.start = None
+        self.comm = ""
+        self.name = ""
+        self.user = ""
+        self.service = ""
+        self.ppid = 0
+        self.stat_fd: Optional[int] = None
+        self.io_fd: Optional[int] = None
+        self.io_ok = True       # /proc/<pid>/io 无权读取时置 False，之后不再尝试
+        self.ticks = self.rb = self.wb = self.rss = 0
+        self.ts = 0.0
+        self.cpu = self.mem = self.disk_read = self.disk_write = 0.0
+
+    def reset(self, start: int):
+        self.start = start
+        self.comm = ""
+        self.ts = 0.0
+        self.cpu = self.disk_read = self.disk_write = 0.0
+
+
+def start_time(e: ProcEntry, boot_time: float) -> float:
+    """进程启动时刻（Unix 秒）：starttime 为开机后的时钟数"""
+    return round(boot_time + (e.start or 0) / _CLK_TCK, 2)
+
+
+class ProcessTracker:
+    """增量进程跟踪器：sample(clock) 返回全部存活进程（ProcEntry，含 cpu / mem / 磁盘读写速率）"""
+
+    def __init__(self, proc: str = PROC, netlink: bool = True, rescan_interval: float = 60.0):
+        self.proc = proc
+        self.rescan_interval = rescan_interval
+        self.entries: Dict[int, ProcEntry] = {}
+        self.mem_total = (os.sysconf("SC_PHYS_PAGES") * _PAGE_SIZE) if hasattr(os, "sysconf") else 0
+        self.fd_budget = self._fd_budget()
+        self._nl: Optional[socket.socket] = self._subscribe() if netlink and proc == PROC else None
+        self._added: set = set()
+        self._removed: set = set()
+        self._last_scan = 0.0
+        self.scans = 0          # 全量扫描次数（基准中用于确认事件路径生效）
+
+    @property
+    def netlink(self) -> bool:
+        return self._nl is not None
+
+    # ---------- 进程集合 ----------
+    @staticmethod
+    def _fd_budget() -> int:
+        """可用于常驻描述符的数量：必要时把软限制提高到硬限制"""
+        try:
+            import resource
+            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if hard == resource.RLIM_INFINITY or hard > soft:
+                target = hard if hard != resource.RLIM_INFINITY else 1 << 20
+                resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+                soft = target
+            return max(0, soft - FD_RESERVE)
+        except (ImportError, ValueError, OSError):
+            return 0
+
+    @staticmethod
+    def _subscribe() -> Optional[socket.socket]:
+        """订阅 proc connector 的进程事件；无权限、不在初始 pid 命名空间或内核不支持时返回 None"""
+        try:
+            if os.stat("/proc/self/ns/pid").st_ino != PROC_PID_INIT_INO:
+                return None
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        except (OSError, AttributeError):
+            return None
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+            sock.bind((0, CN_IDX_PROC))
+            payload = _CNMSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, 4, 0) + struct.pack("=I", PROC_CN_MCAST_LISTEN)
+            sock.send(_NLMSG.pack(_NLMSG.size + len(payload), NLMSG_DONE, 0, 0, 0) + payload)
+            sock.setblocking(False)
+            return sock
+        except OSError:
+            sock.close()
+            return None
+
+    def _drain(self) -> bool:
+        """读取积压的 fork / exit 事件并合并到 _added / _removed；事件丢失时返回 False"""
+        while True:
+            try:
+                data = self._nl.recv(65536)
+            except BlockingIOError:
+                return True
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    return False
+                raise
+            off = 0
+            while off + _EVENT_OFFSET + _EVENT.size + _PIDS.size <= len(data):
+                length = _NLMSG.unpack_from(data, off)[0]
+                what = _EVENT.unpack_from(data, off + _EVENT_OFFSET)[0]
+                a, b, c, d = _PIDS.unpack_from(data, off + _EVENT_OFFSET + _EVENT.size)
+                # 只关心进程（线程组首线程），忽略线程的创建与退出
+                if what == PROC_EVENT_FORK and c == d:
+                    self._removed.discard(c)
+                    self._added.add(c)
+                elif what == PROC_EVENT_EXIT and a == b:
+                    self._added.discard(a)
+                    self._removed.add(a)
+                if length <= 0:
+                    break
+                off += (length + 3) & ~3
+
+    def _listdir(self) -> set:
+        return {int(n) for n in os.listdir(self.proc) if n.isdigit()}
+
+    def _scan(self, now: float):
+        """全量扫描 /proc，与当前集合做差分"""
+        pids = self._listdir()
+        known = self.entries.keys()
+        self._added = pids - known
+        self._removed = known - pids
+        self._last_scan = now
+        self.scans += 1
+
+    def _update_set(self, now: float):
+        if self._nl is None or not self.entries or now - self._last_scan >= self.rescan_interval:
+            if self._nl is not None:
+                try:
+                    self._drain()  # 清空积压事件，随后以全量扫描为准
+                except OSError:
+                    pass
+            self._scan(now)
+        else:
+            try:
+                ok = self._drain()
+            except OSError:
+                ok = False
+            if not ok:
+                self._scan(now)
+        for pid in self._removed:
+            self._drop(pid)
+        for pid in self._added:
+            if pid not in self.entries:
+                self.entries[pid] = self._open(pid)
+        self._added, self._removed = set(), set()
+
+    # ---------- 单个进程 ----------
+    def _open(self, pid: int) -> ProcEntry:
+        e = ProcEntry(pid)
+        base = f"{self.proc}/{pid}"
+        if self.fd_budget >= 2:
+            try:
+                e.stat_fd = os.open(f"{base}/stat", os.O_RDONLY)
+                self.fd_budget -= 1
+                e.io_fd = os.open(f"{base}/io", os.O_RDONLY)
+                self.fd_budget -= 1
+            except OSError:
+                pass
+        return e
+
+    def _drop(self, pid: int):
+        e = self.entries.pop(pid, None)
+        if e is not None:
+            self._release(e)
+
+    def _release(self, e: ProcEntry):
+        for fd in (e.stat_fd, e.io_fd):
+            if fd is not None:
+                _close(fd)
+                self.fd_budget += 1
+        e.stat_fd = e.io_fd = None
+
+    def _resolve_name(self, e: ProcEntry, comm: str):
+        """与 psutil.Process.name() 一致：comm 被截断为 15 字节时用 cmdline 首项的文件名补全"""
+        e.comm = name = comm
+        if len(comm) >= 15:
+            try:
+                with open(f"{self.proc}/{e.pid}/cmdline", "rb") as f:
+                    exe = f.read().split(b"\0", 1)[0].decode("utf-8", "replace")
+                full = os.path.basename(exe)
+                if full.startswith(comm):
+                    name = full
+            except OSError:
+                pass
+        e.name = name
+
+    def _resolve_owner(self, e: ProcEntry):
+        """用户与所属服务：每个进程只解析一次（pid 复用时重新解析）"""
+        base = f"{self.proc}/{e.pid}"
+        try:
+            e.user = user_name(os.stat(base).st_uid)
+        except OSError:
+            e.user = ""
+        try:
+            with open(f"{base}/cgroup", "r", errors="replace") as f:
+                e.service = service_of(f.read())
+        except OSError:
+            e.service = ""
+
+    def _read_stat(self, e: ProcEntry) -> bytes:
+        if e.stat_fd is not None:
+            return _pread(e.stat_fd)
+        return _read_path(f"{self.proc}/{e.pid}/stat")
+
+    def _read_io(self, e: ProcEntry):
+        if not e.io_ok:
+            return None
+        try:
+            raw = _pread(e.io_fd) if e.io_fd is not None else _read_path(f"{self.proc}/{e.pid}/io")
+            return parse_io(raw)
+        except PermissionError:
+            # 其它用户的进程（非 root 运行时）：关闭描述符，以后不再读取
+            e.io_ok = False
+            if e.io_fd is not None:
+                _close(e.io_fd)
+                e.io_fd = None
+                self.fd_budget += 1
+            return None
+        except OSError:
+            return None
+
+    def _sample_one(self, e: ProcEntry, now: float) -> bool:
+        """刷新一个进程；进程已退出时返回 False"""
+        try:
+            raw = self._read_stat(e)
+        except OSError as err:
+            if err.errno not in _GONE or e.stat_fd is None:
+                return False
+            # 常驻描述符指向的进程已退出，但 pid 仍在（已被复用）：重新打开后按新进程处理
+            self._release(e)
+            fresh = self._open(e.pid)
+            e.stat_fd, e.io_fd, e.io_ok = fresh.stat_fd, fresh.io_fd, True
+            try:
+                raw = self._read_stat(e)
+            except OSError:
+                return False
+        try:
+            comm, ppid, ticks, start, rss = parse_stat(raw)
+        except (ValueError, IndexError):
+            return False
+        if start != e.start:
+            e.reset(start)
+            self._resolve_owner(e)
+        e.ppid = ppid
+        if comm != e.comm:
+            self._resolve_name(e, comm)
+        io = self._read_io(e)
+        rb, wb = io if io else (0, 0)
+        dt = now - e.ts
+        if e.ts and dt > 0:
+            e.cpu = round((ticks - e.ticks) / _CLK_TCK / dt * 100, 1)
+            if dt > 0.1:
+                e.disk_read = round(max(0.0, (rb - e.rb) / 1024 / dt), 1)
+                e.disk_write = round(max(0.0, (wb - e.wb) / 1024 / dt), 1)
+        e.rss = rss * _PAGE_SIZE
+        e.mem = round(e.rss / self.mem_total * 100, 1) if self.mem_total else 0.0
+        e.ticks, e.rb, e.wb, e.ts = ticks, rb, wb, now
+        return True
+
+    # ---------- 对外接口 ----------
+    def sample(self, clock: Optional[float] = None) -> List[ProcEntry]:
+        """
+        刷新进程集合与每个进程的计数，返回全部存活进程；首次出现的进程 cpu / 磁盘速率为 0（需上轮基线）。
+        clock 为单调时钟（秒），速率间隔与定期全量扫描都按它计时。
+        """
+        now = time.monotonic() if clock is None else clock
+        self._update_set(now)
+        gone = [pid for pid, e in self.entries.items() if not self._sample_one(e, now)]
+        for pid in gone:
+            self._drop(pid)
+        return list(self.entries.values())
+
+    def close(self):
+        for e in self.entries.values():
+            self._release(e)
+        self.entries.clear()
+        if self._nl is not None:
+            self._nl.close()
+            self._nl = None
+
+
+def create_tracker(proc: str = PROC) -> ProcessTracker:
+    cfg = get_processes_config()
+    return ProcessTracker(proc, netlink=bool(cfg.get("netlink", True)),
+                          rescan_interval=float(cfg.get("rescan_interval", 60)))
@@ -0,0 +1,59 @@
+"""
+指标数据源
+provider 是全局入口：采集线程与硬件信息模块统一通过它取数据。
+按配置 provider.type 选择真实数据源（real）或合成数据源（synthetic）；real 在 Linux 上默认使用
+procfs 快速路径（每轮只读一次 /proc），其它平台或 fast_path: false 时使用 psutil；
+基准等场景可用 set_provider() 在运行时替换，已导入 provider 的模块无需重新导入。
+"""
+from typing import Dict, Optional
+
+from ..app_config import get_provider_config
+from . import procfs
+from .base import MetricsProvider
+from .procfs import ProcfsProvider
+from .real import RealProvider
+from .synthetic import SyntheticProvider
+
+PROVIDERS = ("real", "synthetic")
+
+
+def create_provider(cfg: Optional[Dict] = None) -> MetricsProvider:
+    """按配置创建数据源；类型不合法时抛出 ValueError"""
+    cfg = get_provider_config() if cfg is None else cfg
+    kind = cfg.get("type", "real") or "real"
+    if kind == "real":
+        if cfg.get("fast_path", True) and procfs.is_available():
+            return ProcfsProvider()
+        return RealProvider()
+    if kind == "synthetic":
+        opts = dict(cfg.get("synthetic") or {})
+        opts["trace"] = opts.get("trace") or None
+        return SyntheticProvider(**opts)
+    raise ValueError(f"未知的数据源类型: {kind}（可选 {', '.join(PROVIDERS)}）")
+
+
+class _ProviderProxy:
+    """转发到当前数据源，使 set_provider() 对 `from .providers import provider` 的调用方即时生效"""
+
+    def __init__(self):
+        self._target: Optional[MetricsProvider] = None
+
+    def __getattr__(self, item):
+        if self._target is None:
+            self._target = create_provider()
+        return getattr(self._target, item)
+
+
+provider = _ProviderProxy()
+
+
+def get_provider() -> MetricsProvider:
+    if provider._target is None:
+        provider._target = create_provider()
+    return provider._target
+
+
+def set_provider(p: MetricsProvider) -> MetricsProvider:
+    """替换当前数据源，返回旧数据源（未初始化时为 None）"""
+    old, provider._target = provider._target, p
+    return old
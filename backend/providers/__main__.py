@@ -0,0 +1,4 @@
+"""录制采集轨迹：python -m backend.providers -o trace.jsonl --seconds 300"""
+from .trace import main
+
+main()
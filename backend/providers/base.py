@@ -0,0 +1,168 @@
+"""
+指标数据源接口
+采集线程、硬件信息与基准只通过数据源取原始数据，不直接调用 psutil / subprocess / /proc，
+从而可以切换到合成数据源，在没有对应硬件的机器上测试任意规模（2 万进程、128 网卡、200 块盘）。
+方法名与返回结构尽量与 psutil 一致（namedtuple 或带同名属性的对象），真实实现基本直接转发。
+"""
+import time
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 非 psutil 实现返回的结构（字段为 psutil 同名结构的子集，调用方只按属性名访问）
+scpufreq = namedtuple("scpufreq", "current min max")
+scputimes = namedtuple("scputimes", "user nice system idle iowait irq softirq steal")
+svmem = namedtuple("svmem", "total available percent used free")
+sswap = namedtuple("sswap", "total used free percent sin sout")
+snetio = namedtuple("snetio", "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout")
+snicaddr = namedtuple("snicaddr", "family address netmask broadcast ptp")
+snicstats = namedtuple("snicstats", "isup duplex speed mtu")
+sdiskpart = namedtuple("sdiskpart", "device mountpoint fstype opts")
+sdiskusage = namedtuple("sdiskusage", "total used free percent")
+sdiskio = namedtuple("sdiskio", "read_count write_count read_bytes write_bytes read_time write_time busy_time")
+pio = namedtuple("pio", "read_count write_count read_bytes write_bytes")
+shwtemp = namedtuple("shwtemp", "label current high critical")
+
+
+class MetricsProvider:
+    """数据源基类：子类实现全部方法；name 为配置中的类型名"""
+
+    name = "base"
+
+    def advance(self, timestamp: float):
+        """每轮采集开始时调用一次；真实数据源无需处理，合成数据源据此推进一步"""
+
+    def clock(self, timestamp: float) -> float:
+        """本轮计数器的采样时刻（秒），速率按它求间隔；真实数据源为单调时钟，不受系统时间调整影响"""
+        return time.monotonic()
+
+    # ---------- CPU ----------
+    def cpu_percent(self, percpu: bool = False):
+        """自上次调用以来的 CPU 占用率（%），percpu=True 时返回每核列表"""
+        raise NotImplementedError
+
+    def cpu_times_percent(self, percpu: bool = False):
+        """自上次调用以来各状态占比（%），带 user / system / idle / iowait / irq / softirq / steal 等属性
+        （平台不提供的字段视为 0）；percpu=True 时返回每核列表"""
+        raise NotImplementedError
+
+    def cpu_count(self, logical: bool = True) -> Optional[int]:
+        raise NotImplementedError
+
+    def cpu_freq(self, percpu: bool = False):
+        """当前频率（MHz），对象带 current / min / max 属性；percpu=True 时为列表"""
+        raise NotImplementedError
+
+    def cpu_model(self) -> str:
+        raise NotImplementedError
+
+    def getloadavg(self) -> Tuple[float, float, float]:
+        raise NotImplementedError
+
+    def boot_time(self) -> float:
+        raise NotImplementedError
+
+    # ---------- 内存 ----------
+    def virtual_memory(self):
+        """带 total / available / percent / used 属性"""
+        raise NotImplementedError
+
+    def swap_memory(self):
+        """带 total / used / free / percent / sin / sout 属性"""
+        raise NotImplementedError
+
+    def memory_stats(self) -> Optional[Dict]:
+        """
+        内存压力原始数据：{"meminfo": {b"字段": 字节}, "vmstat": {b"字段": 值}, "pressure": {资源: PSI}}，
+        格式同 backend.pressure.read_raw；不支持时返回 None
+        """
+        raise NotImplementedError
+
+    # ---------- 网卡 ----------
+    def net_io_counters(self, pernic: bool = False):
+        """累计收发字节，带 bytes_sent / bytes_recv 等属性；pernic=True 时为 {网卡: 计数}"""
+        raise NotImplementedError
+
+    def net_if_addrs(self) -> Dict[str, List]:
+        """{网卡: [带 family / address 属性的地址]}"""
+        raise NotImplementedError
+
+    def net_if_stats(self, names: Optional[List[str]] = None) -> Dict:
+        """
+        {网卡: 带 isup / duplex / speed（Mb/s，未知为 0）/ mtu 属性的链路属性}；
+        给出 names 时只需包含这些网卡（实现也可以返回全部）
+        """
+        raise NotImplementedError
+
+    def net_snmp(self) -> Optional[Dict[str, int]]:
+        """协议栈累计计数 {"Tcp.RetransSegs": 值}，口径同 /proc/net/snmp 与 netstat（见 backend.netstats）；不支持时返回 None"""
+        raise NotImplementedError
+
+    def socket_states(self) -> Optional[Dict[str, int]]:
+        """TCP 套接字按状态计数，格式同 netstats.socket_states()；不支持时返回 None"""
+        raise NotImplementedError
+
+    # ---------- 磁盘 ----------
+    def disk_partitions(self) -> List:
+        """已挂载分区，带 device / mountpoint / fstype / opts 属性"""
+        raise NotImplementedError
+
+    def disk_usage(self, path: str):
+        """带 total / used / free / percent 属性"""
+        raise NotImplementedError
+
+    def disk_io_counters(self, perdisk: bool = False):
+        """psutil 口径的累计 IO 计数（非 Linux 回退路径使用）"""
+        raise NotImplementedError
+
+    def diskstats(self) -> Optional[Tuple[Dict[str, Tuple[int, ...]], Dict[str, Dict]]]:
+        """
+        /proc/diskstats 口径的原始计数与设备拓扑：({设备: 11 列计数}, {设备: {type, name, slaves}})，
+        格式同 backend.diskstats；不可用时返回 None（采集线程回退 disk_io_counters）
+        """
+        raise NotImplementedError
+
+    def disk_smart(self) -> List[Dict]:
+        """SMART 属性，格式同 hardware.get_disk_smart()"""
+        raise NotImplementedError
+
+    # ---------- 进程 ----------
+    def pids(self) -> List[int]:
+        raise NotImplementedError
+
+    def process_iter(self, attrs: List[str]) -> Iterator:
+        """逐个返回进程对象：info 字典（含 attrs）及 cpu_percent() / memory_percent() / io_counters()"""
+        raise NotImplementedError
+
+    def proc_net_dev(self, pid: int) -> Optional[Tuple[int, int]]:
+        """进程所在网络命名空间的累计 (接收字节, 发送字节)，不支持时返回 None"""
+        raise NotImplementedError
+
+    def process_tracker(self):
+        """增量进程跟踪器（backend.proctrack.ProcessTracker）；不支持时返回 None，采集线程回退 pids() + process_iter()"""
+        raise NotImplementedError
+
+    # ---------- GPU ----------
+    def gpu_sample(self, vendor: str) -> Tuple[float, Optional[Dict]]:
+        """本轮 GPU 占用率（%）与 Intel 核显补充信息（无则 None）"""
+        raise NotImplementedError
+
+    def gpu_info(self) -> Tuple[Dict, Dict]:
+        """(型号信息, 详细信息)，格式同 hardware.get_gpu_info() / get_gpu_details()"""
+        raise NotImplementedError
+
+    def gpu_details(self, info: Optional[Dict] = None) -> Dict:
+        """GPU 实时详情（格式同 hardware.get_gpu_details()）；info 为已知的型号信息，可省去重新识别型号"""
+        return self.gpu_info()[1]
+
+    def gpu_process_memory(self) -> Dict[int, float]:
+        """{pid: 已用显存 MB}"""
+        raise NotImplementedError
+
+    # ---------- 传感器 ----------
+    def sensors_temperatures(self) -> Dict[str, List]:
+        """{芯片名: [带 label / current / high / critical 属性的读数]}"""
+        raise NotImplementedError
+
+    def sensors_battery(self):
+        """带 percent / power_plugged / secsleft 属性，无电池返回 None"""
+        raise NotImplementedError
@@ -0,0 +1,274 @@
+"""
+Linux 快速路径数据源
+每轮采集只读取一次 /proc/stat、/proc/meminfo、/proc/net/dev、/proc/net/snmp、/proc/vmstat、/proc/pressure、/proc/loadavg 与 cpufreq sysfs：
+文件描述符常驻打开，每次用 preadv 从偏移 0 读入预分配的缓冲区（不再 open / close），
+整体与每核 CPU 占用率（含 user / system / iowait 等分项）、频率、内存、总流量与每网卡流量、负载都由这一次读取派生。
+同一轮内的重复调用（如整体 / 每核 cpu_percent、总量 / 每网卡 net_io_counters）直接返回缓存结果。
+进程由 proctrack.ProcessTracker 增量跟踪（常驻 /proc/<pid> 描述符、按轮次差分进程集合）；
+其余接口（磁盘、传感器、GPU）沿用 RealProvider。
+"""
+import glob
+import os
+from typing import Dict, List, Optional
+
+from .. import netstats, pressure
+from ..cgroups import parse_pressure
+from .base import scpufreq, scputimes, snetio, svmem
+from .real import RealProvider
+
+PROC = "/proc"
+SYS_CPU = "/sys/devices/system/cpu"
+
+
+class _ProcFile:
+    """常驻打开的 procfs / sysfs 文件，read() 每次从头读入同一块缓冲区，不足时倍增"""
+
+    __slots__ = ("path", "fd", "buf", "view")
+
+    def __init__(self, path: str, size: int = 4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+
+    def read(self) -> bytes:
+        while True:
+            n = os.preadv(self.fd, [self.buf], 0)
+            if n < len(self.buf):
+                return bytes(self.view[:n])
+            self.buf = bytearray(len(self.buf) * 2)
+            self.view = memoryview(self.buf)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def _open(path: str, size: int = 4096) -> Optional[_ProcFile]:
+    try:
+        return _ProcFile(path, size)
+    except OSError:
+        return None
+
+
+def is_available(proc: str = PROC) -> bool:
+    return hasattr(os, "preadv") and os.path.exists(os.path.join(proc, "stat"))
+
+
+def parse_stat(raw: bytes):
+    """解析 /proc/stat：返回 (整体 cpu 计数, [每核计数], btime)；计数为前 8 列 user..steal"""
+    total, cores, btime = None, [], None
+    for line in raw.split(b"\n"):
+        if line.startswith(b"cpu"):
+            cols = line.split()
+            vals = [int(x) for x in cols[1:9]]
+            vals += [0] * (8 - len(vals))
+            if cols[0] == b"cpu":
+                total = vals
+            else:
+                cores.append(vals)
+        elif line.startswith(b"btime"):
+            btime = float(line.split()[1])
+    return total, cores, btime
+
+
+def busy_percent(prev: List[int], cur: List[int]) -> float:
+    """与 psutil.cpu_percent 口径一致：(总时间 - idle - iowait) 的增量占总增量的百分比"""
+    all_d = sum(cur) - sum(prev)
+    idle_d = (cur[3] + cur[4]) - (prev[3] + prev[4])
+    if all_d <= 0:
+        return 0.0
+    return round(min(max((all_d - idle_d) / all_d * 100, 0.0), 100.0), 1)
+
+
+def times_percent(prev: List[int], cur: List[int]) -> scputimes:
+    """各状态计数增量占总增量的百分比（与 psutil.cpu_times_percent 口径一致）"""
+    d = [max(c - p, 0) for p, c in zip(prev, cur)]
+    total = sum(d)
+    if total <= 0:
+        return scputimes(0.0, 0.0, 0.0, 100.0, 0.0, 0.0, 0.0, 0.0)
+    return scputimes(*(round(x / total * 100, 1) for x in d))
+
+
+def parse_meminfo(raw: bytes) -> Dict[bytes, int]:
+    out = {}
+    for line in raw.split(b"\n"):
+        key, _, rest = line.partition(b":")
+        if rest:
+            out[key] = int(rest.split()[0]) * 1024
+    return out
+
+
+def parse_net_dev(raw: bytes) -> Dict[str, snetio]:
+    out = {}
+    for line in raw.split(b"\n")[2:]:
+        name, _, rest = line.partition(b":")
+        if not rest:
+            continue
+        c = rest.split()
+        out[name.strip().decode()] = snetio(int(c[8]), int(c[0]), int(c[9]), int(c[1]),
+                                            int(c[2]), int(c[10]), int(c[3]), int(c[11]))
+    return out
+
+
+class ProcfsProvider(RealProvider):
+    name = "procfs"
+
+    def __init__(self, proc: str = PROC, sys_cpu: str = SYS_CPU):
+        super().__init__()
+        self._stat = _open(os.path.join(proc, "stat"), 16384)
+        self._meminfo = _open(os.path.join(proc, "meminfo"))
+        self._netdev = _open(os.path.join(proc, "net", "dev"), 16384)
+        self._loadavg = _open(os.path.join(proc, "loadavg"), 128)
+        # 协议栈计数只在采集线程调用 net_snmp() 时读取，同样常驻描述符
+        self._snmp = _open(os.path.join(proc, "net", "snmp"), 16384)
+        self._netstat = _open(os.path.join(proc, "net", "netstat"), 16384) if self._snmp else None
+        # 内存压力：meminfo 复用本轮 _refresh 的结果，vmstat 与 PSI 在 memory_stats() 时读取
+        self._vmstat = _open(os.path.join(proc, "vmstat"), 16384)
+        self._psi = {res: f for res in pressure.PSI_RESOURCES
+                     for f in [_open(os.path.join(proc, "pressure", res), 256)] if f}
+        # 每核当前频率：优先 cpufreq sysfs（每核一个小文件），没有时回退 /proc/cpuinfo 的 "cpu MHz"
+        paths = sorted(glob.glob(os.path.join(sys_cpu, "cpu[0-9]*", "cpufreq", "scaling_cur_freq")),
+                       key=lambda p: int(p.split(os.sep)[-3][3:]))
+        self._freq_files = [f for f in (_open(p, 64) for p in paths) if f]
+        self._freq_limits = [(_read_khz(os.path.join(os.path.dirname(f.path), "cpuinfo_min_freq")),
+                              _read_khz(os.path.join(os.path.dirname(f.path), "cpuinfo_max_freq")))
+                             for f in self._freq_files]
+        self._cpuinfo = None if self._freq_files else _open(os.path.join(proc, "cpuinfo"), 65536)
+
+        self._cpu_prev = self._cpu_cur = None
+        self._cores_prev = self._cores_cur = []
+        self._btime = None
+        self._mem = None
+        self._net = None
+        self._load = None
+        self._freq = None
+        self._proc = proc
+        self._tracker = None
+        self._refresh()
+
+    def _refresh(self):
+        """读取一轮全部文件（每个文件一次 preadv），保存派生指标所需的原始值"""
+        if self._stat:
+            total, cores, btime = parse_stat(self._stat.read())
+            self._cpu_prev, self._cpu_cur = self._cpu_cur, total
+            self._cores_prev, self._cores_cur = self._cores_cur, cores
+            self._btime = btime or self._btime
+        if self._meminfo:
+            self._mem = parse_meminfo(self._meminfo.read())
+        if self._netdev:
+            self._net = parse_net_dev(self._netdev.read())
+        if self._loadavg:
+            parts = self._loadavg.read().split()
+            self._load = (float(parts[0]), float(parts[1]), float(parts[2]))
+        self._freq = self._read_freq()
+
+    def _read_freq(self) -> Optional[List[scpufreq]]:
+        if self._freq_files:
+            return [scpufreq(int(f.read()) / 1000, lo, hi) for f, (lo, hi) in zip(self._freq_files, self._freq_limits)]
+        if self._cpuinfo:
+            mhz = [float(line.split(b":")[1]) for line in self._cpuinfo.read().split(b"\n")
+                   if line.startswith(b"cpu MHz")]
+            return [scpufreq(v, 0.0, 0.0) for v in mhz] or None
+        return None
+
+    def advance(self, timestamp):
+        self._refresh()
+
+    # ---------- CPU ----------
+    def cpu_percent(self, percpu=False):
+        if self._cpu_cur is None:
+            return super().cpu_percent(percpu)
+        if percpu:
+            prev = self._cores_prev if len(self._cores_prev) == len(self._cores_cur) else [[0] * 8] * len(self._cores_cur)
+            return [busy_percent(p, c) for p, c in zip(prev, self._cores_cur)]
+        return busy_percent(self._cpu_prev or [0] * 8, self._cpu_cur)
+
+    def cpu_times_percent(self, percpu=False):
+        if self._cpu_cur is None:
+            return super().cpu_times_percent(percpu)
+        if percpu:
+            prev = self._cores_prev if len(self._cores_prev) == len(self._cores_cur) else [[0] * 8] * len(self._cores_cur)
+            return [times_percent(p, c) for p, c in zip(prev, self._cores_cur)]
+        return times_percent(self._cpu_prev or [0] * 8, self._cpu_cur)
+
+    def cpu_freq(self, percpu=False):
+        if not self._freq:
+            return super().cpu_freq(percpu)
+        if percpu:
+            return self._freq
+        n = len(self._freq)
+        return scpufreq(sum(f.current for f in self._freq) / n,
+                        min(f.min for f in self._freq), max(f.max for f in self._freq))
+
+    def getloadavg(self):
+        return self._load if self._load else super().getloadavg()
+
+    def boot_time(self):
+        return self._btime or super().boot_time()
+
+    # ---------- 内存 ----------
+    def virtual_memory(self):
+        m = self._mem
+        if not m or b"MemAvailable" not in m:
+            return super().virtual_memory()
+        # 与 psutil 一致：used = total - available，percent 为其占 total 的百分比
+        total, free, avail = m[b"MemTotal"], m.get(b"MemFree", 0), m[b"MemAvailable"]
+        percent = round((total - avail) / total * 100, 1) if total else 0.0
+        return svmem(total, avail, percent, total - avail, free)
+
+    def memory_stats(self):
+        if not self._mem or not self._vmstat:
+            return super().memory_stats()
+        return {"meminfo": self._mem, "vmstat": pressure.parse_vmstat(self._vmstat.read()),
+                "pressure": {res: parse_pressure(f.read().decode("ascii", "ignore")) for res, f in self._psi.items()}}
+
+    # ---------- 网卡 ----------
+    def net_io_counters(self, pernic=False):
+        if self._net is None:
+            return super().net_io_counters(pernic)
+        if pernic:
+            return self._net
+        return snetio(*(sum(col) for col in zip(*self._net.values()))) if self._net else snetio(0, 0, 0, 0, 0, 0, 0, 0)
+
+    def net_if_stats(self, names=None):
+        if names is None:
+            try:
+                names = os.listdir(netstats.SYS_NET)
+            except OSError:
+                return super().net_if_stats()
+        return netstats.read_links(names)
+
+    def net_snmp(self):
+        if not self._snmp:
+            return super().net_snmp()
+        out = netstats.parse_snmp(self._snmp.read())
+        if self._netstat:
+            netstats.parse_snmp(self._netstat.read(), out)
+        return out
+
+    # ---------- 进程 ----------
+    def process_tracker(self):
+        if self._tracker is None:
+            from ..proctrack import create_tracker
+            self._tracker = create_tracker(self._proc)
+        return self._tracker
+
+    def close(self):
+        for f in [self._stat, self._meminfo, self._netdev, self._loadavg, self._snmp, self._netstat,
+                  self._vmstat, self._cpuinfo] + self._freq_files + list(self._psi.values()):
+            if f:
+                f.close()
+        if self._tracker is not None:
+            self._tracker.close()
+            self._tracker = None
+
+
+def _read_khz(path: str) -> float:
+    try:
+        with open(path, "rb") as f:
+            return int(f.read()) / 1000
+    except (OSError, ValueError):
+        return 0.0
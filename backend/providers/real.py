@@ -0,0 +1,189 @@
+"""
+真实数据源：psutil + /proc + NVML / intel_gpu_top / smartctl
+"""
+import platform
+import subprocess
+from typing import Dict, Optional, Tuple
+
+import psutil
+
+from .. import diskstats, netstats, pressure
+from .base import MetricsProvider
+
+
+class RealProvider(MetricsProvider):
+    name = "real"
+
+    def __init__(self):
+        self._linux = platform.system() == "Linux"
+
+    def cpu_percent(self, percpu=False):
+        return psutil.cpu_percent(interval=None, percpu=percpu)
+
+    def cpu_times_percent(self, percpu=False):
+        return psutil.cpu_times_percent(interval=None, percpu=percpu)
+
+    def cpu_count(self, logical=True):
+        return psutil.cpu_count(logical=logical)
+
+    def cpu_freq(self, percpu=False):
+        return psutil.cpu_freq(percpu=percpu)
+
+    def cpu_model(self):
+        from ..hardware import get_cpu_model
+        return get_cpu_model()
+
+    def getloadavg(self):
+        return psutil.getloadavg() if hasattr(psutil, "getloadavg") else None
+
+    def boot_time(self):
+        return psutil.boot_time()
+
+    def virtual_memory(self):
+        return psutil.virtual_memory()
+
+    def swap_memory(self):
+        return psutil.swap_memory()
+
+    def memory_stats(self):
+        return pressure.read_raw() if self._linux and pressure.is_available() else None
+
+    def net_io_counters(self, pernic=False):
+        return psutil.net_io_counters(pernic=pernic)
+
+    def net_if_addrs(self):
+        return psutil.net_if_addrs()
+
+    def net_if_stats(self, names=None):
+        return psutil.net_if_stats()
+
+    def net_snmp(self):
+        return netstats.read_snmp() if self._linux and netstats.is_available() else None
+
+    def socket_states(self):
+        return netstats.socket_states() if self._linux and netstats.is_available() else None
+
+    def disk_partitions(self):
+        return psutil.disk_partitions(all=False)
+
+    def disk_usage(self, path):
+        return psutil.disk_usage(path)
+
+    def disk_io_counters(self, perdisk=False):
+        return psutil.disk_io_counters(perdisk=perdisk)
+
+    def diskstats(self):
+        if not diskstats.is_available():
+            return None
+        stats = diskstats.read_diskstats()
+        return stats, diskstats.get_topology(stats.keys())
+
+    def disk_smart(self):
+        from ..hardware import get_disk_smart
+        return get_disk_smart()
+
+    def pids(self):
+        return psutil.pids()
+
+    def process_iter(self, attrs):
+        return psutil.process_iter(attrs)
+
+    def proc_net_dev(self, pid) -> Optional[Tuple[int, int]]:
+        if not self._linux:
+            return None
+        rx = tx = 0
+        with open(f"/proc/{pid}/net/dev", "r", errors="ignore") as f:
+            for line in f.readlines()[2:]:
+                parts = line.split(":")
+                if len(parts) != 2:
+                    continue
+                cols = parts[1].split()
+                rx += int(cols[0]); tx += int(cols[8])
+        return rx, tx
+
+    def process_tracker(self):
+        return None
+
+    def gpu_sample(self, vendor):
+        from .. import hardware
+        gpu_usage, intel = 0, None
+        if vendor == "nvidia" and hardware.NVML_AVAILABLE and hardware.NVML_HANDLE is not None:
+            try:
+                import py3nvml.py3nvml as nvml
+                gpu_usage = nvml.nvmlDeviceGetUtilizationRates(hardware.NVML_HANDLE).gpu
+            except Exception:
+                hardware.shutdown_nvml()
+
+        if gpu_usage == 0:
+            try:
+                ig = hardware.get_intel_gpu_usage()
+                if isinstance(ig, dict):
+                    if ig.get("utilization") is not None:
+                        gpu_usage = ig["utilization"]
+                    intel = ig
+            except Exception:
+                pass
+
+        if gpu_usage == 0 and platform.system() == "Windows":
+            try:
+                result = subprocess.run(
+                    ['powershell', '-Command',
+                     '(Get-Counter "\\GPU Engine(*)% 3D Utilization").CounterSamples.CookedValue'],
+                    capture_output=True,
+                    text=True,
+                    timeout=3,
+                    encoding='utf-8',
+                    errors='ignore'
+                )
+                if result.returncode == 0:
+                    lines = result.stdout.strip().split('\n')
+                    values = [float(line.strip()) for line in lines if
+                              line.strip().replace('.', '', 1).isdigit()]
+                    if values:
+                        gpu_usage = round(max(values), 1)
+            except Exception:
+                pass
+        return gpu_usage, intel
+
+    def gpu_info(self):
+        from ..hardware import get_gpu_info, get_gpu_details
+        info = get_gpu_info()
+        return info, get_gpu_details(info)
+
+    def gpu_details(self, info=None):
+        from ..hardware import get_gpu_details
+        return get_gpu_details(info)
+
+    def gpu_process_memory(self) -> Dict[int, float]:
+        """
+        per-process 的 GPU 利用率无法跨平台直接获取（psutil/nvml 均只给显存），
+        故此处返回 {pid: 已用显存MB} 作为「GPU 占用」近似。无 GPU / 无进程时返回空。
+        """
+        from .. import hardware
+        if not (hardware.NVML_AVAILABLE and hardware.NVML_HANDLE):
+            return {}
+        try:
+            import py3nvml.py3nvml as nvml
+            procs = []
+            try:
+                procs += nvml.nvmlDeviceGetComputeRunningProcesses(hardware.NVML_HANDLE)
+            except Exception:
+                pass
+            try:
+                procs += nvml.nvmlDeviceGetGraphicsRunningProcesses(hardware.NVML_HANDLE)
+            except Exception:
+                pass
+            result = {}
+            for p in procs:
+                pid = int(p.pid)
+                mem_mb = round(p.usedGpuMemory / 1024, 1) if getattr(p, "usedGpuMemory", 0) else 0
+                result[pid] = max(result.get(pid, 0), mem_mb)
+            return result
+        except Exception:
+            return {}
+
+    def sensors_temperatures(self):
+        return psutil.sensors_temperatures() if hasattr(psutil, "sensors_temperatures") else {}
+
+    def sensors_battery(self):
+        return psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
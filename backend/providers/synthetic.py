@@ -0,0 +1,426 @@
+"""
+合成数据源
+按给定规模（核数、网卡数、磁盘数、进程数）生成确定性的负载曲线：同一 seed 下第 n 轮的数值
+只由 (seed, n) 决定，便于基准与回归对比。也可回放 trace.py 录制的真实轨迹。
+内部只保存每轮的“水平值”（占用率、速率），累计计数（网卡字节、diskstats、进程 IO）按
+速率 × 时间差累加，使采集线程按差分算出的速率与生成的水平值一致。
+"""
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from .base import (MetricsProvider, pio, scpufreq, scputimes, sdiskio, sdiskpart, sdiskusage, shwtemp, snetio,
+                   snicaddr, snicstats, sswap, svmem)
+from .trace import DISK_FIELDS, load as load_trace
+
+
+_PROC_NAMES = ("python", "postgres", "nginx", "java", "node", "redis-server", "containerd-shim",
+               "chrome", "sshd", "systemd-journald", "kworker/u16:2", "dockerd", "mysqld", "envoy")
+_MEM_TOTAL = 64 * 1024 ** 3
+_DISK_TOTAL = 2 * 1024 ** 4
+_FREQ_MIN, _FREQ_MAX = 800.0, 4200.0
+
+
+def _disk_name(i: int) -> str:
+    """0 -> sda, 25 -> sdz, 26 -> sdaa（与内核命名规则一致）"""
+    s = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        s = chr(ord("a") + r) + s
+    return "sd" + s
+
+
+def _carry(old_keys: np.ndarray, old_vals: np.ndarray, new_keys: np.ndarray) -> np.ndarray:
+    """按键把上一轮的累计计数对齐到本轮的键顺序，新出现的键从 0 开始"""
+    out = np.zeros((len(new_keys),) + old_vals.shape[1:], dtype=old_vals.dtype)
+    if len(old_keys) and len(new_keys):
+        order = np.argsort(old_keys)
+        pos = np.clip(np.searchsorted(old_keys[order], new_keys), 0, len(old_keys) - 1)
+        hit = old_keys[order][pos] == new_keys
+        out[hit] = old_vals[order][pos[hit]]
+    return out
+
+
+class _SyntheticProcess:
+    """与 psutil.Process 在采集线程中用到的接口一致"""
+
+    __slots__ = ("info", "_cpu", "_mem", "_io")
+
+    def __init__(self, pid: int, name: str, cpu: float, mem: float, io):
+        self.info = {"pid": pid, "name": name}
+        self._cpu, self._mem, self._io = cpu, mem, io
+
+    def cpu_percent(self, interval=None):
+        return self._cpu
+
+    def memory_percent(self):
+        return self._mem
+
+    def io_counters(self):
+        return pio(0, 0, int(self._io[0]), int(self._io[1]))
+
+
+class SyntheticProvider(MetricsProvider):
+    name = "synthetic"
+
+    def __init__(self, cpus: int = 8, nics: int = 4, disks: int = 4, processes: int = 300,
+                 gpus: int = 0, sensors: int = 4, seed: int = 0, churn: float = 0.01,
+                 trace: Optional[str] = None):
+        self.seed = int(seed)
+        self.churn = float(churn)
+        self.gpus = int(gpus)
+        self.sensors = max(0, int(sensors))
+        self._frames = load_trace(trace) if trace else None
+        self._boot = time.time() - 3 * 86400
+        self._n = -1
+        self._ts = None
+
+        rng = np.random.default_rng((self.seed, 0xC0FFEE))
+        if self._frames:
+            first = self._frames[0]
+            cpus = len(first.get("cpu") or []) or cpus
+        self.cpus = max(1, int(cpus))
+        # 各维度的基准水平与相位，逐轮在其上叠加周期波动与噪声
+        self._cpu_base = rng.uniform(5, 60, self.cpus)
+        self._cpu_phase = rng.uniform(0, 2 * np.pi, self.cpus)
+        self.nic_names = np.array([f"eth{i}" for i in range(int(nics))], dtype=object)
+        self._nic_base = rng.lognormal(4, 1.5, (len(self.nic_names), 2))
+        self._nic_phase = rng.uniform(0, 2 * np.pi, len(self.nic_names))
+        self.disk_names = np.array([_disk_name(i) for i in range(int(disks))], dtype=object)
+        self._disk_iops = rng.lognormal(3, 1.2, (len(self.disk_names), 2))
+        self._disk_kb = rng.uniform(4, 128, (len(self.disk_names), 2))
+        self._disk_await = rng.uniform(0.1, 8, (len(self.disk_names), 2))
+        self._disk_used = rng.uniform(5, 90, len(self.disk_names))
+
+        n = int(processes)
+        self._next_pid = 1000
+        self.pids_arr = np.arange(self._next_pid, self._next_pid + n, dtype=np.int64)
+        self._next_pid += n
+        self._pname = rng.integers(0, len(_PROC_NAMES), n)
+        self._pweight = rng.pareto(1.5, n) + 0.01
+        self._pmem = rng.pareto(2.0, n) * 0.2
+
+        # 当前水平值（advance 时刷新）
+        self.cpu = np.zeros(self.cpus)
+        self.freq = np.full(self.cpus, _FREQ_MIN)
+        self.mem = 0.0
+        self.load = 0.0
+        self.gpu = 0.0
+        self.nic_rates = np.zeros((len(self.nic_names), 2))      # KB/s：上传, 下载
+        self.disk_rates = np.zeros((len(self.disk_names), len(DISK_FIELDS)))
+        self.proc_cpu = np.zeros(n)
+        self.proc_mem = np.zeros(n)
+        self.proc_rates = np.zeros((n, 4))                        # KB/s：读, 写, 下载, 上传
+        self.proc_names = [_PROC_NAMES[i] for i in self._pname]
+        self.temps: Dict[str, float] = {}
+        # 累计计数
+        self._nic_ctr = np.zeros((len(self.nic_names), 2))
+        self._disk_ctr = np.zeros((len(self.disk_names), 11))
+        self._proc_ctr = np.zeros((n, 4))
+        self._mem_ctr = np.zeros(10)  # vmstat 换页 / 回收计数与 PSI 停顿 µs，见 memory_stats
+        self._net_ctr: Optional[Dict[int, list]] = None
+
+    # ---------- 推进 ----------
+    def advance(self, timestamp: float):
+        dt = 1.0 if self._ts is None else max(0.0, timestamp - self._ts)
+        self._ts = timestamp
+        self._n += 1
+        old = (self.nic_names, self._nic_ctr, self.disk_names, self._disk_ctr, self.pids_arr, self._proc_ctr)
+        if self._frames:
+            self._step_trace(self._frames[self._n % len(self._frames)])
+        else:
+            self._step_generated(np.random.default_rng((self.seed, self._n)))
+        self._accumulate(dt, *old)
+        self._net_ctr = None
+
+    def clock(self, timestamp: float) -> float:
+        return timestamp  # 计数按传入的时间戳累计，速率也以它为时间轴
+
+    def _step_generated(self, rng: np.random.Generator):
+        t = self._n
+        wave = np.sin(2 * np.pi * t / 60 + self._cpu_phase)
+        self.cpu = np.clip(self._cpu_base * (1 + 0.5 * wave) + rng.normal(0, 3, self.cpus), 0, 100)
+        self.freq = _FREQ_MIN + (_FREQ_MAX - _FREQ_MIN) * (0.3 + 0.7 * self.cpu / 100)
+        self.mem = float(np.clip(45 + 15 * np.sin(2 * np.pi * t / 600) + rng.normal(0, 0.5), 0, 100))
+        self.load = float(self.cpu.sum() / 100)
+        self.gpu = float(np.clip(50 + 45 * np.sin(2 * np.pi * t / 90), 0, 100)) if self.gpus else 0.0
+
+        k = len(self.nic_names)
+        nic_wave = 1 + 0.8 * np.sin(2 * np.pi * t / 30 + self._nic_phase)
+        self.nic_rates = self._nic_base * nic_wave[:, None] * rng.uniform(0.8, 1.2, (k, 2))
+
+        d = len(self.disk_names)
+        iops = self._disk_iops * rng.uniform(0.5, 1.5, (d, 2))
+        awaits = self._disk_await * rng.uniform(0.8, 1.25, (d, 2))
+        busy = np.minimum(100.0, (iops * awaits).sum(axis=1) / 10)
+        queue = (iops * awaits).sum(axis=1) / 1000
+        self.disk_rates = np.column_stack([iops, iops * self._disk_kb, awaits, busy, queue])
+
+        # 进程：约 churn 比例的进程退出并由新 pid 替换
+        n = len(self.pids_arr)
+        if n:
+            m = int(round(n * self.churn))
+            if m:
+                idx = rng.choice(n, m, replace=False)
+                self.pids_arr = self.pids_arr.copy()
+                self.pids_arr[idx] = np.arange(self._next_pid, self._next_pid + m)
+                self._next_pid += m
+                self._pname[idx] = rng.integers(0, len(_PROC_NAMES), m)
+                self._pweight[idx] = rng.pareto(1.5, m) + 0.01
+                self._pmem[idx] = rng.pareto(2.0, m) * 0.2
+                for i in idx.tolist():
+                    self.proc_names[i] = _PROC_NAMES[self._pname[i]]
+            share = self._pweight * rng.uniform(0.5, 1.5, n)
+            self.proc_cpu = np.minimum(share / share.sum() * self.cpu.sum(), 100.0)
+            self.proc_mem = self._pmem / self._pmem.sum() * self.mem
+            self.proc_rates = self._pweight[:, None] * rng.uniform(0, 20, (n, 4))
+
+        self.temps = {f"Core {i}": 35 + 0.45 * float(self.cpu[i % self.cpus]) for i in range(self.sensors)}
+
+    def _step_trace(self, frame: Dict):
+        cpu = np.asarray(frame.get("cpu") or [0.0], dtype=np.float64)
+        self.cpu = np.resize(cpu, self.cpus)
+        freq = np.asarray(frame.get("freq") or [_FREQ_MIN], dtype=np.float64)
+        self.freq = np.resize(freq, self.cpus)
+        self.mem = float(frame.get("mem", 0))
+        self.load = float(frame.get("load", 0))
+        self.gpu = float(frame.get("gpu", 0))
+        nics = frame.get("nics") or {}
+        self.nic_names = np.array(list(nics), dtype=object)
+        self.nic_rates = np.array(list(nics.values()), dtype=np.float64).reshape(-1, 2)
+        disks = frame.get("disks") or {}
+        self.disk_names = np.array(list(disks), dtype=object)
+        self.disk_rates = np.array(list(disks.values()), dtype=np.float64).reshape(-1, len(DISK_FIELDS))
+        procs = frame.get("procs") or []
+        self.pids_arr = np.array([p[0] for p in procs], dtype=np.int64)
+        self.proc_names = [p[1] for p in procs]
+        self.proc_cpu = np.array([p[2] for p in procs], dtype=np.float64)
+        self.proc_mem = np.array([p[3] for p in procs], dtype=np.float64)
+        self.proc_rates = np.array([p[4:8] for p in procs], dtype=np.float64).reshape(-1, 4)
+        self.temps = dict(frame.get("temps") or {})
+
+    def _accumulate(self, dt, nic_names, nic_ctr, disk_names, disk_ctr, pids, proc_ctr):
+        # 名称集合可能变化（回放轨迹、进程更替），先按名称对齐再累加
+        if not np.array_equal(nic_names, self.nic_names):
+            nic_ctr = _carry(nic_names.astype(str), nic_ctr, self.nic_names.astype(str))
+        self._nic_ctr = nic_ctr + self.nic_rates * 1024 * dt
+
+        if not np.array_equal(disk_names, self.disk_names):
+            disk_ctr = _carry(disk_names.astype(str), disk_ctr, self.disk_names.astype(str))
+        r = dict(zip(DISK_FIELDS, self.disk_rates.T)) if len(self.disk_names) else {}
+        ctr = disk_ctr.copy()
+        if r:
+            ms = dt * 1000
+            ctr[:, 0] += r["r_iops"] * dt
+            ctr[:, 2] += r["read"] * 2 * dt          # KB -> 512 字节扇区
+            ctr[:, 3] += r["r_await"] * r["r_iops"] * dt
+            ctr[:, 4] += r["w_iops"] * dt
+            ctr[:, 6] += r["write"] * 2 * dt
+            ctr[:, 7] += r["w_await"] * r["w_iops"] * dt
+            ctr[:, 8] = np.round(r["queue"])
+            ctr[:, 9] += r["busy"] / 100 * ms
+            ctr[:, 10] += r["queue"] * ms
+        self._disk_ctr = ctr
+
+        if not np.array_equal(pids, self.pids_arr):
+            proc_ctr = _carry(pids, proc_ctr, self.pids_arr)
+        self._proc_ctr = proc_ctr + self.proc_rates * 1024 * dt
+
+        # 每秒：换入 / 换出 KB、缺页、主缺页、swap 页、kswapd 扫描 / 回收页、PSI some / full 停顿 µs
+        strain = self._strain
+        self._mem_ctr = self._mem_ctr + dt * np.array([2000, 3000, 50000, 1 + 20 * strain, 5 * strain, 8 * strain,
+                                                       4000 * strain, 3000 * strain, 1e5 * strain, 5e4 * strain])
+
+    @property
+    def _strain(self) -> float:
+        """内存占用超过 50% 的程度（0 ~ 1），合成数据中的换页与 PSI 停顿随之增长"""
+        return max(0.0, self.mem - 50) / 50
+
+    # ---------- CPU ----------
+    def cpu_percent(self, percpu=False):
+        if percpu:
+            return np.round(self.cpu, 1).tolist()
+        return round(float(self.cpu.mean()), 1)
+
+    def cpu_times_percent(self, percpu=False):
+        # 占用按固定比例拆分为 user / system / irq / steal，另有少量 iowait 计入空闲之外
+        def split(u):
+            io = min(2.0, 100.0 - u)
+            return scputimes(round(u * 0.7, 1), 0.0, round(u * 0.2, 1), round(100.0 - u - io, 1),
+                             round(io, 1), round(u * 0.05, 1), 0.0, round(u * 0.05, 1))
+        if percpu:
+            return [split(u) for u in self.cpu.tolist()]
+        return split(float(self.cpu.mean()))
+
+    def cpu_count(self, logical=True):
+        return self.cpus if logical else max(1, self.cpus // 2)
+
+    def cpu_freq(self, percpu=False):
+        if percpu:
+            return [scpufreq(f, _FREQ_MIN, _FREQ_MAX) for f in self.freq.tolist()]
+        return scpufreq(float(self.freq.mean()), _FREQ_MIN, _FREQ_MAX)
+
+    def cpu_model(self):
+        return f"Synthetic CPU ({self.cpu_count(False)}核{self.cpus}线程)"
+
+    def getloadavg(self):
+        return self.load, self.load, self.load
+
+    def boot_time(self):
+        return self._boot
+
+    # ---------- 内存 ----------
+    def virtual_memory(self):
+        used = int(_MEM_TOTAL * self.mem / 100)
+        return svmem(_MEM_TOTAL, _MEM_TOTAL - used, self.mem, used, _MEM_TOTAL - used)
+
+    def swap_memory(self):
+        total = 8 * 1024 ** 3
+        used = int(total * 0.05)
+        return sswap(total, used, total - used, 5.0, 0, 0)
+
+    def memory_stats(self):
+        # 按当前内存占用拆分：已用中 70% 为匿名页、10% 为 slab，其余可用内存的一半为页缓存；
+        # 换页 / 回收计数与 PSI 停顿时间在 _accumulate 中随占用超过 50% 的程度累加
+        def kb(v):
+            return int(v) // 1024 * 1024
+        used = _MEM_TOTAL * self.mem / 100
+        cache = (_MEM_TOTAL - used) / 2
+        swap = 8 * 1024 ** 3
+        meminfo = {b"MemTotal": _MEM_TOTAL, b"MemFree": kb(_MEM_TOTAL - used - cache),
+                   b"MemAvailable": kb(_MEM_TOTAL - used), b"Buffers": kb(cache * 0.05), b"Cached": kb(cache * 0.95),
+                   b"AnonPages": kb(used * 0.7), b"Active(anon)": kb(used * 0.5), b"Inactive(anon)": kb(used * 0.2),
+                   b"Active(file)": kb(cache * 0.6), b"Inactive(file)": kb(cache * 0.4), b"Shmem": kb(used * 0.02),
+                   b"Slab": kb(used * 0.1), b"SReclaimable": kb(used * 0.07), b"SUnreclaim": kb(used * 0.03),
+                   b"Dirty": kb(cache * 0.002), b"Writeback": 0, b"SwapTotal": swap, b"SwapFree": kb(swap * 0.95)}
+        c = self._mem_ctr.astype(np.int64).tolist()
+        vmstat = dict(zip((b"pgpgin", b"pgpgout", b"pgfault", b"pgmajfault", b"pswpin", b"pswpout",
+                           b"pgscan_kswapd", b"pgsteal_kswapd"), c[:8]))
+        avg = round(self._strain * 10, 2)
+        psi = {"some": {"avg10": avg, "avg60": avg, "avg300": avg, "total": c[8]},
+               "full": {"avg10": avg / 2, "avg60": avg / 2, "avg300": avg / 2, "total": c[9]}}
+        return {"meminfo": meminfo, "vmstat": vmstat, "pressure": {"memory": psi}}
+
+    # ---------- 网卡 ----------
+    def net_io_counters(self, pernic=False):
+        def make(sent, recv):
+            return snetio(int(sent), int(recv), int(sent // 1500), int(recv // 1500), 0, 0, 0, 0)
+        if pernic:
+            return {nic: make(c[0], c[1]) for nic, c in zip(self.nic_names.tolist(), self._nic_ctr.tolist())}
+        total = self._nic_ctr.sum(axis=0) if len(self._nic_ctr) else (0, 0)
+        return make(total[0], total[1])
+
+    def net_if_addrs(self):
+        return {nic: [snicaddr(2, f"10.{i // 250}.{i % 250}.2", "255.255.255.0", None, None)]
+                for i, nic in enumerate(self.nic_names.tolist())}
+
+    def net_if_stats(self, names=None):
+        return {nic: snicstats(True, 2, 10000, 1500) for nic in self.nic_names.tolist()}
+
+    def net_snmp(self):
+        # 协议计数按总流量折算（每段 1448 字节，0.2% 重传），与网卡速率同步变化
+        sent, recv = (self._nic_ctr.sum(axis=0) if len(self._nic_ctr) else (0.0, 0.0))
+        out_segs, in_segs = int(sent // 1448), int(recv // 1448)
+        conns = max(self._n, 0) * 5
+        return {"Tcp.CurrEstab": self.socket_states()["established"], "Tcp.OutSegs": out_segs,
+                "Tcp.InSegs": in_segs, "Tcp.RetransSegs": out_segs // 500, "Tcp.ActiveOpens": conns,
+                "Tcp.PassiveOpens": conns * 2, "Tcp.AttemptFails": conns // 50, "Tcp.EstabResets": conns // 40,
+                "Tcp.OutRsts": conns // 20, "Udp.InDatagrams": in_segs // 10, "Udp.OutDatagrams": out_segs // 10}
+
+    def socket_states(self):
+        wave = np.sin(2 * np.pi * max(self._n, 0) / 120)
+        established = int(40 + len(self.pids_arr) // 5 + 20 * wave)
+        states = {"established": established, "syn_sent": 1, "syn_recv": 0, "fin_wait1": 0, "fin_wait2": 2,
+                  "time_wait": int(30 + 25 * wave), "close": 0, "close_wait": 1, "last_ack": 0, "listen": 12,
+                  "closing": 0}
+        states["total"] = sum(states.values())
+        return states
+
+    # ---------- 磁盘 ----------
+    def disk_partitions(self):
+        return [sdiskpart(f"/dev/{d}1", "/" if i == 0 else f"/mnt/{d}", "ext4", "rw,relatime")
+                for i, d in enumerate(self.disk_names.tolist())]
+
+    def disk_usage(self, path):
+        names = self.disk_names.tolist()
+        dev = "" if path == "/" else path.rsplit("/", 1)[-1]
+        i = 0 if path == "/" else (names.index(dev) if dev in names else 0)
+        pct = float(self._disk_used[i % len(self._disk_used)]) if len(self._disk_used) else 0.0
+        used = int(_DISK_TOTAL * pct / 100)
+        return sdiskusage(_DISK_TOTAL, used, _DISK_TOTAL - used, round(pct, 1))
+
+    def disk_io_counters(self, perdisk=False):
+        def make(c):
+            return sdiskio(int(c[0]), int(c[4]), int(c[2]) * 512, int(c[6]) * 512, int(c[3]), int(c[7]), int(c[9]))
+        if perdisk:
+            return {d: make(c) for d, c in zip(self.disk_names.tolist(), self._disk_ctr)}
+        return make(self._disk_ctr.sum(axis=0)) if len(self._disk_ctr) else None
+
+    def diskstats(self):
+        names = self.disk_names.tolist()
+        stats = {d: tuple(int(x) for x in c) for d, c in zip(names, self._disk_ctr.tolist())}
+        topology = {d: {"type": "disk", "name": d, "slaves": []} for d in names}
+        return stats, topology
+
+    def disk_smart(self):
+        out = []
+        for i, d in enumerate(self.disk_names.tolist()[:8]):
+            out.append({"device": f"/dev/{d}", "model": "Synthetic SSD", "available": True, "attributes": [
+                {"id": 5, "name": "Reallocated_Sector_Ct", "value": 100, "worst": 100, "thresh": 10, "raw": "0"},
+                {"id": 9, "name": "Power_On_Hours", "value": 99, "worst": 99, "thresh": 0, "raw": str(1000 + i)},
+                {"id": 194, "name": "Temperature_Celsius", "value": 64, "worst": 50, "thresh": 0, "raw": "36"},
+            ]})
+        return out
+
+    # ---------- 进程 ----------
+    def pids(self):
+        return self.pids_arr.tolist()
+
+    def process_iter(self, attrs):
+        cpu = np.round(self.proc_cpu, 1).tolist()
+        mem = np.round(self.proc_mem, 2).tolist()
+        io = self._proc_ctr[:, :2].tolist()
+        for pid, name, c, m, rw in zip(self.pids_arr.tolist(), self.proc_names, cpu, mem, io):
+            yield _SyntheticProcess(pid, name, c, m, rw)
+
+    def proc_net_dev(self, pid):
+        if self._net_ctr is None:
+            # 每轮首次调用时建立 {pid: 计数}，之后逐个查询为 O(1)
+            self._net_ctr = dict(zip(self.pids_arr.tolist(), self._proc_ctr[:, 2:4].astype(np.int64).tolist()))
+        ctr = self._net_ctr.get(pid)
+        return tuple(ctr) if ctr is not None else None
+
+    def process_tracker(self):
+        return None
+
+    # ---------- GPU ----------
+    def gpu_sample(self, vendor):
+        return (round(self.gpu, 1) if self.gpus else 0), None
+
+    def gpu_info(self):
+        if not self.gpus:
+            info = {"model": "Unknown", "available": False, "brand": "unknown"}
+            return info, dict(info, memory_total=None, memory_used=None, temperature=None, power_draw=None,
+                              power_limit=None, utilization=None, frequency=None)
+        info = {"model": "Synthetic GPU", "available": True, "brand": "nvidia"}
+        details = dict(info, memory_total=24576, memory_used=round(240 * self.gpu),
+                       temperature=round(40 + 0.4 * self.gpu), power_draw=round(60 + 2.4 * self.gpu, 1),
+                       power_limit=300.0, utilization=round(self.gpu), frequency=None)
+        return info, details
+
+    def gpu_process_memory(self):
+        if not self.gpus or not len(self.pids_arr):
+            return {}
+        top = np.argsort(self.proc_cpu)[-3:]
+        return {int(self.pids_arr[i]): round(512.0 * (j + 1), 1) for j, i in enumerate(top.tolist())}
+
+    # ---------- 传感器 ----------
+    def sensors_temperatures(self):
+        if not self.temps:
+            return {}
+        return {"coretemp": [shwtemp(label, round(v, 1), 90.0, 100.0) for label, v in self.temps.items()]}
+
+    def sensors_battery(self):
+        return None
@@ -0,0 +1,81 @@
+"""
+采集轨迹的录制与读取
+轨迹为 JSON Lines，每行一帧（一轮采集观测到的指标水平，而非累计计数），合成数据源回放时
+据此重建累计计数，使采集线程算出的速率与录制时一致：
+{"ts", "cpu": [每核 %], "freq": [每核 MHz], "mem": %, "load": 1 分钟负载, "gpu": %,
+ "nics": {网卡: [上传 KB/s, 下载 KB/s]},
+ "disks": {磁盘: [r_iops, w_iops, read KB/s, write KB/s, r_await, w_await, busy %, queue]},
+ "procs": [[pid, 名称, cpu %, mem %, 读 KB/s, 写 KB/s, 下载 KB/s, 上传 KB/s], ...],
+ "temps": {传感器: ℃}}
+
+录制（使用真实数据源，每秒一帧）：python -m backend.providers -o trace.jsonl --seconds 300
+"""
+import argparse
+import json
+import time
+from typing import Dict, List
+
+DISK_FIELDS = ("r_iops", "w_iops", "read", "write", "r_await", "w_await", "busy", "queue")
+
+
+def _last(series, default=0.0):
+    return series[-1][1] if series else default
+
+
+def frame_from_monitor(ts: float) -> Dict:
+    """把 monitor 最近一轮的采集结果整理为一帧"""
+    from .. import monitor
+
+    cache = monitor.DATA_CACHE
+    temps = {}
+    try:
+        from . import provider
+        for chip, entries in (provider.sensors_temperatures() or {}).items():
+            for i, e in enumerate(entries):
+                temps[f"{chip}/{e.label or i}"] = e.current
+    except Exception:
+        pass
+    return {
+        "ts": ts,
+        "cpu": list(cache["cpu_core_usage"] or []),
+        "freq": list(cache["cpu_core_freq"] or []),
+        "mem": _last(cache["mem_usage"]),
+        "load": _last(cache["system_load"]),
+        "gpu": _last(cache["gpu_usage"]),
+        "nics": {nic: [_last(h.get("up")), _last(h.get("down"))] for nic, h in monitor.NET_IO_NIC_HISTORY.items()},
+        "disks": {dev: [_last(h.get(k)) for k in DISK_FIELDS] for dev, h in monitor.DISK_IO_HISTORY.items()},
+        "procs": [[p["pid"], p["name"], p["cpu"], p["mem"], p["disk_read"], p["disk_write"],
+                   p["net_down"], p["net_up"]] for p in cache["processes"]],
+        "temps": temps,
+    }
+
+
+def record(path: str, seconds: int = 60, interval: float = 1.0):
+    """以 interval 为周期运行采集并逐帧写入轨迹文件"""
+    from .. import monitor
+
+    monitor.collect_tick()  # 建立速率基线，不写入
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(int(seconds / interval)):
+            time.sleep(interval)
+            ts = time.time()
+            monitor.collect_tick(ts)
+            f.write(json.dumps(frame_from_monitor(ts), ensure_ascii=False) + "\n")
+            f.flush()
+
+
+def load(path: str) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        frames = [json.loads(line) for line in f if line.strip()]
+    if not frames:
+        raise ValueError(f"轨迹文件为空: {path}")
+    return frames
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m backend.providers", description="录制采集轨迹")
+    ap.add_argument("-o", "--output", required=True)
+    ap.add_argument("--seconds", type=int, default=60)
+    ap.add_argument("--interval", type=float, default=1.0)
+    args = ap.parse_args()
+    record(args.output, args.seconds, args.interval)
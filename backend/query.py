@@ -0,0 +1,179 @@
+"""
+窗口聚合查询
+在历史存储上按 step 生成输出时刻 t（从 to 向前），每个 t 聚合 (t - window, t] 内的数据：
+- sum / avg / count：前缀和相减，O(N + 输出点数)；
+- min / max / pNN / rate：把每个窗口的下标补齐成矩阵后一次 NumPy 归约，按输出点与序列两个方向切块控制内存；
+- rate：窗口内首末有效值之差 / 时间差（每秒变化量）。
+所有序列（含每网卡、每磁盘、每核）同时计算；结果按（查询参数, 数据版本）缓存，新数据到来前重复查询直接命中。
+超出原始保留期的部分来自分钟汇总层（均值），其上的分位数为近似值。
+"""
+import re
+import time
+import warnings
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .downsample import LRUCache
+from .history import HistoryStore, to_points
+
+AGGS = ("avg", "min", "max", "sum", "count", "rate", "p50", "p95", "p99")
+MAX_POINTS = 11000          # 单次查询每条序列最多输出的点数
+MAX_SERIES = 2048           # 单次查询最多匹配的序列数
+_BLOCK_ELEMENTS = 4_000_000  # 补齐矩阵单块最多的元素数（float64 约 32 MB）
+_PERCENTILE = re.compile(r"^p(\d{1,2}(?:\.\d+)?)$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_cache = LRUCache(128)
+
+
+def parse_duration(text) -> float:
+    """解析时长：纯数字为秒，也支持 30s / 5m / 1h / 7d / 1w"""
+    s = str(text).strip().lower()
+    unit = _UNITS.get(s[-1:]) if s else None
+    try:
+        value = float(s[:-1]) * unit if unit else float(s)
+    except ValueError:
+        raise ValueError(f"无法解析的时长: {text}")
+    if not 0 < value < float("inf"):
+        raise ValueError(f"时长必须为大于 0 的有限值: {text}")
+    return value
+
+
+def _check_agg(agg: str):
+    if agg not in AGGS and not _PERCENTILE.match(agg):
+        raise ValueError(f"不支持的聚合函数: {agg}（可选 {', '.join(AGGS)} 或任意 pNN）")
+
+
+def _window_blocks(n_out: int, lengths: np.ndarray, k: int):
+    """
+    按补齐后的元素数把输出点与序列切块，返回 ([(行起, 行止, 列起, 列止)], width)，
+    每块 行数 × width × 列数 不超过 _BLOCK_ELEMENTS（单个窗口已超过时每块一行一列）
+    """
+    width = max(1, int(lengths.max())) if n_out else 1
+    k = max(1, k)
+    cols = max(1, min(k, _BLOCK_ELEMENTS // width))
+    rows = max(1, _BLOCK_ELEMENTS // (width * cols))
+    return [(i, min(i + rows, n_out), c, min(c + cols, k))
+            for i in range(0, n_out, rows) for c in range(0, k, cols)], width
+
+
+def _nanpercentile(win: np.ndarray, q: float) -> np.ndarray:
+    """沿 axis=1 的分位数（线性插值，忽略 NaN）；np.nanpercentile 逐切片处理，排序后插值快一个数量级"""
+    srt = np.sort(win, axis=1)                   # NaN 排在末尾
+    n = (~np.isnan(srt)).sum(axis=1)             # [rows, k]
+    rank = q / 100.0 * np.maximum(n - 1, 0)
+    lo = np.floor(rank).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(n - 1, 0))
+    v_lo = np.take_along_axis(srt, lo[:, None, :], axis=1)[:, 0, :]
+    v_hi = np.take_along_axis(srt, hi[:, None, :], axis=1)[:, 0, :]
+    out = v_lo + (v_hi - v_lo) * (rank - lo)
+    out[n == 0] = np.nan
+    return out
+
+
+def aggregate(ts: np.ndarray, values: np.ndarray, out_ts: np.ndarray, window: float, agg: str) -> np.ndarray:
+    """
+    对 values[N, k]（ts 升序）在每个输出时刻 out_ts[j] 的 (t - window, t] 窗口内做聚合，
+    返回 [len(out_ts), k]，窗口内无有效数据为 NaN。
+    """
+    n_out, k = len(out_ts), values.shape[1]
+    lo = np.searchsorted(ts, out_ts - window, side="right")
+    hi = np.searchsorted(ts, out_ts, side="right")
+    valid = ~np.isnan(values)
+
+    if agg in ("sum", "avg", "count"):
+        csum = np.vstack([np.zeros((1, k)), np.cumsum(np.where(valid, values, 0.0), axis=0)])
+        ccnt = np.vstack([np.zeros((1, k)), np.cumsum(valid, axis=0)])
+        total, count = csum[hi] - csum[lo], ccnt[hi] - ccnt[lo]
+        if agg == "count":
+            return count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = total / count if agg == "avg" else total
+        out[count == 0] = np.nan
+        return out
+
+    out = np.full((n_out, k), np.nan)
+    lengths = hi - lo
+    blocks, width = _window_blocks(n_out, lengths, k)
+    offs = np.arange(width)
+    m = _PERCENTILE.match(agg)
+    for a, b, c0, c1 in blocks:
+        if not len(ts):
+            break
+        w = int(lengths[a:b].max())            # 本块内最宽的窗口
+        if w == 0:
+            continue
+        idx = lo[a:b, None] + offs[None, :w]
+        inside = offs[None, :w] < lengths[a:b, None]
+        idx = np.minimum(idx, len(ts) - 1)
+        win = values[idx, c0:c1]               # [rows, w, cols]
+        win[~inside] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 全 NaN 窗口
+            if agg == "min":
+                out[a:b, c0:c1] = np.nanmin(win, axis=1)
+            elif agg == "max":
+                out[a:b, c0:c1] = np.nanmax(win, axis=1)
+            elif m:
+                out[a:b, c0:c1] = _nanpercentile(win, float(m.group(1)))
+            else:  # rate
+                ok = ~np.isnan(win)
+                first = ok.argmax(axis=1)                      # [rows, cols]
+                last = w - 1 - ok[:, ::-1].argmax(axis=1)
+                rows = np.arange(b - a)[:, None]
+                cols = np.arange(c1 - c0)[None, :]
+                t = ts[idx]                                     # [rows, w]
+                dt = t[rows, last] - t[rows, first]
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    rate = (win[rows, last, cols] - win[rows, first, cols]) / dt
+                rate[(dt <= 0) | (ok.sum(axis=1) < 2)] = np.nan
+                out[a:b, c0:c1] = rate
+    return out
+
+
+def run_query(store: HistoryStore, patterns: List[str], agg: str = "avg",
+              start: Optional[float] = None, end: Optional[float] = None,
+              step: Optional[float] = None, window: Optional[float] = None, span: float = 3600) -> Dict:
+    """
+    执行窗口聚合查询。end 缺省为最新数据时刻（便于缓存），start 缺省为 end - span；
+    step 缺省为整个范围（每条序列一个值），window 缺省等于 step。参数不合法时抛出 ValueError。
+    """
+    _check_agg(agg)
+    if not all(v is None or np.isfinite(v) for v in (start, end, step, window)):
+        raise ValueError("from / to / step / window 必须为有限数值")
+    if end is None:
+        newest = store.span()[1]
+        end = newest if np.isfinite(newest) else time.time()
+    start = end - span if start is None else start
+    if not np.isfinite(start):
+        raise ValueError("from 必须为有限数值")
+    if end < start:
+        raise ValueError("to 不能早于 from")
+    step = step or max(end - start, 1.0)
+    window = window or step
+    n_out = max(1, int(np.ceil((end - start) / step)))
+    if n_out > MAX_POINTS:
+        raise ValueError(f"输出点数 {n_out} 超过上限 {MAX_POINTS}，请增大 step")
+    names = store.resolve(patterns) if patterns else store.series()
+    if len(names) > MAX_SERIES:
+        raise ValueError(f"匹配的序列数 {len(names)} 超过上限 {MAX_SERIES}，请缩小 series 模式")
+
+    key = (tuple(names), agg, start, end, step, window, store.version)
+    hit = _cache.get(key)
+    if hit is not None:
+        return hit
+
+    out_ts = end - step * np.arange(n_out)[::-1]
+    ts, values, _ = store.query(names, float(out_ts[0]) - window, end)
+    result = aggregate(ts, values, out_ts, window, agg) if len(names) else np.empty((len(out_ts), 0))
+    body = {
+        "agg": agg,
+        "from": start,
+        "to": end,
+        "step": step,
+        "window": window,
+        "series": {name: to_points(out_ts, result[:, i]) for i, name in enumerate(names)},
+    }
+    _cache.put(key, body)
+    return body
@@ -0,0 +1,92 @@
+"""
+计数器速率引擎
+网卡、磁盘、进程 IO 等累计计数统一在这里换算为速率：每族计数器（同一组字段）按键登记，
+上一轮的计数与采样时刻保存在连续的 NumPy 数组中，一轮内全部键的差分、回绕修正与除法一次向量化完成。
+时间轴使用单调时钟（由数据源给出，真实数据源为 time.monotonic()），系统时间被 NTP 调整时不会出现尖峰或负值。
+各族统一的处理口径：
+- 新出现的键本轮只建立基线，不给出速率；
+- 距基线不足 min_interval 的键不给出速率且保留原基线，下一轮按累计间隔计算；
+- 计数变小时，字段声明了位宽且按回绕解释差值小于量程一半的视为回绕，补上 2^bits；
+  否则视为计数器重置（设备重建、pid 复用等），该字段本轮速率为 0 并以当前值为新基线；
+- 本轮未出现的键视为消失，基线随之丢弃，再次出现时重新建立。
+"""
+from typing import Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Bits = Union[None, int, Sequence[Optional[int]]]
+
+
+class CounterRates:
+    """
+    一族计数器的速率计算。fields 为字段名；scale 为各字段的换算系数（如字节 → KB 传 1/1024），
+    可为标量或与 fields 等长的序列；bits 为各字段计数器的位宽（None 表示不回绕，按 64 位无符号处理）。
+    """
+
+    def __init__(self, fields: Sequence[str], scale: Union[float, Sequence[float]] = 1.0, bits: Bits = None,
+                 min_interval: float = 0.1):
+        self.fields = tuple(fields)
+        f = len(self.fields)
+        self.scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), (f,)).copy()
+        if bits is None or isinstance(bits, int):
+            bits = [bits] * f
+        self._modulus = np.array([float(2 ** b) if b else np.inf for b in bits], dtype=np.float64)
+        self.min_interval = min_interval
+        self._keys: List[Hashable] = []
+        self._index = {}
+        self._last = np.zeros((0, f))
+        self._ts = np.zeros(0)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        self._keys = []
+        self._index = {}
+        self._last = np.zeros((0, len(self.fields)))
+        self._ts = np.zeros(0)
+
+    def deltas(self, keys: Sequence[Hashable], values, now: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        登记本轮全部键的累计计数（values 形状为 (len(keys), 字段数)），返回 (差值, 间隔秒, 有效)：
+        差值已做回绕 / 重置修正，有效为 False 的行（新键、间隔不足、时钟回退）差值与间隔均为 0。
+        """
+        keys = list(keys)
+        n, f = len(keys), len(self.fields)
+        cur = np.asarray(values, dtype=np.float64).reshape(n, f)
+        if keys == self._keys:
+            prev, prev_ts = self._last, self._ts
+            known = np.ones(n, dtype=bool)
+        else:
+            idx = np.fromiter((self._index.get(k, -1) for k in keys), dtype=np.intp, count=n)
+            known = idx >= 0
+            safe = np.where(known, idx, 0)
+            prev = self._last[safe] if len(self._keys) else np.zeros((n, f))
+            prev_ts = self._ts[safe] if len(self._keys) else np.zeros(n)
+        dt = now - prev_ts
+        ok = known & (dt >= self.min_interval)
+        # 间隔不足的已知键保留原基线；时钟回退（dt <= 0）时与新键一样重建基线
+        hold = known & (dt > 0) & ~ok
+
+        delta = cur - prev
+        neg = delta < 0
+        if neg.any():
+            wrapped = delta + self._modulus
+            wrap = neg & (wrapped < self._modulus / 2)
+            delta = np.where(wrap, wrapped, np.where(neg, 0.0, delta))
+        delta[~ok] = 0.0
+        dt = np.where(ok, dt, 0.0)
+
+        self._last = np.where(hold[:, None], prev, cur)
+        self._ts = np.where(hold, prev_ts, now)
+        if keys != self._keys:
+            self._keys = keys
+            self._index = {k: i for i, k in enumerate(keys)}
+        return delta, dt, ok
+
+    def update(self, keys: Sequence[Hashable], values, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """登记本轮计数并返回 (速率, 有效)：速率为每秒增量乘以各字段 scale，无效行为 0"""
+        delta, dt, ok = self.deltas(keys, values, now)
+        rates = np.zeros_like(delta)
+        np.divide(delta * self.scale, dt[:, None], out=rates, where=ok[:, None])
+        return rates, ok
@@ -1,3 +1,4 @@
 from .api import api_router
+from .static import static_router, asset_response
 
-__all__ = ["api_router"]
+__all__ = ["api_router", "static_router", "asset_response"]
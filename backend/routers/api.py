@@ -1,18 +1,33 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 import time
 import json
+import math
 import os
 import asyncio
+from typing import List, Optional
 
 from .. import monitor
+from ..cgroups import cgroup_collector
+from ..sensors import sensor_collector
+from ..alerts import alert_engine
+from ..history import history_store, series_points
+from ..downsample import downsample_snapshot, MODES as DOWNSAMPLE_MODES
+from ..broadcast import broadcaster
+from ..anomaly import anomaly_detector
+from ..export import export, FORMATS as EXPORT_FORMATS, PARQUET_AVAILABLE
+from ..query import run_query, parse_duration
+from ..corehist import core_history
+from ..prochist import process_history
 from ..hardware import get_hardware_info, get_gpu_info
+from ..inventory import hardware_inventory, section_diff
 from ..app_config import get_server_config, get_display_config, get_web_ui_config
 
 api_router = APIRouter(prefix="/api")
 
 CACHE_FILE = "tmp.json"
-WS_PUSH_INTERVAL = 1.0  # WebSocket 推送间隔（秒）
+LONG_POLL_TIMEOUT = 25.0  # 长轮询最长挂起时间（秒），低于常见代理的空闲超时
+SHARED_WAIT = 5.0         # 多进程模式下 worker 等待第一帧的最长时间（秒）
 
 
 @api_router.get("/health")
@@ -57,10 +72,69 @@ async def get_version():
         return {"version": "unknown"}
 
 
+def _snapshot(points: int = 0, mode: str = "lttb"):
+    """完整快照；points > 0 时把实时数据中的每条序列降采样到约 points 个点"""
+    snap = monitor.get_full_snapshot()
+    if points > 0:
+        snap["real_time_data"] = downsample_snapshot(snap["real_time_data"], points, mode)
+    return snap
+
+
 @api_router.get("/data")
-async def get_data():
-    """一次性获取完整监控快照（硬件信息 + 实时数据 + 磁盘）"""
-    return monitor.get_full_snapshot()
+async def get_data(points: int = 0, width: int = 0, mode: str = "lttb"):
+    """
+    一次性获取完整监控快照（硬件信息 + 实时数据 + 磁盘），可用 points / width 请求降采样。
+    广播流水线的最新帧仍新鲜时直接复用其编码结果，不再重复采集硬件信息。
+    """
+    mode = mode if mode in DOWNSAMPLE_MODES else "lttb"
+    frame = broadcaster.fresh()
+    if frame is None and broadcaster.shared:
+        # worker 刚启动、尚未读到采集进程发布的第一帧
+        frame = await broadcaster.wait_after(0, SHARED_WAIT)
+    if frame is not None:
+        return Response(frame.json(points or width, mode), media_type="application/json")
+    return _snapshot(points or width, mode)
+
+
+@api_router.get("/stream")
+async def stream(request: Request, since: Optional[int] = None, timeout: float = LONG_POLL_TIMEOUT):
+    """
+    实时快照推送（WebSocket 不可用时的降级通道），与 WebSocket 共用同一条广播流水线：
+    - 默认为 SSE：先发送 snapshot 事件（完整快照），之后每帧发送 delta 事件（增量），id 为帧序号；
+      断线重连时浏览器自动带上 Last-Event-ID，只补发缺失的增量；
+    - ?since=seq 为长轮询：有比 seq 更新的帧时立即返回 {"seq", "deltas": [...]}（落后太多或 since=0 时为
+      {"seq", "snapshot"}），否则最多挂起 timeout 秒后返回空增量。
+    """
+    if since is not None:
+        await broadcaster.wait_after(since, max(0.0, min(timeout, 60.0)))
+        msgs = broadcaster.catch_up(since)
+        if msgs and msgs[0][0] == "snapshot":
+            body = '{"seq":%d,"snapshot":%s}' % (msgs[0][1], msgs[0][2])
+        else:
+            body = '{"seq":%d,"deltas":[%s]}' % (msgs[-1][1] if msgs else since, ",".join(m[2] for m in msgs))
+        return Response(body, media_type="application/json", headers={"Cache-Control": "no-store"})
+
+    try:
+        last = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last = 0
+
+    async def events():
+        nonlocal last
+        with broadcaster.subscription():
+            yield "retry: 2000\n\n"
+            while not await request.is_disconnected():
+                await broadcaster.wait_after(last, LONG_POLL_TIMEOUT)
+                msgs = broadcaster.catch_up(last)
+                if not msgs:
+                    yield ": keepalive\n\n"
+                    continue
+                for kind, seq, data in msgs:
+                    yield f"id: {seq}\nevent: {kind}\ndata: {data}\n\n"
+                last = msgs[-1][1]
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @api_router.get("/cache")
@@ -72,20 +146,295 @@ async def get_cache():
                 return json.load(f)
     except Exception:
         pass
+    if broadcaster.shared:
+        frame = broadcaster.fresh() or await broadcaster.wait_after(0, SHARED_WAIT)
+        if frame is not None:
+            return Response(frame.json(), media_type="application/json")
     return monitor.get_full_snapshot()
 
 
+@api_router.get("/hardware")
+async def get_hardware(since: Optional[int] = None):
+    """
+    带版本号的硬件清单。?since=版本号 时只返回此后变化的部分 {"version", "diff"}（未变化时 diff 为空，
+    已删除的部分列在 diff["$del"] 中）；
+    未给出或版本已过旧时返回完整清单 {"version", "hardware_info", "sources"}
+    """
+    version, info = await asyncio.to_thread(hardware_inventory.current)
+    if since is not None:
+        version, diff = hardware_inventory.diff_since(since)
+        if diff is not None:
+            return {"version": version, "diff": diff}
+    return {"version": version, "hardware_info": info, "sources": hardware_inventory.sources}
+
+
+@api_router.get("/cgroups")
+async def get_cgroups(top: int = 10, sort: str = "cpu"):
+    """cgroup v2 资源占用 top-N（按 cpu / mem / io_read / io_write / psi_* 降序）"""
+    return {
+        "available": cgroup_collector.available,
+        "root": cgroup_collector.root,
+        "sort": sort,
+        "cgroups": cgroup_collector.top(top, sort),
+        "timestamp": time.time(),
+    }
+
+
+@api_router.get("/cgroups/series")
+async def get_cgroup_series(path: str):
+    """单个 cgroup 的时间序列（cpu % / mem MB / io KB/s / PSI avg10）"""
+    series = cgroup_collector.series(path)
+    if series is None:
+        raise HTTPException(status_code=404, detail="cgroup not found")
+    return {
+        "path": "/" + path.strip("/"),
+        "series": {k: [[int(round(t * 1000)), v] for t, v in vals] for k, vals in series.items()},
+    }
+
+
+@api_router.get("/sensors")
+async def get_sensors(kind: Optional[str] = None):
+    """全部硬件传感器的描述与最新值，可按 kind（temp / fan / in / curr / power）过滤"""
+    return {
+        "cpu_temperature": sensor_collector.cpu_temperature(),
+        "sensors": sensor_collector.entries(kind),
+        "timestamp": time.time(),
+    }
+
+
+@api_router.get("/sensors/series")
+async def get_sensor_series(key: str):
+    """单个传感器的时间序列（key 为 /api/sensors 返回的 <设备>.<标签>）"""
+    series = sensor_collector.series(key)
+    if series is None:
+        raise HTTPException(status_code=404, detail="sensor not found")
+    return {"key": key, "series": [[int(round(t * 1000)), v] for t, v in series]}
+
+
+@api_router.get("/alerts")
+async def get_alerts():
+    """告警状态：已加载的规则与当前 pending / firing 的告警"""
+    return {
+        "enabled": alert_engine.enabled,
+        "rules": [r.to_dict() for r in alert_engine.rules],
+        "active": alert_engine.active(),
+        "timestamp": time.time(),
+    }
+
+
+@api_router.get("/history")
+async def get_history(
+    series: List[str] = Query(default=[]),
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+    points: int = 0,
+    width: int = 0,
+    mode: str = "lttb",
+):
+    """
+    历史序列查询：series 可重复或使用通配符（如 net.*.up），from / to 为 Unix 秒（默认最近 2 分钟）。
+    每条序列同时返回 data（数值）与 score（异常分数）。不带 series 时返回全部可查询的序列名。
+    points（或图表像素宽度 width）> 0 时服务端降采样，mode 可选 lttb / minmax。
+    """
+    if not series:
+        return {"series": history_store.series()}
+    if mode not in DOWNSAMPLE_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {DOWNSAMPLE_MODES}")
+    if not all(v is None or math.isfinite(v) for v in (start, end)):
+        raise HTTPException(status_code=400, detail="from / to must be finite numbers")
+    now = time.time()
+    start = now - monitor.CACHE_DURATION if start is None else start
+    end = now if end is None else end
+    names = history_store.resolve(series)
+    return {
+        "from": start,
+        "to": end,
+        "series": series_points(history_store, names, start, end, points or width, mode),
+    }
+
+
+@api_router.get("/anomalies")
+async def get_anomalies():
+    """每条序列的最新异常分数，以及超过阈值被标记的序列"""
+    names = list(history_store.names)  # 按列号排列（含已回收的空槽），与分数数组一一对应
+    scores = anomaly_detector.last_scores
+    return {
+        "method": anomaly_detector.method,
+        "threshold": anomaly_detector.threshold,
+        "flagged": monitor.DATA_CACHE.get("anomalies", {}),
+        "scores": {n: round(float(scores[i]), 2) for i, n in enumerate(names) if n is not None and i < len(scores)},
+    }
+
+
+@api_router.get("/query")
+def query_aggregate(
+    series: List[str] = Query(default=[]),
+    agg: str = "avg",
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+    range_: str = Query(default="1h", alias="range"),
+    step: Optional[str] = None,
+    window: Optional[str] = None,
+):
+    """
+    窗口聚合查询：agg 为 avg / min / max / sum / count / rate / p50 / p95 / p99（或任意 pNN）。
+    每隔 step 输出一个点，聚合其前 window 内的数据；step 缺省为整个范围（每条序列一个值），window 缺省等于 step。
+    时长支持 30s / 5m / 1h / 7d；from 缺省时取 to（缺省为最新数据）之前的 range。
+    """
+    try:
+        return run_query(
+            history_store, series, agg, start, end,
+            step=parse_duration(step) if step else None,
+            window=parse_duration(window) if window else None,
+            span=parse_duration(range_),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api_router.get("/cores/heatmap")
+def get_core_heatmap(
+    field: str = "usage",
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+    range_: str = Query(default="10m", alias="range"),
+    rows: int = 200,
+    cols: int = 64,
+    agg: str = "max",
+):
+    """
+    每核 CPU 热力图：field 为 usage / user / system / iowait / steal / irq / freq，
+    时间方向最多 rows 桶、核方向最多 cols 组（相邻核合并），agg 为 max / avg / min。
+    from 缺省时取 to（缺省为当前）之前的 range。
+    """
+    try:
+        end = time.time() if end is None else end
+        start = end - parse_duration(range_) if start is None else start
+        return core_history.heatmap(field, start, end, max(1, rows), max(1, cols), agg)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api_router.get("/processes/history")
+def get_process_history_index():
+    """正在保存历史的进程（保留期内进入过前列），按峰值 CPU 降序"""
+    return {"processes": process_history.processes(), "timestamp": time.time()}
+
+
+@api_router.get("/processes/groups")
+def get_process_groups(by: str = "user", sort: str = "cpu", top: int = 10):
+    """
+    进程分组汇总：by 为 user / name / service（systemd unit 或容器 scope），
+    按 sort（cpu / rss / disk_read / disk_write / count）降序取前 top 个分组
+    """
+    try:
+        return {"by": by, "sort": sort, "groups": process_history.group_totals(by, sort, top),
+                "timestamp": time.time()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api_router.get("/processes/groups/series")
+def get_process_group_series(
+    by: str,
+    name: str,
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+):
+    """单个分组的时间序列（cpu % / rss MB / 读写 KB/s / 进程数）；只保存进入过前列的分组"""
+    try:
+        series = process_history.group_series(by, name, start or 0, float("inf") if end is None else end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if series is None:
+        raise HTTPException(status_code=404, detail="group not found")
+    return {"by": by, "name": name, "series": series}
+
+
+@api_router.get("/processes/{pid}/history")
+def get_process_history(
+    pid: int,
+    start_time: Optional[float] = None,
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+):
+    """
+    单个进程的时间序列（cpu % / rss MB / 磁盘与网络 KB/s / 显存 MB）。
+    pid 被复用时默认返回最近启动的进程，可用 start_time（/api/processes/history 中的启动时刻）指定。
+    """
+    hit = process_history.process_series(pid, start_time, start or 0, float("inf") if end is None else end)
+    if hit is None:
+        raise HTTPException(status_code=404, detail="process history not found")
+    return hit
+
+
+@api_router.get("/export")
+def export_history(
+    metrics: List[str] = Query(default=[]),
+    start: Optional[float] = Query(default=None, alias="from"),
+    end: Optional[float] = Query(default=None, alias="to"),
+    fmt: str = Query(default="csv", alias="format"),
+):
+    """
+    流式导出历史数据：metrics 可重复或使用通配符（默认全部），from / to 为 Unix 秒（默认全部已保留数据），
+    format 为 csv / ndjson / parquet。按时间分段编码输出，内存占用与导出范围无关。
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(EXPORT_FORMATS)}")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="parquet export requires pyarrow")
+    start = 0.0 if start is None else start
+    end = time.time() if end is None else end
+    if not (math.isfinite(start) and math.isfinite(end)):
+        raise HTTPException(status_code=400, detail="from / to must be finite numbers")
+    if end < start:
+        raise HTTPException(status_code=400, detail="to must not be earlier than from")
+    names = history_store.resolve(metrics) if metrics else history_store.series()
+    filename = f"systemstatus-{int(start)}-{int(end)}.{fmt}"
+    return StreamingResponse(
+        export(history_store, names, start, end, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @api_router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """实时监控 WebSocket：连接后按固定间隔推送完整快照"""
+    """
+    实时监控 WebSocket：每帧推送完整快照（支持 ?points= 降采样），快照由广播流水线统一生成与编码。
+    硬件清单只随第一帧发送；之后的帧不含 hardware_info，清单版本变化时先发送
+    {"type": "hardware_changed", "version", "diff": {部分: 新值, "$del": [已删除的部分]}}，客户端合并后继续使用。
+    """
     await websocket.accept()
+    params = websocket.query_params
+    try:
+        points = int(params.get("points") or params.get("width") or 0)
+    except ValueError:
+        points = 0
+    mode = params.get("mode") if params.get("mode") in DOWNSAMPLE_MODES else "lttb"
+    seq = 0
+    sent = None  # 本连接已发送的 (硬件清单版本号, 清单)
     try:
-        while True:
-            try:
-                await websocket.send_json(monitor.get_full_snapshot())
-            except Exception:
-                break
-            await asyncio.sleep(WS_PUSH_INTERVAL)
+        with broadcaster.subscription():
+            while True:
+                frame = await broadcaster.wait_after(seq)
+                version = frame.snapshot.get("hardware_version")
+                try:
+                    if sent is None:
+                        await websocket.send_text(frame.json(points, mode))
+                        sent = (version, frame.snapshot.get("hardware_info") or {})
+                    else:
+                        if version != sent[0]:
+                            info = frame.snapshot.get("hardware_info") or {}
+                            diff = section_diff(sent[1], info)
+                            await websocket.send_text(json.dumps({"type": "hardware_changed", "version": version,
+                                                                  "diff": diff},
+                                                                 ensure_ascii=False, separators=(",", ":")))
+                            sent = (version, info)
+                        await websocket.send_text(frame.json(points, mode, hardware=False))
+                except Exception:
+                    break
+                seq = frame.seq
     except WebSocketDisconnect:
         pass
     except Exception:
@@ -0,0 +1,26 @@
+"""
+静态资源路由：/static/ 下的文件由 AssetPipeline 预先指纹化与压缩，这里只做查找、协商与 304 判断
+"""
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from ..assets import Asset, respond, static_assets
+
+static_router = APIRouter()
+
+
+def asset_response(request: Request, asset: Asset, immutable: bool) -> Response:
+    status, headers, body = respond(asset, request.headers.get("accept-encoding"),
+                                    request.headers.get("if-none-match"), immutable)
+    if status == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body if request.method != "HEAD" else b"", status_code=status,
+                    headers=dict(headers, **{"Content-Length": str(len(body))}), media_type=asset.media_type)
+
+
+@static_router.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_static(path: str, request: Request):
+    """指纹路径长期缓存（immutable），原始路径每次用 ETag 重新验证"""
+    asset, immutable = static_assets.lookup(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return asset_response(request, asset, immutable)
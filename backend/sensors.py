@@ -0,0 +1,271 @@
+"""
+硬件传感器采集模块
+枚举 /sys/class/hwmon 与 /sys/class/thermal 下的全部传感器：每路 CPU 封装（Package id N）与每个核心温度、
+NVMe、芯片组、内存条、风扇转速、电压与功耗，每个传感器保存为一条带标签的时间序列。
+枚举只在启动、定期重扫（rescan_interval）或设备消失时进行：各 *_input 文件的描述符与标签常驻缓存，
+每轮对每个传感器只做一次 pread，不再 open / close 也不重新读取 name / label。
+没有 hwmon 的平台（或非真实数据源）由 ingest() 接收 psutil 形状的 sensors_temperatures() 结果。
+所有路径均以 hwmon_root / thermal_root 为基准，可直接指向一个伪造的 sysfs 目录树进行测试。
+"""
+import errno
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+from .app_config import get_sensors_config
+
+HWMON_ROOT = "/sys/class/hwmon"
+THERMAL_ROOT = "/sys/class/thermal"
+HISTORY_DURATION = 120  # 与 monitor.CACHE_DURATION 保持一致：保留 2 分钟
+
+# hwmon 输入类型（*_input 文件前缀）：(换算除数, 单位)
+KINDS = {
+    "temp": (1000.0, "°C"),
+    "fan": (1.0, "RPM"),
+    "in": (1000.0, "V"),
+    "curr": (1000.0, "A"),
+    "power": (1000000.0, "W"),
+}
+_INPUT_RE = re.compile(r"^(temp|fan|in|curr|power)(\d+)_input$")
+# 设备已移除（热插拔、驱动卸载）时 pread 的错误码：触发一次重新枚举
+_GONE = {errno.ENODEV, errno.ENXIO, errno.ENOENT, errno.ESTALE}
+
+# 按优先级查找 CPU 温度的芯片名；每项为 (芯片, 优先采用的标签前缀)
+CPU_CHIPS = (
+    ("coretemp", ("package",)),
+    ("k10temp", ("tctl", "tdie")),
+    ("zenpower", ("tctl", "tdie")),
+    ("cpu_thermal", ()),
+    ("x86_pkg_temp", ()),
+    ("acpitz", ()),
+)
+
+
+def slug(text: str) -> str:
+    """标签规整为序列名片段：小写，非字母数字替换为下划线（"Package id 0" -> package_id_0）"""
+    return re.sub(r"[^0-9a-z]+", "_", text.strip().lower()).strip("_")
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class Sensor:
+    """一个传感器：key 为 <设备>.<标签>，chip 为驱动名（同名设备共享，如两路 coretemp）"""
+
+    __slots__ = ("key", "chip", "device", "label", "kind", "path", "scale", "unit", "fd")
+
+    def __init__(self, chip: str, device: str, label: str, kind: str, path: str):
+        self.chip = chip
+        self.device = device
+        self.label = label
+        self.kind = kind
+        self.path = path
+        self.scale, self.unit = KINDS[kind]
+        self.key = f"{device}.{slug(label) or kind}"
+        self.fd = None
+
+    def info(self) -> Dict:
+        return {"key": self.key, "chip": self.chip, "device": self.device,
+                "label": self.label, "kind": self.kind, "unit": self.unit}
+
+
+def _unique_keys(sensors: List[Sensor]):
+    """同一设备下标签重复（如多个 "Composite"）时追加序号，保证序列名唯一"""
+    seen: Dict[str, int] = {}
+    for s in sensors:
+        n = seen.get(s.key, 0)
+        seen[s.key] = n + 1
+        if n:
+            s.key = f"{s.key}_{n}"
+
+
+def enumerate_hwmon(root: str) -> List[Sensor]:
+    """枚举 root 下的 hwmonN 目录；同名芯片（多路 CPU、多块 NVMe）按 hwmon 序号编号为 name_1、name_2…"""
+    try:
+        dirs = sorted((e for e in os.listdir(root) if e.startswith("hwmon")),
+                      key=lambda e: int(e[5:]) if e[5:].isdigit() else 0)
+    except OSError:
+        return []
+    chips = []
+    for d in dirs:
+        path = os.path.join(root, d)
+        # 少数驱动把 name 与 *_input 放在 device/ 子目录下
+        if not os.path.exists(os.path.join(path, "name")) and os.path.exists(os.path.join(path, "device", "name")):
+            path = os.path.join(path, "device")
+        name = slug(_read_text(os.path.join(path, "name")) or d)
+        chips.append((name, path))
+    counts: Dict[str, int] = {}
+    sensors = []
+    for name, path in chips:
+        n = counts.get(name, 0)
+        counts[name] = n + 1
+        device = f"{name}_{n}" if n else name
+        try:
+            files = sorted(os.listdir(path))
+        except OSError:
+            continue
+        for f in files:
+            m = _INPUT_RE.match(f)
+            if not m:
+                continue
+            kind, idx = m.group(1), m.group(2)
+            label = _read_text(os.path.join(path, f"{kind}{idx}_label")) or f"{kind}{idx}"
+            sensors.append(Sensor(name, device, label, kind, os.path.join(path, f)))
+    return sensors
+
+
+def enumerate_thermal(root: str, skip: set) -> List[Sensor]:
+    """枚举 thermal_zoneN；类型已作为 hwmon 芯片出现（如 acpitz）的跳过，避免同一传感器出现两次"""
+    try:
+        zones = sorted((e for e in os.listdir(root) if e.startswith("thermal_zone")),
+                       key=lambda e: int(e[12:]) if e[12:].isdigit() else 0)
+    except OSError:
+        return []
+    counts: Dict[str, int] = {}
+    sensors = []
+    for z in zones:
+        path = os.path.join(root, z)
+        kind = slug(_read_text(os.path.join(path, "type")) or z)
+        if kind in skip or not os.path.exists(os.path.join(path, "temp")):
+            continue
+        n = counts.get(kind, 0)
+        counts[kind] = n + 1
+        device = f"{kind}_{n}" if n else kind
+        sensors.append(Sensor(kind, device, "temp", "temp", os.path.join(path, "temp")))
+    return sensors
+
+
+class SensorCollector:
+    """hwmon / thermal 传感器采集器：维护传感器枚举与描述符缓存、最新值与每个传感器的时间序列"""
+
+    def __init__(self, hwmon_root: str = HWMON_ROOT, thermal_root: str = THERMAL_ROOT,
+                 rescan_interval: float = 300):
+        self.hwmon_root = hwmon_root
+        self.thermal_root = thermal_root
+        # 风扇、NVMe 等可能在运行中出现（模块加载、热插拔），故定期重新枚举兜底
+        self.rescan_interval = rescan_interval
+        self._last_scan = 0.0
+        self._rescan = True
+        self.sensors: List[Sensor] = []
+        # 时间序列：{传感器: [(ts, val), ...]}
+        self.history: Dict[str, List] = {}
+        # 最近一轮的读数：{传感器: 值}
+        self.latest: Dict[str, float] = {}
+        self._info: Dict[str, Dict] = {}
+
+    @property
+    def available(self) -> bool:
+        return os.path.isdir(self.hwmon_root) or os.path.isdir(self.thermal_root)
+
+    def close(self):
+        for s in self.sensors:
+            if s.fd is not None:
+                try:
+                    os.close(s.fd)
+                except OSError:
+                    pass
+                s.fd = None
+
+    def scan(self) -> List[Sensor]:
+        """重新枚举全部传感器并打开描述符；打不开的（无权限、已移除）直接丢弃"""
+        self.close()
+        sensors = enumerate_hwmon(self.hwmon_root)
+        sensors += enumerate_thermal(self.thermal_root, {s.chip for s in sensors})
+        _unique_keys(sensors)
+        opened = []
+        for s in sensors:
+            try:
+                s.fd = os.open(s.path, os.O_RDONLY)
+            except OSError:
+                continue
+            opened.append(s)
+        self.sensors = opened
+        self._info = {s.key: s.info() for s in opened}
+        self._last_scan = time.monotonic()
+        self._rescan = False
+        return opened
+
+    def read(self) -> Dict[str, float]:
+        """每个传感器一次 pread；暂时无读数（ENODATA、EIO，如未接风扇）的跳过，设备消失时下一轮重新枚举"""
+        if self._rescan or time.monotonic() - self._last_scan >= self.rescan_interval:
+            self.scan()
+        out = {}
+        for s in self.sensors:
+            try:
+                raw = os.pread(s.fd, 32, 0)
+                out[s.key] = round(int(raw) / s.scale, 3 if s.kind in ("in", "curr") else 1)
+            except OSError as e:
+                if e.errno in _GONE:
+                    self._rescan = True
+            except ValueError:
+                continue
+        return out
+
+    def _record(self, ts: float, values: Dict[str, float]) -> Dict[str, float]:
+        for key, v in values.items():
+            hist = self.history.setdefault(key, [])
+            hist.append((ts, v))
+            if ts - hist[0][0] > HISTORY_DURATION:
+                self.history[key] = [x for x in hist if ts - x[0] <= HISTORY_DURATION]
+        # 已消失的传感器同步清理（暂时无读数的保留历史）
+        for key in list(self.history.keys()):
+            if key not in self._info:
+                del self.history[key]
+        self.latest = values
+        return values
+
+    def sample(self, timestamp: Optional[float] = None) -> Dict[str, float]:
+        """采集一轮并写入时间序列，返回 {传感器: 值}"""
+        ts = timestamp if timestamp is not None else time.time()
+        return self._record(ts, self.read())
+
+    def ingest(self, temps: Dict[str, List], timestamp: Optional[float] = None) -> Dict[str, float]:
+        """接收 psutil 形状的 {芯片: [带 label / current 属性的读数]}（非 Linux 或合成数据源），与 sample() 同样记录"""
+        ts = timestamp if timestamp is not None else time.time()
+        sensors, values = [], []
+        for chip, entries in (temps or {}).items():
+            name = slug(chip)
+            for i, e in enumerate(entries):
+                sensors.append(Sensor(name, name, e.label or f"temp{i + 1}", "temp", ""))
+                values.append(e.current)
+        _unique_keys(sensors)
+        self._info = {s.key: s.info() for s in sensors}
+        return self._record(ts, {s.key: round(v, 1) for s, v in zip(sensors, values) if v is not None})
+
+    def cpu_temperature(self) -> Optional[float]:
+        """按 CPU_CHIPS 优先级取 CPU 温度：多路 CPU 取最热的封装温度，没有封装标签时取该芯片的最高温度"""
+        for chip, prefer in CPU_CHIPS:
+            vals, preferred = [], []
+            for key, info in self._info.items():
+                if info["chip"] != chip or info["kind"] != "temp" or key not in self.latest:
+                    continue
+                v = self.latest[key]
+                vals.append(v)
+                if slug(info["label"]).startswith(prefer):
+                    preferred.append(v)
+            if preferred or vals:
+                return max(preferred or vals)
+        return None
+
+    def entries(self, kind: Optional[str] = None) -> List[Dict]:
+        """全部传感器的描述与最新值，可按类型（temp / fan / in / curr / power）过滤"""
+        return [dict(info, value=self.latest.get(key)) for key, info in self._info.items()
+                if kind is None or info["kind"] == kind]
+
+    def series(self, key: str) -> Optional[List]:
+        return self.history.get(key)
+
+
+_CFG = get_sensors_config()
+SENSORS_ENABLED = bool(_CFG.get("enable", True))
+sensor_collector = SensorCollector(
+    hwmon_root=_CFG.get("hwmon_root") or HWMON_ROOT,
+    thermal_root=_CFG.get("thermal_root") or THERMAL_ROOT,
+    rescan_interval=float(_CFG.get("rescan_interval", 300)),
+)
@@ -0,0 +1,137 @@
+"""
+共享内存快照段
+多进程模式下采集进程把每帧已编码的快照与增量写入一块共享内存，各 uvicorn worker 直接从中读取，
+不再各自采集、编码。布局（小端）：
+- 头部 64 字节：magic、快照槽大小、增量槽大小、增量槽数、最新帧序号、最近一次读取需求的时间戳；
+- 快照区：2 个槽按帧序号奇偶交替写入（读者读取期间写者最多推进一帧，不会覆盖正在读的槽）；
+- 增量区：backlog 个槽按 帧序号 % backlog 环形写入，供断线重连 / 长轮询补发。
+每个槽以 seqlock 保护：写者先把锁计数加 1（奇数表示写入中），写完数据、长度与 CRC32 后再加 1；
+读者在锁为偶数且前后两次读取一致、CRC 校验通过时才采用复制出的数据，否则重试，
+因此写者从不等待读者，读者也不需要跨进程锁。CRC 同时兜底弱内存序平台上的乱序可见。
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Optional
+
+SHM_ENV = "SYSTEMSTATUS_SHM"  # worker 通过该环境变量得知共享内存段名称
+MAGIC = b"SSSHM001"
+HEADER_SIZE = 64
+SLOT_HEADER = 24               # lock u64、seq u64、length u32、crc u32
+TOO_BIG = 0xFFFFFFFF           # 数据超过槽大小时写入的长度标记，读者视为缺失
+_HEADER = struct.Struct("<8sIII")
+_LATEST = 24                   # 最新帧序号 u64 的偏移
+_DEMAND = 32                   # 需求时间戳 f64 的偏移
+_SLOT = struct.Struct("<QQII")
+
+
+class SnapshotSegment:
+    """共享内存快照段：采集进程 create() 后写入，worker 以 attach() 只读方式打开"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.buf = shm.buf
+        self.owner = owner
+        magic, self.snap_size, self.delta_size, self.backlog = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"共享内存段 {shm.name} 格式不匹配")
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, snap_size: int, delta_size: int, backlog: int, name: Optional[str] = None) -> "SnapshotSegment":
+        size = HEADER_SIZE + 2 * (SLOT_HEADER + snap_size) + backlog * (SLOT_HEADER + delta_size)
+        shm = shared_memory.SharedMemory(name=name or f"systemstatus_{os.getpid()}", create=True, size=size)
+        shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, snap_size, delta_size, backlog)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SnapshotSegment":
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+        # 3.13 之前 attach 也会登记到 resource_tracker；spawn 出的 worker 与采集进程共用同一个
+        # tracker，登记后再注销会抵消采集进程自己的登记，这里在打开期间跳过登记
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda n, rtype: None if rtype == "shared_memory" else register(n, rtype)
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ---------- 偏移 ----------
+    def _snap_offset(self, seq: int) -> int:
+        return HEADER_SIZE + (seq % 2) * (SLOT_HEADER + self.snap_size)
+
+    def _delta_offset(self, seq: int) -> int:
+        return HEADER_SIZE + 2 * (SLOT_HEADER + self.snap_size) + (seq % self.backlog) * (SLOT_HEADER + self.delta_size)
+
+    # ---------- 写者（仅采集进程） ----------
+    def _write_slot(self, off: int, size: int, seq: int, data: bytes):
+        buf = self.buf
+        lock = struct.unpack_from("<Q", buf, off)[0]
+        struct.pack_into("<Q", buf, off, lock + 1)
+        if len(data) > size:
+            _SLOT.pack_into(buf, off, lock + 1, seq, TOO_BIG, 0)
+        else:
+            start = off + SLOT_HEADER
+            buf[start:start + len(data)] = data
+            _SLOT.pack_into(buf, off, lock + 1, seq, len(data), zlib.crc32(data))
+        struct.pack_into("<Q", buf, off, lock + 2)
+
+    def write(self, seq: int, snapshot: bytes, delta: bytes) -> bool:
+        """写入一帧（已编码的完整快照与增量）并发布其序号；快照超过槽大小时返回 False"""
+        self._write_slot(self._delta_offset(seq), self.delta_size, seq, delta)
+        self._write_slot(self._snap_offset(seq), self.snap_size, seq, snapshot)
+        struct.pack_into("<Q", self.buf, _LATEST, seq)
+        return len(snapshot) <= self.snap_size
+
+    def demand(self) -> float:
+        """最近一次有 worker 需要数据的时间（time.time()），采集进程据此在无人订阅时暂停编码"""
+        return struct.unpack_from("<d", self.buf, _DEMAND)[0]
+
+    # ---------- 读者（worker） ----------
+    def touch(self):
+        struct.pack_into("<d", self.buf, _DEMAND, time.time())
+
+    def latest(self) -> int:
+        return struct.unpack_from("<Q", self.buf, _LATEST)[0]
+
+    def _read_slot(self, off: int, seq: int, retries: int = 100) -> Optional[bytes]:
+        buf = self.buf
+        for i in range(retries):
+            lock, s, length, crc = _SLOT.unpack_from(buf, off)
+            if lock & 1:
+                time.sleep(0 if i < 10 else 0.001)
+                continue
+            if s != seq or length == TOO_BIG:
+                return None  # 已被更新的帧覆盖，或数据超过槽大小
+            start = off + SLOT_HEADER
+            data = bytes(buf[start:start + length])
+            if struct.unpack_from("<Q", buf, off)[0] == lock and zlib.crc32(data) == crc:
+                return data
+        return None
+
+    def snapshot(self, seq: int) -> Optional[bytes]:
+        """seq 号帧的完整快照 JSON；该帧已不是最近两帧之一时返回 None"""
+        return self._read_slot(self._snap_offset(seq), seq)
+
+    def delta(self, seq: int) -> Optional[bytes]:
+        """seq 号帧相对上一帧的增量 JSON；已被环形覆盖或过大时返回 None"""
+        return self._read_slot(self._delta_offset(seq), seq)
@@ -0,0 +1,203 @@
+"""
+工具类样式的离线编译
+页面原先从 unpkg 加载 @tailwindcss/browser，在浏览器中扫描 DOM 并编译工具类：每次打开都要下载并运行编译器，
+离线网络中则整页失去布局。这里扫描 SOURCES 中出现的类名，只为其中认得的 Tailwind v4 工具类生成 CSS，
+连同 preflight 写入 frontend/tailwind.css（python -m backend.tailwind）；静态资源流水线构建时按当前源码重新生成
+该文件的内容，提供的样式总与源码一致，仓库中的文件供关闭指纹（直接挂载 frontend/）时使用：
+- 规则与 Tailwind v4 的输出一致（间距 0.25rem 一档，断点 sm 40rem / md 48rem / lg 64rem / xl 80rem），
+  只覆盖面板用到的工具类族；不认得的类名（自定义组件类、拼接出的字符串）直接忽略；
+- preflight 与工具类分别放在 @layer base / utilities 中，与运行时相同：style.css 中未分层的规则优先；
+- 工具类按族的先后与断点排序（p → px / py → pt / pr ...），简写在前、具体方向在后，同断点内后者覆盖前者。
+新增工具类后重新执行本模块即可；不在规则表中的写法需先在 _RULES 中补充。
+"""
+import argparse
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .app_config import BASE_DIR
+
+FRONTEND_DIR = BASE_DIR / "frontend"
+SOURCES = ("index.html", "script.js")  # 相对 frontend/ 的扫描范围
+OUTPUT = "tailwind.css"
+
+BREAKPOINTS = (("sm", "40rem"), ("md", "48rem"), ("lg", "64rem"), ("xl", "80rem"), ("2xl", "96rem"))
+_VARIANTS = {name: i + 1 for i, (name, _) in enumerate(BREAKPOINTS)}
+_VARIANTS["hover"] = len(BREAKPOINTS) + 1
+
+FONT_MONO = ('ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", '
+             'monospace')
+FONT_SANS = ('ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", '
+             '"Noto Color Emoji"')
+
+PREFLIGHT = f"""*, ::after, ::before, ::backdrop, ::file-selector-button {{ box-sizing: border-box; margin: 0; padding: 0; border: 0 solid; }}
+html, :host {{ line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: {FONT_SANS}; -webkit-tap-highlight-color: transparent; }}
+hr {{ height: 0; color: inherit; border-top-width: 1px; }}
+abbr:where([title]) {{ text-decoration: underline dotted; }}
+h1, h2, h3, h4, h5, h6 {{ font-size: inherit; font-weight: inherit; }}
+a {{ color: inherit; text-decoration: inherit; }}
+b, strong {{ font-weight: bolder; }}
+code, kbd, samp, pre {{ font-family: {FONT_MONO}; font-size: 1em; }}
+small {{ font-size: 80%; }}
+sub, sup {{ font-size: 75%; line-height: 0; position: relative; vertical-align: baseline; }}
+sub {{ bottom: -0.25em; }}
+sup {{ top: -0.5em; }}
+table {{ text-indent: 0; border-color: inherit; border-collapse: collapse; }}
+:-moz-focusring {{ outline: auto; }}
+progress {{ vertical-align: baseline; }}
+summary {{ display: list-item; }}
+ol, ul, menu {{ list-style: none; }}
+img, svg, video, canvas, audio, iframe, embed, object {{ display: block; vertical-align: middle; }}
+img, video {{ max-width: 100%; height: auto; }}
+button, input, select, optgroup, textarea, ::file-selector-button {{ font: inherit; font-feature-settings: inherit; font-variation-settings: inherit; letter-spacing: inherit; color: inherit; border-radius: 0; background-color: transparent; opacity: 1; }}
+:where(select:is([multiple], [size])) optgroup {{ font-weight: bolder; }}
+::placeholder {{ opacity: 1; }}
+textarea {{ resize: vertical; }}
+button, input:where([type="button"], [type="reset"], [type="submit"]), ::file-selector-button {{ appearance: button; }}
+[hidden]:where(:not([hidden="until-found"])) {{ display: none !important; }}"""
+
+# 固定写法的工具类
+_STATIC = {
+    "flex": "display: flex", "grid": "display: grid", "block": "display: block", "hidden": "display: none",
+    "inline-flex": "display: inline-flex", "sticky": "position: sticky", "relative": "position: relative",
+    "flex-col": "flex-direction: column", "flex-1": "flex: 1", "shrink-0": "flex-shrink: 0",
+    "items-center": "align-items: center", "items-baseline": "align-items: baseline",
+    "items-end": "align-items: flex-end", "items-start": "align-items: flex-start",
+    "justify-between": "justify-content: space-between", "justify-center": "justify-content: center",
+    "justify-end": "justify-content: flex-end", "justify-start": "justify-content: flex-start",
+    "text-left": "text-align: left", "text-center": "text-align: center", "text-right": "text-align: right",
+    "font-medium": "font-weight: 500", "font-semibold": "font-weight: 600", "font-bold": "font-weight: 700",
+    "font-mono": f"font-family: {FONT_MONO}",
+    "leading-tight": "line-height: 1.25", "leading-snug": "line-height: 1.375",
+    "leading-relaxed": "line-height: 1.625",
+    "tracking-tight": "letter-spacing: -0.025em",
+    "rounded-md": "border-radius: 0.375rem", "rounded-lg": "border-radius: 0.5rem",
+    "rounded-xl": "border-radius: 0.75rem", "rounded-full": "border-radius: calc(infinity * 1px)",
+    "cursor-pointer": "cursor: pointer", "outline-none": "outline-style: none",
+    "overflow-auto": "overflow: auto", "overflow-hidden": "overflow: hidden", "overflow-x-auto": "overflow-x: auto",
+    "border-collapse": "border-collapse: collapse", "truncate": "overflow: hidden; text-overflow: ellipsis; "
+                                                                "white-space: nowrap",
+    "w-full": "width: 100%", "h-full": "height: 100%", "h-screen": "height: 100vh",
+    "min-h-screen": "min-height: 100vh", "min-w-0": "min-width: 0",
+    "mt-auto": "margin-top: auto", "ml-auto": "margin-left: auto", "mx-auto": "margin-inline: auto",
+}
+
+_SPACING_PROPS = {
+    "p": ("padding",), "px": ("padding-inline",), "py": ("padding-block",),
+    "pt": ("padding-top",), "pr": ("padding-right",), "pb": ("padding-bottom",), "pl": ("padding-left",),
+    "m": ("margin",), "mx": ("margin-inline",), "my": ("margin-block",),
+    "mt": ("margin-top",), "mr": ("margin-right",), "mb": ("margin-bottom",), "ml": ("margin-left",),
+    "gap": ("gap",), "gap-x": ("column-gap",), "gap-y": ("row-gap",),
+    "w": ("width",), "h": ("height",), "top": ("top",), "left": ("left",), "right": ("right",), "bottom": ("bottom",),
+}
+_NUM = r"(\d+(?:\.5)?)"
+_ARBITRARY_COLOR = r"\[((?:var\(--[\w-]+\))|(?:#[0-9a-fA-F]{3,8})|(?:rgba?\([\d.,\s%]+\)))\]"
+
+# (正则, 选择器后缀, 生成声明) —— 列表顺序即同一断点内的输出顺序（固定写法排在最前）
+_RULES: List[Tuple["re.Pattern", str, Callable]] = [
+    (re.compile(r"grid-cols-(\d+)"), "", lambda m: f"grid-template-columns: repeat({m[1]}, minmax(0, 1fr))"),
+    (re.compile(r"col-span-(\d+)"), "", lambda m: f"grid-column: span {m[1]} / span {m[1]}"),
+    (re.compile(rf"space-y-{_NUM}"), " > :not(:last-child)",
+     lambda m: f"margin-block-start: 0; margin-block-end: {_spacing(m[1])}"),
+    (re.compile(r"text-\[(\d+(?:\.\d+)?(?:px|rem|em))\]"), "", lambda m: f"font-size: {m[1]}"),
+    (re.compile(rf"text-{_ARBITRARY_COLOR}"), "", lambda m: f"color: {m[1]}"),
+    (re.compile(rf"bg-{_ARBITRARY_COLOR}"), "", lambda m: f"background-color: {m[1]}"),
+    (re.compile(rf"accent-{_ARBITRARY_COLOR}"), "", lambda m: f"accent-color: {m[1]}"),
+]
+for _prefix, _props in _SPACING_PROPS.items():
+    _RULES.append((re.compile(rf"{_prefix}-{_NUM}"), "",
+                   lambda m, props=_props: "; ".join(f"{p}: {_spacing(m[1])}" for p in props)))
+
+_CANDIDATE_RE = re.compile(r"[^\s\"'`<>=${}]+")
+_ESCAPE_RE = re.compile(r"([^a-zA-Z0-9_-])")
+
+
+def _spacing(n: str) -> str:
+    v = float(n) * 0.25
+    return "0" if v == 0 else f"{v:g}rem"
+
+
+def _selector(cls: str) -> str:
+    return "." + _ESCAPE_RE.sub(r"\\\1", cls)
+
+
+_STATIC_ORDER = {name: i for i, name in enumerate(_STATIC)}
+
+
+def _rule(utility: str) -> Optional[Tuple[Tuple[int, int], str, str]]:
+    """把不带变体的工具类解析为 (排序键, 选择器后缀, 声明)，不认得时返回 None"""
+    if utility in _STATIC:
+        return (0, _STATIC_ORDER[utility]), "", _STATIC[utility]
+    for i, (pattern, suffix, build) in enumerate(_RULES):
+        m = pattern.fullmatch(utility)
+        if m:
+            return (i + 1, 0), suffix, build(m)
+    return None
+
+
+def candidates(texts: Iterable[str]) -> List[str]:
+    """从源码中取出可能是类名的片段（与 Tailwind 的扫描方式相同：宁多勿漏，由规则表筛选）"""
+    out = set()
+    for text in texts:
+        out.update(_CANDIDATE_RE.findall(text))
+    return sorted(out)
+
+
+def compile_css(classes: Iterable[str]) -> Tuple[str, List[str]]:
+    """为认得的工具类生成 CSS，返回 (CSS 文本, 生成了规则的类名)"""
+    entries = []
+    for cls in classes:
+        variant, _, utility = cls.rpartition(":")
+        if variant and variant not in _VARIANTS:
+            continue
+        parsed = _rule(utility)
+        if parsed is None:
+            continue
+        order, suffix, decl = parsed
+        entries.append(((_VARIANTS.get(variant, 0),) + order + (utility,), cls, variant, suffix, decl))
+    entries.sort(key=lambda e: e[0])
+    lines = []
+    media = dict(BREAKPOINTS)
+    for _, cls, variant, suffix, decl in entries:
+        sel = _selector(cls) + (":hover" if variant == "hover" else "")
+        if suffix:
+            sel = f":where({sel}{suffix})"
+        rule = f"{sel} {{ {decl}; }}"
+        if variant in media:
+            rule = f"@media (width >= {media[variant]}) {{ {rule} }}"
+        lines.append("  " + rule)
+    css = ("/* 由 backend/tailwind.py 生成，请勿手动修改；新增工具类后执行 python -m backend.tailwind */\n"
+           "@layer theme, base, components, utilities;\n"
+           "@layer base {\n" + "\n".join("  " + line for line in PREFLIGHT.split("\n")) + "\n}\n"
+           "@layer utilities {\n" + "\n".join(lines) + "\n}\n")
+    return css, [e[1] for e in entries]
+
+
+def build(root: Path = FRONTEND_DIR) -> Tuple[str, List[str]]:
+    texts = [(root / rel).read_text(encoding="utf-8") for rel in SOURCES if (root / rel).exists()]
+    return compile_css(candidates(texts))
+
+
+def write(root: Path = FRONTEND_DIR) -> Dict:
+    """重新生成 frontend/tailwind.css，内容不变时不写入（不改变指纹）"""
+    css, used = build(root)
+    path = root / OUTPUT
+    old = path.read_text(encoding="utf-8") if path.exists() else None
+    if old != css:
+        path.write_text(css, encoding="utf-8")
+    return {"path": str(path), "classes": len(used), "bytes": len(css.encode("utf-8")), "changed": old != css}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="扫描前端源码中的 Tailwind 工具类，生成只含用到部分的 tailwind.css")
+    ap.add_argument("--root", default=str(FRONTEND_DIR))
+    ap.add_argument("--list", action="store_true", help="列出生成了规则的类名")
+    args = ap.parse_args()
+    root = Path(args.root)
+    if args.list:
+        print("\n".join(build(root)[1]))
+    print(write(root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+多进程模式
+server.workers > 1 时，启动进程作为采集进程：唯一的采集线程、NVML 会话与 tmp.json 写入者，
+创建共享内存快照段并启动发布线程，同时在 127.0.0.1 的内部端口上运行一份完整应用；
+对外端口由 uvicorn 的 N 个 worker 进程提供服务：
+- 快照类接口（/api/data、/api/stream、/api/ws、/api/cache）、静态资源与无状态接口由 worker 直接响应，
+  快照从共享内存读取，每帧每个 worker 只复制一次；
+- 其余依赖采集进程内存状态的接口（历史查询、聚合、导出、cgroup、传感器、告警等）转发到内部端口，
+  响应体按块边读边转发（导出等大响应不在 worker 中整体缓冲）。
+worker 通过环境变量得知共享内存段名称与内部端口，未设置时（单进程模式）本模块不生效。
+"""
+import asyncio
+import http.client
+import os
+import socket
+import threading
+from typing import Dict
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .app_config import get_server_config
+from .broadcast import BACKLOG, publish_forever
+from .shm import SHM_ENV, SnapshotSegment
+
+COLLECTOR_ENV = "SYSTEMSTATUS_COLLECTOR"  # 采集进程内部端口
+WORKER_MODE = bool(os.environ.get(SHM_ENV))
+COLLECTOR_PORT = int(os.environ.get(COLLECTOR_ENV) or 0)
+FORWARD_TIMEOUT = 60.0
+FORWARD_CHUNK = 64 << 10  # 转发响应体时每次读取的字节数；不超过该长度的响应整体返回
+# worker 本地处理的接口：快照类从共享内存读取，其余不依赖采集进程状态
+LOCAL_PATHS = {"/api", "/api/", "/api/health", "/api/config", "/api/version",
+               "/api/data", "/api/stream", "/api/ws", "/api/cache"}
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer",
+               "upgrade", "content-length", "host"}
+
+
+def is_local(path: str) -> bool:
+    return not path.startswith("/api") or path in LOCAL_PATHS
+
+
+def _strip(headers) -> Dict[str, str]:
+    return {k: v for k, v in headers if k.lower() not in _HOP_BY_HOP}
+
+
+async def forward(request: Request) -> Response:
+    """
+    把请求原样转发到采集进程的内部端口。长度已知且不超过 FORWARD_CHUNK 的响应整体返回，
+    其余（/api/export 等流式响应）按块读取、边读边发送，worker 内存占用与响应大小无关。
+    """
+    body = await request.body()
+    target = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+    headers = _strip(request.headers.items())
+
+    def call():
+        conn = http.client.HTTPConnection("127.0.0.1", COLLECTOR_PORT, timeout=FORWARD_TIMEOUT)
+        try:
+            conn.request(request.method, target, body=body or None, headers=headers)
+            resp = conn.getresponse()
+            if resp.length is not None and resp.length <= FORWARD_CHUNK:
+                data = resp.read()
+                conn.close()
+                return conn, resp, data
+            return conn, resp, None
+        except BaseException:
+            conn.close()
+            raise
+
+    try:
+        conn, resp, data = await asyncio.to_thread(call)
+    except OSError as e:
+        return JSONResponse({"detail": f"采集进程不可用: {e}"}, status_code=502)
+    if data is not None:
+        return Response(data, status_code=resp.status, headers=_strip(resp.getheaders()))
+
+    async def chunks():
+        try:
+            while True:
+                chunk = await asyncio.to_thread(resp.read, FORWARD_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            conn.close()
+
+    return StreamingResponse(chunks(), status_code=resp.status, headers=_strip(resp.getheaders()))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app, app_path: str, host: str, port: int, workers: int, **uvicorn_kwargs):
+    """
+    在当前进程（已调用 start_monitor 的采集进程）中启动多进程模式，阻塞直到 uvicorn 退出。
+    app 为本进程内的应用（内部端口使用），app_path 为 worker 导入应用的路径（如 "main:app"）。
+    """
+    import uvicorn
+
+    cfg = get_server_config()
+    segment = SnapshotSegment.create(int(cfg.get("shm_snapshot_mb", 8)) << 20,
+                                     int(cfg.get("shm_delta_kb", 256)) << 10, BACKLOG)
+    stop = threading.Event()
+    publisher = threading.Thread(target=publish_forever, args=(segment, stop), daemon=True)
+    publisher.start()
+
+    internal_port = _free_port()
+    internal = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=internal_port, log_level="warning"))
+    threading.Thread(target=internal.run, daemon=True).start()
+
+    # worker 由 uvicorn 以 spawn 方式启动，继承这里设置的环境变量
+    os.environ[SHM_ENV] = segment.name
+    os.environ[COLLECTOR_ENV] = str(internal_port)
+    print(f"[OK] 多进程模式：{workers} 个 worker，共享内存段 {segment.name}，采集进程内部端口 {internal_port}")
+    try:
+        uvicorn.run(app_path, host=host, port=port, workers=workers, **uvicorn_kwargs)
+    finally:
+        stop.set()
+        internal.should_exit = True
+        publisher.join(timeout=5)
+        segment.close()
@@ -0,0 +1 @@
+# SystemStatus Benchmarks
@@ -0,0 +1,94 @@
+"""
+基准套件入口：依次运行采集 / 快照 / 编码、/proc 快速路径、传感器读取、网卡序列基数、磁盘用量、WebSocket 扇出、异常检测、多进程吞吐基准，结果可保存为基线并与之比较。
+用法：
+    python -m bench                              # 运行全部并打印
+    python -m bench --save bench/baseline.json   # 保存为基线（JSON）
+    python -m bench --compare bench/baseline.json --tolerance 0.25   # 与基线比较，p50 变慢超过 25% 时退出码为 1
+    python -m bench --only collector,fanout --quick
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+from . import anomaly, cardinality, collector, diskusage, fanout, procfs, sensors, workers
+from .common import environment
+
+SUITES = ("collector", "procfs", "sensors", "cardinality", "diskusage", "fanout", "anomaly", "workers")
+# 用于匹配基线条目的参数字段
+_KEY_FIELDS = ("case", "provider", "procs", "nics", "disks", "history", "clients", "series", "method", "workers",
+               "hung")
+
+
+def _key(r: Dict) -> tuple:
+    return tuple((k, r[k]) for k in _KEY_FIELDS if k in r)
+
+
+def run(only: List[str], quick: bool) -> List[Dict]:
+    results = []
+    if "collector" in only:
+        results += collector.run(quick=quick)
+    if "procfs" in only:
+        results += procfs.run(ticks=50 if quick else 300, procs=100 if quick else 500)
+    if "sensors" in only:
+        results += sensors.run(cores=16 if quick else 64, ticks=50 if quick else 300)
+    if "cardinality" in only:
+        results += cardinality.run(ticks=120 if quick else 600)
+    if "diskusage" in only:
+        results += diskusage.run(ticks=20 if quick else 60)
+    if "fanout" in only:
+        results += fanout.run(clients=(1, 10) if quick else (1, 10, 50), frames=5 if quick else 10)
+    if "anomaly" in only:
+        for n in ((1000,) if quick else (1000, 10000)):
+            r = anomaly.run(n, ticks=200 if quick else 600)
+            results.append({"case": "anomaly", "series": r["series"], "method": r["method"],
+                            "p50_ms": round(r["tick_us_p50"] / 1000, 3), "p99_ms": round(r["tick_us_p99"] / 1000, 3)})
+    if "workers" in only:
+        results += workers.run(workers=(1, 2) if quick else (1, 2, 4), seconds=2 if quick else 5)
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> int:
+    """逐项对比 p50，返回变慢超过容差的条目数"""
+    base = {_key(r): r for r in baseline.get("results", [])}
+    regressions = 0
+    for r in results:
+        old = base.get(_key(r))
+        if not old or not old.get("p50_ms"):
+            print(f"  [new ] {dict(_key(r))}  p50={r['p50_ms']}ms")
+            continue
+        ratio = r["p50_ms"] / old["p50_ms"]
+        flag = "SLOW" if ratio > 1 + tolerance else ("fast" if ratio < 1 - tolerance else " ok ")
+        regressions += flag == "SLOW"
+        print(f"  [{flag}] {dict(_key(r))}  p50 {old['p50_ms']}ms -> {r['p50_ms']}ms  (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m bench", description="SystemStatus 基准套件")
+    ap.add_argument("--only", default=",".join(SUITES), help=f"逗号分隔，可选 {', '.join(SUITES)}")
+    ap.add_argument("--quick", action="store_true", help="减少重复次数与规模，用于快速自检")
+    ap.add_argument("--save", help="把结果写入该 JSON 文件作为基线")
+    ap.add_argument("--compare", help="与该基线文件比较")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="p50 允许的相对变慢比例")
+    args = ap.parse_args()
+
+    only = [s.strip() for s in args.only.split(",") if s.strip()]
+    results = run(only, args.quick)
+    for r in results:
+        print(json.dumps(r, ensure_ascii=False))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存: {args.save}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"与基线比较（{baseline.get('environment', {}).get('time', '?')}，容差 {args.tolerance:.0%}）：")
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+网卡序列基数基准
+模拟容器宿主机：固定若干物理网卡，另有一批 veth 网卡每轮按 churn 比例被新名称替换（容器启停）。
+用合成数据源逐轮运行 monitor.collect_tick，对比三种序列策略：
+- unbounded：每个出现过的网卡各建一条序列且从不淘汰（引入基数控制之前的行为）；
+- capped：不聚合，只限制单独序列数（64，超出合并到 "*"）并淘汰空闲 60 秒的序列；
+- limited：按 devices.nic 配置（默认把 veth* 聚合为一条组序列、限制单独序列数、淘汰空闲序列）。
+报告每轮耗时、结束时的网卡序列数、历史存储中的网卡列数、快照中 net_io_per_nic 的 JSON 大小，
+以及 tracemalloc 统计的本轮内存增量（耗时含 tracemalloc 开销，仅用于各策略互相对照）。
+用法：python -m bench.cardinality [--ticks 600] [--physical 4] [--veths 200] [--churn 0.05]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+from backend import monitor
+from backend.anomaly import AnomalyDetector
+from backend.devseries import DeviceSeries, create_series
+from backend.history import HistoryStore
+from backend.providers import set_provider
+from backend.providers.synthetic import SyntheticProvider
+
+from .collector import _reset_monitor
+from .common import stats
+
+
+def _churn(p: SyntheticProvider, physical: int, rng: np.random.Generator, churn: float, next_id: List[int]):
+    """把 churn 比例的 veth 换成新名称（旧容器退出、新容器启动）"""
+    veths = len(p.nic_names) - physical
+    m = int(round(veths * churn))
+    if not m:
+        return
+    names = p.nic_names.copy()
+    for i in (physical + rng.choice(veths, m, replace=False)).tolist():
+        names[i] = f"veth{next_id[0]:08x}"
+        next_id[0] += 1
+    p.nic_names = names
+
+
+def bench_churn(series: DeviceSeries, method: str, ticks: int, physical: int, veths: int, churn: float,
+                seed: int = 0) -> Dict:
+    p = SyntheticProvider(cpus=4, nics=physical + veths, disks=2, processes=50, seed=seed)
+    p.nic_names = np.array([f"eth{i}" for i in range(physical)] + [f"veth{i:08x}" for i in range(veths)], dtype=object)
+    old = set_provider(p)
+    saved = (monitor.nic_series, monitor.history_store, monitor.anomaly_detector)
+    monitor.nic_series = series
+    monitor.history_store = HistoryStore(retention=300, rollup_interval=60, rollup_retention=3600)
+    monitor.anomaly_detector = AnomalyDetector()
+    _reset_monitor()
+    rng = np.random.default_rng(seed)
+    next_id = [veths]
+    clock = time.time()
+    cost = []
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        peak_series = 0
+        for _ in range(ticks):
+            _churn(p, physical, rng, churn, next_id)
+            clock += 1.0
+            t0 = time.perf_counter()
+            monitor.collect_tick(clock)
+            cost.append((time.perf_counter() - t0) * 1000)
+            peak_series = max(peak_series, len(monitor.NET_IO_NIC_HISTORY))
+        mem_kb = (tracemalloc.get_traced_memory()[0] - base) / 1024
+        snapshot = json.dumps(monitor.get_real_time_data()["net_io_per_nic"])
+        columns = sum(1 for n in monitor.history_store.series() if n.startswith("net."))
+        return dict(stats(cost), case="nic_churn", method=method, ticks=ticks, nics=physical + veths,
+                    churn=churn, series=len(monitor.NET_IO_NIC_HISTORY), peak_series=peak_series,
+                    history_columns=columns, snapshot_kb=round(len(snapshot) / 1024, 1), mem_kb=round(mem_kb, 1))
+    finally:
+        tracemalloc.stop()
+        monitor.nic_series, monitor.history_store, monitor.anomaly_detector = saved
+        set_provider(old)
+        _reset_monitor()
+
+
+def run(ticks: int = 600, physical: int = 4, veths: int = 200, churn: float = 0.05) -> List[Dict]:
+    strategies = {
+        "unbounded": DeviceSeries(max_series=1 << 30, idle_timeout=float("inf")),
+        "capped": DeviceSeries(max_series=64, idle_timeout=60),
+        "limited": create_series("nic"),
+    }
+    return [bench_churn(s, method, ticks, physical, veths, churn) for method, s in strategies.items()]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="容器网卡更替下的序列基数与内存基准")
+    ap.add_argument("--ticks", type=int, default=600)
+    ap.add_argument("--physical", type=int, default=4, help="物理网卡数")
+    ap.add_argument("--veths", type=int, default=200, help="同时存在的 veth 网卡数")
+    ap.add_argument("--churn", type=float, default=0.05, help="每轮被替换的 veth 比例")
+    args = ap.parse_args()
+    for r in run(args.ticks, args.physical, args.veths, args.churn):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
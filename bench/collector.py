@@ -0,0 +1,150 @@
+"""
+采集与快照基准
+- tick：一轮 monitor.collect_tick() 的耗时，可额外拉起 N 个空闲子进程放大进程遍历开销；
+- tick_synthetic：换用合成数据源，在本机不具备的规模（2 万进程、128 网卡、200 块盘）下测采集耗时；
+- snapshot / full_snapshot：get_real_time_data() 与 get_full_snapshot() 的格式化耗时；
+- encode：完整快照的 JSON 编码耗时与体积。
+快照相关用例按网卡数、磁盘数、进程数与历史长度（每条序列的点数）填充合成数据，不依赖真实硬件。
+用法：python -m bench.collector [--procs 0,500] [--nics 2,64] [--disks 2,64] [--history 120,600]
+                              [--synthetic 2000:16:16,20000:128:200]
+"""
+import argparse
+import json
+import subprocess
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend import monitor
+from backend.providers import SyntheticProvider, set_provider
+
+from .common import measure
+
+
+def spawn_idle(n: int) -> List[subprocess.Popen]:
+    """拉起 n 个空闲子进程（sleep），用于放大进程遍历开销"""
+    return [subprocess.Popen(["sleep", "600"]) for _ in range(n)]
+
+
+def bench_tick(procs: int = 0, repeat: int = 20) -> Dict:
+    children = spawn_idle(procs)
+    try:
+        monitor.collect_tick()  # 建立 cpu_percent / IO 计数基线
+        result = measure(monitor.collect_tick, repeat=repeat, warmup=2)
+    finally:
+        for p in children:
+            p.kill()
+        for p in children:
+            p.wait()
+    return dict(result, case="tick", procs=procs)
+
+
+def _reset_monitor():
+    for store in (monitor.NET_IO_NIC_HISTORY, monitor.DISK_IO_HISTORY, monitor._NET_RATES, monitor._NIC_RATES,
+                  monitor._DISK_RATES, monitor._PROC_IO_RATES, monitor._PROC_NET_RATES, monitor.DISK_IO_DEVICES,
+                  monitor.nic_series, monitor.disk_series, monitor.hardware_inventory, monitor.netstats,
+                  monitor.pressure_collector):
+        store.clear()
+
+
+def bench_tick_synthetic(procs: int, nics: int, disks: int, repeat: int = 10, seed: int = 0) -> Dict:
+    """用合成数据源按给定规模测一轮采集的耗时；时间戳按 1 秒递增，结果与机器负载无关"""
+    old = set_provider(SyntheticProvider(cpus=64, nics=nics, disks=disks, processes=procs, seed=seed))
+    _reset_monitor()
+    clock = [time.time()]
+
+    def tick():
+        clock[0] += 1.0
+        monitor.collect_tick(clock[0])
+
+    try:
+        tick()  # 建立计数基线
+        result = measure(tick, repeat=repeat, warmup=2)
+    finally:
+        set_provider(old)
+        _reset_monitor()
+    return dict(result, case="tick_synthetic", procs=procs, nics=nics, disks=disks)
+
+
+def populate(nics: int, disks: int, procs: int, history: int, seed: int = 0):
+    """按规模向 monitor 的全局缓存填充合成数据（history 为每条序列的点数，1 秒一个）"""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    ts = (now - history + 1 + np.arange(history)).tolist()
+
+    def series():
+        return list(zip(ts, np.round(rng.uniform(0, 100, history), 1).tolist()))
+
+    monitor.CACHE_DURATION = max(monitor.CACHE_DURATION, history)
+    for key in monitor.SCALAR_SERIES:
+        monitor.DATA_CACHE[key] = series()
+    monitor.DATA_CACHE["cpu_core_usage"] = np.round(rng.uniform(0, 100, 16), 1).tolist()
+    monitor.NET_IO_NIC_HISTORY.clear()
+    for i in range(nics):
+        monitor.NET_IO_NIC_HISTORY[f"eth{i}"] = {"up": series(), "down": series()}
+    monitor.DISK_IO_HISTORY.clear()
+    for i in range(disks):
+        monitor.DISK_IO_HISTORY[f"sd{i}"] = {k: series() for k in monitor.DISK_IO_FIELDS}
+    monitor.DATA_CACHE["processes"] = [
+        {"pid": 1000 + i, "name": f"proc-{i}", "cpu": round(float(rng.uniform(0, 100)), 1),
+         "mem": 0.1, "disk_read": 0.0, "disk_write": 0.0, "net_up": 0.0, "net_down": 0.0, "gpu": 0}
+        for i in range(procs)
+    ]
+
+
+def bench_snapshot(nics: int, disks: int, procs: int, history: int, repeat: int = 30) -> List[Dict]:
+    populate(nics, disks, procs, history)
+    params = {"nics": nics, "disks": disks, "procs": procs, "history": history}
+    out = [dict(measure(monitor.get_real_time_data, repeat=repeat), case="snapshot", **params)]
+    out.append(dict(measure(monitor.get_full_snapshot, repeat=max(3, repeat // 3)), case="full_snapshot", **params))
+    snap = monitor.get_full_snapshot()
+    size = len(json.dumps(snap, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    enc = measure(lambda: json.dumps(snap, ensure_ascii=False, separators=(",", ":")), repeat=repeat)
+    out.append(dict(enc, case="encode", bytes=size, **params))
+    return out
+
+
+def _ints(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x]
+
+
+def _scales(text: str) -> List[tuple]:
+    return [tuple(int(x) for x in item.split(":")) for item in text.split(",") if item]
+
+
+def run(procs=(0, 500), nics=(2, 64), disks=(2, 64), history=(120, 600), quick: bool = False,
+        synthetic=None) -> List[Dict]:
+    results = []
+    for n in procs:
+        results.append(bench_tick(n, repeat=5 if quick else 20))
+    if synthetic is None:
+        synthetic = [(2000, 16, 16)] if quick else [(2000, 16, 16), (20000, 128, 200)]
+    for p, n, d in synthetic:
+        results.append(bench_tick_synthetic(p, n, d, repeat=3 if quick else 10))
+    base = {"nics": nics[0], "disks": disks[0], "procs": 20, "history": history[0]}
+    grid = [dict(base)]
+    grid += [dict(base, nics=n) for n in nics[1:]]
+    grid += [dict(base, disks=n) for n in disks[1:]]
+    grid += [dict(base, history=n) for n in history[1:]]
+    for g in grid:
+        results += bench_snapshot(repeat=10 if quick else 30, **g)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="采集 / 快照 / JSON 编码基准")
+    ap.add_argument("--procs", default="0,500", help="额外拉起的空闲进程数（逗号分隔）")
+    ap.add_argument("--nics", default="2,64")
+    ap.add_argument("--disks", default="2,64")
+    ap.add_argument("--history", default="120,600", help="每条序列的点数")
+    ap.add_argument("--synthetic", default=None, help="合成数据源规模 进程数:网卡数:磁盘数（逗号分隔）")
+    ap.add_argument("--quick", action="store_true")
+    args = ap.parse_args()
+    synthetic = _scales(args.synthetic) if args.synthetic is not None else None
+    for r in run(_ints(args.procs), _ints(args.nics), _ints(args.disks), _ints(args.history), args.quick, synthetic):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
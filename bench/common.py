@@ -0,0 +1,43 @@
+"""
+基准公共工具：计时统计、运行环境信息
+"""
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+
+def measure(fn: Callable, repeat: int = 50, warmup: int = 3) -> Dict[str, float]:
+    """重复执行 fn，返回耗时统计（毫秒）"""
+    for _ in range(warmup):
+        fn()
+    cost = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        cost.append(time.perf_counter() - t0)
+    return stats(np.array(cost) * 1000)
+
+
+def stats(ms) -> Dict[str, float]:
+    ms = np.asarray(ms, dtype=np.float64)
+    return {
+        "n": int(len(ms)),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+    }
+
+
+def environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "argv": " ".join(sys.argv[1:]),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
@@ -0,0 +1,116 @@
+"""
+磁盘用量采集基准
+用人为变慢或挂起的 statvfs 模拟挂有 NFS / CIFS / FUSE 的主机：若干本地挂载点立即返回，
+slow 个网络挂载点每次调用耗时 delay 秒，hung 个挂载点首次调用正常返回、之后服务端无响应（调用一直阻塞到基准结束）。
+每轮相当于一次快照（两轮间隔 frame 秒，刷新间隔与超时按同一比例缩短，基准几秒内完成），对比：
+- serial：原先在请求路径上逐个调用 statvfs（存在挂起的挂载点时无法完成，只测 hung=0）；
+- pool：DiskUsageCollector 后台线程 + 按挂载点缓存 + 超时 / 退避。
+报告每轮耗时、结束时返回的挂载点数与其中标记为 stale 的个数、statvfs 调用次数。
+用法：python -m bench.diskusage [--ticks 60] [--local 8] [--slow 2] [--hung 1] [--delay 0.2] [--frame 0.05]
+"""
+import argparse
+import threading
+import time
+from typing import Dict, List
+
+from backend.diskusage import DiskUsageCollector
+from backend.providers.base import sdiskusage
+
+from .common import stats
+
+_GB = 1024 ** 3
+
+
+class FakeStatvfs:
+    """按挂载点名称决定行为的 statvfs：/mnt/slow* 耗时 delay 秒，/mnt/hung* 第二次起阻塞到 release()"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self._seen = set()
+        self._release = threading.Event()
+
+    def __call__(self, path: str):
+        self.calls += 1
+        first = path not in self._seen
+        self._seen.add(path)
+        if path.startswith("/mnt/hung") and not first:
+            self._release.wait()
+            raise OSError(5, "server not responding")
+        if path.startswith("/mnt/slow"):
+            time.sleep(self.delay)
+        return sdiskusage(100 * _GB, 40 * _GB, 60 * _GB, 40.0)
+
+    def release(self):
+        self._release.set()
+
+
+def _partitions(local: int, slow: int, hung: int) -> List[Dict]:
+    parts = [{"device": f"/dev/vd{chr(97 + i)}", "physical_disk": f"vd{chr(97 + i)}",
+              "mountpoint": "/" if i == 0 else f"/data{i}", "fstype": "ext4"} for i in range(local)]
+    parts += [{"device": f"nas:/slow{i}", "physical_disk": f"nas:/slow{i}", "mountpoint": f"/mnt/slow{i}",
+               "fstype": "nfs4"} for i in range(slow)]
+    parts += [{"device": f"nas:/hung{i}", "physical_disk": f"nas:/hung{i}", "mountpoint": f"/mnt/hung{i}",
+               "fstype": "nfs4"} for i in range(hung)]
+    return parts
+
+
+def bench_serial(ticks: int, local: int, slow: int, delay: float) -> Dict:
+    fake = FakeStatvfs(delay)
+    parts = _partitions(local, slow, 0)
+    cost = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        out = []
+        for p in parts:
+            u = fake(p["mountpoint"])
+            out.append(dict(p, total=u.total, used=u.used, usage_percent=u.percent))
+        cost.append((time.perf_counter() - t0) * 1000)
+    return dict(stats(cost), case="disk_usage", method="serial", mounts=len(parts), hung=0,
+                returned=len(out), stale=0, calls=fake.calls)
+
+
+def bench_pool(ticks: int, local: int, slow: int, hung: int, delay: float, frame: float) -> Dict:
+    fake = FakeStatvfs(delay)
+    parts = _partitions(local, slow, hung)
+    # 刷新间隔按 frame 缩短（本地 4 轮、网络 10 轮）；超时大于 slow 挂载点的耗时，hung 挂载点几轮内即被判为超时
+    collector = DiskUsageCollector(workers=4, timeout=2 * delay, wait=0.5,
+                                   refresh={"default": 4 * frame, "nfs*": 10 * frame}, statvfs=fake)
+    cost = []
+    out = []
+    try:
+        for _ in range(ticks):
+            t0 = time.perf_counter()
+            out = collector.usage(parts)
+            elapsed = time.perf_counter() - t0
+            cost.append(elapsed * 1000)
+            time.sleep(max(0.0, frame - elapsed))
+    finally:
+        fake.release()
+    return dict(stats(cost), case="disk_usage", method="pool", mounts=len(parts), hung=hung,
+                returned=len(out), stale=sum(1 for d in out if d["stale"]), calls=fake.calls)
+
+
+def run(ticks: int = 60, local: int = 8, slow: int = 2, hung: int = 1, delay: float = 0.2,
+        frame: float = 0.05) -> List[Dict]:
+    results = [bench_serial(ticks, local, slow, delay), bench_pool(ticks, local, slow, 0, delay, frame)]
+    if hung:
+        results.append(bench_pool(ticks, local, slow, hung, delay, frame))
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="慢 / 挂起的网络文件系统下的磁盘用量采集基准")
+    ap.add_argument("--ticks", type=int, default=60)
+    ap.add_argument("--local", type=int, default=8, help="本地挂载点数")
+    ap.add_argument("--slow", type=int, default=2, help="每次 statvfs 耗时 delay 秒的网络挂载点数")
+    ap.add_argument("--hung", type=int, default=1, help="服务端无响应的挂载点数")
+    ap.add_argument("--delay", type=float, default=0.2)
+    ap.add_argument("--frame", type=float, default=0.05, help="两轮之间的间隔（秒）")
+    args = ap.parse_args()
+    for r in run(args.ticks, args.local, args.slow, args.hung, args.delay, args.frame):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
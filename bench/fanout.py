@@ -0,0 +1,86 @@
+"""
+WebSocket 推送扇出基准
+在本机启动一个只挂载 API 路由的 uvicorn 服务，N 个客户端同时订阅 /api/ws，
+统计每帧从生成快照到各客户端收到的延迟与实际送达帧率。快照数据按 bench.collector.populate 填充。
+用法：python -m bench.fanout [--clients 1,10,50] [--frames 10]
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from .collector import populate
+from .common import stats
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server():
+    """后台线程启动 uvicorn，返回 (server, port)"""
+    import uvicorn
+    from fastapi import FastAPI
+    from backend.routers import api_router
+
+    app = FastAPI()
+    app.include_router(api_router)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started and time.time() < deadline:
+        time.sleep(0.05)
+    return server, port
+
+
+async def _client(url: str, frames: int, latencies: List[float], sizes: List[int]):
+    import websockets
+
+    async with websockets.connect(url, max_size=None) as ws:
+        for _ in range(frames):
+            msg = await ws.recv()
+            now = time.time()
+            # 快照以 "timestamp":<生成时刻> 结尾，直接截取，避免客户端整体解析拖慢测量
+            ts = float(msg[msg.rfind(":") + 1:-1])
+            latencies.append((now - ts) * 1000)
+            sizes.append(len(msg))
+
+
+async def _fanout(port: int, clients: int, frames: int) -> Dict:
+    latencies, sizes = [], []
+    url = f"ws://127.0.0.1:{port}/api/ws"
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_client(url, frames, latencies, sizes) for _ in range(clients)])
+    elapsed = time.perf_counter() - t0
+    return dict(stats(latencies), case="ws_fanout", clients=clients, frames=frames,
+                delivered_per_s=round(len(latencies) / elapsed, 1), bytes=int(np.mean(sizes)))
+
+
+def run(clients=(1, 10, 50), frames: int = 10, nics: int = 2, disks: int = 2, history: int = 120) -> List[Dict]:
+    populate(nics, disks, 20, history)
+    server, port = start_server()
+    try:
+        return [dict(asyncio.run(_fanout(port, n, frames)), nics=nics, disks=disks, history=history)
+                for n in clients]
+    finally:
+        server.should_exit = True
+
+
+def main():
+    ap = argparse.ArgumentParser(description="WebSocket 扇出基准")
+    ap.add_argument("--clients", default="1,10,50")
+    ap.add_argument("--frames", type=int, default=10)
+    args = ap.parse_args()
+    for r in run([int(x) for x in args.clients.split(",") if x], args.frames):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
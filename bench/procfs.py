@@ -0,0 +1,157 @@
+"""
+Linux 快速路径基准
+对比一轮采集中基础指标的取数开销：psutil 逐项调用（RealProvider）与一次读取 /proc（ProcfsProvider）。
+每轮执行与 collect_tick 相同的调用序列：cpu_percent（整体 + 每核）、cpu_freq（每核 + 整体）、
+virtual_memory、net_io_counters（总量 + 每网卡）、getloadavg。
+统计每轮耗时、进程 CPU 时间，以及 read 系统调用数（/proc/self/io 的 syscr）与 open 次数。
+进程部分另行对比：psutil.process_iter 逐个取 cpu / 内存 / IO 与 ProcessTracker 增量跟踪，
+拉起 procs 个空闲子进程，每轮按 churn 比例结束并重新拉起一部分，观察开销随更替数量而非进程总数变化。
+用法：python -m bench.procfs [--ticks 200] [--procs 500] [--churn 0.01]
+"""
+import argparse
+import builtins
+import os
+import time
+from typing import Dict, List
+
+import psutil
+
+from backend.proctrack import ProcessTracker
+from backend.providers import procfs
+from backend.providers.real import RealProvider
+
+from .collector import spawn_idle
+from .common import stats
+
+
+def _tick(p):
+    p.advance(time.time())
+    p.cpu_percent()
+    p.cpu_percent(percpu=True)
+    p.cpu_freq(percpu=True)
+    p.cpu_freq()
+    p.virtual_memory()
+    p.net_io_counters()
+    p.net_io_counters(pernic=True)
+    p.getloadavg()
+
+
+def _syscr() -> int:
+    with open("/proc/self/io", "rb") as f:
+        for line in f:
+            if line.startswith(b"syscr:"):
+                return int(line.split()[1])
+    return 0
+
+
+class _OpenCounter:
+    """统计期间内 builtins.open 与 os.open 的调用次数"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        self._open, self._os_open = builtins.open, os.open
+
+        def counted(fn):
+            def wrapper(*a, **kw):
+                self.count += 1
+                return fn(*a, **kw)
+            return wrapper
+
+        builtins.open, os.open = counted(self._open), counted(self._os_open)
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open, os.open = self._open, self._os_open
+
+
+def bench_provider(p, ticks: int) -> Dict:
+    for _ in range(3):
+        _tick(p)
+    cost = []
+    cpu0 = time.process_time()
+    base = _syscr()
+    probe = _syscr() - base  # 读取 /proc/self/io 本身的 read 次数
+    base = _syscr()
+    with _OpenCounter() as opens:
+        for _ in range(ticks):
+            t0 = time.perf_counter()
+            _tick(p)
+            cost.append((time.perf_counter() - t0) * 1000)
+    reads = _syscr() - base - probe
+    cpu = time.process_time() - cpu0
+    return dict(stats(cost), case="procfs", provider=p.name, cpu_ms=round(cpu * 1000 / ticks, 3),
+                reads_per_tick=round(reads / ticks, 1), opens_per_tick=round(opens.count / ticks, 1))
+
+
+def _iterate_psutil():
+    for p in psutil.process_iter(["pid", "name"]):
+        try:
+            p.cpu_percent(interval=None)
+            p.memory_percent()
+            p.io_counters()
+        except (psutil.Error, OSError):
+            pass
+
+
+def bench_processes(procs: int, churn: float, ticks: int, netlink: bool = True) -> List[Dict]:
+    """两种方式交替执行，每轮先按 churn 更替子进程；返回两条结果"""
+    children = spawn_idle(procs)
+    tracker = ProcessTracker(netlink=netlink)
+    cost = {"psutil": [], "tracker": []}
+    opens = {"psutil": 0, "tracker": 0}
+    replace = max(1, int(round(procs * churn))) if churn > 0 and procs else 0
+    try:
+        _iterate_psutil()
+        tracker.sample()
+        scans = tracker.scans
+        for i in range(ticks):
+            if replace:
+                for c in children[:replace]:
+                    c.kill()
+                    c.wait()
+                children = children[replace:] + spawn_idle(replace)
+            for method, fn in (("psutil", _iterate_psutil), ("tracker", tracker.sample)):
+                with _OpenCounter() as counter:
+                    t0 = time.perf_counter()
+                    fn()
+                    cost[method].append((time.perf_counter() - t0) * 1000)
+                opens[method] += counter.count
+        total = len(tracker.entries)
+        scans = tracker.scans - scans
+        events = tracker.netlink
+    finally:
+        tracker.close()
+        for c in children:
+            c.kill()
+            c.wait()
+    params = {"case": "processes", "procs": total, "churn": churn}
+    return [dict(stats(cost["psutil"]), method="psutil", opens_per_tick=round(opens["psutil"] / ticks, 1), **params),
+            dict(stats(cost["tracker"]), method="tracker", opens_per_tick=round(opens["tracker"] / ticks, 1),
+                 netlink=events, full_scans=scans, **params)]
+
+
+def run(ticks: int = 200, procs: int = 500, churn: float = 0.01) -> List[Dict]:
+    if not procfs.is_available():
+        return []
+    fast = procfs.ProcfsProvider()
+    try:
+        results = [bench_provider(RealProvider(), ticks), bench_provider(fast, ticks)]
+    finally:
+        fast.close()
+    return results + bench_processes(procs, churn, max(10, ticks // 10))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="psutil 与 procfs 快速路径的单轮取数开销对比（基础指标与进程）")
+    ap.add_argument("--ticks", type=int, default=200)
+    ap.add_argument("--procs", type=int, default=500, help="拉起的空闲子进程数")
+    ap.add_argument("--churn", type=float, default=0.01, help="每轮更替的子进程比例")
+    args = ap.parse_args()
+    for r in run(args.ticks, args.procs, args.churn):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+传感器采集基准
+在临时目录中生成伪造的 hwmon / thermal 目录树（多路 CPU 的封装与每核温度、NVMe、芯片组、内存条、风扇），
+对比两种读取方式每轮的耗时：
+- reopen：与 psutil.sensors_temperatures 相同，每轮逐个 open / read / close 输入文件并重新读取 name 与 label；
+- pread：SensorCollector 常驻描述符，每个传感器一次 pread。
+伪造目录树也可直接用于验证枚举、命名与 CPU 温度选择（make_sysfs 返回 hwmon / thermal 根目录）。
+用法：python -m bench.sensors [--sockets 2] [--cores 64] [--nvme 8] [--ticks 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from backend.sensors import SensorCollector
+
+from .common import measure
+
+
+def _write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+def make_sysfs(root: str, sockets: int = 2, cores: int = 16, nvme: int = 2, fans: int = 4,
+               dimms: int = 4) -> Tuple[str, str]:
+    """在 root 下生成伪造的 class/hwmon 与 class/thermal，返回 (hwmon_root, thermal_root)"""
+    hwmon = os.path.join(root, "class", "hwmon")
+    thermal = os.path.join(root, "class", "thermal")
+    chips: List[Tuple[str, List[Tuple[str, str, int]]]] = []
+    for s in range(sockets):
+        inputs = [("temp1", f"Package id {s}", 50000 + 1000 * s)]
+        inputs += [(f"temp{i + 2}", f"Core {i}", 40000 + 100 * i) for i in range(cores)]
+        chips.append(("coretemp", inputs))
+    for n in range(nvme):
+        chips.append(("nvme", [("temp1", "Composite", 38000 + 500 * n), ("temp2", "Sensor 1", 36000)]))
+    chips.append(("pch_cannonlake", [("temp1", "", 45000)]))
+    for d in range(dimms):
+        chips.append(("jc42", [("temp1", "", 33000 + 250 * d)]))
+    chips.append(("nct6798", [(f"fan{i + 1}", "", 800 + 50 * i) for i in range(fans)]
+                  + [("in0", "Vcore", 1104), ("in1", "+12V", 12096)]))
+    for i, (name, inputs) in enumerate(chips):
+        base = os.path.join(hwmon, f"hwmon{i}")
+        _write(os.path.join(base, "name"), name)
+        for f, label, value in inputs:
+            _write(os.path.join(base, f"{f}_input"), str(value))
+            if label:
+                _write(os.path.join(base, f"{f}_label"), label)
+    # acpitz 同时出现在 hwmon 与 thermal 中（应只计一次），x86_pkg_temp 只在 thermal 中
+    base = os.path.join(hwmon, f"hwmon{len(chips)}")
+    _write(os.path.join(base, "name"), "acpitz")
+    _write(os.path.join(base, "temp1_input"), "27800")
+    for i, (kind, value) in enumerate([("acpitz", 27800)] + [("x86_pkg_temp", 51000 + 1000 * s) for s in range(sockets)]):
+        _write(os.path.join(thermal, f"thermal_zone{i}", "type"), kind)
+        _write(os.path.join(thermal, f"thermal_zone{i}", "temp"), str(value))
+    return hwmon, thermal
+
+
+def read_reopen(hwmon: str, thermal: str) -> Dict[str, float]:
+    """逐个 open 的读取方式（psutil 的做法）：每轮重新 listdir、读取 name / label / input"""
+    out = {}
+    for d in os.listdir(hwmon):
+        base = os.path.join(hwmon, d)
+        with open(os.path.join(base, "name")) as f:
+            name = f.read().strip()
+        for fn in os.listdir(base):
+            if not fn.endswith("_input"):
+                continue
+            prefix = fn[:-6]
+            try:
+                with open(os.path.join(base, prefix + "_label")) as f:
+                    label = f.read().strip()
+            except OSError:
+                label = prefix
+            with open(os.path.join(base, fn)) as f:
+                out[f"{name}.{label}"] = int(f.read()) / 1000
+    for z in os.listdir(thermal):
+        with open(os.path.join(thermal, z, "type")) as f:
+            kind = f.read().strip()
+        with open(os.path.join(thermal, z, "temp")) as f:
+            out[kind] = int(f.read()) / 1000
+    return out
+
+
+def run(sockets: int = 2, cores: int = 64, nvme: int = 8, ticks: int = 200) -> List[Dict]:
+    with tempfile.TemporaryDirectory() as root:
+        hwmon, thermal = make_sysfs(root, sockets=sockets, cores=cores, nvme=nvme)
+        collector = SensorCollector(hwmon, thermal, rescan_interval=3600)
+        try:
+            n = len(collector.scan())
+            params = {"sensors": n, "cpu_temperature": collector.sample() and collector.cpu_temperature()}
+            reopen = measure(lambda: read_reopen(hwmon, thermal), repeat=ticks)
+            pread = measure(collector.read, repeat=ticks)
+        finally:
+            collector.close()
+    return [dict(reopen, case="sensors", method="reopen", **params),
+            dict(pread, case="sensors", method="pread", **params)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="hwmon 传感器读取开销：逐个 open 与常驻描述符 pread 对比")
+    ap.add_argument("--sockets", type=int, default=2)
+    ap.add_argument("--cores", type=int, default=64, help="每路 CPU 的核心温度传感器数")
+    ap.add_argument("--nvme", type=int, default=8)
+    ap.add_argument("--ticks", type=int, default=200)
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    for r in run(args.sockets, args.cores, args.nvme, args.ticks):
+        print(r)
+    print(f"总耗时 {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+多进程模式吞吐基准
+在子进程中分别以单进程（workers=1）与多进程模式（共享内存快照 + N 个 uvicorn worker）启动只挂载 API 路由的服务，
+快照数据按 bench.collector.populate 填充；再由若干压测进程并发请求 /api/data，统计每秒请求数与延迟分布。
+worker 数超过 CPU 核数（含压测进程）时多进程模式不会更快，结果中的 cpus 字段供对照。
+用法：python -m bench.workers [--workers 1,2,4] [--loaders 2] [--concurrency 16] [--seconds 5]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+from fastapi import FastAPI, Request
+
+from backend import workers as mw
+from backend.routers import api_router
+
+from .common import stats
+
+app = FastAPI()
+app.include_router(api_router)
+if mw.WORKER_MODE:
+    @app.middleware("http")
+    async def forward_to_collector(request: Request, call_next):
+        if mw.is_local(request.url.path):
+            return await call_next(request)
+        return await mw.forward(request)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(workers: int, port: int, history: int):
+    """子进程入口：填充数据后按 worker 数启动服务（阻塞）"""
+    import uvicorn
+    from .collector import populate
+
+    populate(4, 4, 20, history)
+    if workers > 1:
+        mw.serve(app, "bench.workers:app", "127.0.0.1", port, workers, log_level="warning")
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _wait_ready(port: int, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/data", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("服务未能在限定时间内就绪")
+
+
+async def _load(url: str, concurrency: int, seconds: float) -> List[float]:
+    import httpx
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                resp = await client.get(url)
+                resp.read()
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies
+
+
+def _loader(url: str, concurrency: int, seconds: float, out):
+    out.put(asyncio.run(_load(url, concurrency, seconds)))
+
+
+def measure_throughput(port: int, loaders: int, concurrency: int, seconds: float) -> Dict:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    url = f"http://127.0.0.1:{port}/api/data"
+    procs = [ctx.Process(target=_loader, args=(url, concurrency, seconds, out)) for _ in range(loaders)]
+    for p in procs:
+        p.start()
+    latencies = [x for _ in procs for x in out.get()]
+    for p in procs:
+        p.join()
+    return dict(stats(np.array(latencies)), req_per_s=round(len(latencies) / seconds, 1))
+
+
+def run(workers=(1, 2, 4), loaders: int = 2, concurrency: int = 16, seconds: float = 5.0,
+        history: int = 300) -> List[Dict]:
+    results = []
+    for n in workers:
+        port = _free_port()
+        server = subprocess.Popen([sys.executable, "-m", "bench.workers", "--serve", str(n),
+                                   "--port", str(port), "--history", str(history)])
+        try:
+            _wait_ready(port)
+            r = measure_throughput(port, loaders, concurrency, seconds)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        results.append(dict(r, case="workers", workers=n, method="shm" if n > 1 else "single",
+                            history=history, cpus=os.cpu_count()))
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="多进程模式（共享内存快照）/api/data 吞吐基准")
+    ap.add_argument("--workers", default="1,2,4", help="逗号分隔的 worker 数，1 为单进程模式")
+    ap.add_argument("--loaders", type=int, default=2, help="压测进程数")
+    ap.add_argument("--concurrency", type=int, default=16, help="每个压测进程的并发请求数")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--history", type=int, default=300, help="每条序列的历史点数（决定快照大小）")
+    ap.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.serve:
+        _serve(args.serve, args.port, args.history)
+        return
+    for r in run([int(x) for x in args.workers.split(",") if x], args.loaders, args.concurrency,
+                 args.seconds, args.history):
+        print(r)
+
+
+if __name__ == "__main__":
+    main()
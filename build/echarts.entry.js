@@ -0,0 +1,20 @@
+/* 精简版 ECharts 入口 —— cd build && npm install && npm run build
+ * 只注册面板用到的部分：折线图（CPU / 内存 / GPU / 网络 / 磁盘 IO）、热力图（每核热力图）、
+ * 直角坐标系、提示框、图例、连续型视觉映射与 Canvas 渲染器。全局名与完整版相同（window.echarts），
+ * script.js 无需改动；静态资源流水线发现 echarts.min.js 后自动把页面引用改写为它（见 backend/assets.py 的 ALIASES）。
+ * script.js 中新增图表类型或组件时需同步在这里注册。
+ */
+import * as echarts from "echarts/core";
+import { HeatmapChart, LineChart } from "echarts/charts";
+import {
+    GridComponent, LegendComponent, TooltipComponent, VisualMapContinuousComponent,
+} from "echarts/components";
+import { CanvasRenderer } from "echarts/renderers";
+
+echarts.use([
+    LineChart, HeatmapChart,
+    GridComponent, TooltipComponent, LegendComponent, VisualMapContinuousComponent,
+    CanvasRenderer,
+]);
+
+export * from "echarts/core";
@@ -28,10 +28,12 @@ window.LANGUAGE_DATA['de-DE'] = {
         bootTime: "Läuft seit",
         sysLoad: "Systemlast",
         procCount: "Prozesse",
+        anomalies: "Anomalien",
         memModel: "Speichermodell",
         cpuUsage: "CPU-Auslastung",
         perCore: "Pro Kern",
         perCoreFreq: "Takt pro Kern",
+        coreHeatmap: "Kern-Heatmap",
         cpuFreq: "CPU-Takt",
         memUsage: "Speicherauslastung",
         memDetail: "Speicherdetails",
@@ -41,6 +43,18 @@ window.LANGUAGE_DATA['de-DE'] = {
         swapSout: "Heraus",
         swapAuto: "Systemverwaltet",
         swapNone: "Keine Auslagerungspartition / Pagedatei gefunden",
+        memPressure: "Speicherdruck",
+        psiMemory: "Speicher-PSI (some)",
+        psiMemoryFull: "Speicher-PSI (full)",
+        psiIo: "IO-PSI",
+        psiCpu: "CPU-PSI",
+        memAnon: "Anonym",
+        memFile: "Datei-Cache",
+        memSlab: "Slab",
+        memDirty: "Dirty / Writeback",
+        majorFaults: "Major Faults",
+        swapIo: "Swap ein / aus",
+        directReclaim: "Direkte Rückgewinnung",
         nicTraffic: "NIC-Datenverkehr",
         navProcess: "Prozesse",
         processHint: "Nach CPU-Auslastung sortiert, nur Top 20 (nur lesen)",
@@ -62,6 +76,7 @@ window.LANGUAGE_DATA['de-DE'] = {
         ioWait: "E/A-Warte",
         partitions: "Partitionen",
         diskTotal: "Gesamt",
+        diskStale: "Zeitüberschreitung, letzter Wert angezeigt",
         total: "Gesamt", used: "Belegt", free: "Frei",
         disk: "Festplatte",
         noGpu: "Keine dedizierte GPU erkannt (oder Treiber fehlt)",
@@ -73,4 +88,14 @@ window.LANGUAGE_DATA['de-DE'] = {
         traffic: "Echtzeit-Traffic",
         download: "Download", upload: "Upload",
         interfaces: "Schnittstellen",
+        netStack: "Netzwerk-Stack",
+        tcpRetrans: "TCP-Neuübertragungen",
+        tcpResets: "TCP-Resets",
+        listenDrops: "Listen-Verwerfungen",
+        tcpEstablished: "Aufgebaut",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "UDP-Fehler",
+        nicErrors: "Fehler",
+        nicDrops: "Verw.",
 };
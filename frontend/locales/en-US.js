@@ -28,10 +28,12 @@ window.LANGUAGE_DATA['en-US'] = {
         bootTime: "Running for",
         sysLoad: "System Load",
         procCount: "Processes",
+        anomalies: "Anomalies",
         memModel: "Memory Model",
         cpuUsage: "CPU Usage",
         perCore: "Per-Core Usage",
         perCoreFreq: "Per-Core Frequency",
+        coreHeatmap: "Per-Core Heatmap",
         cpuFreq: "CPU Frequency",
         memUsage: "Memory Usage",
         memDetail: "Memory Detail",
@@ -41,6 +43,18 @@ window.LANGUAGE_DATA['en-US'] = {
         swapSout: "Swapped out",
         swapAuto: "System managed",
         swapNone: "No swap partition / page file detected",
+        memPressure: "Memory Pressure",
+        psiMemory: "Memory PSI (some)",
+        psiMemoryFull: "Memory PSI (full)",
+        psiIo: "IO PSI",
+        psiCpu: "CPU PSI",
+        memAnon: "Anonymous",
+        memFile: "File Cache",
+        memSlab: "Slab",
+        memDirty: "Dirty / Writeback",
+        majorFaults: "Major Faults",
+        swapIo: "Swap In / Out",
+        directReclaim: "Direct Reclaim Scans",
         nicTraffic: "NIC Traffic",
         navProcess: "Processes",
         processHint: "Sorted by CPU usage, top 20 only (read-only)",
@@ -62,6 +76,7 @@ window.LANGUAGE_DATA['en-US'] = {
         ioWait: "I/O Wait",
         partitions: "partitions",
         diskTotal: "Total",
+        diskStale: "Timed out, showing last result",
         total: "Total", used: "Used", free: "Free",
         disk: "Disk",
         noGpu: "No usable dedicated GPU detected (or driver not installed)",
@@ -73,4 +88,14 @@ window.LANGUAGE_DATA['en-US'] = {
         traffic: "Live Traffic",
         download: "Download", upload: "Upload",
         interfaces: "Interfaces",
+        netStack: "Network Stack",
+        tcpRetrans: "TCP Retransmits",
+        tcpResets: "TCP Resets",
+        listenDrops: "Listen Drops",
+        tcpEstablished: "Established",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "UDP Errors",
+        nicErrors: "err",
+        nicDrops: "drop",
 };
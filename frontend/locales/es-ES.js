@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['es-ES'] = {
         bootTime: "Activo desde hace",
         sysLoad: "Carga del sistema",
         procCount: "Procesos",
+        anomalies: "Anomalías",
         memModel: "Modelo de memoria",
         cpuUsage: "Uso de CPU",
         perCore: "Uso por núcleo",
         perCoreFreq: "Frecuencia por núcleo",
+        coreHeatmap: "Mapa de calor por núcleo",
         cpuFreq: "Frecuencia de CPU",
         memUsage: "Uso de memoria",
         memDetail: "Detalle de memoria",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['es-ES'] = {
         swapSout: "Salida",
         swapAuto: "Administrado por el sistema",
         swapNone: "No se detectó partición swap / archivo de paginación",
+        memPressure: "Presión de memoria",
+        psiMemory: "PSI de memoria (some)",
+        psiMemoryFull: "PSI de memoria (full)",
+        psiIo: "PSI de E/S",
+        psiCpu: "PSI de CPU",
+        memAnon: "Anónima",
+        memFile: "Caché de archivos",
+        memSlab: "Slab",
+        memDirty: "Sucias / Escritura",
+        majorFaults: "Fallos mayores",
+        swapIo: "Swap entrada / salida",
+        directReclaim: "Recuperación directa",
         nicTraffic: "Tráfico NIC",
         navProcess: "Procesos",
         processHint: "Ordenado por uso de CPU, solo los 20 primeros (solo lectura)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['es-ES'] = {
         ioWait: "Espera E/S",
         partitions: "particiones",
         diskTotal: "Total",
+        diskStale: "Tiempo agotado, se muestra el último resultado",
         total: "Total", used: "Usado", free: "Libre",
         disk: "Disco",
         noGpu: "No se detectó una GPU dedicada (o el controlador no está instalado)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['es-ES'] = {
         traffic: "Tráfico en vivo",
         download: "Descarga", upload: "Subida",
         interfaces: "Interfaces",
+        netStack: "Pila de red",
+        tcpRetrans: "Retransmisiones TCP",
+        tcpResets: "Reinicios TCP",
+        listenDrops: "Descartes de escucha",
+        tcpEstablished: "Establecidas",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "Errores UDP",
+        nicErrors: "err",
+        nicDrops: "desc",
 };
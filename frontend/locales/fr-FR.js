@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['fr-FR'] = {
         bootTime: "Actif depuis",
         sysLoad: "Charge système",
         procCount: "Processus",
+        anomalies: "Anomalies",
         memModel: "Modèle mémoire",
         cpuUsage: "Utilisation CPU",
         perCore: "Par cœur",
         perCoreFreq: "Fréquence par cœur",
+        coreHeatmap: "Carte thermique par cœur",
         cpuFreq: "Fréquence CPU",
         memUsage: "Utilisation mémoire",
         memDetail: "Détail mémoire",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['fr-FR'] = {
         swapSout: "Sortie",
         swapAuto: "Géré par le système",
         swapNone: "Aucune partition swap / fichier d'échange détecté",
+        memPressure: "Pression mémoire",
+        psiMemory: "PSI mémoire (some)",
+        psiMemoryFull: "PSI mémoire (full)",
+        psiIo: "PSI E/S",
+        psiCpu: "PSI CPU",
+        memAnon: "Anonyme",
+        memFile: "Cache fichiers",
+        memSlab: "Slab",
+        memDirty: "Sales / Écriture",
+        majorFaults: "Défauts majeurs",
+        swapIo: "Swap entrée / sortie",
+        directReclaim: "Récupération directe",
         nicTraffic: "Trafic NIC",
         navProcess: "Processus",
         processHint: "Triés par usage CPU, top 20 uniquement (lecture seule)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['fr-FR'] = {
         ioWait: "Attente E/S",
         partitions: "partitions",
         diskTotal: "Total",
+        diskStale: "Délai dépassé, dernier résultat affiché",
         total: "Total", used: "Utilisé", free: "Libre",
         disk: "Disque",
         noGpu: "Aucun GPU dédié détecté (ou pilote non installé)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['fr-FR'] = {
         traffic: "Trafic en direct",
         download: "Réception", upload: "Émission",
         interfaces: "Interfaces",
+        netStack: "Pile réseau",
+        tcpRetrans: "Retransmissions TCP",
+        tcpResets: "Réinitialisations TCP",
+        listenDrops: "Rejets d'écoute",
+        tcpEstablished: "Établies",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "Erreurs UDP",
+        nicErrors: "err",
+        nicDrops: "rejet",
 };
@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['id-ID'] = {
         bootTime: "Berjalan selama",
         sysLoad: "Beban Sistem",
         procCount: "Proses",
+        anomalies: "Anomali",
         memModel: "Model Memori",
         cpuUsage: "Penggunaan CPU",
         perCore: "Penggunaan per Inti",
         perCoreFreq: "Frekuensi per Inti",
+        coreHeatmap: "Peta Panas per Inti",
         cpuFreq: "Frekuensi CPU",
         memUsage: "Penggunaan Memori",
         memDetail: "Detail Memori",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['id-ID'] = {
         swapSout: "Swap keluar",
         swapAuto: "Dikelola sistem",
         swapNone: "Tidak ada partisi swap / berkas paging yang terdeteksi",
+        memPressure: "Tekanan Memori",
+        psiMemory: "PSI Memori (some)",
+        psiMemoryFull: "PSI Memori (full)",
+        psiIo: "PSI IO",
+        psiCpu: "PSI CPU",
+        memAnon: "Anonim",
+        memFile: "Cache Berkas",
+        memSlab: "Slab",
+        memDirty: "Dirty / Writeback",
+        majorFaults: "Major Fault",
+        swapIo: "Swap Masuk / Keluar",
+        directReclaim: "Reklamasi Langsung",
         nicTraffic: "Trafik NIC",
         navProcess: "Proses",
         processHint: "Diurutkan berdasarkan CPU, 20 teratas saja (baca saja)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['id-ID'] = {
         ioWait: "Tunggu I/O",
         partitions: "partisi",
         diskTotal: "Total",
+        diskStale: "Waktu habis, menampilkan hasil terakhir",
         total: "Total", used: "Terpakai", free: "Tersedia",
         disk: "Disk",
         noGpu: "GPU dedicasi tidak terdeteksi (atau driver belum terpasang)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['id-ID'] = {
         traffic: "Lalu Lintas Real-time",
         download: "Unduh", upload: "Unggah",
         interfaces: "Antarmuka",
+        netStack: "Tumpukan Jaringan",
+        tcpRetrans: "Transmisi Ulang TCP",
+        tcpResets: "Reset TCP",
+        listenDrops: "Drop Antrean Listen",
+        tcpEstablished: "Terhubung",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "Galat UDP",
+        nicErrors: "galat",
+        nicDrops: "drop",
 };
@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['ja-JP'] = {
         bootTime: "稼働時間",
         sysLoad: "システム負荷",
         procCount: "プロセス数",
+        anomalies: "異常",
         memModel: "メモリ型番",
         cpuUsage: "CPU 使用率",
         perCore: "コア別使用率",
         perCoreFreq: "コア別周波数",
+        coreHeatmap: "コア別ヒートマップ",
         cpuFreq: "CPU 周波数",
         memUsage: "メモリ使用率",
         memDetail: "メモリ詳細",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['ja-JP'] = {
         swapSout: "スワップアウト",
         swapAuto: "システム管理",
         swapNone: "スワップ領域 / ページファイルが見つかりません",
+        memPressure: "メモリプレッシャー",
+        psiMemory: "メモリ PSI (some)",
+        psiMemoryFull: "メモリ PSI (full)",
+        psiIo: "IO PSI",
+        psiCpu: "CPU PSI",
+        memAnon: "匿名ページ",
+        memFile: "ファイルキャッシュ",
+        memSlab: "Slab",
+        memDirty: "ダーティ / 書き戻し",
+        majorFaults: "メジャーフォールト",
+        swapIo: "スワップイン / アウト",
+        directReclaim: "直接回収スキャン",
         nicTraffic: "NIC トラフィック",
         navProcess: "プロセス監視",
         processHint: "CPU 使用率順、上位 20 のみ（読み取り専用）",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['ja-JP'] = {
         ioWait: "待機",
         partitions: "パーティション",
         diskTotal: "合計",
+        diskStale: "タイムアウト、前回の結果を表示",
         total: "合計", used: "使用中", free: "空き",
         disk: "ディスク",
         noGpu: "利用可能な専用 GPU が検出されませんでした（またはドライバ未導入）",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['ja-JP'] = {
         traffic: "リアルタイム通信量",
         download: "ダウンロード", upload: "アップロード",
         interfaces: "ネットワークインターフェース",
+        netStack: "ネットワークスタック",
+        tcpRetrans: "TCP 再送",
+        tcpResets: "TCP リセット",
+        listenDrops: "リッスンキュー破棄",
+        tcpEstablished: "確立済み接続",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "UDP エラー",
+        nicErrors: "エラー",
+        nicDrops: "破棄",
 };
@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['ko-KR'] = {
         bootTime: "가동 시간",
         sysLoad: "시스템 부하",
         procCount: "프로세스 수",
+        anomalies: "이상 징후",
         memModel: "메모리 모델",
         cpuUsage: "CPU 사용률",
         perCore: "코어별 사용률",
         perCoreFreq: "코어별 주파수",
+        coreHeatmap: "코어별 히트맵",
         cpuFreq: "CPU 주파수",
         memUsage: "메모리 사용률",
         memDetail: "메모리 상세",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['ko-KR'] = {
         swapSout: "스왑 아웃",
         swapAuto: "시스템 관리",
         swapNone: "스왑 파티션 / 페이지 파일을 찾을 수 없음",
+        memPressure: "메모리 압력",
+        psiMemory: "메모리 PSI (some)",
+        psiMemoryFull: "메모리 PSI (full)",
+        psiIo: "IO PSI",
+        psiCpu: "CPU PSI",
+        memAnon: "익명 페이지",
+        memFile: "파일 캐시",
+        memSlab: "Slab",
+        memDirty: "더티 / 쓰기 저장",
+        majorFaults: "주 페이지 폴트",
+        swapIo: "스왑 인 / 아웃",
+        directReclaim: "직접 회수 스캔",
         nicTraffic: "NIC 트래픽",
         navProcess: "프로세스 모니터",
         processHint: "CPU 사용률 순, 상위 20개만 (읽기 전용)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['ko-KR'] = {
         ioWait: "대기",
         partitions: "파티션",
         diskTotal: "합계",
+        diskStale: "시간 초과, 마지막 결과 표시",
         total: "전체", used: "사용됨", free: "사용 가능",
         disk: "디스크",
         noGpu: "사용 가능한 전용 GPU가 감지되지 않았습니다 (또는 드라이버 미설치)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['ko-KR'] = {
         traffic: "실시간 트래픽",
         download: "다운로드", upload: "업로드",
         interfaces: "네트워크 인터페이스",
+        netStack: "네트워크 스택",
+        tcpRetrans: "TCP 재전송",
+        tcpResets: "TCP 리셋",
+        listenDrops: "리슨 큐 드롭",
+        tcpEstablished: "연결됨",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "UDP 오류",
+        nicErrors: "오류",
+        nicDrops: "드롭",
 };
@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['ru-RU'] = {
         bootTime: "Работает",
         sysLoad: "Нагрузка",
         procCount: "Процессы",
+        anomalies: "Аномалии",
         memModel: "Модель памяти",
         cpuUsage: "Загрузка ЦП",
         perCore: "По ядрам",
         perCoreFreq: "Частота по ядрам",
+        coreHeatmap: "Тепловая карта ядер",
         cpuFreq: "Частота ЦП",
         memUsage: "Загрузка памяти",
         memDetail: "Подробно",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['ru-RU'] = {
         swapSout: "Вывод",
         swapAuto: "Управляется системой",
         swapNone: "Раздел подкачки / файл подкачки не обнаружен",
+        memPressure: "Давление памяти",
+        psiMemory: "PSI памяти (some)",
+        psiMemoryFull: "PSI памяти (full)",
+        psiIo: "PSI ввода-вывода",
+        psiCpu: "PSI CPU",
+        memAnon: "Анонимная",
+        memFile: "Файловый кэш",
+        memSlab: "Slab",
+        memDirty: "Грязные / Запись",
+        majorFaults: "Крупные сбои",
+        swapIo: "Подкачка ввод / вывод",
+        directReclaim: "Прямое освобождение",
         nicTraffic: "Трафик NIC",
         navProcess: "Процессы",
         processHint: "По загрузке CPU, только топ-20 (только чтение)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['ru-RU'] = {
         ioWait: "Ожидание",
         partitions: "разделов",
         diskTotal: "Всего",
+        diskStale: "Тайм-аут, показан последний результат",
         total: "Всего", used: "Занято", free: "Свободно",
         disk: "Диск",
         noGpu: "Выделенная видеокарта не обнаружена (или драйвер не установлен)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['ru-RU'] = {
         traffic: "Трафик",
         download: "Приём", upload: "Отдача",
         interfaces: "Интерфейсы",
+        netStack: "Сетевой стек",
+        tcpRetrans: "Повторы TCP",
+        tcpResets: "Сбросы TCP",
+        listenDrops: "Отбросы очереди listen",
+        tcpEstablished: "Установлено",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "Ошибки UDP",
+        nicErrors: "ошибки",
+        nicDrops: "отбросы",
 };
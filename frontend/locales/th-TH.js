@@ -27,10 +27,12 @@ window.LANGUAGE_DATA['th-TH'] = {
         bootTime: "ทำงานมา",
         sysLoad: "ภาระระบบ",
         procCount: "จำนวนโปรเซส",
+        anomalies: "ความผิดปกติ",
         memModel: "รุ่นหน่วยความจำ",
         cpuUsage: "การใช้งาน CPU",
         perCore: "การใช้งานต่อคอร์",
         perCoreFreq: "ความถี่ต่อคอร์",
+        coreHeatmap: "ฮีตแมปต่อคอร์",
         cpuFreq: "ความถี่ CPU",
         memUsage: "การใช้งานหน่วยความจำ",
         memDetail: "รายละเอียดหน่วยความจำ",
@@ -40,6 +42,18 @@ window.LANGUAGE_DATA['th-TH'] = {
         swapSout: "สวอปออก",
         swapAuto: "ระบบจัดการ",
         swapNone: "ไม่พบพาร์ติชันสวอป / ไฟล์เพจ",
+        memPressure: "แรงกดดันหน่วยความจำ",
+        psiMemory: "PSI หน่วยความจำ (some)",
+        psiMemoryFull: "PSI หน่วยความจำ (full)",
+        psiIo: "PSI IO",
+        psiCpu: "PSI CPU",
+        memAnon: "หน้าแบบนิรนาม",
+        memFile: "แคชไฟล์",
+        memSlab: "Slab",
+        memDirty: "Dirty / Writeback",
+        majorFaults: "Major Fault",
+        swapIo: "สวอปเข้า / ออก",
+        directReclaim: "การเรียกคืนโดยตรง",
         nicTraffic: "ทราฟฟิก NIC",
         navProcess: "กระบวนการ",
         processHint: "เรียงตามการใช้ CPU แสดง 20 อันดับแรก (อ่านอย่างเดียว)",
@@ -61,6 +75,7 @@ window.LANGUAGE_DATA['th-TH'] = {
         ioWait: "รอ I/O",
         partitions: "พาร์ติชัน",
         diskTotal: "รวม",
+        diskStale: "หมดเวลา แสดงผลล่าสุด",
         total: "รวม", used: "ใช้ไป", free: "ว่าง",
         disk: "ดิสก์",
         noGpu: "ไม่พบการ์ดจอแยก (หรือยังไม่ได้ติดตั้งไดรเวอร์)",
@@ -72,4 +87,14 @@ window.LANGUAGE_DATA['th-TH'] = {
         traffic: "เทรฟฟิกแบบเรียลไทม์",
         download: "ดาวน์โหลด", upload: "อัปโหลด",
         interfaces: "อินเทอร์เฟซเครือข่าย",
+        netStack: "สแต็กเครือข่าย",
+        tcpRetrans: "TCP ส่งซ้ำ",
+        tcpResets: "TCP รีเซ็ต",
+        listenDrops: "คิว listen ทิ้ง",
+        tcpEstablished: "เชื่อมต่อแล้ว",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "ข้อผิดพลาด UDP",
+        nicErrors: "ผิดพลาด",
+        nicDrops: "ทิ้ง",
 };
@@ -30,10 +30,12 @@ window.LANGUAGE_DATA['zh-CN'] = {
         bootTime: "已运行",
         sysLoad: "系统负载",
         procCount: "进程数",
+        anomalies: "异常指标",
         memModel: "内存型号",
         cpuUsage: "CPU 占用率",
         perCore: "每核心占用",
         perCoreFreq: "每核心频率",
+        coreHeatmap: "每核心热力图",
         cpuFreq: "CPU 频率",
         memUsage: "内存占用率",
         memDetail: "内存详情",
@@ -43,6 +45,18 @@ window.LANGUAGE_DATA['zh-CN'] = {
         swapSout: "换出",
         swapAuto: "系统托管",
         swapNone: "未检测到交换分区 / 页面文件",
+        memPressure: "内存压力",
+        psiMemory: "内存压力 PSI (some)",
+        psiMemoryFull: "内存压力 PSI (full)",
+        psiIo: "IO 压力 PSI",
+        psiCpu: "CPU 压力 PSI",
+        memAnon: "匿名页",
+        memFile: "文件页缓存",
+        memSlab: "Slab",
+        memDirty: "脏页 / 回写",
+        majorFaults: "主缺页",
+        swapIo: "换入 / 换出",
+        directReclaim: "直接回收扫描",
         nicTraffic: "网卡流量",
         navProcess: "进程监测",
         processHint: "按 CPU 占用降序，仅显示前 20 个（只读）",
@@ -64,6 +78,7 @@ window.LANGUAGE_DATA['zh-CN'] = {
         ioWait: "等待",
         partitions: "分区",
         diskTotal: "合计",
+        diskStale: "获取超时，显示上次结果",
         total: "总计", used: "已用", free: "可用",
         disk: "磁盘",
         noGpu: "未检测到可用的独立显卡（或驱动未安装）",
@@ -75,4 +90,14 @@ window.LANGUAGE_DATA['zh-CN'] = {
         traffic: "实时流量",
         download: "下载", upload: "上传",
         interfaces: "网络接口",
+        netStack: "协议栈",
+        tcpRetrans: "TCP 重传",
+        tcpResets: "TCP 重置",
+        listenDrops: "监听队列丢弃",
+        tcpEstablished: "已建立连接",
+        tcpTimeWait: "TIME_WAIT",
+        tcpCloseWait: "CLOSE_WAIT",
+        udpErrors: "UDP 错误",
+        nicErrors: "错误",
+        nicDrops: "丢包",
 };
@@ -1,17 +1,21 @@
 /* SystemStatus 前端 —— 侧边栏 + 实时数据渲染
- * 数据源：后端 WebSocket /api/ws（每秒推送完整快照）
- * 降级：WebSocket 不可用时回退到 /api/data 轮询
+ * 数据源：stream.js 在 Web Worker 中连接后端（WebSocket /api/ws → SSE /api/stream → 长轮询），
+ *        解码 JSON 并把每帧转换为增量，页面只合并增量（序列原地滑动追加）
  *
  * 渲染策略：每个模块「结构只构建一次」，后续更新只改文本/进度条宽度/图表数据，
  *          避免 innerHTML 全量重建导致 ECharts 实例失效、进度条闪烁。
+ *          到达的帧合并到下一个 requestAnimationFrame 统一渲染，且只渲染当前可见的模块；
+ *          图表完整选项只设置一次，之后每帧只更新系列数据；页面隐藏时暂停渲染并断开连接，
+ *          重新可见时以完整快照追平。
  */
 
 (function () {
     "use strict";
 
     /* ============ 多语言 ============ */
-    const LANGS = window.LANGUAGES || {};
-    const LANG_ORDER = window.LANGUAGE_ORDER || Object.keys(LANGS);
+    const LANGS = window.LANGUAGES || {};  // 已加载的语言，按需填充
+    const LANG_ORDER = window.LANGUAGE_ORDER || Object.keys(window.LANGUAGE_CONFIG || {});
+    const known = (code) => LANG_ORDER.includes(code);
 
     /* cookie 工具 */
     function getCookie(name) {
@@ -25,16 +29,33 @@
 
     function detectLang() {
         const saved = getCookie("lang");
-        if (saved && LANGS[saved]) return saved;     // cookie 优先
-        const nav = (navigator.language || "zh-CN").toLowerCase();
-        if (LANGS[nav]) return nav;                 // 完整匹配，如 zh-CN / en-US
-        const short = nav.split("-")[0];            // 短码回退，如 zh / en
-        if (LANGS[short]) return short;
-        const prefix = Object.keys(LANGS).find((k) => k.split("-")[0] === short);
+        if (saved && known(saved)) return saved;     // cookie 优先
+        const nav = navigator.language || "zh-CN";
+        const exact = LANG_ORDER.find((k) => k.toLowerCase() === nav.toLowerCase());
+        if (exact) return exact;                    // 完整匹配，如 zh-CN / en-US
+        const short = nav.split("-")[0].toLowerCase();  // 短码回退，如 zh / en
+        const prefix = LANG_ORDER.find((k) => k.split("-")[0].toLowerCase() === short);
         return prefix || "zh-CN";
     }
+    // 语言文件按需加载：只插入所需语言的脚本（指纹路径见 index.html 的 LOCALE_URLS），
+    // 加载前与加载失败时 t() 使用调用处的中文默认文本
+    const localeLoads = {};
+    function loadLocale(code) {
+        if (LANGS[code]) return Promise.resolve();
+        if (!localeLoads[code]) {
+            localeLoads[code] = new Promise((resolve) => {
+                const s = document.createElement("script");
+                s.src = (window.LOCALE_URLS || {})[code] || `/static/locales/${code}.js`;
+                s.onload = () => resolve();
+                s.onerror = () => { delete localeLoads[code]; resolve(); };
+                document.head.appendChild(s);
+            });
+        }
+        return localeLoads[code];
+    }
     let lang = detectLang();
     let T = LANGS[lang] || {};
+    let localeReady = false;
     // web_ui 标题自定义配置（来自 /api/config），默认无覆盖
     let webUiCfg = { page_title: { enable: false, lang: {} }, web_title: { enable: false, lang: {} } };
     const t = (key, fallback) => (T[key] !== undefined ? T[key] : (fallback !== undefined ? fallback : key));
@@ -87,25 +108,58 @@
     }
     function setBar(fillEl, pct) {
         const p = Math.max(0, Math.min(100, Number(pct) || 0));
+        if (fillEl.__pct === p) return;
+        fillEl.__pct = p;
         fillEl.style.width = p + "%";
         fillEl.style.background = colorByPct(p);
     }
+    // 内容未变时不写 DOM（写入相同文本也会使布局失效）
+    function setText(node, text) {
+        if (node.__text !== text) { node.textContent = text; node.__text = text; }
+    }
+    function setHtml(node, html) {
+        if (node.__html !== html) { node.innerHTML = html; node.__html = html; }
+    }
 
     /* ============ ECharts 折线图 ============ */
     const charts = {};
+    const plotted = {};  // domId -> 上次交给图表的 { epoch, data, tails }
     function ensureChart(domId) {
         const dom = document.getElementById(domId);
         if (!dom) return null;
-        if (charts[domId]) return charts[domId];
+        // 容器被重建（磁盘 / 显卡卡片）后旧实例指向已脱离文档的节点，需重新 init
+        if (charts[domId] && charts[domId].getDom() === dom) return charts[domId];
+        if (charts[domId]) { charts[domId].dispose(); delete charts[domId]; }
         // 容器不可见（display:none）时 clientWidth/Height 为 0，
         // 此时不初始化，交由「模块激活」时再 init，避免零尺寸实例。
         if (!dom.clientWidth || !dom.clientHeight) return null;
+        delete plotted[domId];  // 新实例需要完整选项
         charts[domId] = echarts.init(dom);
         return charts[domId];
     }
+    // 增量绘制：完整选项（配色、图例、坐标轴）只在首次绘制与 chartEpoch 变化（主题 / 语言切换、重新同步）时
+    // 由 build() 生成并设置；之后每帧只把各系列的数据数组交给 ECharts。序列由 applyDelta 原地滑动追加，
+    // 数组与末点都未变化的图表整帧跳过。
+    let chartEpoch = 0;
+    function plot(domId, data, build) {
+        const ch = ensureChart(domId);
+        if (!ch) return null;
+        const tails = data.map((d) => (d.length ? d.length + ":" + d[d.length - 1][0] : ""));
+        const prev = plotted[domId];
+        if (!prev || prev.epoch !== chartEpoch) {
+            ch.setOption(build(), true);
+        } else if (data.every((d, i) => d === prev.data[i] && tails[i] === prev.tails[i])) {
+            return ch;
+        } else {
+            ch.setOption({ series: data.map((d) => ({ data: d })) }, { lazyUpdate: true, silent: true });
+        }
+        plotted[domId] = { epoch: chartEpoch, data, tails };
+        return ch;
+    }
     function lineOption(series, color, unit) {
         const area = color.replace("rgb(", "rgba(").replace(")", ",.18)");
         return {
+            animationDurationUpdate: 0,  // 每秒滑动一次，过渡动画只会让每张图多重绘数十帧
             grid: { left: 44, right: 16, top: 18, bottom: 24 },
             tooltip: { trigger: "axis" },
             xAxis: { type: "time", axisLine: { show: false }, axisTick: { show: false },
@@ -148,7 +202,9 @@
         loadLine.innerHTML = `${t("sysLoad", "系统负载")}: <span class="font-medium text-[var(--color-ink)]" id="b-load">—</span>`;
         const procLine = el("div", "text-[13px] text-[var(--color-faint)]");
         procLine.innerHTML = `${t("procCount", "进程数")}: <span class="font-medium text-[var(--color-ink)]" id="b-proc">—</span>`;
-        up.appendChild(loadLine); up.appendChild(procLine);
+        const anomalyLine = el("div", "text-[13px] text-[var(--color-faint)]");
+        anomalyLine.innerHTML = `${t("anomalies", "异常指标")}: <span class="font-medium text-[var(--color-ink)]" id="b-anomaly">—</span>`;
+        up.appendChild(loadLine); up.appendChild(procLine); up.appendChild(anomalyLine);
         grid.appendChild(up);
         // 内存型号
         const mm = card("memModel");
@@ -194,6 +250,18 @@
         const cfw = el("div", "grid grid-cols-2 sm:grid-cols-3 md:grid-cols-4 lg:grid-cols-6 xl:grid-cols-8 gap-x-4 gap-y-2"); cfw.id = "cpu-core-freqs";
         coreFreq.appendChild(cfw); refs.cpuCoreFreqs = cfw;
         grid.appendChild(coreFreq);
+        // 每核热力图（整行）：时间 × 核，由服务端沿两个方向聚合后一次返回
+        const heat = card("coreHeatmap");
+        heat.className += " xl:col-span-2";
+        const sel = el("select", "text-[12px] rounded-lg px-2 py-1 cursor-pointer outline-none mb-2");
+        sel.style.cssText = "background:var(--color-surface);color:var(--color-ink);border:1px solid var(--color-sidebar)";
+        HEATMAP_FIELDS.forEach((f) => { const o = el("option", "", f); o.value = f; sel.appendChild(o); });
+        sel.value = heatmap.field;
+        sel.addEventListener("change", () => { heatmap.field = sel.value; renderCoreHeatmap(true); });
+        heat.appendChild(sel);
+        const hchart = el("div"); hchart.id = "cpu-heatmap"; hchart.style.cssText = "height:260px";
+        heat.appendChild(hchart);
+        grid.appendChild(heat);
         sec.appendChild(grid);
     }
 
@@ -238,6 +306,24 @@
         sgrid.id = "swap-detail"; swap.appendChild(sgrid);
         refs.swapDetail = sgrid;
         grid.appendChild(swap);
+
+        // 内存压力：PSI 与 meminfo / vmstat 明细（仅 Linux，数据源不支持时隐藏）
+        refs.memPressure = card("memPressure");
+        refs.memPressure.className += " xl:col-span-2";
+        const pgrid = el("div", "grid grid-cols-1 md:grid-cols-3 gap-x-6");
+        refs.psiMemory = metricRow(pgrid, "psiMemory", null, "%");
+        refs.psiMemoryFull = metricRow(pgrid, "psiMemoryFull", null, "%");
+        refs.psiIo = metricRow(pgrid, "psiIo", null, "%");
+        refs.psiCpu = metricRow(pgrid, "psiCpu", null, "%");
+        refs.memAnon = metricRow(pgrid, "memAnon", null, "GB");
+        refs.memFile = metricRow(pgrid, "memFile", null, "GB");
+        refs.memSlab = metricRow(pgrid, "memSlab", null, "MB");
+        refs.memDirty = metricRow(pgrid, "memDirty", null, "MB");
+        refs.majorFaults = metricRow(pgrid, "majorFaults", null, "/s");
+        refs.swapIo = metricRow(pgrid, "swapIo", null, "/s");
+        refs.directReclaim = metricRow(pgrid, "directReclaim", null, "/s");
+        refs.memPressure.appendChild(pgrid);
+        grid.appendChild(refs.memPressure);
         sec.appendChild(grid);
     }
 
@@ -316,18 +402,36 @@
         nicCard.appendChild(nicChart);
         grid.appendChild(nicCard);
         refs.netSelectedNic = null;
+
+        // 协议栈：TCP 重传 / 重置、监听队列丢弃、套接字状态与 UDP 错误（数据源不支持时隐藏）
+        refs.netStack = card("netStack");
+        refs.netStack.className += " xl:col-span-2";
+        const stack = el("div", "grid grid-cols-2 md:grid-cols-4 gap-x-6");
+        refs.tcpRetrans = metricRow(stack, "tcpRetrans", null, "/s");
+        refs.tcpResets = metricRow(stack, "tcpResets", null, "/s");
+        refs.listenDrops = metricRow(stack, "listenDrops", null, "/s");
+        refs.udpErrors = metricRow(stack, "udpErrors", null, "/s");
+        refs.tcpEstablished = metricRow(stack, "tcpEstablished");
+        refs.tcpTimeWait = metricRow(stack, "tcpTimeWait");
+        refs.tcpCloseWait = metricRow(stack, "tcpCloseWait");
+        refs.netStack.appendChild(stack);
+        grid.appendChild(refs.netStack);
     }
 
+    /* 进程表按行虚拟化：固定行高，只为视口内（上下各多留 PROC_OVERSCAN 行）的进程填充行，行元素复用，
+     * 上下两个占位行撑开滚动高度；滚动时在下一帧重绘可见区间 */
+    const PROC_ROW_H = 33, PROC_OVERSCAN = 6, PROC_VIEW_H = 640;
     function buildProcess() {
         const sec = $("#sec-process");
         sec.innerHTML = "";
         const c = card("navProcess");
         const hint = el("div", "text-[12px] text-[var(--color-faint)] mb-3", t("processHint", "按 CPU 占用降序，仅显示前 20 个（只读）"));
         c.appendChild(hint);
-        const wrap = el("div", "overflow-x-auto");
+        const wrap = el("div", "overflow-auto");
+        wrap.style.maxHeight = PROC_VIEW_H + "px";
         const table = el("table", "w-full text-[13px] border-collapse");
         table.innerHTML = `<thead>
-            <tr class="text-[var(--color-faint)] text-left" style="border-bottom:1px solid var(--color-border)">
+            <tr class="text-[var(--color-faint)] text-left" style="border-bottom:1px solid var(--color-border);position:sticky;top:0;background:var(--color-surface)">
                 <th class="py-2 pr-3 font-medium">PID</th>
                 <th class="py-2 pr-3 font-medium">${t("procName", "进程名")}</th>
                 <th class="py-2 pr-3 font-medium text-right">CPU</th>
@@ -338,54 +442,87 @@
             </tr>
         </thead>`;
         refs.procBody = el("tbody");
+        const spacer = () => {
+            const tr = el("tr", null, `<td colspan="7" style="padding:0;border:0"></td>`);
+            refs.procBody.appendChild(tr);
+            return tr.firstChild;
+        };
+        refs.procTop = spacer();
+        refs.procEmpty = el("tr", null, `<td colspan="7" class="py-4 text-center text-[var(--color-faint)]">—</td>`);
+        refs.procBody.appendChild(refs.procEmpty);
+        refs.procBottom = spacer();
+        refs.procRows = [];
+        refs.procList = [];
         table.appendChild(refs.procBody);
         wrap.appendChild(table);
+        let queued = false;
+        wrap.addEventListener("scroll", () => {
+            if (queued) return;
+            queued = true;
+            requestAnimationFrame(() => { queued = false; renderProcRows(); });
+        }, { passive: true });
+        refs.procWrap = wrap;
         c.appendChild(wrap);
         sec.appendChild(c);
     }
+    function procRow() {
+        const tr = el("tr");
+        tr.style.cssText = `border-bottom:1px solid var(--color-border);height:${PROC_ROW_H}px`;
+        tr.innerHTML = `<td class="py-1.5 pr-3 font-mono text-[12px] text-[var(--color-subtle)]"></td>
+            <td class="py-1.5 pr-3" style="max-width:240px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap"></td>
+            <td class="py-1.5 pr-3 text-right font-medium"></td>
+            <td class="py-1.5 pr-3 text-right"></td>
+            <td class="py-1.5 pr-3 text-right text-[12px] text-[var(--color-subtle)]"></td>
+            <td class="py-1.5 pr-3 text-right text-[12px] text-[var(--color-subtle)]"></td>
+            <td class="py-1.5 pr-3 text-right"></td>`;
+        const [pid, name, cpu, mem, disk, net, gpu] = tr.children;
+        return { tr, pid, name, cpu, mem, disk, net, gpu };
+    }
 
     function updateProcess(snap) {
-        const list = snap.real_time_data.processes || snap.processes || [];
+        refs.procList = snap.real_time_data.processes || snap.processes || [];
+        renderProcRows();
+    }
+    function renderProcRows() {
+        const list = refs.procList, wrap = refs.procWrap;
         if (!refs.procBody) return;
-        if (!list.length) {
-            refs.procBody.innerHTML = `<tr><td colspan="7" class="py-4 text-center text-[var(--color-faint)]">—</td></tr>`;
-            return;
+        refs.procEmpty.style.display = list.length ? "none" : "";
+        const viewH = wrap.clientHeight || PROC_VIEW_H;
+        const first = Math.max(0, Math.min(list.length, Math.floor(wrap.scrollTop / PROC_ROW_H) - PROC_OVERSCAN));
+        const last = Math.min(list.length, first + Math.ceil(viewH / PROC_ROW_H) + 2 * PROC_OVERSCAN);
+        while (refs.procRows.length < last - first) {
+            const r = procRow();
+            refs.procRows.push(r);
+            refs.procBody.insertBefore(r.tr, refs.procBottom.parentNode);
         }
-        // 仅在数量变化时全量重建，避免每秒重排抖动
-        if (refs.procBody.childElementCount !== list.length) {
-            refs.procBody.innerHTML = "";
-            list.forEach(() => {
-                const tr = el("tr");
-                tr.style.borderBottom = "1px solid var(--color-border)";
-                tr.innerHTML = `<td class="py-1.5 pr-3 font-mono text-[12px] text-[var(--color-subtle)] proc-pid"></td>
-                    <td class="py-1.5 pr-3 proc-name" style="max-width:240px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap"></td>
-                    <td class="py-1.5 pr-3 text-right proc-cpu font-medium"></td>
-                    <td class="py-1.5 pr-3 text-right proc-mem"></td>
-                    <td class="py-1.5 pr-3 text-right proc-disk text-[12px] text-[var(--color-subtle)]"></td>
-                    <td class="py-1.5 pr-3 text-right proc-net text-[12px] text-[var(--color-subtle)]"></td>
-                    <td class="py-1.5 pr-3 text-right proc-gpu"></td>`;
-                refs.procBody.appendChild(tr);
-            });
-        }
-        list.forEach((p, i) => {
-            const tr = refs.procBody.children[i];
-            if (!tr) return;
-            tr.querySelector(".proc-pid").textContent = p.pid;
-            tr.querySelector(".proc-name").textContent = p.name;
-            tr.querySelector(".proc-name").title = p.name;
-            const cpu = tr.querySelector(".proc-cpu"); cpu.textContent = p.cpu + "%"; cpu.style.color = colorByPct(p.cpu);
-            tr.querySelector(".proc-mem").textContent = p.mem + "%";
-            tr.querySelector(".proc-disk").textContent = `${p.disk_read} / ${p.disk_write} KB/s`;
-            tr.querySelector(".proc-net").textContent = `${p.net_down} / ${p.net_up} KB/s`;
-            const gpu = tr.querySelector(".proc-gpu");
-            gpu.textContent = p.gpu ? p.gpu + " MB" : "—";
-            gpu.style.color = p.gpu ? "var(--color-orange)" : "var(--color-faint)";
+        refs.procRows.forEach((r, i) => {
+            const p = list[first + i];
+            r.tr.style.display = p ? "" : "none";
+            if (!p) return;
+            setText(r.pid, String(p.pid));
+            setText(r.name, p.name);
+            r.name.title = p.name;
+            setText(r.cpu, p.cpu + "%");
+            r.cpu.style.color = colorByPct(p.cpu);
+            setText(r.mem, p.mem + "%");
+            setText(r.disk, `${p.disk_read} / ${p.disk_write} KB/s`);
+            setText(r.net, `${p.net_down} / ${p.net_up} KB/s`);
+            setText(r.gpu, p.gpu ? p.gpu + " MB" : "—");
+            r.gpu.style.color = p.gpu ? "var(--color-orange)" : "var(--color-faint)";
         });
+        refs.procTop.style.height = first * PROC_ROW_H + "px";
+        refs.procBottom.style.height = (list.length - last) * PROC_ROW_H + "px";
     }
 
     /* ============ 模块更新（每次快照） ============ */
+    // 硬件清单（很少变化）与实时部分（swap 用量、GPU 详情）分开下发，这里合并为原先的 hardware_info 形状
+    function hwOf(snap) {
+        const hw = snap.hardware_info || {}, live = snap.hardware_live;
+        if (!live) return hw;
+        return Object.assign({}, hw, live, { swap: Object.assign({}, hw.swap, live.swap) });
+    }
     function updateBasic(snap) {
-        const hw = snap.hardware_info || {};
+        const hw = hwOf(snap);
         const rt = snap.real_time_data || {};
         const cpu = hw.cpu || {}, mem = hw.memory || {}, net = hw.network || [], gpu = hw.gpu || {};
         refs.bCpu.textContent = esc(cpu.model);
@@ -398,6 +535,13 @@
         $("#b-load").textContent = load != null ? load : "—";
         const proc = (rt.process_count || []).slice(-1)[0]?.[1];
         $("#b-proc").textContent = proc != null ? proc : "—";
+        // 异常检测：按分数绝对值降序显示前 5 条被标记的序列
+        const anomalies = Object.entries(rt.anomalies || {}).sort((a, b) => Math.abs(b[1]) - Math.abs(a[1]));
+        const anomalyEl = $("#b-anomaly");
+        anomalyEl.textContent = anomalies.length
+            ? anomalies.slice(0, 5).map(([k, v]) => `${k} (${v > 0 ? "+" : ""}${v})`).join(", ")
+            : "—";
+        anomalyEl.style.color = anomalies.length ? "var(--color-orange)" : "";
         refs.bMemModel.textContent = esc(mem.model);
         refs.bMemFreq.textContent = mem.mem_frequency != null ? mem.mem_frequency : "—";
     }
@@ -425,7 +569,7 @@
             });
         }
         cores.forEach((u, i) => {
-            if (refs.coreFills[i]) { setBar(refs.coreFills[i].fill, u); refs.coreFills[i].val.textContent = Math.round(u) + "%"; }
+            if (refs.coreFills[i]) { setBar(refs.coreFills[i].fill, u); setText(refs.coreFills[i].val, Math.round(u) + "%"); }
         });
 
         // 每核频率
@@ -446,7 +590,7 @@
         for (let i = 0; i < n; i++) {
             if (refs.coreFreqVals[i]) {
                 const v = coreFreqs[i];
-                refs.coreFreqVals[i].textContent = v != null ? Math.round(v) + " MHz" : "—";
+                setText(refs.coreFreqVals[i], v != null ? Math.round(v) + " MHz" : "—");
             }
         }
 
@@ -459,15 +603,55 @@
         const rt = (snap || lastSnap || {}).real_time_data || {};
         const usage = rt.cpu_usage || [];
         const freq = rt.cpu_freq || [];
-        const ch = ensureChart("cpu-chart");
-        if (ch) ch.setOption(lineOption(usage, "rgb(0,113,227)", "%"));
-        const fh = ensureChart("cpu-freq-chart");
-        if (fh) fh.setOption(lineOption(freq, "rgb(52,199,89)", ""));
+        plot("cpu-chart", [usage], () => lineOption(usage, "rgb(0,113,227)", "%"));
+        plot("cpu-freq-chart", [freq], () => lineOption(freq, "rgb(52,199,89)", ""));
+        renderCoreHeatmap(false);
+    }
+
+    /* 每核热力图：按需拉取 /api/cores/heatmap（至多每 HEATMAP_INTERVAL 一次），整张矩阵一个 heatmap 系列 */
+    const HEATMAP_FIELDS = ["usage", "user", "system", "iowait", "steal", "irq", "freq"];
+    const HEATMAP_INTERVAL = 5000;
+    const heatmap = { field: "usage", at: 0, busy: false };
+    function renderCoreHeatmap(force) {
+        const ch = ensureChart("cpu-heatmap");
+        const dom = document.getElementById("cpu-heatmap");
+        // 模块不可见（零尺寸）时不拉取
+        if (!ch || !dom.clientWidth || heatmap.busy || (!force && Date.now() - heatmap.at < HEATMAP_INTERVAL)) return;
+        heatmap.busy = true;
+        heatmap.at = Date.now();
+        // 时间桶按宽度约 4px 一格，核分组按高度约 4px 一格，超过的部分由服务端合并
+        const rows = Math.max(20, Math.floor(dom.clientWidth / 4));
+        const cols = Math.max(4, Math.floor(dom.clientHeight / 4));
+        fetch(`/api/cores/heatmap?field=${heatmap.field}&range=10m&rows=${rows}&cols=${cols}`, { cache: "no-store" })
+            .then((r) => (r.ok ? r.json() : null))
+            .then((h) => { if (h) ch.setOption(heatmapOption(h), true); })
+            .catch(() => {})
+            .finally(() => { heatmap.busy = false; });
+    }
+    function heatmapOption(h) {
+        const data = [];
+        h.values.forEach((row, x) => row.forEach((v, y) => { if (v != null) data.push([x, y, v]); }));
+        const unit = h.field === "freq" ? " MHz" : "%";
+        const time = (ms) => new Date(ms).toLocaleTimeString();
+        const label = ([a, b]) => (a === b ? `#${a}` : `#${a}-${b}`);
+        const axisLabel = { color: cssVar("--color-faint"), fontSize: 10 };
+        return {
+            grid: { left: 56, right: 16, top: 6, bottom: 52 },
+            tooltip: { formatter: (p) => `${time(h.ts[p.value[0]])}<br>${label(h.cores[p.value[1]])}: ${p.value[2]}${unit}` },
+            xAxis: { type: "category", data: h.ts.map(time), axisLabel, axisLine: { show: false }, axisTick: { show: false } },
+            yAxis: { type: "category", data: h.cores.map(label), axisLabel, axisLine: { show: false }, axisTick: { show: false } },
+            visualMap: {
+                min: 0, max: h.max || 100, orient: "horizontal", left: "center", bottom: 0,
+                itemHeight: 160, itemWidth: 10, textStyle: axisLabel,
+                inRange: { color: ["rgba(0,113,227,.08)", "rgb(52,199,89)", "rgb(255,159,10)", "rgb(255,59,48)"] },
+            },
+            series: [{ type: "heatmap", data, progressive: 0, animation: false }],
+        };
     }
 
     function updateMemory(snap) {
         const rt = snap.real_time_data || {};
-        const mem = (snap.hardware_info || {}).memory || {};
+        const mem = hwOf(snap).memory || {};
         const usage = rt.mem_usage || [];
         const last = usage.length ? usage[usage.length - 1][1] : 0;
         const totalGb = mem.total || 0;
@@ -483,7 +667,7 @@
         refs.memFreq.textContent = mem.mem_frequency != null ? mem.mem_frequency : "—";
 
         // 交换分区 / 页面文件
-        const swap = (snap.hardware_info || {}).swap || {};
+        const swap = hwOf(snap).swap || {};
         const swapTotal = swap.total || 0;
         const swapUsed = swap.used || 0;
         const swapPct = swap.percent || (swapTotal ? (swapUsed / swapTotal * 100) : 0);
@@ -503,25 +687,41 @@
                     html += `<div class="col-span-2 sm:col-span-3"><span class="text-[var(--color-subtle)]">${esc(pf.name)}:</span> <span class="font-medium">${size}</span></div>`;
                 });
             }
-            refs.swapDetail.innerHTML = html;
+            setHtml(refs.swapDetail, html);
         } else {
             refs.swapUsed.textContent = "0";
             refs.swapUsed.nextSibling.textContent = "/ 0 GB";
             $("#swap-pct").textContent = "—";
             setBar(refs.swapFill, 0);
-            refs.swapDetail.innerHTML = `<div class="col-span-2 sm:col-span-3 text-[var(--color-faint)]">${t("swapNone", "未检测到交换分区 / 页面文件")}</div>`;
+            setHtml(refs.swapDetail, `<div class="col-span-2 sm:col-span-3 text-[var(--color-faint)]">${t("swapNone", "未检测到交换分区 / 页面文件")}</div>`);
         }
 
+        // 内存压力（PSI 取 10 秒平均；速率首轮为空时显示 —）
+        const mp = rt.memory_pressure || {};
+        const info = mp.meminfo || {}, vm = mp.vmstat || {}, psi = mp.psi || {};
+        refs.memPressure.style.display = Object.keys(info).length ? "" : "none";
+        const num = (v, digits) => (v == null ? "—" : Number(v).toFixed(digits));
+        refs.psiMemory.textContent = num((psi.memory || {}).some_avg10, 2);
+        refs.psiMemoryFull.textContent = num((psi.memory || {}).full_avg10, 2);
+        refs.psiIo.textContent = num((psi.io || {}).some_avg10, 2);
+        refs.psiCpu.textContent = num((psi.cpu || {}).some_avg10, 2);
+        refs.memAnon.textContent = num(info.anon != null ? info.anon / 1024 : null, 2);
+        refs.memFile.textContent = num(info.file != null ? info.file / 1024 : null, 2);
+        refs.memSlab.textContent = num(info.slab, 0);
+        refs.memDirty.textContent = info.dirty == null ? "—" : `${info.dirty.toFixed(1)} / ${(info.writeback || 0).toFixed(1)}`;
+        refs.majorFaults.textContent = num(vm.major_faults, 0);
+        refs.swapIo.textContent = vm.swap_in == null ? "—" : `${vm.swap_in.toFixed(0)} / ${vm.swap_out.toFixed(0)}`;
+        refs.directReclaim.textContent = num(vm.scan_direct, 0);
+
         renderMemCharts(snap);
     }
     function renderMemCharts(snap) {
         const usage = ((snap || lastSnap || {}).real_time_data || {}).mem_usage || [];
-        const ch = ensureChart("mem-chart");
-        if (ch) ch.setOption(lineOption(usage, "rgb(255,159,10)", "%"));
+        plot("mem-chart", [usage], () => lineOption(usage, "rgb(255,159,10)", "%"));
     }
 
     function updateDisk(snap) {
-        const hw = snap.hardware_info || {};
+        const hw = hwOf(snap);
         const disks = snap.disk_usage || hw.disks || [];
         const physicalDisks = hw.physical_disks || [];
         if (!disks.length) {
@@ -529,10 +729,11 @@
             return;
         }
         // 按物理磁盘聚合分区
-        const byDisk = {};
+        const byDisk = {}, byMount = {};
         disks.forEach((d) => {
             const pd = d.physical_disk || d.device;
             (byDisk[pd] = byDisk[pd] || []).push(d);
+            byMount[d.mountpoint] = d;
         });
         const pdList = physicalDisks.length ? physicalDisks : Object.keys(byDisk);
 
@@ -565,23 +766,35 @@
                     fills.push({ fill, pct: row.querySelector(".disk-pct"), data: p });
                 });
                 c.appendChild(plist);
+                // IOPS / 平均延迟 / 队列深度（仅 Linux /proc/diskstats 提供）
+                const ioStat = el("div", "text-[12px] font-mono text-[var(--color-subtle)]");
+                c.appendChild(ioStat);
                 // IO 图表（读写 + 等待）
                 const chart = el("div"); const chartId = "disk-io-" + pd.replace(/[^a-zA-Z0-9]/g, "_");
                 chart.id = chartId; chart.style.cssText = "height:180px;margin-top:8px";
                 c.appendChild(chart);
                 refs.diskGrid.appendChild(c);
-                refs.diskCards[pd] = { card: c, parts: plist, fills, chartId, total };
+                refs.diskCards[pd] = { card: c, parts: plist, fills, chartId, total, ioStat };
             });
         }
         // 增量更新分区使用率
+        const diskIo = (snap.real_time_data || {}).disk_io || {};
+        const lastOf = (arr) => (arr && arr.length ? arr[arr.length - 1][1] : null);
         pdList.forEach((pd) => {
             const ref = refs.diskCards[pd];
             if (!ref) return;
+            const io = diskIo[pd] || {};
+            const awaitMs = lastOf(io.await);
+            ref.ioStat.textContent = awaitMs == null ? "" :
+                `IOPS ${lastOf(io.r_iops)} / ${lastOf(io.w_iops)} · await ${awaitMs} ms · queue ${lastOf(io.queue)}`;
             ref.fills.forEach((f) => {
-                const pct = f.data.usage_percent ?? 0;
+                const d = byMount[f.data.mountpoint] || f.data;
+                const pct = d.usage_percent ?? 0;
                 setBar(f.fill, pct);
-                f.pct.textContent = pct + "%";
-                f.pct.style.color = colorByPct(pct);
+                // stale：该挂载点最近一次获取超时或出错（如 NFS 服务端无响应），显示的是上一次的结果
+                f.pct.textContent = pct + "%" + (d.stale ? " ⚠" : "");
+                f.pct.title = d.stale ? t("diskStale", "获取超时，显示上次结果") : "";
+                f.pct.style.color = d.stale ? "var(--color-faint)" : colorByPct(pct);
             });
         });
         renderDiskCharts(snap);
@@ -593,12 +806,15 @@
         Object.keys(refs.diskCards || {}).forEach((pd) => {
             const ref = refs.diskCards[pd];
             const series = io[pd];
-            const ch = ensureChart(ref.chartId);
-            if (!ch) return;  // 容器隐藏或零尺寸时跳过，待激活时渲染
             if (!series) {
-                ch.clear(); return;
+                const ch = ensureChart(ref.chartId);
+                if (ch) { ch.clear(); delete plotted[ref.chartId]; }
+                return;
             }
-            const option = {
+            // 容器隐藏或零尺寸时 plot 跳过，待激活时渲染
+            const data = [series.read || [], series.write || [], series.busy || []];
+            plot(ref.chartId, data, () => ({
+                animationDurationUpdate: 0,
                 grid: { left: 48, right: 48, top: 30, bottom: 24 },
                 tooltip: { trigger: "axis" },
                 legend: {
@@ -616,21 +832,20 @@
                 series: [
                     { name: t("read", "读取"), type: "line", showSymbol: false, smooth: true, yAxisIndex: 0,
                       lineStyle: { width: 1.5, color: "rgb(10,132,255)" }, itemStyle: { color: "rgb(10,132,255)" },
-                      areaStyle: { color: "rgba(10,132,255,0.12)" }, data: series.read || [] },
+                      areaStyle: { color: "rgba(10,132,255,0.12)" }, data: data[0] },
                     { name: t("write", "写入"), type: "line", showSymbol: false, smooth: true, yAxisIndex: 0,
                       lineStyle: { width: 1.5, color: "rgb(255,59,48)" }, itemStyle: { color: "rgb(255,59,48)" },
-                      areaStyle: { color: "rgba(255,59,48,0.12)" }, data: series.write || [] },
+                      areaStyle: { color: "rgba(255,59,48,0.12)" }, data: data[1] },
                     { name: t("ioWait", "等待"), type: "line", showSymbol: false, smooth: true, yAxisIndex: 1,
                       lineStyle: { width: 1.5, color: "rgb(255,149,0)", type: "dashed" }, itemStyle: { color: "rgb(255,149,0)" },
-                      data: series.busy || [] }
+                      data: data[2] }
                 ]
-            };
-            ch.setOption(option);
+            }));
         });
     }
 
     function updateGpu(snap) {
-        const hw = snap.hardware_info || {};
+        const hw = hwOf(snap);
         const info = hw.gpu || {}, det = hw.gpu_details || {};
         const sec = $("#sec-gpu");
         const hasGpu = det.available || info.available;
@@ -670,8 +885,7 @@
     }
     function renderGpuCharts(snap) {
         const usage = ((snap || lastSnap || {}).real_time_data || {}).gpu_usage || [];
-        const ch = ensureChart("gpu-chart");
-        if (ch) ch.setOption(lineOption(usage, "rgb(175,82,222)", "%"));
+        plot("gpu-chart", [usage], () => lineOption(usage, "rgb(175,82,222)", "%"));
     }
     function buildGpuContent() {
         const sec = $("#sec-gpu");
@@ -704,8 +918,9 @@
         $("#net-up").textContent = Number(upLast).toFixed(1);
 
         // 各网卡实时上传/下载
-        const net = (snap.hardware_info || {}).network || [];
+        const net = hwOf(snap).network || [];
         const perNic = rt.net_io_per_nic || {};
+        const nicStats = (rt.net_stats || {}).nics || {};
         const nicOrder = net.map((n) => n.name);
         // 默认选中第一张网卡
         if (!refs.netSelectedNic && nicOrder.length) refs.netSelectedNic = nicOrder[0];
@@ -715,12 +930,13 @@
             net.forEach((n) => {
                 const row = el("div", "flex items-center justify-between py-1.5 px-2 rounded-lg cursor-pointer");
                 row.style.transition = "background .15s";
-                row.innerHTML = `<span class="metric-label nic-name">${esc(n.name)}</span>
+                row.innerHTML = `<span class="flex flex-col"><span class="metric-label nic-name">${esc(n.name)}</span>
+                    <span class="text-[11px] font-mono nic-link text-[var(--color-faint)]"></span></span>
                     <span class="text-[12px] font-mono nic-rate text-[var(--color-subtle)]"></span>`;
                 row.addEventListener("click", () => {
                     refs.netSelectedNic = n.name;
                     highlightNic();
-                    renderNicChart(snap);
+                    renderNicChart(lastSnap);
                 });
                 refs.netList.appendChild(row);
             });
@@ -731,10 +947,35 @@
             const s = (perNic[n.name] || {});
             const dLast = (s.down || [])[0] ? s.down[s.down.length - 1][1] : 0;
             const uLast = (s.up || [])[0] ? s.up[s.up.length - 1][1] : 0;
-            row.querySelector(".nic-rate").textContent = `↓ ${dLast.toFixed(1)}  ↑ ${uLast.toFixed(1)} KB/s`;
+            setText(row.querySelector(".nic-rate"), `↓ ${dLast.toFixed(1)}  ↑ ${uLast.toFixed(1)} KB/s`);
+            // 链路带宽、利用率与错误 / 丢包每秒（带宽未知的虚拟网卡只显示后两项）
+            const link = nicStats[n.name] || {};
+            const errs = link.errors || 0, drops = link.drops || 0;
+            const parts = [];
+            if (link.speed) parts.push(link.speed >= 1000 ? `${link.speed / 1000} Gb/s` : `${link.speed} Mb/s`);
+            if (link.util != null) parts.push(`${link.util.toFixed(1)}%`);
+            parts.push(`${t("nicErrors", "错误")} ${errs}/s`, `${t("nicDrops", "丢包")} ${drops}/s`);
+            const linkEl = row.querySelector(".nic-link");
+            setText(linkEl, parts.join(" · "));
+            linkEl.style.color = errs || drops ? "var(--color-red)" : "";
         });
         highlightNic();
 
+        const stats = rt.net_stats || {};
+        const tcp = stats.tcp || {}, udp = stats.udp || {}, sockets = stats.sockets || {};
+        const hasStack = Object.keys(tcp).length || Object.keys(sockets).length;
+        refs.netStack.style.display = hasStack ? "" : "none";
+        if (hasStack) {
+            const fmt = (v) => (v == null ? "—" : String(v));
+            refs.tcpRetrans.textContent = tcp.retrans == null ? "—" : `${tcp.retrans} (${tcp.retrans_pct}%)`;
+            refs.tcpResets.textContent = tcp.estab_resets == null ? "—" : String(Math.round((tcp.estab_resets + tcp.out_rsts) * 100) / 100);
+            refs.listenDrops.textContent = fmt(tcp.listen_drops);
+            refs.udpErrors.textContent = udp.in_errors == null ? "—" : String(Math.round((udp.in_errors + udp.rcvbuf_errors + udp.sndbuf_errors) * 100) / 100);
+            refs.tcpEstablished.textContent = fmt(sockets.established != null ? sockets.established : tcp.curr_estab);
+            refs.tcpTimeWait.textContent = fmt(sockets.time_wait);
+            refs.tcpCloseWait.textContent = fmt(sockets.close_wait);
+        }
+
         renderNetCharts(snap);
         renderNicChart(snap);
     }
@@ -746,66 +987,73 @@
             row.style.background = active ? "var(--color-accent-soft)" : "transparent";
         });
     }
+    // 总流量与单网卡流量图共用的选项（下载 / 上传两条线）
+    function trafficOption(down, up) {
+        return {
+            animationDurationUpdate: 0,
+            grid: { left: 44, right: 16, top: 30, bottom: 24 },
+            tooltip: { trigger: "axis" },
+            legend: { data: [t("download", "下载"), t("upload", "上传")], textStyle: { color: cssVar("--color-subtle") }, top: 0, right: 0 },
+            xAxis: { type: "time", axisLine: { show: false }, axisTick: { show: false }, axisLabel: { color: cssVar("--color-faint"), fontSize: 11 } },
+            yAxis: { type: "value", axisLabel: { color: cssVar("--color-faint"), fontSize: 11 }, splitLine: { lineStyle: { color: "rgba(128,128,128,.12)" } } },
+            series: [
+                { name: t("download", "下载"), type: "line", showSymbol: false, smooth: true, data: down, lineStyle: { width: 2, color: "rgb(52,199,89)" }, areaStyle: { color: "rgba(52,199,89,.12)" } },
+                { name: t("upload", "上传"), type: "line", showSymbol: false, smooth: true, data: up, lineStyle: { width: 2, color: "rgb(255,159,10)" }, areaStyle: { color: "rgba(255,159,10,.12)" } },
+            ],
+        };
+    }
     function renderNetCharts(snap) {
         const rt = (snap || lastSnap || {}).real_time_data || {};
         const up = rt.net_upload_speed || [], down = rt.net_download_speed || [];
-        const ch = ensureChart("net-chart");
-        if (ch) {
-            ch.setOption({
-                grid: { left: 44, right: 16, top: 30, bottom: 24 },
-                tooltip: { trigger: "axis" },
-                legend: { data: [t("download", "下载"), t("upload", "上传")], textStyle: { color: cssVar("--color-subtle") }, top: 0, right: 0 },
-                xAxis: { type: "time", axisLine: { show: false }, axisTick: { show: false }, axisLabel: { color: cssVar("--color-faint"), fontSize: 11 } },
-                yAxis: { type: "value", axisLabel: { color: cssVar("--color-faint"), fontSize: 11 }, splitLine: { lineStyle: { color: "rgba(128,128,128,.12)" } } },
-                series: [
-                    { name: t("download", "下载"), type: "line", showSymbol: false, smooth: true, data: down, lineStyle: { width: 2, color: "rgb(52,199,89)" }, areaStyle: { color: "rgba(52,199,89,.12)" } },
-                    { name: t("upload", "上传"), type: "line", showSymbol: false, smooth: true, data: up, lineStyle: { width: 2, color: "rgb(255,159,10)" }, areaStyle: { color: "rgba(255,159,10,.12)" } },
-                ],
-            });
-        }
+        plot("net-chart", [down, up], () => trafficOption(down, up));
     }
 
     function renderNicChart(snap) {
         const rt = (snap || lastSnap || {}).real_time_data || {};
         const perNic = rt.net_io_per_nic || {};
         const nic = refs.netSelectedNic;
-        const ch = ensureChart("net-nic-chart");
-        if (!ch) return;
-        const series = (nic && perNic[nic]) || { up: [], down: [] };
-        if (refs.nicSelected) refs.nicSelected.textContent = `${esc(nic || "—")} · ${t("nicTraffic", "网卡流量")}`;
-        ch.setOption({
-            grid: { left: 44, right: 16, top: 30, bottom: 24 },
-            tooltip: { trigger: "axis" },
-            legend: { data: [t("download", "下载"), t("upload", "上传")], textStyle: { color: cssVar("--color-subtle") }, top: 0, right: 0 },
-            xAxis: { type: "time", axisLine: { show: false }, axisTick: { show: false }, axisLabel: { color: cssVar("--color-faint"), fontSize: 11 } },
-            yAxis: { type: "value", axisLabel: { color: cssVar("--color-faint"), fontSize: 11 }, splitLine: { lineStyle: { color: "rgba(128,128,128,.12)" } } },
-            series: [
-                { name: t("download", "下载"), type: "line", showSymbol: false, smooth: true, data: series.down || [], lineStyle: { width: 2, color: "rgb(52,199,89)" }, areaStyle: { color: "rgba(52,199,89,.12)" } },
-                { name: t("upload", "上传"), type: "line", showSymbol: false, smooth: true, data: series.up || [], lineStyle: { width: 2, color: "rgb(255,159,10)" }, areaStyle: { color: "rgba(255,159,10,.12)" } },
-            ],
-        });
+        const series = (nic && perNic[nic]) || {};
+        if (refs.nicSelected) setText(refs.nicSelected, `${esc(nic || "—")} · ${t("nicTraffic", "网卡流量")}`);
+        const down = series.down || [], up = series.up || [];
+        plot("net-nic-chart", [down, up], () => trafficOption(down, up));
     }
 
     let lastSnap = null;
+    let currentSection = "basic";
+    const UPDATERS = {
+        basic: updateBasic, cpu: updateCpu, memory: updateMemory, disk: updateDisk,
+        gpu: updateGpu, network: updateNetwork, process: updateProcess,
+    };
     function firstRender(snap) {
         lastSnap = snap;
         buildBasic(); buildCpu(); buildMemory(); buildDisk(); buildGpu(); buildNetwork(); buildProcess();
-        updateAll(snap);
-        // 基础信息模块默认可见（无图表）；其余模块的图表在「首次激活」时再 init
+        renderSection(currentSection);
+        // 其余模块（含图表）在「首次激活」时再更新与 init
     }
-    function updateAll(snap) {
-        lastSnap = snap;
-        updateBasic(snap); updateCpu(snap); updateMemory(snap); updateDisk(snap); updateGpu(snap); updateNetwork(snap); updateProcess(snap);
+    // 只更新当前可见的模块：隐藏模块的 DOM 与图表不参与每帧渲染，切换过去时按最新快照一次补齐
+    function renderSection(section) {
+        const fn = UPDATERS[section];
+        if (fn && lastSnap) fn(lastSnap);
     }
-    // 某模块被激活（可见）时，渲染其图表（此时容器尺寸正确）
-    function activateCharts(section) {
-        switch (section) {
-            case "cpu":     renderCpuCharts(lastSnap); break;
-            case "memory":  renderMemCharts(lastSnap); break;
-            case "gpu":     renderGpuCharts(lastSnap); break;
-            case "network": renderNetCharts(lastSnap); break;
-            case "disk":    renderDiskCharts(lastSnap); break;
-        }
+
+    /* ============ 帧调度 ============ */
+    // 到达的快照 / 增量只合并进 lastSnap，渲染合并到下一个动画帧（一帧内到达多条时只渲染一次）；
+    // 页面隐藏时不调度（浏览器也不会执行 rAF 回调），重新可见时整体重绘
+    let built = false;
+    let frameQueued = false, resync = true;
+    function schedule(full) {
+        if (full) resync = true;
+        if (frameQueued || document.hidden) return;
+        frameQueued = true;
+        requestAnimationFrame(flush);
+    }
+    function flush() {
+        frameQueued = false;
+        // 首次渲染等当前语言加载完成：模块结构中的文本只在构建时取一次
+        if (!lastSnap || !lastSnap.real_time_data || !localeReady) return;
+        if (resync) { chartEpoch++; resync = false; }
+        if (!built) { firstRender(lastSnap); built = true; }
+        else renderSection(currentSection);
     }
 
     /* ============ 连接状态 ============ */
@@ -846,9 +1094,10 @@
         const target = document.querySelector(`.section[data-section="${section}"]`);
         if (target) target.classList.add("active");
         setCookie("section", section);
-        // 下一帧布局完成后渲染该模块图表（容器此时已可见，尺寸正确）
+        currentSection = section;
+        // 下一帧布局完成后按最新快照补齐该模块（容器此时已可见，图表尺寸正确）
         requestAnimationFrame(() => {
-            activateCharts(section);
+            if (built) renderSection(section);
             Object.values(charts).forEach((c) => c.resize());
         });
     }
@@ -883,22 +1132,18 @@
 
     /* ============ 语言切换 ============ */
     function setLang(next) {
-        if (!LANGS[next]) return;
+        if (!known(next)) return;
+        loadLocale(next).then(() => applyLang(next));
+    }
+    function applyLang(next) {
         lang = next;
         T = LANGS[lang] || {};
         setCookie("lang", lang);
         document.documentElement.lang = lang;
         applyI18n();
         const sel = $("#lang-select"); if (sel) sel.value = lang;
-        // 图表内部文本（legend / 轴名）依赖 t()，需重渲染可见图表
-        const activeSection = document.querySelector(".section.active");
-        const sec = activeSection ? activeSection.dataset.section : "basic";
-        if (lastSnap) {
-            requestAnimationFrame(() => {
-                activateCharts(sec);
-                Object.values(charts).forEach((c) => c && c.resize());
-            });
-        }
+        // 图表内部文本（legend / 轴名）依赖 t()，需以完整选项重渲染
+        schedule(true);
     }
 
     /* ============ 主题切换 ============ */
@@ -907,15 +1152,8 @@
         else delete document.documentElement.dataset.theme;
         setCookie("theme", mode);
         const sel = $("#theme-select"); if (sel) sel.value = mode;
-        // ECharts 在 canvas 渲染，需重渲染以套用新 CSS 变量色
-        if (lastSnap) {
-            requestAnimationFrame(() => {
-                const activeSection = document.querySelector(".section.active");
-                const sec = activeSection ? activeSection.dataset.section : "basic";
-                activateCharts(sec);
-                Object.values(charts).forEach((c) => c && c.resize());
-            });
-        }
+        // ECharts 在 canvas 渲染，需以完整选项重渲染以套用新 CSS 变量色
+        schedule(true);
     }
 
     /* ============ 自定义背景 ============ */
@@ -951,34 +1189,100 @@
     }
 
     /* ============ 数据连接 ============ */
-    let built = false;
-    function onSnapshot(snap) {
-        if (!snap || !snap.real_time_data) return;
-        if (!built) { firstRender(snap); built = true; }
-        else updateAll(snap);
+    const PAUSE_DELAY = 10000;  // 页面隐藏超过该毫秒数才断开连接，短暂切走不必重新同步
+    let synced = false;         // 已收到数据连接的完整快照，之后的增量基于它合并
+    let stream = null, pauseTimer = null;
+    // 合并后端增量（规则见 backend/broadcast.py）：对象按键递归，序列 {$append, $from} 原地滑动追加
+    // （数组引用不变，图表只需重新取数据），其余整体替换
+    function applyDelta(target, delta) {
+        if (delta && typeof delta === "object" && !Array.isArray(delta)) {
+            if (delta.$append && Array.isArray(target)) {
+                let k = 0;
+                while (k < target.length && target[k][0] < delta.$from) k++;
+                if (k) target.splice(0, k);
+                for (const p of delta.$append) target.push(p);
+                return target;
+            }
+            if (target && typeof target === "object" && !Array.isArray(target)) {
+                (delta.$del || []).forEach((k) => { delete target[k]; });
+                Object.keys(delta).forEach((k) => {
+                    if (k !== "$del") target[k] = k in target ? applyDelta(target[k], delta[k]) : delta[k];
+                });
+                return target;
+            }
+        }
+        return delta;
     }
-    function startWebSocket() {
-        const proto = location.protocol === "https:" ? "wss" : "ws";
-        const ws = new WebSocket(`${proto}://${location.host}/api/ws`);
-        ws.onopen = () => setStatus(true);
-        ws.onmessage = (ev) => { try { onSnapshot(JSON.parse(ev.data)); } catch (e) {} };
-        ws.onclose = () => { setStatus(false); startPolling(); };
-        ws.onerror = () => { ws.close(); };
+    function onStreamMessage(msg) {
+        if (msg.type === "status") setStatus(msg.ok);
+        else if (msg.type === "snapshot") {
+            synced = true;
+            lastSnap = msg.snap;
+            schedule(true);
+        } else if (msg.type === "delta" && synced) {
+            lastSnap = applyDelta(lastSnap, msg.delta);
+            schedule(false);
+        }
     }
-    let pollTimer = null;
-    function startPolling() {
-        if (pollTimer) return;
-        const poll = async () => {
+    // 首屏缓存（/api/cache）：数据连接的首帧到达前先渲染
+    function onCachedSnapshot(snap) {
+        if (synced || !snap || !snap.real_time_data) return;
+        lastSnap = snap;
+        schedule(true);
+    }
+    function startStream() {
+        const src = ($("#stream-script") || {}).src;
+        if (window.Worker && src) {
             try {
-                const r = await fetch("/api/data");
-                if (r.ok) { onSnapshot(await r.json()); setStatus(true); }
-            } catch (e) { setStatus(false); }
-        };
-        poll(); pollTimer = setInterval(poll, 2000);
+                const worker = new Worker(src);
+                worker.onmessage = (ev) => onStreamMessage(ev.data);
+                // Worker 脚本无法加载（CSP、file:// 等）时改为在主线程连接
+                worker.onerror = (ev) => {
+                    ev.preventDefault();
+                    worker.terminate();
+                    if (stream && stream.worker === worker) startLocalStream();
+                };
+                stream = {
+                    worker,
+                    pause: () => worker.postMessage({ type: "pause" }),
+                    resume: () => worker.postMessage({ type: "resume" }),
+                };
+                return;
+            } catch (e) {}
+        }
+        startLocalStream();
+    }
+    function startLocalStream() {
+        if (!window.SystemStatusStream) return;
+        // 主线程中连接会与页面共享对象，先复制一份，避免原地合并改动连接内保留的上一帧
+        const copy = window.structuredClone || ((v) => JSON.parse(JSON.stringify(v)));
+        stream = window.SystemStatusStream.createStream((msg) => onStreamMessage(copy(msg)));
+        stream.start();
+    }
+    // 页面隐藏：立即停止渲染，PAUSE_DELAY 后断开连接；重新可见：恢复连接（首帧为完整快照）并整体重绘
+    function onVisibilityChange() {
+        if (!stream) return;
+        if (document.hidden) {
+            clearTimeout(pauseTimer);
+            pauseTimer = setTimeout(() => {
+                synced = false;
+                stream.pause();
+            }, PAUSE_DELAY);
+        } else {
+            clearTimeout(pauseTimer);
+            stream.resume();
+            schedule(true);
+        }
     }
 
     function boot() {
         document.documentElement.lang = lang;
+        loadLocale(lang).then(() => {
+            T = LANGS[lang] || {};
+            localeReady = true;
+            applyI18n();
+            schedule(true);
+        });
         // 拉取 WebUI 配置（标题自定义等），拿到后再渲染文案
         fetch("/api/config").then((r) => r.json()).then((cfg) => {
             if (cfg && cfg.web_ui) webUiCfg = cfg.web_ui;
@@ -993,8 +1297,9 @@
         }
         initControls();
         applyBackground();
-        fetch("/api/cache").then((r) => r.json()).then(onSnapshot).catch(() => {});
-        startWebSocket();
+        fetch("/api/cache").then((r) => r.json()).then(onCachedSnapshot).catch(() => {});
+        startStream();
+        document.addEventListener("visibilitychange", onVisibilityChange);
         window.addEventListener("resize", () => Object.values(charts).forEach((c) => c.resize()));
     }
 
@@ -0,0 +1,205 @@
+/* SystemStatus 数据连接 —— 在 Web Worker 中运行（页面无法创建 Worker 时在主线程调用同一实现）
+ * 依次尝试：WebSocket /api/ws（每秒完整快照）→ /api/stream（SSE 增量推送）→ /api/stream?since= 长轮询。
+ * 只有从未连通过的 WebSocket 才降级（代理不支持 Upgrade 等）；连通过之后断开（网络抖动、服务重启）
+ * 按退避间隔重新连接 WebSocket，重启期间连接失败也不降级。降级后每 UPGRADE_INTERVAL 试探一次 WebSocket，连通即切换回来。
+ * JSON 解码、硬件清单合并与增量计算都在这里完成，页面只收到：
+ *   {type: "snapshot", snap}  首帧 / 重新连接后的完整快照
+ *   {type: "delta", delta}    相对上一帧的增量（规则同 backend/broadcast.py，WebSocket 的完整帧在这里转换）
+ *   {type: "status", ok}      连接状态
+ * 控制消息：{type: "pause"} 断开连接（页面隐藏时），{type: "resume"} 重新连接，首帧即为追平用的完整快照。
+ */
+
+(function (scope) {
+    "use strict";
+
+    const SAME = {};  // make_delta 的「无变化」标记
+    const RETRY_MIN = 1000;           // WebSocket 断线重连的初始间隔（毫秒），逐次翻倍
+    const RETRY_MAX = 30000;          // 重连间隔上限
+    const UPGRADE_INTERVAL = 60000;   // 降级后试探 WebSocket 的间隔
+
+    function isPoints(v) {
+        return Array.isArray(v) && v.length > 0 && Array.isArray(v[0]) && v[0].length === 2;
+    }
+    function equal(a, b) {
+        if (a === b) return true;
+        if (!a || !b || typeof a !== "object" || typeof b !== "object" || Array.isArray(a) !== Array.isArray(b)) return false;
+        if (Array.isArray(a)) {
+            if (a.length !== b.length) return false;
+            for (let i = 0; i < a.length; i++) if (!equal(a[i], b[i])) return false;
+            return true;
+        }
+        const keys = Object.keys(a);
+        if (keys.length !== Object.keys(b).length) return false;
+        return keys.every((k) => k in b && equal(a[k], b[k]));
+    }
+    // 与 backend/broadcast.py 的 make_delta 相同：对象按键递归，序列向前滑动时只给出新增点，其余变化整体替换
+    function makeDelta(old, cur) {
+        if (old === cur) return SAME;
+        const isObj = (v) => v && typeof v === "object" && !Array.isArray(v);
+        if (isObj(old) && isObj(cur)) {
+            const out = {};
+            let changed = false;
+            Object.keys(cur).forEach((k) => {
+                const d = k in old ? makeDelta(old[k], cur[k]) : cur[k];
+                if (d !== SAME) { out[k] = d; changed = true; }
+            });
+            const removed = Object.keys(old).filter((k) => !(k in cur));
+            if (removed.length) { out.$del = removed; changed = true; }
+            return changed ? out : SAME;
+        }
+        if (isPoints(old) && isPoints(cur)) {
+            const last = old[old.length - 1][0];
+            let k = 0;
+            while (k < cur.length && cur[k][0] <= last) k++;
+            if (k && equal(cur.slice(0, k), old.slice(old.length - k))) {
+                if (k === cur.length && cur.length === old.length) return SAME;
+                return { $append: cur.slice(k), $from: cur[0][0] };
+            }
+            return cur;
+        }
+        return equal(old, cur) ? SAME : cur;
+    }
+
+    function createStream(post) {
+        let mode = "ws";    // 当前连接方式，降级后保持（重新连接时不再尝试更高的方式）
+        let gen = 0;        // 连接代数：断开后旧连接的回调一律忽略
+        let conn = null;
+        let paused = false;
+        let retry = RETRY_MIN;
+        let wsWorked = false;  // WebSocket 是否连通过
+        const status = (ok) => post({ type: "status", ok });
+        const wsUrl = () => `${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/api/ws`;
+
+        function openWebSocket(my) {
+            const ws = new WebSocket(wsUrl());
+            let hardware = null, prev = null, opened = false;
+            conn = ws;
+            ws.onopen = () => {
+                if (my !== gen) return;
+                opened = wsWorked = true;
+                retry = RETRY_MIN;
+                status(true);
+            };
+            // 硬件清单只随首帧下发，之后按 hardware_changed 的差异合并；每帧完整快照在这里转换为增量
+            ws.onmessage = (ev) => {
+                if (my !== gen) return;
+                let msg;
+                try { msg = JSON.parse(ev.data); } catch (e) { return; }
+                if (msg.type === "hardware_changed") {
+                    // diff 为变化的部分及其新值，已删除的部分列在 $del 中（同增量规则）
+                    hardware = Object.assign({}, hardware, msg.diff);
+                    (msg.diff.$del || []).forEach((k) => { delete hardware[k]; });
+                    delete hardware.$del;
+                    return;
+                }
+                if (msg.hardware_info) hardware = msg.hardware_info;
+                else msg.hardware_info = hardware;
+                if (!prev) post({ type: "snapshot", snap: msg });
+                else {
+                    const delta = makeDelta(prev, msg);
+                    if (delta !== SAME) post({ type: "delta", delta });
+                }
+                prev = msg;
+            };
+            let closed = false;
+            ws.onclose = () => {
+                if (closed || my !== gen) return;
+                closed = true;
+                status(false);
+                if (!opened && !wsWorked) { mode = "sse"; connect(); return; }
+                // 保持 WebSocket，退避后重连（pause 会使本次重连失效）
+                setTimeout(() => { if (my === gen) connect(); }, retry);
+                retry = Math.min(retry * 2, RETRY_MAX);
+            };
+            // 按规范 error 之后必有 close；个别实现握手失败时只触发 error，这里同样按断开处理（closed 保证只处理一次）
+            ws.onerror = () => { ws.onerror = null; ws.close(); ws.onclose(); };
+        }
+        // SSE：首帧为完整快照，之后只推送增量（原样转发）；断线后浏览器带 Last-Event-ID 自动重连补发
+        function openStream(my) {
+            const src = new EventSource("/api/stream");
+            let synced = false;
+            conn = src;
+            src.addEventListener("snapshot", (ev) => {
+                if (my !== gen) return;
+                try { post({ type: "snapshot", snap: JSON.parse(ev.data) }); synced = true; status(true); } catch (e) {}
+            });
+            src.addEventListener("delta", (ev) => {
+                if (my !== gen || !synced) return;
+                try { post({ type: "delta", delta: JSON.parse(ev.data) }); status(true); } catch (e) {}
+            });
+            src.onerror = () => {
+                if (my !== gen) return;
+                status(false);
+                // 从未收到数据（代理拦截 / 缓冲了事件流）则放弃 SSE，改用长轮询
+                if (!synced) { src.close(); mode = "poll"; connect(); }
+            };
+        }
+        // 长轮询：有新帧立即返回增量，否则服务端挂起至超时，开销与 WebSocket 订阅者相同
+        async function poll(my) {
+            const ctl = scope.AbortController ? new AbortController() : null;
+            conn = { close: () => ctl && ctl.abort() };
+            let seq = 0, synced = false;
+            while (my === gen) {
+                try {
+                    const r = await fetch(`/api/stream?since=${seq}`, { cache: "no-store", signal: ctl && ctl.signal });
+                    if (!r.ok) throw new Error(String(r.status));
+                    const msg = await r.json();
+                    if (my !== gen) return;
+                    if (msg.snapshot) { post({ type: "snapshot", snap: msg.snapshot }); synced = true; }
+                    else if (synced) (msg.deltas || []).forEach((delta) => post({ type: "delta", delta }));
+                    seq = synced ? msg.seq : 0;
+                    status(true);
+                } catch (e) {
+                    if (my !== gen) return;
+                    status(false);
+                    await new Promise((res) => setTimeout(res, 2000));
+                }
+            }
+        }
+
+        function connect() {
+            const my = ++gen;
+            if (mode === "ws" && scope.WebSocket) openWebSocket(my);
+            else if (mode !== "poll" && scope.EventSource) openStream(my);
+            else { mode = "poll"; poll(my); }
+        }
+        function disconnect() {
+            gen++;
+            if (conn) conn.close();
+            conn = null;
+        }
+        // 降级期间试探 WebSocket：握手成功才断开当前连接并切换，试探失败不影响正在使用的连接
+        function upgrade() {
+            if (paused || mode === "ws" || !scope.WebSocket) return;
+            const probe = new WebSocket(wsUrl());
+            probe.onopen = () => {
+                probe.close();
+                if (paused || mode === "ws") return;
+                disconnect();
+                mode = "ws";
+                connect();
+            };
+            probe.onerror = () => { probe.onerror = null; probe.close(); };
+        }
+        return {
+            start() {
+                setInterval(upgrade, UPGRADE_INTERVAL);
+                connect();
+            },
+            pause() { if (!paused) { paused = true; disconnect(); } },
+            // 重新可见时先尝试 WebSocket，仍不可用会再次降级
+            resume() { if (paused) { paused = false; mode = "ws"; connect(); } },
+        };
+    }
+
+    if (typeof WorkerGlobalScope !== "undefined" && scope instanceof WorkerGlobalScope) {
+        const stream = createStream((msg) => scope.postMessage(msg));
+        scope.onmessage = (ev) => {
+            const fn = ev.data && stream[ev.data.type];
+            if (fn) fn();
+        };
+        stream.start();
+    } else {
+        scope.SystemStatusStream = { createStream, makeDelta };
+    }
+})(self);
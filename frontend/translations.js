@@ -1,6 +1,6 @@
 // 语言翻译聚合文件 - System Status Monitor
 // 各语言翻译已拆分到 frontend/locales/<code>.js 独立文件，
-// 由 index.html 按序加载后，本文件负责聚合为 window.LANGUAGES。
+// 由 script.js 按需加载（只加载当前语言），加载后出现在 window.LANGUAGES 中。
 // 注意：使用 window 对象导出，避免与其他脚本冲突。
 
 window.LANGUAGE_DATA = window.LANGUAGE_DATA || {};
@@ -53,7 +53,7 @@ window.LANGUAGE_CONFIG = {
     }
 };
 
-// 下拉菜单顺序（与 index.html 加载顺序一致）
+// 下拉菜单顺序，也是可选语言代码的全集（index.html 的 LOCALE_URLS 需包含同样的代码）
 window.LANGUAGE_ORDER = [
     'zh-CN', 'en-US', 'ja-JP', 'fr-FR', 'de-DE', 'ru-RU', 'ko-KR', 'es-ES', 'id-ID', 'th-TH'
 ];
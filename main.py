@@ -47,8 +47,10 @@ import threading
 import time
 from backend.hardware import init_nvml, shutdown_nvml
 from backend.monitor import collect_real_time_data, restore_from_cache, update_cache_file
-from backend.routers import api_router
+from backend.routers import api_router, static_router, asset_response
+from backend.assets import static_assets, FINGERPRINT_ENABLED
 from backend.app_config import get_server_config
+from backend import workers
 BASE_DIR = Path(__file__).parent.absolute()
 FRONTEND_DIR = BASE_DIR / "frontend"
 PUBLIC_DIR = BASE_DIR / "public"
@@ -57,6 +59,7 @@ PUBLIC_DIR = BASE_DIR / "public"
 _SERVER_CFG = get_server_config()
 HOST = _SERVER_CFG.get("host", "0.0.0.0")
 PORT = int(_SERVER_CFG.get("port", 8001))
+WORKERS = max(1, int(_SERVER_CFG.get("workers", 1)))
 
 # 获取Git版本信息
 def get_git_commit_sha():
@@ -94,6 +97,13 @@ async def log_requests(request: Request, call_next):
     process_time = (time.time() - start_time) * 1000
     print(f"[Response] Status: {response.status_code} | Time: {process_time:.2f}ms")
     return response
+if workers.WORKER_MODE:
+    # 多进程模式的 worker：依赖采集进程内存状态的接口转发到采集进程
+    @app.middleware("http")
+    async def forward_to_collector(request: Request, call_next):
+        if workers.is_local(request.url.path):
+            return await call_next(request)
+        return await workers.forward(request)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -106,7 +116,12 @@ app.add_middleware(
 )
 app.include_router(api_router)
 if FRONTEND_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
+    if FINGERPRINT_ENABLED:
+        # 启动时一次性指纹化并预压缩前端资源，页面中的引用改写为指纹路径
+        static_assets.build()
+        app.include_router(static_router)
+    else:
+        app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
 if PUBLIC_DIR.exists():
     app.mount("/public", StaticFiles(directory=str(PUBLIC_DIR)), name="public")
 @app.get("/robots.txt", include_in_schema=False)
@@ -149,7 +164,9 @@ async def humans_txt():
         return FileResponse(str(file_path), media_type="text/plain")
     raise HTTPException(status_code=404, detail="File not found")
 @app.get("/")
-async def root():
+async def root(request: Request):
+    if static_assets.built and "index.html" in static_assets.assets:
+        return asset_response(request, static_assets.assets["index.html"], immutable=False)
     index_path = FRONTEND_DIR / "index.html"
     if index_path.exists():
         return FileResponse(str(index_path))
@@ -167,6 +184,9 @@ async def root():
     )
 @app.exception_handler(404)
 async def custom_404_handler(request: Request, exc):
+    for page in ("404.html", "index.html"):
+        if static_assets.built and page in static_assets.assets:
+            return asset_response(request, static_assets.assets[page], immutable=False)
     custom_404_path = FRONTEND_DIR / "404.html"
     if custom_404_path.exists():
         return FileResponse(str(custom_404_path))
@@ -216,6 +236,11 @@ if __name__ == "__main__":
             except Exception:
                 pass
 
+        if WORKERS > 1:
+            # 多进程模式：本进程只采集与发布快照，对外服务由 uvicorn worker 进程承担
+            workers.serve(app, "main:app", HOST, PORT, WORKERS, **run_kwargs)
+            sys.exit(0)
+
         def make_config():
             cfg = uvicorn.Config(app, host=HOST, port=PORT, **run_kwargs)
             return cfg
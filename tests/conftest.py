@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 测试直接导入 backend 包：把仓库根目录加入导入路径（python -m pytest 与 pytest 均可运行）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,91 @@
+"""
+告警引擎测试：规则加载的容错，以及用本地 HTTP 接收端（http.server，127.0.0.1 随机端口）验证
+webhook 通知能收到 firing / resolved 事件，且迟滞区间（clear 与 threshold 之间）不会提前恢复。
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from backend.alerts import AlertEngine
+
+
+@pytest.fixture
+def receiver():
+    events = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            events.append(json.loads(body))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/alert", events
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(events, n, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(events) < n and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return events
+
+
+def test_webhook_receives_firing_and_resolved_with_hysteresis(receiver):
+    url, events = receiver
+    engine = AlertEngine([{"name": "disk_full", "metric": "disk_usage.*", "op": ">", "threshold": 90, "clear": 85}],
+                         [{"type": "webhook", "url": url, "timeout": 2}], repeat_interval=0)
+
+    engine.evaluate(0, {"disk_usage./": 80})
+    engine.evaluate(1, {"disk_usage./": 95})
+    assert [a["state"] for a in engine.active()] == ["firing"]
+    # 回落到 clear 与 threshold 之间：仍为 firing，不发送恢复
+    assert engine.evaluate(2, {"disk_usage./": 88}) == []
+    assert [a["state"] for a in engine.active()] == ["firing"]
+    engine.evaluate(3, {"disk_usage./": 84})
+    assert engine.active() == []
+
+    wait_for(events, 2)
+    assert [(e["event"], e["rule"], e["series"], e["value"]) for e in events] == [
+        ("firing", "disk_full", "disk_usage./", 95.0),
+        ("resolved", "disk_full", "disk_usage./", 84.0),
+    ]
+
+
+def test_for_duration_and_disappearing_series(receiver):
+    url, events = receiver
+    engine = AlertEngine([{"name": "cpu", "metric": "cpu_usage", "threshold": 90, "for": 2}],
+                         [{"type": "webhook", "url": url}], repeat_interval=0)
+    engine.evaluate(0, {"cpu_usage": 95})
+    engine.evaluate(1, {"cpu_usage": 95})
+    assert [a["state"] for a in engine.active()] == ["pending"]
+    engine.evaluate(2, {"cpu_usage": 95})
+    # 指标消失时 firing 的告警按恢复处理
+    engine.evaluate(3, {})
+    wait_for(events, 2)
+    assert [e["event"] for e in events] == ["firing", "resolved"]
+
+
+def test_invalid_and_duplicate_rules_are_skipped(capsys):
+    engine = AlertEngine([
+        {"name": "a", "metric": "cpu_usage", "threshold": 90},
+        {"name": "a", "metric": "mem_usage", "threshold": 90},
+        {"name": "no_threshold", "metric": "cpu_usage"},
+        {"name": "bad_op", "metric": "cpu_usage", "threshold": 1, "op": "=="},
+        {"name": "bad_number", "metric": "cpu_usage", "threshold": "high"},
+        "not a mapping",
+    ], [])
+    assert [(r.name, r.metric) for r in engine.rules] == [("a", "cpu_usage")]
+    out = capsys.readouterr().out
+    for reason in ("重复", "缺少 threshold", "不支持的比较符", "high", "映射"):
+        assert reason in out
@@ -0,0 +1,117 @@
+"""
+cgroup v2 采集器测试：在临时目录中伪造 cgroupfs（cgroup.controllers、cpu.stat、io.stat、memory.current、*.pressure），
+按 Kubernetes 节点的目录布局验证遍历深度、速率计算与容器退出后的清理。
+"""
+import os
+import shutil
+
+import pytest
+
+from backend.cgroups import SERIES_KEYS, CgroupCollector, detect_root
+
+POD = "kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod1234.slice"
+CONTAINER = POD + "/cri-containerd-abcd.scope"
+
+
+def write_cgroup(root, rel, usage_usec=0, rbytes=0, wbytes=0, mem=0, psi_cpu=0.0):
+    path = os.path.join(root, rel)
+    os.makedirs(path, exist_ok=True)
+    files = {
+        "cpu.stat": f"usage_usec {usage_usec}\nuser_usec 0\nsystem_usec 0\n",
+        "io.stat": f"8:0 rbytes={rbytes} wbytes={wbytes} rios=0 wios=0 dbytes=0 dios=0\n",
+        "memory.current": f"{mem}\n",
+        "cpu.pressure": f"some avg10={psi_cpu:.2f} avg60=0.00 avg300=0.00 total=0\n"
+                        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n",
+    }
+    for name, text in files.items():
+        with open(os.path.join(path, name), "w") as f:
+            f.write(text)
+
+
+@pytest.fixture
+def cgroupfs(tmp_path):
+    root = str(tmp_path)
+    with open(os.path.join(root, "cgroup.controllers"), "w") as f:
+        f.write("cpuset cpu io memory pids\n")
+    for rel in ("system.slice", "system.slice/docker-1.scope", "kubepods.slice",
+                "kubepods.slice/kubepods-burstable.slice", POD, CONTAINER):
+        write_cgroup(root, rel)
+    return root
+
+
+def test_detect_root(cgroupfs, tmp_path):
+    assert detect_root(cgroupfs) == cgroupfs
+    assert detect_root(str(tmp_path / "missing")) is None
+
+
+def test_default_depth_reaches_kubernetes_containers(cgroupfs):
+    walked = CgroupCollector(root=cgroupfs).walk()
+    assert "system.slice/docker-1.scope" in walked
+    assert CONTAINER in walked
+    assert CONTAINER not in CgroupCollector(root=cgroupfs, max_depth=3).walk()
+
+
+def test_rates_on_monotonic_clock(cgroupfs):
+    c = CgroupCollector(root=cgroupfs)
+    assert c.sample(1000.0, clock=10.0) == {}  # 首轮只建立基线
+
+    write_cgroup(cgroupfs, CONTAINER, usage_usec=500000, rbytes=4096, wbytes=2048, mem=64 << 20, psi_cpu=1.5)
+    # 墙钟回拨（NTP 调整）不影响速率：间隔按单调时钟计
+    latest = c.sample(900.0, clock=11.0)
+    assert latest[CONTAINER] == {"cpu": 50.0, "io_read": 4.0, "io_write": 2.0, "mem": 64.0,
+                                 "psi_cpu": 1.5, "psi_mem": 0.0, "psi_io": 0.0}
+    assert c.series("/" + CONTAINER)["cpu"] == [(900.0, 50.0)]
+    assert c.top(1)[0]["path"] == "/" + CONTAINER
+
+    # 计数器变小（cgroup 以同名重建）按重置处理：本轮速率为 0，以当前值为新基线
+    write_cgroup(cgroupfs, CONTAINER, usage_usec=1000)
+    assert c.sample(901.0, clock=12.0)[CONTAINER]["cpu"] == 0.0
+    write_cgroup(cgroupfs, CONTAINER, usage_usec=201000)
+    assert c.sample(902.0, clock=13.0)[CONTAINER]["cpu"] == 20.0
+
+
+def test_removed_cgroup_is_dropped(cgroupfs):
+    c = CgroupCollector(root=cgroupfs, rescan_interval=0)
+    c.sample(0.0, clock=0.0)
+    c.sample(1.0, clock=1.0)
+    assert c.series("/" + CONTAINER) is not None
+
+    shutil.rmtree(os.path.join(cgroupfs, CONTAINER))
+    latest = c.sample(2.0, clock=2.0)
+    assert CONTAINER not in latest
+    assert c.series("/" + CONTAINER) is None
+    assert POD in latest
+
+
+def test_unavailable_root(tmp_path):
+    c = CgroupCollector(root=str(tmp_path / "missing"))
+    assert not c.available
+    assert c.sample() == {}
+
+
+def test_series_budget_overflow_and_release(cgroupfs):
+    c = CgroupCollector(root=cgroupfs, max_series=2)
+    c.sample(0.0, clock=0.0)
+    write_cgroup(cgroupfs, CONTAINER, usage_usec=1_000_000, psi_cpu=3.0)
+    c.sample(1.0, clock=1.0)
+    flat = c.flatten()
+    # 先到先得：深度优先的前两个 cgroup 单独成序列，其余按字段取最大值合并
+    individual = sorted({k[len("cgroup./"):].rsplit(".", 1)[0] for k in flat} - {"*"})
+    assert individual == ["kubepods.slice", "kubepods.slice/kubepods-burstable.slice"]
+    assert c.overflowed == 4
+    assert flat["cgroup./*.cpu"] == 100.0
+    assert flat["cgroup./*.psi_cpu"] == 3.0
+    assert len(flat) == 3 * 7
+
+    # 退出的 cgroup 在其历史列被回收前仍占名额；回收后名额释放给之后的 cgroup
+    shutil.rmtree(os.path.join(cgroupfs, "kubepods.slice"))
+    c.sample(2.0, clock=2.0)
+    assert "cgroup./*.cpu" in c.flatten()
+    c.release([f"cgroup./kubepods.slice.{k}" for k in SERIES_KEYS] +
+              [f"cgroup./kubepods.slice/kubepods-burstable.slice.{k}" for k in SERIES_KEYS])
+    flat = c.flatten()
+    assert "cgroup./system.slice/docker-1.scope.cpu" in flat
+    assert "cgroup./*.cpu" not in flat and c.overflowed == 0
+
+    c.adopt(["cgroup./gone.slice.cpu", "cpu_usage"])
+    assert "gone.slice" in c._tracked and len(c._tracked) == 3
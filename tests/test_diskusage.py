@@ -0,0 +1,79 @@
+"""
+磁盘用量采集测试：用 bench/diskusage.py 的 FakeStatvfs 模拟服务端无响应的网络挂载点，
+验证挂起的挂载点多于线程数时本地磁盘仍能获取并持续刷新。
+"""
+import collections
+import time
+
+import pytest
+
+from backend.diskusage import DiskUsageCollector
+from bench.diskusage import FakeStatvfs
+
+LOCAL = [{"device": "/dev/vda1", "mountpoint": "/", "fstype": "ext4"},
+         {"device": "/dev/vdb1", "mountpoint": "/data", "fstype": "xfs"}]
+HUNG = [{"device": f"nas:/hung{i}", "mountpoint": f"/mnt/hung{i}", "fstype": "nfs4"} for i in range(4)]
+
+
+@pytest.fixture
+def fake():
+    fake = FakeStatvfs(delay=0.0)
+    yield fake
+    fake.release()
+
+
+def counting(fake):
+    calls = collections.Counter()
+
+    def statvfs(path):
+        calls[path] += 1
+        return fake(path)
+    return statvfs, calls
+
+
+def poll(collector, parts, until, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        out = collector.usage(parts)
+        if until(out) or time.monotonic() > deadline:
+            return out
+        time.sleep(0.02)
+
+
+def test_local_disks_reported_while_more_mounts_than_workers_hang(fake):
+    statvfs, calls = counting(fake)
+    collector = DiskUsageCollector(workers=2, timeout=0.1, wait=0.5, refresh={"default": 0.05}, statvfs=statvfs)
+
+    # 首次调用正常返回，之后 4 个挂载点全部挂起（多于 workers）并超时
+    out = poll(collector, HUNG, lambda out: len(out) == 4 and all(d["stale"] for d in out))
+    assert len(out) == 4 and all(d["stale"] for d in out)
+
+    # 此后新出现的本地磁盘仍能取到结果，不会排在挂起的调用之后
+    out = poll(collector, HUNG + LOCAL, lambda out: {"/", "/data"} <= {d["mountpoint"] for d in out})
+    local = {d["mountpoint"]: d for d in out if not d["mountpoint"].startswith("/mnt/")}
+    assert set(local) == {"/", "/data"}
+    assert not any(d["stale"] for d in local.values())
+
+    # 并且按刷新间隔持续刷新
+    before = calls["/"]
+    poll(collector, HUNG + LOCAL, lambda out: calls["/"] >= before + 3)
+    assert calls["/"] >= before + 3
+    assert all(calls[p["mountpoint"]] == 2 for p in HUNG)  # 挂起的挂载点同时最多一个调用在途
+
+
+def test_abandoned_threads_are_capped(fake):
+    collector = DiskUsageCollector(workers=1, timeout=0.05, wait=0.5, refresh={"default": 0.01},
+                                   max_hung=2, statvfs=fake)
+    poll(collector, HUNG, lambda out: collector._abandoned == 2 and len(out) == 4)
+    time.sleep(0.2)
+    collector.usage(HUNG)
+    assert collector._abandoned == 2
+    assert collector._threads == 3
+
+    # 挂起的调用返回后被顶替的线程退出
+    fake.release()
+    deadline = time.monotonic() + 5
+    while collector._abandoned and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert collector._abandoned == 0
+    assert collector._threads == 1